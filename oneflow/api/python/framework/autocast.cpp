@@ -0,0 +1,46 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include <pybind11/pybind11.h>
+#include "oneflow/api/python/of_api_registry.h"
+#include "oneflow/core/framework/autocast.h"
+#include "oneflow/core/framework/device.h"
+#include "oneflow/core/framework/dtype.h"
+#include "oneflow/core/framework/to_string.h"
+
+namespace py = pybind11;
+
+namespace oneflow {
+
+namespace autocast {
+
+ONEFLOW_API_PYBIND11_MODULE("autocast", m) {
+  m.def("is_enabled", &is_enabled);
+  m.def("set_enabled", &set_enabled);
+  m.def("get_device_type", []() {
+    return Device::Type4DeviceTag(DeviceTag4DeviceType(get_device_type()).GetOrThrow());
+  });
+  m.def("set_device_type", [](const std::string& device_type) {
+    std::string device_tag = device_type == "cuda" ? "gpu" : device_type;
+    set_device_type(DeviceType4DeviceTag(device_tag).GetOrThrow());
+  });
+  m.def("get_dtype", &get_dtype);
+  m.def("set_dtype", &set_dtype);
+  m.def("clear_cache", &clear_cache);
+}
+
+}  // namespace autocast
+
+}  // namespace oneflow
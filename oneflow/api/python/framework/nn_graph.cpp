@@ -21,6 +21,7 @@ limitations under the License.
 #include "oneflow/core/framework/tensor.h"
 #include "oneflow/core/framework/nn_graph.h"
 #include "oneflow/core/job/runtime.h"
+#include "oneflow/core/profiler/graph_profiler.h"
 #include "oneflow/core/register/blob.h"
 
 namespace py = pybind11;
@@ -50,7 +51,16 @@ ONEFLOW_API_PYBIND11_MODULE("nn.graph.", m) {
                  .GetOrThrow();
            })
       .def("complie_and_init_runtime",
-           [](NNGraph& graph) { return graph.CompileAndInitRuntime().GetOrThrow(); });
+           [](NNGraph& graph) { return graph.CompileAndInitRuntime().GetOrThrow(); })
+      .def("init_runtime_with_compiled_plan",
+           [](NNGraph& graph, const std::string& serialized_job,
+              const std::string& serialized_plan) {
+             return graph.InitRuntimeWithCompiledPlan(serialized_job, serialized_plan)
+                 .GetOrThrow();
+           })
+      .def("get_serialized_plan",
+           [](const NNGraph& graph) { return py::bytes(*graph.GetSerializedPlan().GetOrThrow()); })
+      .def("close", [](NNGraph& graph) { return graph.Close().GetOrThrow(); });
 
   m.def("RunLazyNNGraph",
         [](const one::TensorTuple& inputs, const one::TensorTuple& outputs,
@@ -61,6 +71,45 @@ ONEFLOW_API_PYBIND11_MODULE("nn.graph.", m) {
         [](const one::TensorTuple& buffers, const std::shared_ptr<NNGraph>& nn_graph) {
           return SoftSyncNNGraphBuffers(buffers, nn_graph).GetOrThrow();
         });
+  m.def("GetRuntimeProfile", [](const std::string& job_name) {
+    py::list records;
+    for (const auto& stats : profiler::GetActorRuntimeStats(job_name)) {
+      py::dict record;
+      record["actor_id"] = stats.actor_id;
+      record["act_cnt"] = stats.act_cnt;
+      record["act_ns"] = stats.act_ns;
+      record["read_wait_ns"] = stats.read_wait_ns;
+      record["write_wait_ns"] = stats.write_wait_ns;
+      record["queue_ns"] = stats.queue_ns;
+      record["queue_msg_cnt"] = stats.queue_msg_cnt;
+      py::list kernels;
+      for (const auto& kernel : stats.kernels) {
+        py::dict kernel_record;
+        kernel_record["op_name"] = kernel.op_name;
+        kernel_record["launch_cnt"] = kernel.launch_cnt;
+        kernel_record["total_ns"] = kernel.total_ns;
+        kernel_record["max_ns"] = kernel.max_ns;
+        kernels.append(kernel_record);
+      }
+      record["kernels"] = kernels;
+      py::list regsts;
+      for (const auto& regst : stats.regsts) {
+        py::dict regst_record;
+        regst_record["regst_desc_id"] = regst.regst_desc_id;
+        regst_record["capacity"] = regst.capacity;
+        regst_record["sample_cnt"] = regst.sample_cnt;
+        regst_record["total_in_use"] = regst.total_in_use;
+        regst_record["max_in_use"] = regst.max_in_use;
+        regst_record["full_cnt"] = regst.full_cnt;
+        regsts.append(regst_record);
+      }
+      record["regsts"] = regsts;
+      records.append(record);
+    }
+    return records;
+  });
+  m.def("ResetRuntimeProfile",
+        [](const std::string& job_name) { profiler::ResetActorRuntimeStats(job_name); });
   m.def("AddTensorAsGraphLoss",
         [](const std::shared_ptr<one::Tensor>& t) { return AddTensorAsGraphLoss(t).GetOrThrow(); });
 }
@@ -73,6 +73,18 @@ void ApiCopyMirroredTensorFromNumpy(const std::shared_ptr<Tensor>& tensor, py::a
   Py_DECREF(copied_array);
 }
 
+template<typename T>
+void ApiCopyMirroredTensorFromNumpyBlocking(const std::shared_ptr<Tensor>& tensor,
+                                            py::array_t<T> array) {
+  // Wait until the copy is done instead of backing up the array, the caller must
+  // pass a C-style contiguous array.
+  CHECK_OR_THROW(PyArray_IS_C_CONTIGUOUS((PyArrayObject*)array.ptr()))
+      << "the numpy array must be C-style contiguous";
+  CopyBetweenMirroredTensorAndNumpy<T>(tensor, array.ptr(), BlobNumpyCopyUtil<T>::From, "mut",
+                                       /*block_host_until_done=*/true)
+      .GetOrThrow();
+}
+
 const std::string& ApiGetCopyMirroredTensorToNumpyFuncName(const Tensor& tensor) {
   return *GetCopyMirroredTensorToNumpyFuncName(tensor.dtype()->data_type()).GetPtrOrThrow();
 }
@@ -100,6 +112,8 @@ bool ApiIsContiguous(const std::shared_ptr<Tensor>& tensor) {
   return IsContiguous(tensor).GetOrThrow();
 }
 
+bool ApiIsPinned(const std::shared_ptr<Tensor>& tensor) { return IsPinned(tensor).GetOrThrow(); }
+
 py::tuple ApiTensorGetPyTupleOfSbp(const Tensor& tensor) {
   return *TensorGetPyTupleOfSbp(tensor).GetPtrOrThrow();
 }
@@ -163,6 +177,7 @@ ONEFLOW_API_PYBIND11_MODULE("", m) {
              return py::tuple(py::make_iterator(stride.begin(), stride.end()));
            })
       .def("is_contiguous", &ApiIsContiguous)
+      .def("is_pinned", &ApiIsPinned)
       .def_property_readonly("grad_fn", &Tensor::grad_fn_node)
       .def_property_readonly("is_leaf", &Tensor::is_leaf)
       .def_property("requires_grad", &Tensor::requires_grad, &ApiSetRequiresGrad)
@@ -198,9 +213,10 @@ ONEFLOW_API_PYBIND11_MODULE("", m) {
            [](const std::shared_ptr<one::Tensor>& tensor) {
              return CheckMetaConsistency(tensor).GetOrThrow();
            })
-#define DEFINE_TENSOR_METHOD(T, type_proto)                    \
-  .def("_copy_to_numpy_" #T, &ApiCopyMirroredTensorToNumpy<T>) \
-      .def("_copy_from_numpy_" #T, &ApiCopyMirroredTensorFromNumpy<T>)
+#define DEFINE_TENSOR_METHOD(T, type_proto)                                             \
+  .def("_copy_to_numpy_" #T, &ApiCopyMirroredTensorToNumpy<T>)                          \
+      .def("_copy_from_numpy_" #T, &ApiCopyMirroredTensorFromNumpy<T>)                  \
+      .def("_copy_from_numpy_blocking_" #T, &ApiCopyMirroredTensorFromNumpyBlocking<T>)
           OF_PP_FOR_EACH_TUPLE(DEFINE_TENSOR_METHOD, POD_DATA_TYPE_SEQ BOOL_DATA_TYPE_SEQ)
 #undef DEFINE_TENSOR_METHOD
       .def("_get_copy_mirrored_tensor_to_numpy_func_name", &ApiGetCopyMirroredTensorToNumpyFuncName)
@@ -14,9 +14,11 @@ See the License for the specific language governing permissions and
 limitations under the License.
 */
 #include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
 #include "oneflow/api/python/of_api_registry.h"
 
 #include "oneflow/core/profiler/profiler.h"
+#include "oneflow/core/profiler/op_profiler.h"
 
 namespace py = pybind11;
 
@@ -30,6 +32,30 @@ ONEFLOW_API_PYBIND11_MODULE("profiler", m) {
   m.def("ProfilerStart", []() { profiler::ProfilerStart(); });
 
   m.def("ProfilerStop", []() { profiler::ProfilerStop(); });
+
+  m.def("EnableOpProfiler",
+        [](bool record_shapes) { profiler::EnableOpProfiler(record_shapes).GetOrThrow(); });
+
+  m.def("DisableOpProfiler", []() {
+    const auto& events = profiler::DisableOpProfiler().GetPtrOrThrow();
+    py::list records;
+    for (const auto& event : *events) {
+      py::dict record;
+      record["id"] = event->id;
+      record["op_type_name"] = event->op_type_name;
+      record["device"] = event->device;
+      record["input_shapes"] = event->input_shapes;
+      record["dispatch_thread_id"] = event->dispatch_thread_id;
+      record["dispatch_start_ns"] = event->dispatch_start_ns;
+      record["dispatch_end_ns"] = event->dispatch_end_ns;
+      record["kernel_thread_id"] = event->kernel_thread_id;
+      record["kernel_start_ns"] = event->kernel_start_ns;
+      record["kernel_end_ns"] = event->kernel_end_ns;
+      record["allocated_bytes"] = event->allocated_bytes;
+      records.append(record);
+    }
+    return records;
+  });
 }
 
 }  // namespace oneflow
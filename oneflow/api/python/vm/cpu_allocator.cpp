@@ -0,0 +1,47 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include <pybind11/pybind11.h>
+#include "oneflow/api/python/of_api_registry.h"
+#include "oneflow/core/vm/cpu_allocator.h"
+
+namespace oneflow {
+namespace vm {
+
+namespace py = pybind11;
+
+ONEFLOW_API_PYBIND11_MODULE("vm", m) {
+  m.def("CpuAllocatorStats", []() {
+    const CpuAllocator::Stats stats = Global<CpuAllocator>::Get()->GetStats();
+    py::dict dict;
+    dict["bytes_in_use"] = stats.bytes_in_use;
+    dict["peak_bytes_in_use"] = stats.peak_bytes_in_use;
+    dict["cached_bytes"] = stats.cached_bytes;
+    dict["num_allocs"] = stats.num_allocs;
+    dict["num_frees"] = stats.num_frees;
+    dict["num_cache_hits"] = stats.num_cache_hits;
+    dict["num_system_allocs"] = stats.num_system_allocs;
+    dict["num_system_frees"] = stats.num_system_frees;
+    return dict;
+  });
+  m.def("CpuAllocatorEmptyCache", []() { Global<CpuAllocator>::Get()->EmptyCache(); });
+  m.def("CpuAllocatorResetPeakStats", []() { Global<CpuAllocator>::Get()->ResetPeakStats(); });
+  m.def("CpuAllocatorGetCacheLimit", []() { return Global<CpuAllocator>::Get()->cache_limit(); });
+  m.def("CpuAllocatorSetCacheLimit",
+        [](size_t cache_limit) { Global<CpuAllocator>::Get()->set_cache_limit(cache_limit); });
+}
+
+}  // namespace vm
+}  // namespace oneflow
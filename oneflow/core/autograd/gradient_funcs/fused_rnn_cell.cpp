@@ -0,0 +1,120 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+
+#include "oneflow/core/framework/op_expr_grad_function.h"
+#include "oneflow/core/framework/op_expr.h"
+#include "oneflow/core/functional/functional.h"
+
+namespace oneflow {
+namespace one {
+
+struct FusedLstmCellCaptureState : public AutoGradCaptureState {
+  bool input_gates_requires_grad = false;
+  bool hidden_gates_requires_grad = false;
+  bool cx_requires_grad = false;
+};
+
+class FusedLstmCell : public OpExprGradFunction<FusedLstmCellCaptureState> {
+ public:
+  Maybe<void> Init(const OpExpr& op) override { return Maybe<void>::Ok(); }
+
+  Maybe<void> Capture(FusedLstmCellCaptureState* ctx, const TensorTuple& inputs,
+                      const TensorTuple& outputs, const AttrMap& attrs) const override {
+    CHECK_EQ_OR_RETURN(inputs.size(), 3);   // input_gates, hidden_gates, cx
+    CHECK_EQ_OR_RETURN(outputs.size(), 3);  // hy, cy, workspace
+    ctx->input_gates_requires_grad = inputs.at(0)->requires_grad();
+    ctx->hidden_gates_requires_grad = inputs.at(1)->requires_grad();
+    ctx->cx_requires_grad = inputs.at(2)->requires_grad();
+    if (!ctx->input_gates_requires_grad && !ctx->hidden_gates_requires_grad
+        && !ctx->cx_requires_grad) {
+      return Maybe<void>::Ok();
+    }
+    ctx->SaveTensorForBackward(inputs.at(2));   // cx
+    ctx->SaveTensorForBackward(outputs.at(1));  // cy
+    ctx->SaveTensorForBackward(outputs.at(2));  // workspace
+    return Maybe<void>::Ok();
+  }
+
+  Maybe<void> Apply(const FusedLstmCellCaptureState* ctx, const TensorTuple& out_grads,
+                    TensorTuple* in_grads) const override {
+    CHECK_EQ_OR_RETURN(out_grads.size(), 3);
+    in_grads->resize(3);
+    if (!ctx->input_gates_requires_grad && !ctx->hidden_gates_requires_grad
+        && !ctx->cx_requires_grad) {
+      return Maybe<void>::Ok();
+    }
+    const auto& cx = ctx->SavedTensors().at(0);
+    const auto& cy = ctx->SavedTensors().at(1);
+    const auto& workspace = ctx->SavedTensors().at(2);
+    const auto& results =
+        JUST(functional::FusedLstmCellGrad(out_grads.at(0), out_grads.at(1), cx, cy, workspace));
+    // input_gates and hidden_gates are summed in the forward pass, so they share one gradient.
+    if (ctx->input_gates_requires_grad) { in_grads->at(0) = results->at(0); }
+    if (ctx->hidden_gates_requires_grad) { in_grads->at(1) = results->at(0); }
+    if (ctx->cx_requires_grad) { in_grads->at(2) = results->at(1); }
+    return Maybe<void>::Ok();
+  }
+};
+
+struct FusedGruCellCaptureState : public AutoGradCaptureState {
+  bool input_gates_requires_grad = false;
+  bool hidden_gates_requires_grad = false;
+  bool hx_requires_grad = false;
+};
+
+class FusedGruCell : public OpExprGradFunction<FusedGruCellCaptureState> {
+ public:
+  Maybe<void> Init(const OpExpr& op) override { return Maybe<void>::Ok(); }
+
+  Maybe<void> Capture(FusedGruCellCaptureState* ctx, const TensorTuple& inputs,
+                      const TensorTuple& outputs, const AttrMap& attrs) const override {
+    CHECK_EQ_OR_RETURN(inputs.size(), 3);   // input_gates, hidden_gates, hx
+    CHECK_EQ_OR_RETURN(outputs.size(), 2);  // hy, workspace
+    ctx->input_gates_requires_grad = inputs.at(0)->requires_grad();
+    ctx->hidden_gates_requires_grad = inputs.at(1)->requires_grad();
+    ctx->hx_requires_grad = inputs.at(2)->requires_grad();
+    if (!ctx->input_gates_requires_grad && !ctx->hidden_gates_requires_grad
+        && !ctx->hx_requires_grad) {
+      return Maybe<void>::Ok();
+    }
+    ctx->SaveTensorForBackward(inputs.at(2));   // hx
+    ctx->SaveTensorForBackward(outputs.at(1));  // workspace
+    return Maybe<void>::Ok();
+  }
+
+  Maybe<void> Apply(const FusedGruCellCaptureState* ctx, const TensorTuple& out_grads,
+                    TensorTuple* in_grads) const override {
+    CHECK_EQ_OR_RETURN(out_grads.size(), 2);
+    in_grads->resize(3);
+    if (!ctx->input_gates_requires_grad && !ctx->hidden_gates_requires_grad
+        && !ctx->hx_requires_grad) {
+      return Maybe<void>::Ok();
+    }
+    const auto& hx = ctx->SavedTensors().at(0);
+    const auto& workspace = ctx->SavedTensors().at(1);
+    const auto& results = JUST(functional::FusedGruCellGrad(out_grads.at(0), hx, workspace));
+    if (ctx->input_gates_requires_grad) { in_grads->at(0) = results->at(0); }
+    if (ctx->hidden_gates_requires_grad) { in_grads->at(1) = results->at(1); }
+    if (ctx->hx_requires_grad) { in_grads->at(2) = results->at(2); }
+    return Maybe<void>::Ok();
+  }
+};
+
+REGISTER_OP_EXPR_GRAD_FUNCTION("fused_lstm_cell", FusedLstmCell);
+REGISTER_OP_EXPR_GRAD_FUNCTION("fused_gru_cell", FusedGruCell);
+
+}  // namespace one
+}  // namespace oneflow
@@ -0,0 +1,96 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/attr_map.h"
+#include "oneflow/core/framework/op_expr_grad_function.h"
+#include "oneflow/core/functional/functional.h"
+
+namespace oneflow {
+namespace one {
+
+struct GroupNormCaptureState : public AutoGradCaptureState {
+  bool affine = false;
+  bool x_requires_grad = false;
+  bool gamma_requires_grad = false;
+  bool beta_requires_grad = false;
+  int32_t num_groups = 1;
+};
+
+// y, mean, inv_variance = group_norm(x, [gamma], [beta], num_groups, epsilon)
+class GroupNorm : public OpExprGradFunction<GroupNormCaptureState> {
+ public:
+  Maybe<void> Init(const OpExpr& op) override {
+    const auto* fw_op_expr = dynamic_cast<const UserOpExpr*>(&op);
+    CHECK_NOTNULL_OR_RETURN(fw_op_expr);
+    base_attrs_ = MakeAttrMapFromUserOpConf(fw_op_expr->proto());
+    return Maybe<void>::Ok();
+  }
+
+  Maybe<void> Capture(GroupNormCaptureState* ctx, const TensorTuple& inputs,
+                      const TensorTuple& outputs, const AttrMap& attrs) const override {
+    CHECK_OR_RETURN(inputs.size() == 1 || inputs.size() == 3);
+    ctx->affine = inputs.size() == 3;
+    ctx->x_requires_grad = inputs.at(0)->requires_grad();
+    ctx->gamma_requires_grad = ctx->affine && inputs.at(1)->requires_grad();
+    ctx->beta_requires_grad = ctx->affine && inputs.at(2)->requires_grad();
+    if (!ctx->x_requires_grad && !ctx->gamma_requires_grad && !ctx->beta_requires_grad) {
+      return Maybe<void>::Ok();
+    }
+    ComposedAttrMap composed_attrs(attrs, base_attrs_);
+    ctx->num_groups = JUST(composed_attrs.GetAttr<int32_t>("num_groups"));
+    ctx->SaveTensorForBackward(inputs.at(0));   // x
+    ctx->SaveTensorForBackward(outputs.at(1));  // mean
+    ctx->SaveTensorForBackward(outputs.at(2));  // inv_variance
+    if (ctx->affine) { ctx->SaveTensorForBackward(inputs.at(1)); }  // gamma
+    return Maybe<void>::Ok();
+  }
+
+  Maybe<void> Apply(const GroupNormCaptureState* ctx, const TensorTuple& out_grads,
+                    TensorTuple* in_grads) const override {
+    in_grads->resize(ctx->affine ? 3 : 1);
+    if (!ctx->x_requires_grad && !ctx->gamma_requires_grad && !ctx->beta_requires_grad) {
+      return Maybe<void>::Ok();
+    }
+    const auto& dy = out_grads.at(0);
+    const auto& x = ctx->SavedTensors().at(0);
+    const auto& mean = ctx->SavedTensors().at(1);
+    const auto& inv_variance = ctx->SavedTensors().at(2);
+    if (ctx->x_requires_grad) {
+      if (ctx->affine) {
+        const auto& gamma = ctx->SavedTensors().at(3);
+        in_grads->at(0) = JUST(
+            functional::GroupNormGrad(dy, x, mean, inv_variance, gamma, ctx->num_groups));
+      } else {
+        in_grads->at(0) = JUST(
+            functional::GroupNormGrad(dy, x, mean, inv_variance, NullOpt, ctx->num_groups));
+      }
+    }
+    if (ctx->gamma_requires_grad || ctx->beta_requires_grad) {
+      const auto& results =
+          JUST(functional::GroupNormParamGrad(dy, x, mean, inv_variance, ctx->num_groups));
+      if (ctx->gamma_requires_grad) { in_grads->at(1) = results->at(0); }
+      if (ctx->beta_requires_grad) { in_grads->at(2) = results->at(1); }
+    }
+    return Maybe<void>::Ok();
+  }
+
+ private:
+  AttrMap base_attrs_;
+};
+
+REGISTER_OP_EXPR_GRAD_FUNCTION("group_norm", GroupNorm);
+
+}  // namespace one
+}  // namespace oneflow
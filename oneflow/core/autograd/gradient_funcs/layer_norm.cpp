@@ -30,6 +30,8 @@ struct LayerNormCaptureState : public AutoGradCaptureState {
   double epsilon = 1e-5;
 
   bool x_requires_grad = true;
+  bool gamma_requires_grad = true;
+  bool beta_requires_grad = true;
   bool has_affine = true;
 
   size_t gamma_index = 0;
@@ -81,7 +83,10 @@ Maybe<void> LayerNorm::Capture(LayerNormCaptureState* ctx, const TensorTuple& in
   bool has_gamma_diff = ctx->scale && inputs.at(1)->requires_grad();
   bool has_beta_diff = ctx->center && inputs.at(2)->requires_grad();
 
-  ctx->has_affine = has_normalized_diff && has_gamma_diff && has_beta_diff;
+  // dy has to be scaled by gamma as soon as it exists, even if gamma and beta are frozen.
+  ctx->has_affine = has_normalized_diff || has_gamma_diff || has_beta_diff;
+  ctx->gamma_requires_grad = has_gamma_diff;
+  ctx->beta_requires_grad = has_beta_diff;
 
   if (ctx->has_affine) {
     ctx->gamma_index = ctx->SaveTensorForBackward(inputs.at(1));  // save gamma.
@@ -117,8 +122,8 @@ Maybe<void> LayerNorm::Apply(const LayerNormCaptureState* ctx, const TensorTuple
     std::shared_ptr<Tensor> normalized = saved_tensors.at(ctx->normalized_index);
     const auto& results = JUST(functional::LayerNormAffineParamGrad(
         dy, gamma, normalized, begin_params_axis, ctx->epsilon));
-    in_grads->at(1) = results->at(0);  // For gamma.
-    in_grads->at(2) = results->at(1);  // For beta.
+    if (ctx->gamma_requires_grad) { in_grads->at(1) = results->at(0); }  // For gamma.
+    if (ctx->beta_requires_grad) { in_grads->at(2) = results->at(1); }   // For beta.
     dy = results->at(2);
   }
 
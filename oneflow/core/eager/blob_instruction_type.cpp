@@ -129,8 +129,13 @@ void TensorViewInstructionType::Compute(vm::Instruction* instruction) const {
   OfBlob input_ofblob(device_ctx->stream(), ptr->eager_blob_object()->mut_blob());
   OfBlob view_ofblob(device_ctx->stream(), ptr->view_eager_blob_object()->mut_blob());
 
-  void* input_ptr = input_ofblob.mut_blob()->mut_dptr();
-  view_ofblob.mut_blob()->reset_dptr(static_cast<char*>(input_ptr));
+  // The storage offsets are counted from the start of the shared storage, so the view starts at
+  // the difference of the two offsets from the data of the input.
+  const int64_t offset_bytes = (ptr->view_eager_blob_object()->storage_offset()
+                                - ptr->eager_blob_object()->storage_offset())
+                               * GetSizeOfDataType(view_ofblob.blob().data_type());
+  char* input_ptr = static_cast<char*>(input_ofblob.mut_blob()->mut_dptr());
+  view_ofblob.mut_blob()->reset_dptr(input_ptr + offset_bytes);
 }
 
 void AccessBlobByCallbackInstructionType::Compute(vm::Instruction* instruction) const {
@@ -64,6 +64,11 @@ Maybe<void> EagerBlobObject::TryAllocateBlobBodyMemory(DeviceCtx* device_ctx) {
   }
   if (tensor_buffer_->blob_dptr() != nullptr) {
     CHECK_GE_OR_RETURN(tensor_buffer_->blob_bytes(), required_body_bytes);
+    // The buffer may be allocated before the blob, e.g. the page-locked buffer of a pinned tensor.
+    if (blob->dptr() == nullptr) {
+      int64_t storage_offset_bytes = storage_offset_ * GetSizeOfDataType(blob_desc_.data_type());
+      blob->reset_dptr(tensor_buffer_->blob_dptr() + storage_offset_bytes);
+    }
     return Maybe<void>::Ok();
   }
   {
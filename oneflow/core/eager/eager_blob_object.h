@@ -30,10 +30,15 @@ namespace vm {
 
 class TensorBuffer {
  public:
-  TensorBuffer() : non_pod_allocator_(std::make_unique<MemoryAllocator>()) {}
+  TensorBuffer()
+      : is_pinned_(false), non_pod_allocator_(std::make_unique<MemoryAllocator>()) {}
 
   size_t blob_bytes() const { return blob_bytes_; }
 
+  // Whether blob_dptr is page-locked host memory.
+  bool is_pinned() const { return is_pinned_; }
+  void set_is_pinned(bool is_pinned) { is_pinned_ = is_pinned; }
+
   char* blob_dptr() { return blob_dptr_.get(); }
 
   MemoryAllocator* non_pod_allocator() { return non_pod_allocator_.get(); }
@@ -45,6 +50,7 @@ class TensorBuffer {
 
  private:
   size_t blob_bytes_;
+  bool is_pinned_;
   std::unique_ptr<char, std::function<void(char*)>> blob_dptr_;
   std::unique_ptr<MemoryAllocator> non_pod_allocator_;
 };
@@ -40,6 +40,12 @@ class OpKernel;
 
 }  // namespace user_op
 
+namespace profiler {
+
+struct OpEvent;
+
+}  // namespace profiler
+
 namespace vm {
 
 class LocalCallOpKernelPhyInstrOperand final : public vm::PhyInstrOperand {
@@ -89,6 +95,12 @@ class LocalCallOpKernelPhyInstrOperand final : public vm::PhyInstrOperand {
     return consistent_tensor_infer_result_;
   }
 
+  // Set only while the eager op profiler is enabled.
+  const std::shared_ptr<profiler::OpEvent>& op_event() const { return op_event_; }
+  void set_op_event(std::shared_ptr<profiler::OpEvent>&& op_event) {
+    op_event_ = std::move(op_event);
+  }
+
  private:
   LocalCallOpKernelPhyInstrOperand(
       const std::shared_ptr<one::StatefulLocalOpKernel>& opkernel,
@@ -121,6 +133,7 @@ class LocalCallOpKernelPhyInstrOperand final : public vm::PhyInstrOperand {
   const one::DevVmDepObjectConsumeMode dev_vm_dep_object_consume_mode_;
   DependenceVector input_dependences_;
   DependenceVector output_dependences_;
+  std::shared_ptr<profiler::OpEvent> op_event_;
 };
 
 }  // namespace vm
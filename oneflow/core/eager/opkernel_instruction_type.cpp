@@ -41,6 +41,7 @@ limitations under the License.
 #include "oneflow/core/operator/op_conf_symbol.h"
 #include "oneflow/user/kernels/stateful_local_opkernel.h"
 #include "oneflow/core/profiler/profiler.h"
+#include "oneflow/core/profiler/op_profiler.h"
 #include "oneflow/core/common/cpp_attribute.h"
 
 namespace oneflow {
@@ -446,13 +447,22 @@ Maybe<T*> GetSharedOpKernel(vm::Instruction* instruction, DeviceType device_type
 struct LocalCallOpKernelUtil final {
   static inline Maybe<void> Compute(vm::Instruction* instruction) {
     auto* operand = LocalCallOpKernelUtil::GetLocalCallOpKernelPhyInstrOperand(instruction);
+    profiler::OpEvent* op_event = operand->op_event().get();
+    if (unlikely(op_event != nullptr)) {
+      op_event->kernel_thread_id = profiler::CurrentThreadId();
+      op_event->kernel_start_ns = profiler::NowNanoseconds();
+    }
     operand->mut_opkernel()->composed_attrs_for_scheduler_thread()->ResetPrior(operand->attrs());
     DeviceCtx* device_ctx = instruction->stream().device_ctx().get();
-    JUST(AllocateOutputBlobsMemory(operand, device_ctx));
+    JUST(AllocateOutputBlobsMemory(operand, device_ctx, op_event));
     if (unlikely(operand->need_temp_storage())) {
       InferTempStorageBlobDesc(operand);
       JUST(ResetTempStorageBlob(operand));
       JUST(TryAllocateTempStorageBlobMemory(operand, device_ctx));
+      if (unlikely(op_event != nullptr)) {
+        op_event->allocated_bytes +=
+            operand->mut_opkernel()->mut_temp_blob_object()->blob().AlignedByteSizeOfBlobBody();
+      }
     }
     user_op::OpKernelState* state;
     TryInitOpKernelState(operand, device_ctx, &state);
@@ -460,6 +470,12 @@ struct LocalCallOpKernelUtil final {
     if (unlikely(operand->need_temp_storage())) {
       JUST(DeallocateTempStorageBlobMemory(operand, device_ctx));
     }
+    if (unlikely(op_event != nullptr)) {
+      // Kernels on devices other than cpu run asynchronously, wait for them so that the kernel
+      // time covers the execution instead of the launch.
+      if (device_ctx->device_type() != DeviceType::kCPU) { JUST(device_ctx->stream()->Sync()); }
+      op_event->kernel_end_ns = profiler::NowNanoseconds();
+    }
     return Maybe<void>::Ok();
   }
 
@@ -500,10 +516,14 @@ struct LocalCallOpKernelUtil final {
   }
 
   static inline Maybe<void> AllocateOutputBlobsMemory(LocalCallOpKernelPhyInstrOperand* operand,
-                                                      DeviceCtx* device_ctx) {
+                                                      DeviceCtx* device_ctx,
+                                                      profiler::OpEvent* op_event) {
     for (const auto& blob_object : *operand->outputs()) {
       CHECK_NOTNULL_OR_RETURN(blob_object);
       JUST(blob_object->TryInitBlob());
+      if (unlikely(op_event != nullptr) && blob_object->tensor_buffer()->blob_dptr() == nullptr) {
+        op_event->allocated_bytes += blob_object->blob().AlignedByteSizeOfBlobBody();
+      }
       JUST(blob_object->TryAllocateBlobBodyMemory(device_ctx));
     }
     return Maybe<void>::Ok();
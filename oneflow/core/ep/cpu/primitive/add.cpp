@@ -16,6 +16,7 @@ limitations under the License.
 #include "oneflow/core/ep/include/primitive/add.h"
 #include "oneflow/core/ep/cpu/primitive/type_seq.h"
 #include "oneflow/core/ep/cpu/cpu_stream.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
 
 namespace oneflow {
 
@@ -26,20 +27,32 @@ namespace {
 
 template<typename T, size_t arity>
 void AddCpu(const T* const* srcs, T* dst, size_t count) {
-  for (size_t i = 0; i < count; ++i) {
-    T sum = T(0);
-    for (size_t a = 0; a < arity; ++a) { sum += srcs[a][i]; }
-    dst[i] = sum;
-  }
+  const int64_t grain_size = kParallelForDefaultGrain / std::max<size_t>(arity, 1);
+  ParallelFor(
+      0, count,
+      [srcs, dst](int64_t begin, int64_t end) {
+        for (int64_t i = begin; i < end; ++i) {
+          T sum = T(0);
+          for (size_t a = 0; a < arity; ++a) { sum += srcs[a][i]; }
+          dst[i] = sum;
+        }
+      },
+      grain_size);
 }
 
 template<typename T>
 void AddCpu(const T* const* srcs, size_t arity, T* dst, size_t count) {
-  for (size_t i = 0; i < count; ++i) {
-    T sum = T(0);
-    for (size_t a = 0; a < arity; ++a) { sum += srcs[a][i]; }
-    dst[i] = sum;
-  }
+  const int64_t grain_size = kParallelForDefaultGrain / std::max<size_t>(arity, 1);
+  ParallelFor(
+      0, count,
+      [srcs, arity, dst](int64_t begin, int64_t end) {
+        for (int64_t i = begin; i < end; ++i) {
+          T sum = T(0);
+          for (size_t a = 0; a < arity; ++a) { sum += srcs[a][i]; }
+          dst[i] = sum;
+        }
+      },
+      grain_size);
 }
 
 template<typename T>
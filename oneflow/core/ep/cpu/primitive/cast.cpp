@@ -15,6 +15,7 @@ limitations under the License.
 */
 #include "oneflow/core/ep/include/primitive/cast.h"
 #include "oneflow/core/ep/cpu/primitive/type_seq.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
 
 namespace oneflow {
 
@@ -25,7 +26,9 @@ namespace {
 
 template<typename From, typename To>
 void CastCpu(const From* from, To* to, size_t count) {
-  for (size_t i = 0; i < count; ++i) { to[i] = static_cast<To>(from[i]); }
+  ParallelFor(0, count, [from, to](int64_t begin, int64_t end) {
+    for (int64_t i = begin; i < end; ++i) { to[i] = static_cast<To>(from[i]); }
+  });
 }
 
 template<typename From, typename To>
@@ -16,6 +16,7 @@ limitations under the License.
 #include "oneflow/core/ep/common/primitive/elementwise_unary.h"
 #include "oneflow/core/ep/cpu/primitive/unary_functor.h"
 #include "oneflow/core/ep/cpu/primitive/type_seq.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
 
 namespace oneflow {
 
@@ -34,9 +35,11 @@ class ElementwiseUnaryImpl : public ElementwiseUnary {
   void Launch(Stream* stream, const void* src_ptr, void* dst_ptr, size_t count) override {
     Dst* dst = reinterpret_cast<Dst*>(dst_ptr);
     const Src* src = reinterpret_cast<const Src*>(src_ptr);
-    for (size_t i = 0; i < count; ++i) {
-      dst[i] = UnaryFunctor<DeviceType::kCPU, unary_op, Dst, Src>()(src[i]);
-    }
+    ParallelFor(0, count, [src, dst](int64_t begin, int64_t end) {
+      for (int64_t i = begin; i < end; ++i) {
+        dst[i] = UnaryFunctor<DeviceType::kCPU, unary_op, Dst, Src>()(src[i]);
+      }
+    });
   }
 };
 
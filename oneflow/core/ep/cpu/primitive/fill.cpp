@@ -16,6 +16,7 @@ limitations under the License.
 #include "oneflow/core/ep/include/primitive/fill.h"
 #include "oneflow/core/ep/cpu/primitive/type_seq.h"
 #include "oneflow/core/common/scalar.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
 
 namespace oneflow {
 
@@ -42,7 +43,11 @@ class FillImpl : public Fill {
   ~FillImpl() override = default;
 
   void Launch(Stream* stream, void* dst, Scalar value, size_t count) override {
-    std::fill_n(reinterpret_cast<T*>(dst), count, GetValue<T>(value));
+    T* dst_ptr = reinterpret_cast<T*>(dst);
+    const T fill_value = GetValue<T>(value);
+    ParallelFor(0, count, [dst_ptr, fill_value](int64_t begin, int64_t end) {
+      std::fill(dst_ptr + begin, dst_ptr + end, fill_value);
+    });
   }
 };
 
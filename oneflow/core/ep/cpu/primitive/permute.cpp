@@ -15,6 +15,7 @@ limitations under the License.
 */
 #include "oneflow/core/ep/include/primitive/permute.h"
 #include "oneflow/core/ep/common/primitive/permute_impl.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
 
 namespace oneflow {
 
@@ -32,16 +33,18 @@ void PermuteKernel(PermuteKernelParams<num_dims, IndexType> params) {
   using T = typename std::aligned_storage<movement_size, movement_size>::type;
   const T* src = reinterpret_cast<const T*>(params.src);
   T* dst = reinterpret_cast<T*>(params.dst);
-  for (IndexType i = 0; i < params.count; ++i) {
-    IndexType src_index[num_dims];
-    IndexType dst_index[num_dims];
-    params.dst_index_helper.OffsetToNdIndex(i, dst_index);
-    for (size_t dim = 0; dim < num_dims; ++dim) {
-      src_index[params.permutation[dim]] = dst_index[dim];
+  ParallelFor(0, params.count, [&params, src, dst](int64_t begin, int64_t end) {
+    for (IndexType i = begin; i < end; ++i) {
+      IndexType src_index[num_dims];
+      IndexType dst_index[num_dims];
+      params.dst_index_helper.OffsetToNdIndex(i, dst_index);
+      for (size_t dim = 0; dim < num_dims; ++dim) {
+        src_index[params.permutation[dim]] = dst_index[dim];
+      }
+      IndexType src_offset = params.src_index_helper.NdIndexToOffset(src_index);
+      dst[i] = src[src_offset];
     }
-    IndexType src_offset = params.src_index_helper.NdIndexToOffset(src_index);
-    dst[i] = src[src_offset];
-  }
+  });
 }
 
 template<size_t num_dims, size_t movement_size, typename IndexType>
@@ -16,6 +16,7 @@ limitations under the License.
 #include "oneflow/core/ep/include/primitive/softmax.h"
 #include "oneflow/core/ep/include/primitive/log_softmax.h"
 #include "oneflow/core/ep/cpu/primitive/type_seq.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
 
 namespace oneflow {
 
@@ -30,8 +31,8 @@ enum class Algorithm {
 };
 
 template<Algorithm algorithm, typename T>
-void SoftmaxCpu(size_t rows, size_t cols, const T* x, T* y) {
-  for (size_t i = 0; i < rows; ++i) {
+void SoftmaxCpu(size_t begin, size_t end, size_t cols, const T* x, T* y) {
+  for (size_t i = begin; i < end; ++i) {
     size_t row_offset = i * cols;
     const T* row_x = x + row_offset;
     T* row_y = y + row_offset;
@@ -69,7 +70,16 @@ class SoftmaxImpl : public SoftmaxBase {
   ~SoftmaxImpl() override = default;
 
   void Launch(Stream* stream, size_t rows, size_t cols, const void* x, void* y) override {
-    SoftmaxCpu<algorithm, T>(rows, cols, reinterpret_cast<const T*>(x), reinterpret_cast<T*>(y));
+    const T* x_ptr = reinterpret_cast<const T*>(x);
+    T* y_ptr = reinterpret_cast<T*>(y);
+    const int64_t grain_size =
+        std::max<int64_t>(kParallelForDefaultGrain / std::max<size_t>(cols, 1), 1);
+    ParallelFor(
+        0, rows,
+        [cols, x_ptr, y_ptr](int64_t begin, int64_t end) {
+          SoftmaxCpu<algorithm, T>(begin, end, cols, x_ptr, y_ptr);
+        },
+        grain_size);
   }
 };
 
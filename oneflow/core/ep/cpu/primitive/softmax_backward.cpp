@@ -16,6 +16,7 @@ limitations under the License.
 #include "oneflow/core/ep/include/primitive/softmax_backward.h"
 #include "oneflow/core/ep/include/primitive/log_softmax_backward.h"
 #include "oneflow/core/ep/cpu/primitive/type_seq.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
 
 namespace oneflow {
 
@@ -30,8 +31,8 @@ enum class Algorithm {
 };
 
 template<Algorithm algorithm, typename T>
-void SoftmaxBackwardCpu(size_t rows, size_t cols, const T* y, const T* dy, T* dx) {
-  for (size_t i = 0; i < rows; ++i) {
+void SoftmaxBackwardCpu(size_t begin, size_t end, size_t cols, const T* y, const T* dy, T* dx) {
+  for (size_t i = begin; i < end; ++i) {
     size_t row_offset = i * cols;
     const T* row_y = y + row_offset;
     const T* row_dy = dy + row_offset;
@@ -67,8 +68,17 @@ class SoftmaxBackwardImpl : public SoftmaxBackwardBase {
 
   void Launch(Stream* stream, size_t rows, size_t cols, const void* y, const void* dy,
               void* dx) override {
-    SoftmaxBackwardCpu<algorithm, T>(rows, cols, reinterpret_cast<const T*>(y),
-                                     reinterpret_cast<const T*>(dy), reinterpret_cast<T*>(dx));
+    const T* y_ptr = reinterpret_cast<const T*>(y);
+    const T* dy_ptr = reinterpret_cast<const T*>(dy);
+    T* dx_ptr = reinterpret_cast<T*>(dx);
+    const int64_t grain_size =
+        std::max<int64_t>(kParallelForDefaultGrain / std::max<size_t>(cols, 1), 1);
+    ParallelFor(
+        0, rows,
+        [cols, y_ptr, dy_ptr, dx_ptr](int64_t begin, int64_t end) {
+          SoftmaxBackwardCpu<algorithm, T>(begin, end, cols, y_ptr, dy_ptr, dx_ptr);
+        },
+        grain_size);
   }
 };
 
@@ -0,0 +1,157 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/autocast.h"
+#include "oneflow/core/autograd/autograd_mode.h"
+#include "oneflow/core/framework/device.h"
+#include "oneflow/core/framework/dtype.h"
+#include "oneflow/core/framework/op_expr.h"
+#include "oneflow/core/framework/tensor.h"
+#include "oneflow/core/framework/tensor_tuple.h"
+#include "oneflow/core/functional/functional.h"
+#include "oneflow/core/job/parallel_desc.h"
+#include "oneflow/core/job_rewriter/auto_mixed_precision_lists.h"
+
+namespace oneflow {
+namespace autocast {
+
+using one::Tensor;
+using one::TensorTuple;
+using one::UserOpExpr;
+
+namespace {
+
+struct AutocastState {
+  bool enabled = false;
+  DeviceType device_type = DeviceType::kCUDA;
+  Symbol<DType> dtype = DType::Float16();
+};
+
+AutocastState* GetThreadLocalAutocastState() {
+  static thread_local AutocastState state;
+  return &state;
+}
+
+using CastCache =
+    HashMap<const Tensor*, std::pair<std::weak_ptr<Tensor>, std::shared_ptr<Tensor>>>;
+
+CastCache* GetThreadLocalCastCache() {
+  static thread_local CastCache cache;
+  return &cache;
+}
+
+enum class CastPolicy {
+  kNone,            // ops in the clear list or in no list
+  kLowerPrecision,  // white list, run in the autocast dtype
+  kFloat,           // black list, run in float32
+  kFollowInputs,    // gray list, run in the autocast dtype if any input is already in it
+};
+
+CastPolicy GetCastPolicy(const std::string& op_type_name) {
+  if (AutoMixedPrecisionLists::WhiteList().count(op_type_name) > 0) {
+    return CastPolicy::kLowerPrecision;
+  }
+  if (AutoMixedPrecisionLists::BlackList().count(op_type_name) > 0) { return CastPolicy::kFloat; }
+  if (AutoMixedPrecisionLists::GrayList().count(op_type_name) > 0) {
+    return CastPolicy::kFollowInputs;
+  }
+  return CastPolicy::kNone;
+}
+
+Maybe<bool> IsOnAutocastDevice(const std::shared_ptr<Tensor>& tensor) {
+  DeviceType device_type = DeviceType::kInvalidDevice;
+  if (tensor->is_local()) {
+    device_type = JUST(tensor->device())->enum_type();
+  } else {
+    device_type = JUST(tensor->parallel_desc())->device_type();
+  }
+  return device_type == GetThreadLocalAutocastState()->device_type;
+}
+
+Maybe<Tensor> CastTensor(const std::shared_ptr<Tensor>& tensor, Symbol<DType> dtype) {
+  // Only cache the lower precision copies of leaf tensors which require grad, i.e. parameters.
+  const bool cacheable = dtype != DType::Float() && tensor->is_leaf() && tensor->requires_grad()
+                         && autograd::GradMode::is_enabled();
+  if (!cacheable) { return one::functional::Cast(tensor, dtype); }
+  auto* cache = GetThreadLocalCastCache();
+  auto it = cache->find(tensor.get());
+  if (it != cache->end() && !it->second.first.expired() && it->second.second->dtype() == dtype) {
+    return it->second.second;
+  }
+  const auto& casted = JUST(one::functional::Cast(tensor, dtype));
+  (*cache)[tensor.get()] = std::make_pair(std::weak_ptr<Tensor>(tensor), casted);
+  return casted;
+}
+
+}  // namespace
+
+bool is_enabled() { return GetThreadLocalAutocastState()->enabled; }
+
+void set_enabled(bool enabled) { GetThreadLocalAutocastState()->enabled = enabled; }
+
+DeviceType get_device_type() { return GetThreadLocalAutocastState()->device_type; }
+
+void set_device_type(DeviceType device_type) {
+  GetThreadLocalAutocastState()->device_type = device_type;
+}
+
+Symbol<DType> get_dtype() { return GetThreadLocalAutocastState()->dtype; }
+
+void set_dtype(Symbol<DType> dtype) { GetThreadLocalAutocastState()->dtype = dtype; }
+
+void clear_cache() { GetThreadLocalCastCache()->clear(); }
+
+Maybe<TensorTuple> MaybeCastInputs(const UserOpExpr& op_expr, const TensorTuple& inputs) {
+  const std::string& op_type_name = op_expr.op_type_name();
+  const CastPolicy policy = GetCastPolicy(op_type_name);
+  if (policy == CastPolicy::kNone) { return std::shared_ptr<TensorTuple>(); }
+  const Symbol<DType> lower_dtype = get_dtype();
+  const Symbol<DType> float_dtype = DType::Float();
+  Symbol<DType> from_dtype;
+  Symbol<DType> to_dtype;
+  if (policy == CastPolicy::kLowerPrecision) {
+    from_dtype = float_dtype;
+    to_dtype = lower_dtype;
+  } else if (policy == CastPolicy::kFloat) {
+    from_dtype = lower_dtype;
+    to_dtype = float_dtype;
+  } else {
+    bool has_lower_precision_input = false;
+    for (const auto& input : inputs) {
+      if (input->dtype() == lower_dtype && JUST(IsOnAutocastDevice(input))) {
+        has_lower_precision_input = true;
+        break;
+      }
+    }
+    if (!has_lower_precision_input) { return std::shared_ptr<TensorTuple>(); }
+    from_dtype = float_dtype;
+    to_dtype = lower_dtype;
+  }
+  std::shared_ptr<TensorTuple> casted_inputs;
+  for (int i = 0; i < inputs.size(); ++i) {
+    const auto& input = inputs.at(i);
+    if (input->dtype() != from_dtype || !JUST(IsOnAutocastDevice(input))) { continue; }
+    if (AutoMixedPrecisionLists::IsNoCastInput(op_type_name,
+                                               op_expr.indexed_input_pairs().at(i))) {
+      continue;
+    }
+    if (!casted_inputs) { casted_inputs = std::make_shared<TensorTuple>(inputs); }
+    casted_inputs->at(i) = JUST(CastTensor(input, to_dtype));
+  }
+  return casted_inputs;
+}
+
+}  // namespace autocast
+}  // namespace oneflow
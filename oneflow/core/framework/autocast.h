@@ -0,0 +1,57 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_CORE_FRAMEWORK_AUTOCAST_H_
+#define ONEFLOW_CORE_FRAMEWORK_AUTOCAST_H_
+
+#include <memory>
+#include <string>
+#include "oneflow/core/common/maybe.h"
+#include "oneflow/core/common/symbol.h"
+#include "oneflow/core/common/device_type.pb.h"
+
+namespace oneflow {
+
+class DType;
+
+namespace one {
+class TensorTuple;
+class UserOpExpr;
+}  // namespace one
+
+namespace autocast {
+
+bool is_enabled();
+void set_enabled(bool enabled);
+
+DeviceType get_device_type();
+void set_device_type(DeviceType device_type);
+
+Symbol<DType> get_dtype();
+void set_dtype(Symbol<DType> dtype);
+
+// Casted copies of leaf tensors (e.g. parameters) are cached while autocast is enabled, so a
+// weight used by several ops is only casted once per autocast region.
+void clear_cache();
+
+// Returns the inputs casted by the auto mixed precision lists of the op, or nullptr if no input
+// needs to be casted.
+Maybe<one::TensorTuple> MaybeCastInputs(const one::UserOpExpr& op_expr,
+                                        const one::TensorTuple& inputs);
+
+}  // namespace autocast
+}  // namespace oneflow
+
+#endif  // ONEFLOW_CORE_FRAMEWORK_AUTOCAST_H_
@@ -45,6 +45,7 @@ limitations under the License.
 #include "oneflow/core/framework/device.h"
 #include "oneflow/core/framework/instruction_replay.h"
 #include "oneflow/core/vm/tensor_view_operand.h"
+#include "oneflow/core/profiler/op_profiler.h"
 
 namespace oneflow {
 
@@ -792,6 +793,9 @@ Maybe<void> InstructionsBuilder::LocalCallOpKernel(
   auto phy_instr_operand = JUST(vm::LocalCallOpKernelPhyInstrOperand::New(
       opkernel, input_eager_blob_objects, output_eager_blob_objects, consistent_tensor_infer_result,
       ctx, *one::CurrentDevVmDepObjectConsumeMode()));
+  if (unlikely(profiler::IsOpProfilerEnabled())) {
+    phy_instr_operand->set_op_event(std::move(*profiler::MutThreadLocalDispatchingOpEvent()));
+  }
   auto instruction = intrusive::make_shared<vm::InstructionMsg>(
       Global<VirtualMachine>::Get()->mut_vm(), JUST(op_device->local_call_instruction_name()),
       parallel_desc_sym, phy_instr_operand);
@@ -297,6 +297,48 @@ Maybe<void> NNGraph::CompileAndInitRuntime() {
   return Maybe<void>::Ok();
 }
 
+Maybe<void> NNGraph::InitRuntimeWithCompiledPlan(const std::string& serialized_job,
+                                                  const std::string& serialized_plan) {
+  JUST(RegisterFreeEagerTensorsToVariableOpNames());
+  CHECK_OR_RETURN(!runtime_inited_);
+  JobBuildAndInferCtx* job_ctx = JUST(GetJobBuildAndInferCtx(name_));
+  CHECK_OR_RETURN(job_.ParseFromString(serialized_job))
+      << " nn.Graph " << name_ << " failed to parse the compiled job.";
+  CHECK_OR_RETURN(plan_.ParseFromString(serialized_plan))
+      << " nn.Graph " << name_ << " failed to parse the compiled plan.";
+  CHECK_EQ_OR_RETURN(job_.job_conf().job_name(), name_)
+      << " The compiled plan of job " << job_.job_conf().job_name()
+      << " cannot be loaded by nn.Graph " << name_;
+  const auto& job_id2job_conf = plan_.job_confs().job_id2job_conf();
+  CHECK_OR_RETURN(job_id2job_conf.find(job_ctx->job_id()) != job_id2job_conf.end())
+      << " The compiled plan of nn.Graph " << name_ << " is not compiled with job_id "
+      << job_ctx->job_id()
+      << ", please create and load compiled graphs in the same order as they were compiled.";
+  JUST(CreateAndRegisterNewVariableOpInJobPass());
+
+  // NOTE(chengcheng): Global<JobDesc> need be clear before GlobalJobDescScope construct.
+  if (Global<JobDesc>::Get() != nullptr) { Global<JobDesc>::Delete(); }
+
+  auto scope = std::make_unique<GlobalJobDescScope>(job_.job_conf(), job_ctx->job_id());
+  LOG(INFO) << "\njob_id: " << job_ctx->job_id() << " , job_name: " << name_
+            << " , init runtime with compiled plan.\n";
+  // NOTE(chengcheng): the saved plan is populated, this is a no-op except for checking.
+  PlanUtil::PopulateOpAttribute(&plan_, plan_.job_id2op_attribute_ref_table());
+
+  NewRuntimeBuffers();
+  runtime_.reset(new Runtime(plan_, variable_op_name2eager_blob_));
+  runtime_inited_ = true;
+  return Maybe<void>::Ok();
+}
+
+Maybe<std::string> NNGraph::GetSerializedPlan() const {
+  CHECK_OR_RETURN(runtime_inited_)
+      << " nn.Graph " << name_ << " has no plan because it has not been compiled.";
+  std::string serialized_plan;
+  CHECK_OR_RETURN(plan_.SerializeToString(&serialized_plan));
+  return serialized_plan;
+}
+
 void NNGraph::NewRuntimeBuffers() {
   auto* buffer_mgr = Global<BufferMgr<std::shared_ptr<JobInstance>>>::Get();
   // NOTE(chengcheng):
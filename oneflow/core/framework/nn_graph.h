@@ -52,6 +52,11 @@ class NNGraph final : public NNGraphIf {
       const std::vector<std::string>& variable_op_names,
       const std::vector<std::shared_ptr<one::Tensor>>& variable_tensors);
   Maybe<void> CompileAndInitRuntime();
+  // Init runtime with a plan compiled by CompileAndInitRuntime before, so the job is not compiled
+  // again. The job build and infer ctx of this graph must be opened with the same job id.
+  Maybe<void> InitRuntimeWithCompiledPlan(const std::string& serialized_job,
+                                          const std::string& serialized_plan);
+  Maybe<std::string> GetSerializedPlan() const;
   Maybe<void> Close();
 
  private:
@@ -40,6 +40,7 @@ limitations under the License.
 #include "oneflow/core/framework/id_util.h"
 #include "oneflow/core/functional/functional.h"
 #include "oneflow/core/rpc/include/global_process_ctx.h"
+#include "oneflow/core/profiler/op_profiler.h"
 
 namespace oneflow {
 namespace one {
@@ -85,6 +86,17 @@ std::vector<TensorMeta*>* ThreadLocalDefaultOutputMutTensorMetas(int64_t size) {
 Maybe<void> NaiveInterpret(const UserOpExpr& user_op_expr, const TensorTuple& inputs,
                            const Symbol<Device>& default_device, TensorTuple* outputs,
                            const OpExprInterpContext& ctx) {
+  std::shared_ptr<profiler::OpEvent> op_event;
+  if (unlikely(profiler::IsOpProfilerEnabled())) {
+    op_event = profiler::NewOpEvent(user_op_expr.op_type_name(), default_device->ToString(),
+                                    [&](std::vector<std::vector<int64_t>>* input_shapes) {
+                                      for (const auto& input : inputs) {
+                                        const auto& dim_vec = input->shape()->dim_vec();
+                                        input_shapes->emplace_back(dim_vec.begin(), dim_vec.end());
+                                      }
+                                    });
+  }
+  profiler::DispatchingOpEventGuard op_event_guard(op_event);
   const auto& attrs = ctx.attrs;
   std::shared_ptr<EagerBlobObjectList> input_eager_blob_objects =
       std::make_shared<EagerBlobObjectList>(inputs.size());
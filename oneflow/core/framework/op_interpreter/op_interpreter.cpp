@@ -17,12 +17,14 @@ limitations under the License.
 
 #include "oneflow/core/autograd/autograd_engine.h"
 #include "oneflow/core/autograd/autograd_mode.h"
+#include "oneflow/core/framework/autocast.h"
 #include "oneflow/core/framework/op_interpreter/op_interpreter_util.h"
 #include "oneflow/core/framework/instructions_builder.h"
 #include "oneflow/core/framework/op_arg_util.h"
 #include "oneflow/core/framework/op_expr_grad_function.h"
 #include "oneflow/core/framework/tensor.h"
 #include "oneflow/core/framework/tensor_tuple.h"
+#include "oneflow/core/job/lazy_mode.h"
 
 namespace oneflow {
 namespace one {
@@ -84,6 +86,14 @@ Maybe<void> EagerInterpreter::ApplyImpl(const FunctionOpExpr& op_expr, const Ten
 
 Maybe<void> AutogradInterpreter::Apply(const OpExpr& op_expr, const TensorTuple& inputs,
                                        TensorTuple* outputs, const OpExprInterpContext& ctx) const {
+  const auto* user_op_expr = dynamic_cast<const UserOpExpr*>(&op_expr);
+  if (autocast::is_enabled() && !LazyMode::is_enabled() && user_op_expr != nullptr
+      && std::all_of(outputs->begin(), outputs->end(),
+                     [](const std::shared_ptr<Tensor>& output) { return !output; })) {
+    // Inplace ops keep the dtype of their outputs, so only the others are autocasted.
+    const auto& casted_inputs = JUST(autocast::MaybeCastInputs(*user_op_expr, inputs));
+    if (casted_inputs) { return Apply(op_expr, *casted_inputs, outputs, ctx); }
+  }
   bool requires_grad = false;
   if (autograd::GradMode::is_enabled() && !JUST(op_expr.IsGradDisabled())) {
     requires_grad =
@@ -18,8 +18,14 @@ limitations under the License.
 
 #include "oneflow/core/autograd/autograd_engine.h"
 #include "oneflow/core/autograd/autograd_mode.h"
+#include "oneflow/core/common/global.h"
 #include "oneflow/core/common/shape.h"
 #include "oneflow/core/eager/eager_blob_object.h"
+#include "oneflow/core/eager/local_dep_object.h"
+#include "oneflow/core/ep/include/device_manager_registry.h"
+#include "oneflow/core/framework/device.h"
+#include "oneflow/core/framework/shut_down_util.h"
+#include "oneflow/core/framework/tensor_storage.h"
 #include "oneflow/core/framework/stride.h"
 #include "oneflow/core/functional/functional.h"
 #include "oneflow/core/register/ofblob.h"
@@ -46,6 +52,47 @@ Maybe<bool> IsContiguous(const std::shared_ptr<Tensor>& tensor) {
   return contig_if_nonempty;
 }
 
+Maybe<Tensor> PinnedEmpty(const Shape& shape, DataType dtype, int64_t pinned_device_index) {
+#ifdef WITH_CUDA
+  const auto& device = JUST(Device::New("cpu"));
+  auto tensor_meta =
+      std::make_shared<MirroredTensorMeta>(std::make_shared<Shape>(shape), dtype, device);
+  auto tensor_impl = std::make_shared<EagerMirroredTensorImpl>(tensor_meta, /*requires_grad=*/false,
+                                                               /*is_leaf=*/true);
+  JUST(tensor_impl->InitEagerBlobObject(JUST(GetLocalDepObjectFromDevicePool(device))));
+  const auto& eager_blob_object = JUST(tensor_impl->eager_blob_object());
+  // The body is allocated here instead of by the allocator of the cpu stream, which finds the
+  // buffer allocated when the first instruction runs on the tensor.
+  const size_t body_bytes = eager_blob_object->blob_desc().AlignedByteSizeOfBlobBody();
+  if (body_bytes > 0) {
+    ep::AllocationOptions options;
+    options.SetPinnedDevice(DeviceType::kCUDA, pinned_device_index);
+    auto ep_device = Global<ep::DeviceManagerRegistry>::Get()->GetDevice(DeviceType::kCPU, 0);
+    CHECK_OR_RETURN(ep_device);
+    void* dptr = nullptr;
+    JUST(ep_device->Alloc(options, &dptr, body_bytes));
+    const auto& Free = [ep_device, options](char* dptr) {
+      if (IsShuttingDown()) { return; }
+      ep_device->Free(options, dptr);
+    };
+    const auto& tensor_buffer = eager_blob_object->tensor_buffer();
+    tensor_buffer->set_blob_dptr(
+        std::unique_ptr<char, std::function<void(char*)>>(static_cast<char*>(dptr), Free),
+        body_bytes);
+    tensor_buffer->set_is_pinned(true);
+  }
+  return std::shared_ptr<Tensor>(new MirroredTensor(tensor_impl));
+#else
+  return Error::RuntimeError() << "Pinned memory requires oneflow to be built with CUDA";
+#endif  // WITH_CUDA
+}
+
+Maybe<bool> IsPinned(const std::shared_ptr<Tensor>& tensor) {
+  if (!(tensor->is_eager() && tensor->is_local())) { return false; }
+  if (!JUST(tensor->has_eager_blob_object())) { return false; }
+  return JUST(tensor->tensor_storage())->buffer()->is_pinned();
+}
+
 namespace view {
 
 Maybe<Tensor> BasicView(const std::shared_ptr<Tensor>& input, const Shape& target_shape,
@@ -130,6 +177,52 @@ Maybe<Tensor> Reshape(const std::shared_ptr<Tensor>& input, const Shape& shape)
   return output;
 }
 
+Maybe<Tensor> Narrow(const std::shared_ptr<Tensor>& input, int64_t dim, int64_t start,
+                     int64_t length) {
+  if (!(input->is_eager() && input->is_local())) {
+    return Error::RuntimeError() << "view::Narrow(): input should be eager local tensor, but got "
+                                 << (input->is_lazy() ? "lazy" : "consistent");
+  }
+  const Shape& shape = *input->shape();
+  const int64_t ndim = shape.NumAxes();
+  CHECK_OR_RETURN((-ndim <= dim) && (dim <= ndim - 1))
+      << " (Dimension out of range, expected to be in range of [" << -ndim << ", " << ndim - 1
+      << "], but got:" << dim << ")";
+  if (dim < 0) { dim += ndim; }
+  CHECK_OR_RETURN(start >= 0 && length >= 0 && start + length <= shape.At(dim))
+      << "view::Narrow(): start (" << start << ") + length (" << length
+      << ") exceeds dimension size (" << shape.At(dim) << ")";
+  // The viewed tensor has contiguous strides, so only narrowing the outermost non-trivial
+  // dimension of a contiguous tensor can be expressed as a view.
+  CHECK_OR_RETURN(JUST(IsContiguous(input)))
+      << "view::Narrow(): input should be contiguous";
+  CHECK_EQ_OR_RETURN(shape.Count(0, dim), 1)
+      << "view::Narrow(): all the dimensions before dim " << dim << " should be 1, but got shape "
+      << shape.ToString();
+  Shape target_shape = shape;
+  target_shape.Set(dim, length);
+  std::shared_ptr<Tensor> output =
+      JUST(BasicView(input, target_shape, start * shape.Count(dim + 1)));
+
+  if (autograd::GradMode::is_enabled() && input->requires_grad()) {
+    auto backward_fn =
+        std::make_shared<std::function<Maybe<void>(const TensorTuple&, TensorTuple*, bool)>>(
+            [=](const TensorTuple& out_grads, TensorTuple* in_grads,
+                bool create_graph) -> Maybe<void> {
+              autograd::AutoGradMode mode(create_graph);
+              CHECK_EQ_OR_RETURN(out_grads.size(), 1);
+              in_grads->resize(1);
+              in_grads->at(0) =
+                  JUST(functional::NarrowGrad(out_grads.at(0), input, dim, start, length));
+              return Maybe<void>::Ok();
+            });
+    TensorTuple outputs{output};
+    JUST(GetThreadLocalAutogradEngine()->AddBackwardFuncPtr("view::narrow_backward", backward_fn,
+                                                            {input}, &outputs));
+  }
+  return output;
+}
+
 }  // namespace view
 }  // namespace one
 }  // namespace oneflow
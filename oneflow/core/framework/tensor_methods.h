@@ -26,6 +26,12 @@ class Tensor;
 
 Maybe<bool> IsContiguous(const std::shared_ptr<Tensor>& tensor);
 
+// Returns an uninitialized local host tensor in page-locked memory, which is registered to the
+// CUDA device `pinned_device_index`, so host-to-device copies from it can be asynchronous.
+Maybe<Tensor> PinnedEmpty(const Shape& shape, DataType dtype, int64_t pinned_device_index);
+
+Maybe<bool> IsPinned(const std::shared_ptr<Tensor>& tensor);
+
 namespace view {
 
 Maybe<Tensor> BasicView(const std::shared_ptr<Tensor>& input, const Shape& target_shape,
@@ -33,6 +39,9 @@ Maybe<Tensor> BasicView(const std::shared_ptr<Tensor>& input, const Shape& targe
 
 Maybe<Tensor> Reshape(const std::shared_ptr<Tensor>& input, const Shape& shape);
 
+Maybe<Tensor> Narrow(const std::shared_ptr<Tensor>& input, int64_t dim, int64_t start,
+                     int64_t length);
+
 }  // namespace view
 }  // namespace one
 }  // namespace oneflow
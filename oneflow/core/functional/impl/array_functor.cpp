@@ -188,7 +188,12 @@ class EmptyFunctor {
  public:
   EmptyFunctor() { op_ = CHECK_JUST(one::OpBuilder("empty").Output("out").Build()); }
   Maybe<Tensor> operator()(const Shape& shape, const Symbol<DType>& dtype,
-                           const Optional<Symbol<Device>>& device) const {
+                           const Optional<Symbol<Device>>& device, const bool pin_memory) const {
+    if (pin_memory) {
+      CHECK_OR_RETURN(!device.has_value() || JUST(device)->type() == "cpu")
+          << "Only cpu tensors can be pinned, but got device " << JUST(device)->ToString();
+      return PinnedEmpty(shape, dtype->data_type(), GlobalProcessCtx::LocalRank());
+    }
     MutableAttrMap attrs;
     JUST(attrs.SetAttr<Shape>("shape", shape));
     JUST(attrs.SetAttr<DataType>("dtype", dtype->data_type()));
@@ -995,6 +1000,15 @@ class NarrowFunctor {
   std::shared_ptr<OpExpr> op_;
 };
 
+class NarrowViewFunctor {
+ public:
+  NarrowViewFunctor() = default;
+  Maybe<Tensor> operator()(const std::shared_ptr<one::Tensor>& input, const int64_t& dim,
+                           const int64_t& start, const int64_t& length) const {
+    return view::Narrow(input, dim, start, length);
+  }
+};
+
 class NarrowGradFunctor {
  public:
   NarrowGradFunctor() {
@@ -2275,6 +2289,7 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
   m.add_functor<impl::SliceFunctor>("Slice");
   m.add_functor<impl::SliceGradFunctor>("SliceGrad");
   m.add_functor<impl::NarrowFunctor>("Narrow");
+  m.add_functor<impl::NarrowViewFunctor>("NarrowView");
   m.add_functor<impl::NarrowGradFunctor>("NarrowGrad");
   m.add_functor<impl::LogicalSliceAssignFunctor>("LogicalSliceAssign");
   m.add_functor<impl::LogicalSliceFunctor>("LogicalSlice");
@@ -161,7 +161,7 @@ auto* CachedRankGroupAndDeviceType2AllReduceOpExpr =
 class LocalAllReduceFunctor {
  public:
   LocalAllReduceFunctor() = default;
-  Maybe<Tensor> operator()(const std::shared_ptr<one::Tensor>& x) const {
+  Maybe<Tensor> operator()(const std::shared_ptr<one::Tensor>& x, bool inplace) const {
     const auto& device = JUST(x->device());
     CHECK_EQ_OR_RETURN(device->device_id(), GlobalProcessCtx::LocalRank());
     const auto& rank_group = JUST(RankGroupScope::CurrentRankGroup());
@@ -173,6 +173,10 @@ class LocalAllReduceFunctor {
     if (const auto& static_zeros_tensor = std::dynamic_pointer_cast<StaticZerosTensor>(x)) {
       return OpInterpUtil::Dispatch<Tensor>(*op_expr,
                                             {JUST(static_zeros_tensor->AsMirroredTensor())}, {});
+    } else if (inplace) {
+      TensorTuple outputs{x};
+      JUST(OpInterpUtil::Dispatch(*op_expr, {x}, &outputs));
+      return x;
     } else {
       return OpInterpUtil::Dispatch<Tensor>(*op_expr, {x}, {});
     }
@@ -70,6 +70,32 @@ class AddNFunctor {
   std::vector<std::shared_ptr<OpExpr>> op_;
 };
 
+class MultiCountNotFiniteFunctor {
+ public:
+  MultiCountNotFiniteFunctor() {
+    op_.resize(kMaxInputCount /*the maximum number of inputs*/);
+    for (int n = 0; n < op_.size(); ++n) {
+      op_[n] = CHECK_JUST(
+          one::OpBuilder("multi_count_not_finite").Input("x", n + 1).Output("y").Build());
+    }
+  }
+  Maybe<Tensor> operator()(const TensorTuple& inputs) const {
+    CHECK_GE_OR_RETURN(inputs.size(), 1);
+    TensorTuple counts;
+    for (int i = 0; i < inputs.size(); i += kMaxInputCount) {
+      size_t size = (i + kMaxInputCount) < inputs.size() ? kMaxInputCount : inputs.size() - i;
+      TensorTuple partial_inputs(size);
+      std::copy(inputs.begin() + i, inputs.begin() + i + size, partial_inputs.begin());
+      counts.emplace_back(JUST(OpInterpUtil::Dispatch<Tensor>(*op_.at(size - 1), partial_inputs)));
+    }
+    if (counts.size() == 1) { return counts.at(0); }
+    return functional::Add(counts, /*inplace=*/false);
+  }
+
+ private:
+  std::vector<std::shared_ptr<OpExpr>> op_;
+};
+
 class ScalarMathBaseFunctor {
  public:
   explicit ScalarMathBaseFunctor(std::string op_name) {
@@ -1686,6 +1712,7 @@ using namespace impl;
 
 ONEFLOW_FUNCTION_LIBRARY(m) {
   m.add_functor<AddNFunctor>("Add");
+  m.add_functor<MultiCountNotFiniteFunctor>("MultiCountNotFinite");
   m.add_functor<ScalarAddFunctor, ScalarAdd2Functor>("ScalarAdd");
   m.add_functor<ScalarSubFunctor, ScalarSub2Functor>("ScalarSub");
   m.add_functor<ScalarMulFunctor, ScalarMul2Functor>("ScalarMul");
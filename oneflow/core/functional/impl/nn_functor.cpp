@@ -310,6 +310,43 @@ class LayerNormAffineFunctor {
   std::shared_ptr<OpExpr> op_;
 };
 
+class GroupNormFunctor {
+ public:
+  GroupNormFunctor() {
+    op_ = CHECK_JUST(one::OpBuilder("group_norm")
+                         .Input("x")
+                         .Output("y")
+                         .Output("mean")
+                         .Output("inv_variance")
+                         .Build());
+    affine_op_ = CHECK_JUST(one::OpBuilder("group_norm")
+                                .Input("x")
+                                .Input("gamma")
+                                .Input("beta")
+                                .Output("y")
+                                .Output("mean")
+                                .Output("inv_variance")
+                                .Build());
+  }
+  Maybe<Tensor> operator()(const std::shared_ptr<one::Tensor>& x,
+                           const Optional<one::Tensor>& gamma, const Optional<one::Tensor>& beta,
+                           const int32_t& num_groups, const double& epsilon) const {
+    CHECK_EQ_OR_RETURN(gamma.has_value(), beta.has_value())
+        << "gamma and beta should be given together";
+    MutableAttrMap attrs;
+    JUST(attrs.SetAttr<int32_t>("num_groups", num_groups));
+    JUST(attrs.SetAttr<double>("epsilon", epsilon));
+    if (gamma) {
+      return OpInterpUtil::Dispatch<Tensor>(*affine_op_, {x, JUST(gamma), JUST(beta)}, attrs);
+    }
+    return OpInterpUtil::Dispatch<Tensor>(*op_, {x}, attrs);
+  }
+
+ private:
+  std::shared_ptr<OpExpr> op_;
+  std::shared_ptr<OpExpr> affine_op_;
+};
+
 class PoolNDFunctor {
  public:
   PoolNDFunctor() = default;
@@ -1722,6 +1759,49 @@ class FusedSelfAttentionGradFunctor {
   std::shared_ptr<OpExpr> op_;
 };
 
+class FusedLstmCellFunctor {
+ public:
+  FusedLstmCellFunctor() {
+    op_ = CHECK_JUST(one::OpBuilder("fused_lstm_cell")
+                         .Input("input_gates")
+                         .Input("hidden_gates")
+                         .Input("cx")
+                         .Output("hy")
+                         .Output("cy")
+                         .Output("workspace")
+                         .Build());
+  }
+  Maybe<TensorTuple> operator()(const std::shared_ptr<one::Tensor>& input_gates,
+                                const std::shared_ptr<one::Tensor>& hidden_gates,
+                                const std::shared_ptr<one::Tensor>& cx) const {
+    return OpInterpUtil::Dispatch<TensorTuple>(*op_, {input_gates, hidden_gates, cx});
+  }
+
+ private:
+  std::shared_ptr<OpExpr> op_;
+};
+
+class FusedGruCellFunctor {
+ public:
+  FusedGruCellFunctor() {
+    op_ = CHECK_JUST(one::OpBuilder("fused_gru_cell")
+                         .Input("input_gates")
+                         .Input("hidden_gates")
+                         .Input("hx")
+                         .Output("hy")
+                         .Output("workspace")
+                         .Build());
+  }
+  Maybe<TensorTuple> operator()(const std::shared_ptr<one::Tensor>& input_gates,
+                                const std::shared_ptr<one::Tensor>& hidden_gates,
+                                const std::shared_ptr<one::Tensor>& hx) const {
+    return OpInterpUtil::Dispatch<TensorTuple>(*op_, {input_gates, hidden_gates, hx});
+  }
+
+ private:
+  std::shared_ptr<OpExpr> op_;
+};
+
 class FusedScaleTrilSoftmaxMaskScaleFunctor {
  public:
   FusedScaleTrilSoftmaxMaskScaleFunctor() {
@@ -2119,6 +2199,7 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
   m.add_functor<impl::BatchMatMulFunctor>("BatchMatMul");
   m.add_functor<impl::LayerNormFunctor>("LayerNorm");
   m.add_functor<impl::LayerNormAffineFunctor>("LayerNormAffine");
+  m.add_functor<impl::GroupNormFunctor>("GroupNorm");
   m.add_functor<impl::TFAvgPool2DFunctor>("AvgPool2D");
   m.add_functor<impl::Maxpool1DFunctor>("Maxpool1D");
   m.add_functor<impl::Maxpool2DFunctor>("Maxpool2D");
@@ -2164,6 +2245,8 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
   m.add_functor<impl::FusedBiasAddGeluFunctor>("FusedBiasAddGelu");
   m.add_functor<impl::FusedBiasAddGeluGradFunctor>("FusedBiasAddGeluGrad");
   m.add_functor<impl::FusedBiasAddDropoutFunctor>("FusedBiasAddDropout");
+  m.add_functor<impl::FusedLstmCellFunctor>("FusedLstmCell");
+  m.add_functor<impl::FusedGruCellFunctor>("FusedGruCell");
   m.add_functor<impl::FusedScaleMaskSoftmaxFunctor>("FusedScaleMaskSoftmax");
   m.add_functor<impl::FusedScaleMaskSoftmaxDropoutFunctor>("FusedScaleMaskSoftmaxDropout");
   m.add_functor<impl::FusedScaleTrilSoftmaxMaskScaleFunctor>("FusedScaleTrilSoftmaxMaskScale");
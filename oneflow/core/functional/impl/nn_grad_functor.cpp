@@ -818,6 +818,70 @@ class LayerNormAffineParamGradFunctor {
   std::shared_ptr<OpExpr> op_;
 };
 
+class GroupNormGradFunctor {
+ public:
+  GroupNormGradFunctor() {
+    op_ = CHECK_JUST(one::OpBuilder("group_norm_grad")
+                         .Input("dy")
+                         .Input("x")
+                         .Input("mean")
+                         .Input("inv_variance")
+                         .Output("dx")
+                         .Build());
+    affine_op_ = CHECK_JUST(one::OpBuilder("group_norm_grad")
+                                .Input("dy")
+                                .Input("x")
+                                .Input("mean")
+                                .Input("inv_variance")
+                                .Input("gamma")
+                                .Output("dx")
+                                .Build());
+  }
+  Maybe<Tensor> operator()(const std::shared_ptr<one::Tensor>& dy,
+                           const std::shared_ptr<one::Tensor>& x,
+                           const std::shared_ptr<one::Tensor>& mean,
+                           const std::shared_ptr<one::Tensor>& inv_variance,
+                           const Optional<one::Tensor>& gamma, const int32_t& num_groups) const {
+    MutableAttrMap attrs;
+    JUST(attrs.SetAttr<int32_t>("num_groups", num_groups));
+    if (gamma) {
+      return OpInterpUtil::Dispatch<Tensor>(*affine_op_, {dy, x, mean, inv_variance, JUST(gamma)},
+                                            attrs);
+    }
+    return OpInterpUtil::Dispatch<Tensor>(*op_, {dy, x, mean, inv_variance}, attrs);
+  }
+
+ private:
+  std::shared_ptr<OpExpr> op_;
+  std::shared_ptr<OpExpr> affine_op_;
+};
+
+class GroupNormParamGradFunctor {
+ public:
+  GroupNormParamGradFunctor() {
+    op_ = CHECK_JUST(one::OpBuilder("group_norm_param_grad")
+                         .Input("dy")
+                         .Input("x")
+                         .Input("mean")
+                         .Input("inv_variance")
+                         .Output("gamma_diff")
+                         .Output("beta_diff")
+                         .Build());
+  }
+  Maybe<TensorTuple> operator()(const std::shared_ptr<one::Tensor>& dy,
+                                const std::shared_ptr<one::Tensor>& x,
+                                const std::shared_ptr<one::Tensor>& mean,
+                                const std::shared_ptr<one::Tensor>& inv_variance,
+                                const int32_t& num_groups) const {
+    MutableAttrMap attrs;
+    JUST(attrs.SetAttr<int32_t>("num_groups", num_groups));
+    return OpInterpUtil::Dispatch<TensorTuple>(*op_, {dy, x, mean, inv_variance}, attrs);
+  }
+
+ private:
+  std::shared_ptr<OpExpr> op_;
+};
+
 class BroadcastMatmulGradBFunctor {
  public:
   BroadcastMatmulGradBFunctor() {
@@ -860,6 +924,67 @@ class FusedScaleTrilSoftmaxMaskScaleGradFunctor {
   std::shared_ptr<OpExpr> fused_op_;
 };
 
+class FusedLstmCellGradFunctor {
+ public:
+  FusedLstmCellGradFunctor() {
+    op_ = CHECK_JUST(one::OpBuilder("fused_lstm_cell_grad")
+                         .Input("grad_hy")
+                         .Input("cx")
+                         .Input("cy")
+                         .Input("workspace")
+                         .Output("grad_gates")
+                         .Output("grad_cx")
+                         .Build());
+    op_with_grad_cy_ = CHECK_JUST(one::OpBuilder("fused_lstm_cell_grad")
+                                      .Input("grad_hy")
+                                      .Input("grad_cy")
+                                      .Input("cx")
+                                      .Input("cy")
+                                      .Input("workspace")
+                                      .Output("grad_gates")
+                                      .Output("grad_cx")
+                                      .Build());
+  }
+  Maybe<TensorTuple> operator()(const std::shared_ptr<one::Tensor>& grad_hy,
+                                const Optional<one::Tensor>& grad_cy,
+                                const std::shared_ptr<one::Tensor>& cx,
+                                const std::shared_ptr<one::Tensor>& cy,
+                                const std::shared_ptr<one::Tensor>& workspace) const {
+    if (grad_cy) {
+      return OpInterpUtil::Dispatch<TensorTuple>(*op_with_grad_cy_,
+                                                 {grad_hy, JUST(grad_cy), cx, cy, workspace});
+    } else {
+      return OpInterpUtil::Dispatch<TensorTuple>(*op_, {grad_hy, cx, cy, workspace});
+    }
+  }
+
+ private:
+  std::shared_ptr<OpExpr> op_;
+  std::shared_ptr<OpExpr> op_with_grad_cy_;
+};
+
+class FusedGruCellGradFunctor {
+ public:
+  FusedGruCellGradFunctor() {
+    op_ = CHECK_JUST(one::OpBuilder("fused_gru_cell_grad")
+                         .Input("grad_hy")
+                         .Input("hx")
+                         .Input("workspace")
+                         .Output("grad_input_gates")
+                         .Output("grad_hidden_gates")
+                         .Output("grad_hx")
+                         .Build());
+  }
+  Maybe<TensorTuple> operator()(const std::shared_ptr<one::Tensor>& grad_hy,
+                                const std::shared_ptr<one::Tensor>& hx,
+                                const std::shared_ptr<one::Tensor>& workspace) const {
+    return OpInterpUtil::Dispatch<TensorTuple>(*op_, {grad_hy, hx, workspace});
+  }
+
+ private:
+  std::shared_ptr<OpExpr> op_;
+};
+
 class FusedScaleMaskSoftmaxGradFunctor {
  public:
   FusedScaleMaskSoftmaxGradFunctor() {
@@ -937,10 +1062,14 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
   m.add_functor<impl::LayerNormGradFunctor>("LayerNormGrad");
   m.add_functor<impl::LayerNormParamGradFunctor>("LayerNormParamGrad");
   m.add_functor<impl::LayerNormAffineParamGradFunctor>("LayerNormAffineParamGrad");
+  m.add_functor<impl::GroupNormGradFunctor>("GroupNormGrad");
+  m.add_functor<impl::GroupNormParamGradFunctor>("GroupNormParamGrad");
   m.add_functor<impl::BroadcastMatmulGradBFunctor>("BroadcastMatmulGradB");
   m.add_functor<impl::CtcLossGradFunctor>("CtcLossGrad");
   m.add_functor<impl::FusedScaleTrilSoftmaxMaskScaleGradFunctor>(
       "FusedScaleTrilSoftmaxMaskScaleGrad");
+  m.add_functor<impl::FusedLstmCellGradFunctor>("FusedLstmCellGrad");
+  m.add_functor<impl::FusedGruCellGradFunctor>("FusedGruCellGrad");
   m.add_functor<impl::FusedScaleMaskSoftmaxGradFunctor>("FusedScaleMaskSoftmaxGrad");
   m.add_functor<impl::FusedScaleMaskSoftmaxDropoutGradFunctor>("FusedScaleMaskSoftmaxDropoutGrad");
 };
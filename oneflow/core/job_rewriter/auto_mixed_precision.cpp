@@ -37,22 +37,6 @@ void VerifyAMPList(const AMPList& amp_list) {
   }
 }
 
-using OpArg = std::pair<std::string, int32_t>;
-using NoCastRegistry = std::multimap<std::string, OpArg>;
-
-NoCastRegistry* GetNoCastRegistry() {
-  static NoCastRegistry s_registry;
-  return &s_registry;
-}
-
-bool FindInNoCastRegisry(const std::string& op_type, const OpArg& op_arg) {
-  auto range = GetNoCastRegistry()->equal_range(op_type);
-  for (auto it = range.first; it != range.second; ++it) {
-    if (it->second == op_arg) { return true; }
-  }
-  return false;
-}
-
 std::function<bool(OpNode*)> MakePredicatorIsAllowedToRunWithHalf(const OpGraph& op_graph) {
   auto allowed_set = std::make_shared<HashSet<OpNode*>>();
   op_graph.ForEachNode([&](OpNode* node) {
@@ -125,7 +109,7 @@ void InsertCastOpImpl(bool f2h, const OpGraph& op_graph, const HashSet<OpNode*>&
       if (dst_node->op().op_conf().has_user_conf()) {
         const std::string& op_type = dst_node->op().op_conf().user_conf().op_type_name();
         const auto& op_arg = GenUnRepeatedBn(dst_ibn);
-        if (FindInNoCastRegisry(op_type, op_arg)) { continue; }
+        if (AutoMixedPrecisionLists::IsNoCastInput(op_type, op_arg)) { continue; }
       }
 
       cast_is_consumed = true;
@@ -313,35 +297,6 @@ REGISTER_JOB_PASS("AutoMixedPrecision", AutoMixedPrecision);
 
 }  // namespace
 
-namespace {
-
-struct NoCastRegistrar final {
-  NoCastRegistrar(const std::string& op_type, OpArg&& op_arg) {
-    auto* registry = GetNoCastRegistry();
-    registry->emplace(std::make_pair(op_type, std::move(op_arg)));
-  }
-  ~NoCastRegistrar() = default;
-};
-
-#define REGISTER_NO_CAST_REGISTRY(op_type, input_arg_name, idx)       \
-  static NoCastRegistrar OF_PP_CAT(g_registrar, __COUNTER__)(op_type, \
-                                                             std::make_pair(input_arg_name, idx));
-
-// For Example:
-// REGISTER_NO_CAST_REGISTRY("matmul", "b", 0);
-
-REGISTER_NO_CAST_REGISTRY("normalization", "moving_mean", 0)
-REGISTER_NO_CAST_REGISTRY("normalization", "moving_variance", 0)
-REGISTER_NO_CAST_REGISTRY("normalization", "gamma", 0)
-REGISTER_NO_CAST_REGISTRY("normalization", "beta", 0)
-
-REGISTER_NO_CAST_REGISTRY("normalization_add_relu", "moving_mean", 0)
-REGISTER_NO_CAST_REGISTRY("normalization_add_relu", "moving_variance", 0)
-REGISTER_NO_CAST_REGISTRY("normalization_add_relu", "gamma", 0)
-REGISTER_NO_CAST_REGISTRY("normalization_add_relu", "beta", 0)
-
-}  // namespace
-
 }  // namespace oneflow
 
 #endif  // WITH_CUDA
@@ -99,4 +99,22 @@ const AMPList& AutoMixedPrecisionLists::ClearList() {
   return clear_list;
 }
 
+bool AutoMixedPrecisionLists::IsNoCastInput(const std::string& op_type,
+                                            const std::pair<std::string, int32_t>& input) {
+  static const std::multimap<std::string, std::pair<std::string, int32_t>> no_cast_inputs = {
+      {"normalization", {"moving_mean", 0}},
+      {"normalization", {"moving_variance", 0}},
+      {"normalization", {"gamma", 0}},
+      {"normalization", {"beta", 0}},
+      {"normalization_add_relu", {"moving_mean", 0}},
+      {"normalization_add_relu", {"moving_variance", 0}},
+      {"normalization_add_relu", {"gamma", 0}},
+      {"normalization_add_relu", {"beta", 0}}};
+  auto range = no_cast_inputs.equal_range(op_type);
+  for (auto it = range.first; it != range.second; ++it) {
+    if (it->second == input) { return true; }
+  }
+  return false;
+}
+
 }  // namespace oneflow
@@ -30,6 +30,10 @@ class AutoMixedPrecisionLists final {
   static const AMPList& BlackList();
   static const AMPList& GrayList();
   static const AMPList& ClearList();
+  // Inputs which keep their data type even if the op runs in half, e.g. the moving statistics
+  // of normalization which are updated inplace.
+  static bool IsNoCastInput(const std::string& op_type,
+                            const std::pair<std::string, int32_t>& input);
 };
 
 }  // namespace oneflow
@@ -17,6 +17,8 @@ limitations under the License.
 #include "oneflow/core/control/global_process_ctx.h"
 #include "oneflow/core/job/runtime_job_descs.h"
 #include "oneflow/core/stream/include/stream_context.h"
+#include "oneflow/core/common/cpp_attribute.h"
+#include "oneflow/core/profiler/op_profiler.h"
 
 namespace oneflow {
 
@@ -183,6 +185,7 @@ void Actor::Init(const JobDesc* job_desc, ActorContext* actor_ctx) {
   TakeOverNaiveProduced(task_proto.produced_regst_desc());
   InitBnInOp2BlobInfo(task_proto);
   VirtualActorInit(task_proto);
+  InitRuntimeProfile(job_desc);
 }
 
 void Actor::TakeOverInplaceConsumedAndProduced(
@@ -251,6 +254,51 @@ void Actor::TakeOverNaiveProduced(const PbMap<std::string, RegstDescProto>& prod
   }
 }
 
+void Actor::InitRuntimeProfile(const JobDesc* job_desc) {
+  idle_start_ns_ = -1;
+  is_waiting_for_write_ = false;
+  if (!job_desc->job_conf().enable_runtime_profiling()) { return; }
+  runtime_profile_.reset(new profiler::ActorRuntimeProfile(
+      actor_id_, job_desc->job_name(), job_desc->job_conf().runtime_profiling_sync_device()));
+  for (const ExecKernel& ek : exec_kernel_vec_) {
+    runtime_profile_->AddKernel(ek.kernel->op_conf().name());
+  }
+  for (const auto& pair : produced_regsts_) {
+    if (IsProducedCtrlRegstDescId(pair.first)) { continue; }
+    if (!naive_produced_rs_.HasRegstDescId(pair.first)) { continue; }
+    profiled_regst_desc_ids_.emplace_back(pair.first);
+    runtime_profile_->AddRegst(pair.first, pair.second.size());
+  }
+  profiler::RegisterActorRuntimeProfile(runtime_profile_);
+}
+
+void Actor::LaunchProfiledKernel(const ExecKernel& ek, int64_t kernel_idx) {
+  const int64_t start_ns = profiler::NowNanoseconds();
+  ek.kernel->Launch(ek.kernel_ctx.get());
+  if (runtime_profile_->sync_device()) { CHECK_JUST(ek.kernel_ctx->stream()->Sync()); }
+  runtime_profile_->AddKernelTime(kernel_idx, profiler::NowNanoseconds() - start_ns);
+}
+
+void Actor::SampleProducedRegstOccupancy() {
+  for (int64_t i = 0; i < profiled_regst_desc_ids_.size(); ++i) {
+    const int64_t regst_desc_id = profiled_regst_desc_ids_.at(i);
+    const int64_t capacity = produced_regsts_.at(regst_desc_id).size();
+    const int64_t available = naive_produced_rs_.RegstDeq4RegstDescId(regst_desc_id).size();
+    runtime_profile_->AddRegstSample(i, capacity - available);
+  }
+}
+
+void Actor::UpdateIdleStateForRuntimeProfile() {
+  // The actor may be woken up by a msg without being able to act, so the idle time is split into
+  // segments each attributed to what the actor was waiting for at the segment start.
+  const int64_t now_ns = profiler::NowNanoseconds();
+  if (idle_start_ns_ >= 0) {
+    runtime_profile_->AddWait(is_waiting_for_write_, now_ns - idle_start_ns_);
+  }
+  idle_start_ns_ = now_ns;
+  is_waiting_for_write_ = IsReadReady();
+}
+
 void Actor::InitBnInOp2BlobInfo(const TaskProto& task_proto) {
   for (int64_t i = 0; i < exec_kernel_vec_.size(); ++i) {
     ExecKernel& ek = exec_kernel_vec_.at(i);
@@ -340,6 +388,10 @@ int Actor::HandlerNormal(const ActorMsg& msg) {
   } else if (msg.msg_type() == ActorMsgType::kRegstMsg) {
     if (msg.SrcMachineId() == GlobalProcessCtx::Rank()) {
       Regst* regst = msg.regst();
+      if (unlikely(runtime_profile_ != nullptr) && regst->produced_ns() >= 0
+          && regst->producer_actor_id() != actor_id_) {
+        runtime_profile_->AddQueueTime(profiler::NowNanoseconds() - regst->produced_ns());
+      }
       if (naive_consumed_rs_.HasRegstDescId(regst->regst_desc_id())) {
         CHECK_EQ(0, naive_consumed_rs_.TryPushBackRegst(regst));
         const auto& rdeq = naive_consumed_rs_.RegstDeq4RegstDescId(regst->regst_desc_id());
@@ -421,7 +473,18 @@ int Actor::HandlerZombie(const ActorMsg& msg) {
 
 void Actor::ActUntilFail() {
   while (IsReadReady() && IsWriteReady()) {
+    int64_t act_start_ns = 0;
+    if (unlikely(runtime_profile_ != nullptr)) {
+      act_start_ns = profiler::NowNanoseconds();
+      if (idle_start_ns_ >= 0) {
+        runtime_profile_->AddWait(is_waiting_for_write_, act_start_ns - idle_start_ns_);
+        idle_start_ns_ = -1;
+      }
+    }
     Act();
+    if (unlikely(runtime_profile_ != nullptr)) {
+      runtime_profile_->AddAct(profiler::NowNanoseconds() - act_start_ns);
+    }
 
     AsyncSendCustomizedProducedRegstMsgToConsumer();
     AsyncSendNaiveProducedRegstMsgToConsumer();
@@ -432,9 +495,11 @@ void Actor::ActUntilFail() {
     AsyncRetInplaceConsumedRegstIfNoConsumer();
 
     AsyncSendQueuedMsg();
+    if (unlikely(runtime_profile_ != nullptr)) { SampleProducedRegstOccupancy(); }
   }
   // NOTE(liujuncheng): return inplace consumed
   AsyncSendQueuedMsg();
+  if (unlikely(runtime_profile_ != nullptr)) { UpdateIdleStateForRuntimeProfile(); }
 }
 
 void Actor::AsyncSendNaiveProducedRegstMsgToConsumer() {
@@ -518,6 +583,7 @@ int64_t Actor::HandleRegstToConsumer(Regst* regst) {
   auto regst_reading_cnt_it = produced_regst2reading_cnt_.find(regst);
   CHECK_EQ(regst_reading_cnt_it->second, 0);
 
+  if (unlikely(runtime_profile_ != nullptr)) { regst->set_produced_ns(profiler::NowNanoseconds()); }
   int64_t real_consumer_cnt = 0;
   for (int64_t consumer : regst->consumers_actor_id()) {
     EnqueueAsyncMsg(ActorMsg::BuildRegstMsgToConsumer(actor_id_, consumer, regst));
@@ -559,7 +625,11 @@ void Actor::AsyncLaunchKernel(std::function<Regst*(int64_t)> Regst4RegstDescId)
             return regst->GetBlobByLbi(info.lbi);
           }
         });
-    ek.kernel->Launch(ek.kernel_ctx.get());
+    if (unlikely(runtime_profile_ != nullptr)) {
+      LaunchProfiledKernel(ek, &ek - exec_kernel_vec_.data());
+    } else {
+      ek.kernel->Launch(ek.kernel_ctx.get());
+    }
   }
 }
 
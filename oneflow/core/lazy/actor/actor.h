@@ -23,6 +23,7 @@ limitations under the License.
 #include "oneflow/core/kernel/kernel_context.h"
 #include "oneflow/core/register/register_manager.h"
 #include "oneflow/core/lazy/actor/register_slot.h"
+#include "oneflow/core/profiler/graph_profiler.h"
 
 namespace oneflow {
 
@@ -149,6 +150,12 @@ class Actor : public ActorBase {
   void TakeOverNaiveProduced(const PbMap<std::string, RegstDescProto>& produced_ids);
   void InitBnInOp2BlobInfo(const TaskProto& task_proto);
 
+  // Runtime Profiling
+  void InitRuntimeProfile(const JobDesc* job_desc);
+  void LaunchProfiledKernel(const ExecKernel& ek, int64_t kernel_idx);
+  void SampleProducedRegstOccupancy();
+  void UpdateIdleStateForRuntimeProfile();
+
   // Send Msgs
   void AsyncSendNaiveProducedRegstMsgToConsumer();
   virtual void VirtualAsyncSendNaiveProducedRegstMsgToConsumer();
@@ -215,6 +222,11 @@ class Actor : public ActorBase {
   std::deque<ActorMsg> async_msg_queue_;
   bool is_kernel_launch_synchronized_;
   std::vector<int64_t> tmp_regst_desc_id_vec_;
+
+  std::shared_ptr<profiler::ActorRuntimeProfile> runtime_profile_;
+  std::vector<int64_t> profiled_regst_desc_ids_;
+  int64_t idle_start_ns_;
+  bool is_waiting_for_write_;
 };
 
 }  // namespace oneflow
@@ -0,0 +1,163 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/profiler/graph_profiler.h"
+#include <algorithm>
+
+namespace oneflow {
+
+namespace profiler {
+
+namespace {
+
+struct ActorRuntimeProfileRegistry {
+  std::mutex mutex;
+  HashMap<std::string, std::vector<std::weak_ptr<ActorRuntimeProfile>>> job_name2profiles;
+};
+
+ActorRuntimeProfileRegistry* MutActorRuntimeProfileRegistry() {
+  static ActorRuntimeProfileRegistry* registry = new ActorRuntimeProfileRegistry();
+  return registry;
+}
+
+template<typename HandlerT>
+void ForEachLiveProfile(const std::string& job_name, const HandlerT& Handler) {
+  auto* registry = MutActorRuntimeProfileRegistry();
+  std::unique_lock<std::mutex> lock(registry->mutex);
+  auto it = registry->job_name2profiles.find(job_name);
+  if (it == registry->job_name2profiles.end()) { return; }
+  auto& profiles = it->second;
+  profiles.erase(std::remove_if(profiles.begin(), profiles.end(),
+                                [](const std::weak_ptr<ActorRuntimeProfile>& profile) {
+                                  return profile.expired();
+                                }),
+                 profiles.end());
+  for (const auto& weak_profile : profiles) {
+    const auto profile = weak_profile.lock();
+    if (profile) { Handler(*profile); }
+  }
+  if (profiles.empty()) { registry->job_name2profiles.erase(it); }
+}
+
+}  // namespace
+
+ActorRuntimeProfile::ActorRuntimeProfile(int64_t actor_id, const std::string& job_name,
+                                         bool sync_device)
+    : sync_device_(sync_device) {
+  stats_.actor_id = actor_id;
+  stats_.job_name = job_name;
+}
+
+int64_t ActorRuntimeProfile::AddKernel(const std::string& op_name) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  stats_.kernels.emplace_back();
+  stats_.kernels.back().op_name = op_name;
+  return stats_.kernels.size() - 1;
+}
+
+int64_t ActorRuntimeProfile::AddRegst(int64_t regst_desc_id, int64_t capacity) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  stats_.regsts.emplace_back();
+  stats_.regsts.back().regst_desc_id = regst_desc_id;
+  stats_.regsts.back().capacity = capacity;
+  return stats_.regsts.size() - 1;
+}
+
+void ActorRuntimeProfile::AddKernelTime(int64_t kernel_idx, int64_t ns) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  KernelRuntimeStats* kernel = &stats_.kernels.at(kernel_idx);
+  kernel->launch_cnt += 1;
+  kernel->total_ns += ns;
+  kernel->max_ns = std::max(kernel->max_ns, ns);
+}
+
+void ActorRuntimeProfile::AddRegstSample(int64_t regst_idx, int64_t in_use) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  RegstRuntimeStats* regst = &stats_.regsts.at(regst_idx);
+  regst->sample_cnt += 1;
+  regst->total_in_use += in_use;
+  regst->max_in_use = std::max(regst->max_in_use, in_use);
+  if (in_use >= regst->capacity) { regst->full_cnt += 1; }
+}
+
+void ActorRuntimeProfile::AddAct(int64_t ns) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  stats_.act_cnt += 1;
+  stats_.act_ns += ns;
+}
+
+void ActorRuntimeProfile::AddWait(bool is_write_wait, int64_t ns) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  if (is_write_wait) {
+    stats_.write_wait_ns += ns;
+  } else {
+    stats_.read_wait_ns += ns;
+  }
+}
+
+void ActorRuntimeProfile::AddQueueTime(int64_t ns) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  stats_.queue_msg_cnt += 1;
+  stats_.queue_ns += ns;
+}
+
+ActorRuntimeStats ActorRuntimeProfile::GetStats() const {
+  std::unique_lock<std::mutex> lock(mutex_);
+  return stats_;
+}
+
+void ActorRuntimeProfile::Reset() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  stats_.act_cnt = 0;
+  stats_.act_ns = 0;
+  stats_.read_wait_ns = 0;
+  stats_.write_wait_ns = 0;
+  stats_.queue_ns = 0;
+  stats_.queue_msg_cnt = 0;
+  for (auto& kernel : stats_.kernels) {
+    kernel.launch_cnt = 0;
+    kernel.total_ns = 0;
+    kernel.max_ns = 0;
+  }
+  for (auto& regst : stats_.regsts) {
+    regst.sample_cnt = 0;
+    regst.total_in_use = 0;
+    regst.max_in_use = 0;
+    regst.full_cnt = 0;
+  }
+}
+
+void RegisterActorRuntimeProfile(const std::shared_ptr<ActorRuntimeProfile>& profile) {
+  auto* registry = MutActorRuntimeProfileRegistry();
+  const std::string& job_name = profile->GetStats().job_name;
+  std::unique_lock<std::mutex> lock(registry->mutex);
+  registry->job_name2profiles[job_name].emplace_back(profile);
+}
+
+std::vector<ActorRuntimeStats> GetActorRuntimeStats(const std::string& job_name) {
+  std::vector<ActorRuntimeStats> stats;
+  ForEachLiveProfile(job_name, [&](const ActorRuntimeProfile& profile) {
+    stats.emplace_back(profile.GetStats());
+  });
+  return stats;
+}
+
+void ResetActorRuntimeStats(const std::string& job_name) {
+  ForEachLiveProfile(job_name, [](ActorRuntimeProfile& profile) { profile.Reset(); });
+}
+
+}  // namespace profiler
+
+}  // namespace oneflow
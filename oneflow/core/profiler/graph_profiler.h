@@ -0,0 +1,100 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_CORE_PROFILER_GRAPH_PROFILER_H_
+#define ONEFLOW_CORE_PROFILER_GRAPH_PROFILER_H_
+
+#include <mutex>
+#include "oneflow/core/common/util.h"
+
+namespace oneflow {
+
+namespace profiler {
+
+struct KernelRuntimeStats {
+  std::string op_name;
+  int64_t launch_cnt = 0;
+  int64_t total_ns = 0;
+  int64_t max_ns = 0;
+};
+
+// Occupancy of the registers produced by an actor, sampled after every act. A register is in use
+// from the time it is written until all its consumers have returned it.
+struct RegstRuntimeStats {
+  int64_t regst_desc_id = -1;
+  int64_t capacity = 0;
+  int64_t sample_cnt = 0;
+  int64_t total_in_use = 0;
+  int64_t max_in_use = 0;
+  int64_t full_cnt = 0;
+};
+
+struct ActorRuntimeStats {
+  int64_t actor_id = -1;
+  std::string job_name;
+  int64_t act_cnt = 0;
+  int64_t act_ns = 0;
+  // Idle time of the actor between two acts, split by what it was waiting for: readable input
+  // registers, or free output registers (i.e. backpressure from the consumers).
+  int64_t read_wait_ns = 0;
+  int64_t write_wait_ns = 0;
+  // Time between a producer handing a register to this actor and this actor handling the message.
+  int64_t queue_ns = 0;
+  int64_t queue_msg_cnt = 0;
+  std::vector<KernelRuntimeStats> kernels;
+  std::vector<RegstRuntimeStats> regsts;
+};
+
+// The statistics of one actor. They are written by the actor thread and read by the thread
+// building the report, hence the mutex.
+class ActorRuntimeProfile final {
+ public:
+  OF_DISALLOW_COPY_AND_MOVE(ActorRuntimeProfile);
+  ActorRuntimeProfile(int64_t actor_id, const std::string& job_name, bool sync_device);
+  ~ActorRuntimeProfile() = default;
+
+  bool sync_device() const { return sync_device_; }
+
+  int64_t AddKernel(const std::string& op_name);
+  int64_t AddRegst(int64_t regst_desc_id, int64_t capacity);
+
+  void AddKernelTime(int64_t kernel_idx, int64_t ns);
+  void AddRegstSample(int64_t regst_idx, int64_t in_use);
+  void AddAct(int64_t ns);
+  void AddWait(bool is_write_wait, int64_t ns);
+  void AddQueueTime(int64_t ns);
+
+  ActorRuntimeStats GetStats() const;
+  void Reset();
+
+ private:
+  const bool sync_device_;
+  mutable std::mutex mutex_;
+  ActorRuntimeStats stats_;
+};
+
+// Keeps the profiles of the live actors of every job, the profiles of destroyed actors are
+// dropped. Actors only register themselves if their job enables runtime profiling.
+void RegisterActorRuntimeProfile(const std::shared_ptr<ActorRuntimeProfile>& profile);
+
+std::vector<ActorRuntimeStats> GetActorRuntimeStats(const std::string& job_name);
+
+void ResetActorRuntimeStats(const std::string& job_name);
+
+}  // namespace profiler
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_CORE_PROFILER_GRAPH_PROFILER_H_
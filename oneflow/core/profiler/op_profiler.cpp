@@ -0,0 +1,107 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/profiler/op_profiler.h"
+#include <chrono>
+#include <mutex>
+
+namespace oneflow {
+
+namespace profiler {
+
+namespace internal {
+
+std::atomic<bool> op_profiler_enabled(false);
+
+}  // namespace internal
+
+namespace {
+
+struct OpProfilerSession {
+  std::mutex mutex;
+  bool record_shapes = false;
+  int64_t next_event_id = 0;
+  std::vector<std::shared_ptr<OpEvent>> events;
+};
+
+OpProfilerSession* MutOpProfilerSession() {
+  static OpProfilerSession* session = new OpProfilerSession();
+  return session;
+}
+
+}  // namespace
+
+int64_t NowNanoseconds() {
+  return std::chrono::duration_cast<std::chrono::nanoseconds>(
+             std::chrono::steady_clock::now().time_since_epoch())
+      .count();
+}
+
+int64_t CurrentThreadId() {
+  static std::atomic<int64_t> next_thread_id(0);
+  static thread_local int64_t thread_id = next_thread_id.fetch_add(1);
+  return thread_id;
+}
+
+Maybe<void> EnableOpProfiler(bool record_shapes) {
+  auto* session = MutOpProfilerSession();
+  std::unique_lock<std::mutex> lock(session->mutex);
+  CHECK_OR_RETURN(!IsOpProfilerEnabled()) << "The eager op profiler is already enabled";
+  session->record_shapes = record_shapes;
+  session->next_event_id = 0;
+  session->events.clear();
+  internal::op_profiler_enabled.store(true);
+  return Maybe<void>::Ok();
+}
+
+Maybe<std::vector<std::shared_ptr<OpEvent>>> DisableOpProfiler() {
+  auto* session = MutOpProfilerSession();
+  std::unique_lock<std::mutex> lock(session->mutex);
+  CHECK_OR_RETURN(IsOpProfilerEnabled()) << "The eager op profiler is not enabled";
+  internal::op_profiler_enabled.store(false);
+  auto events = std::make_shared<std::vector<std::shared_ptr<OpEvent>>>();
+  events->swap(session->events);
+  return events;
+}
+
+std::shared_ptr<OpEvent> NewOpEvent(const std::string& op_type_name, const std::string& device,
+                                    const std::function<void(std::vector<std::vector<int64_t>>*)>&
+                                        FillInputShapes) {
+  auto* session = MutOpProfilerSession();
+  auto event = std::make_shared<OpEvent>();
+  event->op_type_name = op_type_name;
+  event->device = device;
+  event->dispatch_thread_id = CurrentThreadId();
+  event->dispatch_start_ns = NowNanoseconds();
+  {
+    std::unique_lock<std::mutex> lock(session->mutex);
+    // The profiler may be disabled between IsOpProfilerEnabled() and here.
+    if (!IsOpProfilerEnabled()) { return nullptr; }
+    event->id = session->next_event_id++;
+    session->events.push_back(event);
+    if (!session->record_shapes) { return event; }
+  }
+  FillInputShapes(&event->input_shapes);
+  return event;
+}
+
+std::shared_ptr<OpEvent>* MutThreadLocalDispatchingOpEvent() {
+  static thread_local std::shared_ptr<OpEvent> event;
+  return &event;
+}
+
+}  // namespace profiler
+
+}  // namespace oneflow
@@ -0,0 +1,105 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_CORE_PROFILER_OP_PROFILER_H_
+#define ONEFLOW_CORE_PROFILER_OP_PROFILER_H_
+
+#include <atomic>
+#include "oneflow/core/common/util.h"
+#include "oneflow/core/common/cpp_attribute.h"
+
+namespace oneflow {
+
+namespace profiler {
+
+// One eager op call. The dispatch fields are written by the thread calling the interpreter, the
+// kernel fields by the vm thread running the kernel, so the latter are only valid after the vm is
+// synchronized.
+struct OpEvent {
+  int64_t id = -1;
+  std::string op_type_name;
+  std::string device;
+  std::vector<std::vector<int64_t>> input_shapes;
+  int64_t dispatch_thread_id = -1;
+  int64_t dispatch_start_ns = -1;
+  int64_t dispatch_end_ns = -1;
+  int64_t kernel_thread_id = -1;
+  int64_t kernel_start_ns = -1;
+  int64_t kernel_end_ns = -1;
+  int64_t allocated_bytes = 0;
+};
+
+namespace internal {
+
+extern std::atomic<bool> op_profiler_enabled;
+
+}  // namespace internal
+
+// Checked on every eager op dispatch, so it is a single relaxed load.
+inline bool IsOpProfilerEnabled() {
+  return internal::op_profiler_enabled.load(std::memory_order_relaxed);
+}
+
+int64_t NowNanoseconds();
+
+// A small sequential id of the current thread, used as tid in the exported traces.
+int64_t CurrentThreadId();
+
+// Starts collecting OpEvents, the events of a previous session are dropped.
+Maybe<void> EnableOpProfiler(bool record_shapes);
+
+// Stops collecting and returns the events collected since EnableOpProfiler.
+Maybe<std::vector<std::shared_ptr<OpEvent>>> DisableOpProfiler();
+
+// Creates the event of an op about to be dispatched, or returns nullptr when the profiler is
+// disabled. Input shapes are filled only if requested by EnableOpProfiler.
+std::shared_ptr<OpEvent> NewOpEvent(const std::string& op_type_name, const std::string& device,
+                                    const std::function<void(std::vector<std::vector<int64_t>>*)>&
+                                        FillInputShapes);
+
+// The event of the op being dispatched by the current thread. The instruction built for the op
+// takes it, so the vm thread can fill the kernel fields.
+std::shared_ptr<OpEvent>* MutThreadLocalDispatchingOpEvent();
+
+// Publishes the event as the dispatching one during the scope and records the dispatch end time.
+// The event of an outer dispatch is restored at the end of the scope, so that ops dispatched
+// while dispatching another op (e.g. by a kernel falling back to other ops) keep their own events.
+class DispatchingOpEventGuard final {
+ public:
+  OF_DISALLOW_COPY_AND_MOVE(DispatchingOpEventGuard);
+  explicit DispatchingOpEventGuard(const std::shared_ptr<OpEvent>& event) : event_(event) {
+    if (unlikely(event_ != nullptr)) {
+      std::shared_ptr<OpEvent>* dispatching_op_event = MutThreadLocalDispatchingOpEvent();
+      prev_event_ = std::move(*dispatching_op_event);
+      *dispatching_op_event = event_;
+    }
+  }
+  ~DispatchingOpEventGuard() {
+    if (unlikely(event_ != nullptr)) {
+      *MutThreadLocalDispatchingOpEvent() = std::move(prev_event_);
+      event_->dispatch_end_ns = NowNanoseconds();
+    }
+  }
+
+ private:
+  const std::shared_ptr<OpEvent>& event_;
+  std::shared_ptr<OpEvent> prev_event_;
+};
+
+}  // namespace profiler
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_CORE_PROFILER_OP_PROFILER_H_
@@ -26,6 +26,7 @@ Regst::Regst()
     : regst_desc_(nullptr),
       main_mem_ptr_(nullptr),
       separated_header_mem_ptr_(nullptr),
+      produced_ns_(-1),
       comm_net_token_(nullptr) {}
 
 Regst::~Regst() {
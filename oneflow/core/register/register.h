@@ -46,6 +46,9 @@ class Regst final {
   void* separated_header_mem_ptr() const { return separated_header_mem_ptr_; }
   void set_separated_header_mem_ptr(void* ptr) { separated_header_mem_ptr_ = ptr; }
   void* comm_net_token();
+  // Time the producer handed the regst to its consumers, only set by profiled actors.
+  int64_t produced_ns() const { return produced_ns_; }
+  void set_produced_ns(int64_t ns) { produced_ns_ = ns; }
 
  private:
   friend class RegstMgr;
@@ -58,6 +61,7 @@ class Regst final {
   std::vector<std::unique_ptr<Blob>> sorted_blob_vec_;
   void* main_mem_ptr_;
   void* separated_header_mem_ptr_;
+  int64_t produced_ns_;
 
   std::atomic<void*> comm_net_token_;
   std::mutex comm_net_token_mutex_;
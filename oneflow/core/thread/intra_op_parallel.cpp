@@ -0,0 +1,196 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/thread/intra_op_parallel.h"
+#include <atomic>
+#include <condition_variable>
+#include <deque>
+#include <mutex>
+#include <thread>
+#include <vector>
+#include "oneflow/core/common/cpp_attribute.h"
+#include "oneflow/core/common/global.h"
+#include "oneflow/core/common/util.h"
+#include "oneflow/core/control/ctrl_bootstrap.pb.h"
+#include "oneflow/core/platform/include/pthread_fork.h"
+#include "oneflow/core/rpc/include/global_process_ctx.h"
+
+namespace oneflow {
+
+namespace {
+
+thread_local bool in_intra_op_parallel_region = false;
+
+int32_t DefaultIntraOpNumThreads() {
+  int64_t num_threads = std::thread::hardware_concurrency();
+  if (Global<ProcessCtx>::Get() != nullptr) {
+    num_threads /= GlobalProcessCtx::NumOfProcessPerNode();
+  }
+  num_threads = ParseIntegerFromEnv("ONEFLOW_NUM_THREADS", num_threads);
+  return static_cast<int32_t>(std::max<int64_t>(num_threads, 1));
+}
+
+// State shared by the chunks of one ParallelFor call.
+struct ParallelForContext {
+  std::mutex mutex;
+  std::condition_variable cond;
+  int64_t num_pending_chunks;
+};
+
+// The workers of the pool and the threads calling ParallelFor take chunks from one queue. A caller
+// keeps taking chunks while its own are pending, so a call always finishes even when every worker
+// is busy with other calls or the workers are being restarted by SetNumThreads.
+class IntraOpThreadPool final {
+ public:
+  OF_DISALLOW_COPY_AND_MOVE(IntraOpThreadPool);
+  IntraOpThreadPool() : num_threads_(DefaultIntraOpNumThreads()), stopped_(false) {}
+  ~IntraOpThreadPool() { StopWorkers(); }
+
+  int32_t num_threads() const { return num_threads_.load(std::memory_order_relaxed); }
+
+  void SetNumThreads(int32_t num_threads) {
+    std::unique_lock<std::mutex> resize_lock(resize_mutex_);
+    StopWorkers();
+    num_threads_.store(num_threads, std::memory_order_relaxed);
+  }
+
+  void Run(int64_t num_chunks, const std::function<void(int64_t)>& DoEachChunk) {
+    ParallelForContext ctx;
+    ctx.num_pending_chunks = num_chunks;
+    const auto RunChunk = [&ctx, &DoEachChunk](int64_t chunk_id) {
+      DoEachChunk(chunk_id);
+      std::unique_lock<std::mutex> lock(ctx.mutex);
+      ctx.num_pending_chunks -= 1;
+      if (ctx.num_pending_chunks == 0) { ctx.cond.notify_all(); }
+    };
+    {
+      std::unique_lock<std::mutex> lock(mutex_);
+      if (workers_.empty() && !stopped_) { StartWorkers(); }
+      FOR_RANGE(int64_t, chunk_id, 1, num_chunks) {
+        tasks_.emplace_back([&RunChunk, chunk_id]() { RunChunk(chunk_id); });
+      }
+    }
+    task_cond_.notify_all();
+    in_intra_op_parallel_region = true;
+    RunChunk(0);
+    while (true) {
+      {
+        std::unique_lock<std::mutex> lock(ctx.mutex);
+        if (ctx.num_pending_chunks == 0) { break; }
+      }
+      std::function<void()> task;
+      if (TryPopTask(&task)) {
+        task();
+      } else {
+        std::unique_lock<std::mutex> lock(ctx.mutex);
+        ctx.cond.wait(lock, [&ctx]() { return ctx.num_pending_chunks == 0; });
+        break;
+      }
+    }
+    in_intra_op_parallel_region = false;
+  }
+
+ private:
+  bool TryPopTask(std::function<void()>* task) {
+    std::unique_lock<std::mutex> lock(mutex_);
+    if (tasks_.empty()) { return false; }
+    *task = std::move(tasks_.front());
+    tasks_.pop_front();
+    return true;
+  }
+
+  // Must be called with mutex_ held.
+  void StartWorkers() {
+    FOR_RANGE(int32_t, i, 1, num_threads()) {
+      workers_.emplace_back([this]() {
+        in_intra_op_parallel_region = true;
+        while (true) {
+          std::function<void()> task;
+          {
+            std::unique_lock<std::mutex> lock(mutex_);
+            task_cond_.wait(lock, [this]() { return stopped_ || !tasks_.empty(); });
+            if (tasks_.empty()) { return; }
+            task = std::move(tasks_.front());
+            tasks_.pop_front();
+          }
+          task();
+        }
+      });
+    }
+  }
+
+  void StopWorkers() {
+    std::vector<std::thread> workers;
+    {
+      std::unique_lock<std::mutex> lock(mutex_);
+      stopped_ = true;
+      workers.swap(workers_);
+    }
+    task_cond_.notify_all();
+    for (auto& worker : workers) { worker.join(); }
+    std::unique_lock<std::mutex> lock(mutex_);
+    stopped_ = false;
+  }
+
+  std::atomic<int32_t> num_threads_;
+  std::mutex resize_mutex_;
+  std::mutex mutex_;
+  std::condition_variable task_cond_;
+  std::deque<std::function<void()>> tasks_;
+  std::vector<std::thread> workers_;
+  bool stopped_;
+};
+
+IntraOpThreadPool* GetIntraOpThreadPool() {
+  static IntraOpThreadPool* pool = new IntraOpThreadPool();
+  return pool;
+}
+
+}  // namespace
+
+int32_t GetIntraOpNumThreads() {
+  if (unlikely(pthread_fork::IsForkedSubProcess())) { return 1; }
+  return GetIntraOpThreadPool()->num_threads();
+}
+
+void SetIntraOpNumThreads(int32_t num_threads) {
+  CHECK_GT(num_threads, 0) << "The number of threads must be positive";
+  GetIntraOpThreadPool()->SetNumThreads(num_threads);
+}
+
+namespace internal {
+
+bool IsInIntraOpParallelRegion() { return in_intra_op_parallel_region; }
+
+void ParallelForImpl(int64_t begin, int64_t end, int64_t grain_size,
+                     const std::function<void(int64_t, int64_t)>& func) {
+  const int64_t range = end - begin;
+  const int64_t max_num_chunks = (range + grain_size - 1) / std::max<int64_t>(grain_size, 1);
+  const int64_t num_chunks = std::min<int64_t>(GetIntraOpNumThreads(), max_num_chunks);
+  if (num_chunks <= 1) {
+    func(begin, end);
+    return;
+  }
+  const int64_t chunk_size = (range + num_chunks - 1) / num_chunks;
+  GetIntraOpThreadPool()->Run(num_chunks, [&](int64_t chunk_id) {
+    const int64_t chunk_begin = begin + chunk_id * chunk_size;
+    const int64_t chunk_end = std::min(end, chunk_begin + chunk_size);
+    if (chunk_begin < chunk_end) { func(chunk_begin, chunk_end); }
+  });
+}
+
+}  // namespace internal
+
+}  // namespace oneflow
@@ -0,0 +1,61 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_CORE_THREAD_INTRA_OP_PARALLEL_H_
+#define ONEFLOW_CORE_THREAD_INTRA_OP_PARALLEL_H_
+
+#include <cstdint>
+#include <functional>
+
+namespace oneflow {
+
+// Ranges shorter than the grain size are not worth the cost of waking up another thread.
+// The default suits cheap elementwise loops, kernels doing more work per index should pass a
+// smaller grain, e.g. kParallelForDefaultGrain / cost_per_index.
+constexpr int64_t kParallelForDefaultGrain = 32768;
+
+// The number of threads used by ParallelFor, including the calling thread. It defaults to
+// ONEFLOW_NUM_THREADS if set, otherwise to the number of cores divided by the number of processes
+// on this node.
+int32_t GetIntraOpNumThreads();
+void SetIntraOpNumThreads(int32_t num_threads);
+
+namespace internal {
+
+bool IsInIntraOpParallelRegion();
+void ParallelForImpl(int64_t begin, int64_t end, int64_t grain_size,
+                     const std::function<void(int64_t, int64_t)>& func);
+
+}  // namespace internal
+
+// Splits [begin, end) into contiguous chunks of at least grain_size indices, calls
+// func(chunk_begin, chunk_end) on each of them in the intra-op thread pool, and returns after all
+// the chunks are done. The calling thread runs one of the chunks itself. Nested calls from inside a
+// chunk run serially in the current thread.
+template<typename F>
+void ParallelFor(int64_t begin, int64_t end, const F& func,
+                 int64_t grain_size = kParallelForDefaultGrain) {
+  if (begin >= end) { return; }
+  if (end - begin <= grain_size || GetIntraOpNumThreads() <= 1
+      || internal::IsInIntraOpParallelRegion()) {
+    func(begin, end);
+    return;
+  }
+  internal::ParallelForImpl(begin, end, grain_size, func);
+}
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_CORE_THREAD_INTRA_OP_PARALLEL_H_
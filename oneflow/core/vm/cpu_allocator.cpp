@@ -15,16 +15,114 @@ limitations under the License.
 */
 #include <cstdlib>
 #include "oneflow/core/vm/cpu_allocator.h"
-#include "oneflow/core/common/util.h"
 
 namespace oneflow {
 namespace vm {
 
+CpuAllocator::CpuAllocator()
+    : cache_limit_(ParseIntegerFromEnv("ONEFLOW_CPU_ALLOCATOR_CACHE_LIMIT_MB", 1024) * 1024
+                   * 1024) {}
+
+CpuAllocator::~CpuAllocator() { EmptyCache(); }
+
+size_t CpuAllocator::SizeClass4Size(size_t size) {
+  if (size <= kMinSizeClass) { return RoundUp(std::max<size_t>(size, 1), kHostAlignSize); }
+  // size lies in (2^power, 2^(power + 1)], which is split into four classes.
+  const size_t power = 63 ^ __builtin_clzll(static_cast<uint64_t>(size - 1));
+  const size_t step = static_cast<size_t>(1) << (power - 2);
+  return RoundUp(size, step);
+}
+
 void CpuAllocator::Allocate(char** mem_ptr, std::size_t size) {
-  *mem_ptr = reinterpret_cast<char*>(aligned_alloc(kHostAlignSize, size));
+  const size_t size_class = SizeClass4Size(size);
+  std::unique_lock<std::mutex> lock(mutex_);
+  char* ptr = nullptr;
+  auto& free_ptrs = size_class2free_ptrs_[size_class];
+  if (!free_ptrs.empty()) {
+    ptr = free_ptrs.back();
+    free_ptrs.pop_back();
+    stats_.cached_bytes -= size_class;
+    stats_.num_cache_hits += 1;
+  } else {
+    ptr = reinterpret_cast<char*>(aligned_alloc(kHostAlignSize, size_class));
+    if (ptr == nullptr) {
+      // The cached blocks of other size classes may be what the system is missing.
+      ReleaseCachedBlocks();
+      ptr = reinterpret_cast<char*>(aligned_alloc(kHostAlignSize, size_class));
+    }
+    CHECK(ptr != nullptr) << "Failed to allocate " << size_class << " bytes of host memory";
+    stats_.num_system_allocs += 1;
+  }
+  ptr2size_class_.emplace(ptr, size_class);
+  stats_.bytes_in_use += size_class;
+  stats_.peak_bytes_in_use = std::max(stats_.peak_bytes_in_use, stats_.bytes_in_use);
+  stats_.num_allocs += 1;
+  *mem_ptr = ptr;
+}
+
+void CpuAllocator::Deallocate(char* mem_ptr, std::size_t size) {
+  if (mem_ptr == nullptr) { return; }
+  std::unique_lock<std::mutex> lock(mutex_);
+  auto it = ptr2size_class_.find(mem_ptr);
+  CHECK(it != ptr2size_class_.end()) << "Deallocating host memory not owned by CpuAllocator";
+  const size_t size_class = it->second;
+  ptr2size_class_.erase(it);
+  stats_.bytes_in_use -= size_class;
+  stats_.num_frees += 1;
+  if (stats_.cached_bytes + size_class <= cache_limit_) {
+    size_class2free_ptrs_[size_class].push_back(mem_ptr);
+    stats_.cached_bytes += size_class;
+  } else {
+    std::free(mem_ptr);
+    stats_.num_system_frees += 1;
+  }
+}
+
+void CpuAllocator::EmptyCache() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  ReleaseCachedBlocks();
+}
+
+CpuAllocator::Stats CpuAllocator::GetStats() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  return stats_;
 }
 
-void CpuAllocator::Deallocate(char* mem_ptr, std::size_t size) { std::free(mem_ptr); }
+void CpuAllocator::ResetPeakStats() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  stats_.peak_bytes_in_use = stats_.bytes_in_use;
+}
+
+size_t CpuAllocator::cache_limit() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  return cache_limit_;
+}
+
+void CpuAllocator::set_cache_limit(size_t cache_limit) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  cache_limit_ = cache_limit;
+  TrimCacheToLimit();
+}
+
+void CpuAllocator::ReleaseCachedBlocks() {
+  for (auto& pair : size_class2free_ptrs_) {
+    for (char* ptr : pair.second) { std::free(ptr); }
+    stats_.num_system_frees += pair.second.size();
+    pair.second.clear();
+  }
+  stats_.cached_bytes = 0;
+}
+
+void CpuAllocator::TrimCacheToLimit() {
+  for (auto& pair : size_class2free_ptrs_) {
+    while (stats_.cached_bytes > cache_limit_ && !pair.second.empty()) {
+      std::free(pair.second.back());
+      pair.second.pop_back();
+      stats_.cached_bytes -= pair.first;
+      stats_.num_system_frees += 1;
+    }
+  }
+}
 
 COMMAND(Global<CpuAllocator>::SetAllocated(new CpuAllocator()));
 
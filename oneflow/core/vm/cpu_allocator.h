@@ -17,18 +17,61 @@ limitations under the License.
 #define ONEFLOW_CORE_VM_CPU_ALLOCATOR_H_
 
 #include <cstdint>
+#include <mutex>
+#include <vector>
 #include "oneflow/core/vm/allocator.h"
+#include "oneflow/core/common/util.h"
 
 namespace oneflow {
 namespace vm {
 
+// CpuAllocator caches freed host memory in size-class free lists, so eager loops that allocate
+// the same activation sizes every step are served without malloc/free and new page faults.
+//
+// Requested sizes are rounded up to a size class. Sizes up to kMinSizeClass are rounded to
+// kHostAlignSize, larger sizes get four classes per power of two, which bounds the internal
+// fragmentation to 25%. Freed blocks stay in the free list of their class while the cached bytes
+// are below the cache limit (ONEFLOW_CPU_ALLOCATOR_CACHE_LIMIT_MB, 1024 by default, 0 disables
+// caching) and are returned to the system otherwise.
 class CpuAllocator final : public Allocator {
  public:
-  explicit CpuAllocator() = default;
-  ~CpuAllocator() override = default;
+  struct Stats {
+    int64_t bytes_in_use = 0;
+    int64_t peak_bytes_in_use = 0;
+    int64_t cached_bytes = 0;
+    int64_t num_allocs = 0;
+    int64_t num_frees = 0;
+    int64_t num_cache_hits = 0;
+    int64_t num_system_allocs = 0;
+    int64_t num_system_frees = 0;
+  };
+
+  CpuAllocator();
+  ~CpuAllocator() override;
 
   void Allocate(char** mem_ptr, std::size_t size) override;
   void Deallocate(char* mem_ptr, std::size_t size) override;
+
+  // Returns all the cached blocks to the system, blocks in use are not affected.
+  void EmptyCache();
+  Stats GetStats();
+  void ResetPeakStats();
+  size_t cache_limit();
+  void set_cache_limit(size_t cache_limit);
+
+  static size_t SizeClass4Size(size_t size);
+
+ private:
+  static constexpr size_t kMinSizeClass = 512;
+
+  void ReleaseCachedBlocks();
+  void TrimCacheToLimit();
+
+  std::mutex mutex_;
+  size_t cache_limit_;
+  HashMap<size_t, std::vector<char*>> size_class2free_ptrs_;
+  HashMap<char*, size_t> ptr2size_class_;
+  Stats stats_;
 };
 
 }  // namespace vm
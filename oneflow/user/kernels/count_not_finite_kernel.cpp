@@ -58,4 +58,54 @@ REGISTER_COUNT_NOT_FINITE_CPU_KERNEL(double)
 REGISTER_MULTI_COUNT_NOT_FINITE_CPU_KERNEL(float)
 REGISTER_MULTI_COUNT_NOT_FINITE_CPU_KERNEL(double)
 
+namespace {
+
+template<typename T>
+struct UnscaleComputeType {
+  using type = float;
+};
+
+template<>
+struct UnscaleComputeType<double> {
+  using type = double;
+};
+
+}  // namespace
+
+template<typename T>
+class MultiUnscaleCountNotFiniteCpuKernel final : public user_op::OpKernel {
+ public:
+  MultiUnscaleCountNotFiniteCpuKernel() = default;
+  ~MultiUnscaleCountNotFiniteCpuKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    using ComputeType = typename UnscaleComputeType<T>::type;
+    const auto scale = static_cast<ComputeType>(ctx->Attr<double>("scale"));
+    user_op::Tensor* y = ctx->Tensor4ArgNameAndIndex("y", 0);
+    int64_t count = 0;
+    FOR_RANGE(int32_t, i, 0, ctx->inputs().size()) {
+      user_op::Tensor* x = ctx->Tensor4ArgNameAndIndex("x", i);
+      T* x_ptr = x->mut_dptr<T>();
+      FOR_RANGE(int64_t, j, 0, x->shape().elem_cnt()) {
+        const ComputeType value = static_cast<ComputeType>(x_ptr[j]);
+        if (!std::isfinite(value)) { count++; }
+        x_ptr[j] = static_cast<T>(value * scale);
+      }
+    }
+    y->mut_dptr<int64_t>()[0] = count;
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+};
+
+#define REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CPU_KERNEL(dtype)     \
+  REGISTER_USER_KERNEL("multi_unscale_count_not_finite")              \
+      .SetCreateFn<MultiUnscaleCountNotFiniteCpuKernel<dtype>>()      \
+      .SetIsMatchedHob((user_op::HobDeviceType() == DeviceType::kCPU) \
+                       && (user_op::HobDataType("x", 0) == GetDataType<dtype>::value));
+
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CPU_KERNEL(float)
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CPU_KERNEL(double)
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CPU_KERNEL(float16)
+
 }  // namespace oneflow
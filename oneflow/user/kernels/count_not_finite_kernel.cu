@@ -67,6 +67,62 @@ __global__ void MultiCountNotFiniteGpu(Param<T, N> param) {
   if (threadIdx.x == 0) { AtomicAdd(param.y, block_count_sum); }
 }
 
+template<typename T, int32_t N>
+struct UnscaleParam {
+  T* x[N];
+  int64_t x_elem_cnt[N];
+  int64_t* y;
+  int64_t num_x;
+};
+
+template<typename T>
+struct UnscaleComputeType {
+  using type = float;
+};
+
+template<>
+struct UnscaleComputeType<double> {
+  using type = double;
+};
+
+template<typename T>
+__device__ __forceinline__ typename UnscaleComputeType<T>::type ToComputeType(T x) {
+  return x;
+}
+
+template<>
+__device__ __forceinline__ float ToComputeType<half>(half x) {
+  return __half2float(x);
+}
+
+template<typename T>
+__device__ __forceinline__ T FromComputeType(typename UnscaleComputeType<T>::type x) {
+  return x;
+}
+
+template<>
+__device__ __forceinline__ half FromComputeType<half>(float x) {
+  return __float2half(x);
+}
+
+template<typename T, int32_t N>
+__global__ void MultiUnscaleCountNotFiniteGpu(UnscaleParam<T, N> param,
+                                              typename UnscaleComputeType<T>::type scale) {
+  typedef cub::BlockReduce<int64_t, kCudaThreadsNumPerBlock> BlockReduce;
+  __shared__ typename BlockReduce::TempStorage cub_reduce_tmp_storage;
+  int64_t thread_count = 0;
+  for (int32_t k = 0; k < param.num_x; ++k) {
+    CUDA_1D_KERNEL_LOOP(i, param.x_elem_cnt[k]) {
+      const auto value = ToComputeType<T>(param.x[k][i]);
+      if (!isfinite(value)) { thread_count += 1; }
+      param.x[k][i] = FromComputeType<T>(value * scale);
+    }
+  }
+  __syncthreads();
+  int64_t block_count_sum = BlockReduce(cub_reduce_tmp_storage).Reduce(thread_count, cub::Sum());
+  if (threadIdx.x == 0) { AtomicAdd(param.y, block_count_sum); }
+}
+
 constexpr int64_t kCountNotFiniteNumBlocks = 512;
 
 int GetCountNotFiniteNumBlocks(const int64_t elem_cnt) {
@@ -157,4 +213,54 @@ class MultiCountNotFiniteGpuKernel final : public user_op::OpKernel,
 REGISTER_MULTI_COUNT_NOT_FINITE_CUDA_KERNEL(float)
 REGISTER_MULTI_COUNT_NOT_FINITE_CUDA_KERNEL(double)
 
+template<typename T>
+class MultiUnscaleCountNotFiniteGpuKernel final : public user_op::OpKernel,
+                                                  public user_op::CudaGraphSupport {
+ public:
+  MultiUnscaleCountNotFiniteGpuKernel() = default;
+  ~MultiUnscaleCountNotFiniteGpuKernel() override = default;
+
+ private:
+  using user_op::OpKernel::Compute;
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    user_op::Tensor* y = ctx->Tensor4ArgNameAndIndex("y", 0);
+    const auto scale =
+        static_cast<typename UnscaleComputeType<T>::type>(ctx->Attr<double>("scale"));
+    UnscaleParam<T, 128> para;
+    Memset<DeviceType::kCUDA>(ctx->stream(), y->mut_dptr<int64_t>(), 0,
+                              y->shape().elem_cnt() * sizeof(int64_t));
+    para.y = y->mut_dptr<int64_t>();
+
+    // One launch counts and scales up to 128 tensors.
+    int64_t remain_size = ctx->inputs().size();
+    int64_t input_id = 0;
+    while (remain_size > 0) {
+      para.num_x = std::min<int64_t>(remain_size, 128);
+      remain_size -= para.num_x;
+      int64_t max_elem_cnt = 0;
+      for (int32_t i = 0; i < para.num_x; ++i) {
+        user_op::Tensor* x = ctx->Tensor4ArgNameAndIndex("x", input_id);
+        input_id++;
+        para.x[i] = x->mut_dptr<T>();
+        para.x_elem_cnt[i] = x->shape().elem_cnt();
+        max_elem_cnt = std::max(max_elem_cnt, x->shape().elem_cnt());
+      }
+      MultiUnscaleCountNotFiniteGpu<T, 128>
+          <<<GetCountNotFiniteNumBlocks(max_elem_cnt), kCudaThreadsNumPerBlock, 0,
+             ctx->stream()->As<ep::CudaStream>()->cuda_stream()>>>(para, scale);
+    }
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+};
+
+#define REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CUDA_KERNEL(dtype)     \
+  REGISTER_USER_KERNEL("multi_unscale_count_not_finite")               \
+      .SetCreateFn<MultiUnscaleCountNotFiniteGpuKernel<dtype>>()       \
+      .SetIsMatchedHob((user_op::HobDeviceType() == DeviceType::kCUDA) \
+                       && (user_op::HobDataType("x", 0) == GetDataType<dtype>::value));
+
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CUDA_KERNEL(float)
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CUDA_KERNEL(double)
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CUDA_KERNEL(half)
+
 }  // namespace oneflow
@@ -0,0 +1,131 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/framework.h"
+#include "oneflow/user/kernels/fused_rnn_cell_kernel_util.h"
+
+namespace oneflow {
+
+template<DeviceType device_type, typename T>
+class FusedLstmCellKernel final : public user_op::OpKernel {
+ public:
+  FusedLstmCellKernel() = default;
+  ~FusedLstmCellKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* input_gates = ctx->Tensor4ArgNameAndIndex("input_gates", 0);
+    const user_op::Tensor* hidden_gates = ctx->Tensor4ArgNameAndIndex("hidden_gates", 0);
+    const user_op::Tensor* cx = ctx->Tensor4ArgNameAndIndex("cx", 0);
+    user_op::Tensor* hy = ctx->Tensor4ArgNameAndIndex("hy", 0);
+    user_op::Tensor* cy = ctx->Tensor4ArgNameAndIndex("cy", 0);
+    user_op::Tensor* workspace = ctx->Tensor4ArgNameAndIndex("workspace", 0);
+    FusedRnnCellKernelUtil<device_type, T>::LstmForward(
+        ctx->stream(), cx->shape().At(0), cx->shape().At(1), input_gates->dptr<T>(),
+        hidden_gates->dptr<T>(), cx->dptr<T>(), hy->mut_dptr<T>(), cy->mut_dptr<T>(),
+        workspace->mut_dptr<T>());
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+};
+
+template<DeviceType device_type, typename T>
+class FusedLstmCellGradKernel final : public user_op::OpKernel {
+ public:
+  FusedLstmCellGradKernel() = default;
+  ~FusedLstmCellGradKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* grad_hy = ctx->Tensor4ArgNameAndIndex("grad_hy", 0);
+    const T* grad_cy_ptr = ctx->has_input("grad_cy", 0)
+                               ? ctx->Tensor4ArgNameAndIndex("grad_cy", 0)->dptr<T>()
+                               : nullptr;
+    const user_op::Tensor* cx = ctx->Tensor4ArgNameAndIndex("cx", 0);
+    const user_op::Tensor* cy = ctx->Tensor4ArgNameAndIndex("cy", 0);
+    const user_op::Tensor* workspace = ctx->Tensor4ArgNameAndIndex("workspace", 0);
+    user_op::Tensor* grad_gates = ctx->Tensor4ArgNameAndIndex("grad_gates", 0);
+    user_op::Tensor* grad_cx = ctx->Tensor4ArgNameAndIndex("grad_cx", 0);
+    FusedRnnCellKernelUtil<device_type, T>::LstmBackward(
+        ctx->stream(), cx->shape().At(0), cx->shape().At(1), grad_hy->dptr<T>(), grad_cy_ptr,
+        cx->dptr<T>(), cy->dptr<T>(), workspace->dptr<T>(), grad_gates->mut_dptr<T>(),
+        grad_cx->mut_dptr<T>());
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+};
+
+template<DeviceType device_type, typename T>
+class FusedGruCellKernel final : public user_op::OpKernel {
+ public:
+  FusedGruCellKernel() = default;
+  ~FusedGruCellKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* input_gates = ctx->Tensor4ArgNameAndIndex("input_gates", 0);
+    const user_op::Tensor* hidden_gates = ctx->Tensor4ArgNameAndIndex("hidden_gates", 0);
+    const user_op::Tensor* hx = ctx->Tensor4ArgNameAndIndex("hx", 0);
+    user_op::Tensor* hy = ctx->Tensor4ArgNameAndIndex("hy", 0);
+    user_op::Tensor* workspace = ctx->Tensor4ArgNameAndIndex("workspace", 0);
+    FusedRnnCellKernelUtil<device_type, T>::GruForward(
+        ctx->stream(), hx->shape().At(0), hx->shape().At(1), input_gates->dptr<T>(),
+        hidden_gates->dptr<T>(), hx->dptr<T>(), hy->mut_dptr<T>(), workspace->mut_dptr<T>());
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+};
+
+template<DeviceType device_type, typename T>
+class FusedGruCellGradKernel final : public user_op::OpKernel {
+ public:
+  FusedGruCellGradKernel() = default;
+  ~FusedGruCellGradKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* grad_hy = ctx->Tensor4ArgNameAndIndex("grad_hy", 0);
+    const user_op::Tensor* hx = ctx->Tensor4ArgNameAndIndex("hx", 0);
+    const user_op::Tensor* workspace = ctx->Tensor4ArgNameAndIndex("workspace", 0);
+    user_op::Tensor* grad_input_gates = ctx->Tensor4ArgNameAndIndex("grad_input_gates", 0);
+    user_op::Tensor* grad_hidden_gates = ctx->Tensor4ArgNameAndIndex("grad_hidden_gates", 0);
+    user_op::Tensor* grad_hx = ctx->Tensor4ArgNameAndIndex("grad_hx", 0);
+    FusedRnnCellKernelUtil<device_type, T>::GruBackward(
+        ctx->stream(), hx->shape().At(0), hx->shape().At(1), grad_hy->dptr<T>(), hx->dptr<T>(),
+        workspace->dptr<T>(), grad_input_gates->mut_dptr<T>(), grad_hidden_gates->mut_dptr<T>(),
+        grad_hx->mut_dptr<T>());
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+};
+
+#define REGISTER_FUSED_RNN_CELL_KERNELS(device_type_v, dtype_pair)                                \
+  REGISTER_USER_KERNEL("fused_lstm_cell")                                                         \
+      .SetCreateFn<FusedLstmCellKernel<device_type_v, OF_PP_PAIR_FIRST(dtype_pair)>>()            \
+      .SetIsMatchedHob((user_op::HobDeviceType() == device_type_v)                                \
+                       && (user_op::HobDataType("hy", 0) == OF_PP_PAIR_SECOND(dtype_pair)));      \
+  REGISTER_USER_KERNEL("fused_lstm_cell_grad")                                                    \
+      .SetCreateFn<FusedLstmCellGradKernel<device_type_v, OF_PP_PAIR_FIRST(dtype_pair)>>()        \
+      .SetIsMatchedHob((user_op::HobDeviceType() == device_type_v)                                \
+                       && (user_op::HobDataType("grad_cx", 0) == OF_PP_PAIR_SECOND(dtype_pair))); \
+  REGISTER_USER_KERNEL("fused_gru_cell")                                                          \
+      .SetCreateFn<FusedGruCellKernel<device_type_v, OF_PP_PAIR_FIRST(dtype_pair)>>()             \
+      .SetIsMatchedHob((user_op::HobDeviceType() == device_type_v)                                \
+                       && (user_op::HobDataType("hy", 0) == OF_PP_PAIR_SECOND(dtype_pair)));      \
+  REGISTER_USER_KERNEL("fused_gru_cell_grad")                                                     \
+      .SetCreateFn<FusedGruCellGradKernel<device_type_v, OF_PP_PAIR_FIRST(dtype_pair)>>()         \
+      .SetIsMatchedHob((user_op::HobDeviceType() == device_type_v)                                \
+                       && (user_op::HobDataType("grad_hx", 0) == OF_PP_PAIR_SECOND(dtype_pair)));
+
+OF_PP_SEQ_PRODUCT_FOR_EACH_TUPLE(REGISTER_FUSED_RNN_CELL_KERNELS, DEVICE_TYPE_SEQ,
+                                 FLOATING_DATA_TYPE_SEQ)
+
+}  // namespace oneflow
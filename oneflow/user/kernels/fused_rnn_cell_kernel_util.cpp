@@ -0,0 +1,98 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/user/kernels/fused_rnn_cell_kernel_util.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
+
+namespace oneflow {
+
+namespace {
+
+// Every gate element costs a few transcendental functions, so a batch row weighs several times
+// a plain elementwise op of hidden_size elements.
+int64_t RowGrainSize(int64_t hidden_size) {
+  return std::max<int64_t>(kParallelForDefaultGrain / (4 * std::max<int64_t>(hidden_size, 1)), 1);
+}
+
+}  // namespace
+
+template<typename T>
+struct FusedRnnCellKernelUtil<DeviceType::kCPU, T> {
+  static void LstmForward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                          const T* input_gates, const T* hidden_gates, const T* cx, T* hy, T* cy,
+                          T* workspace) {
+    ParallelFor(
+        0, batch_size,
+        [&](int64_t begin, int64_t end) {
+          FOR_RANGE(int64_t, b, begin, end) {
+            FOR_RANGE(int64_t, j, 0, hidden_size) {
+              fused_rnn_cell::LstmCellForward(b, j, hidden_size, input_gates, hidden_gates, cx,
+                                              hy, cy, workspace);
+            }
+          }
+        },
+        RowGrainSize(hidden_size));
+  }
+  static void LstmBackward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                           const T* grad_hy, const T* grad_cy, const T* cx, const T* cy,
+                           const T* workspace, T* grad_gates, T* grad_cx) {
+    ParallelFor(
+        0, batch_size,
+        [&](int64_t begin, int64_t end) {
+          FOR_RANGE(int64_t, b, begin, end) {
+            FOR_RANGE(int64_t, j, 0, hidden_size) {
+              fused_rnn_cell::LstmCellBackward(b, j, hidden_size, grad_hy, grad_cy, cx, cy,
+                                               workspace, grad_gates, grad_cx);
+            }
+          }
+        },
+        RowGrainSize(hidden_size));
+  }
+  static void GruForward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                         const T* input_gates, const T* hidden_gates, const T* hx, T* hy,
+                         T* workspace) {
+    ParallelFor(
+        0, batch_size,
+        [&](int64_t begin, int64_t end) {
+          FOR_RANGE(int64_t, b, begin, end) {
+            FOR_RANGE(int64_t, j, 0, hidden_size) {
+              fused_rnn_cell::GruCellForward(b, j, hidden_size, input_gates, hidden_gates, hx, hy,
+                                             workspace);
+            }
+          }
+        },
+        RowGrainSize(hidden_size));
+  }
+  static void GruBackward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                          const T* grad_hy, const T* hx, const T* workspace, T* grad_input_gates,
+                          T* grad_hidden_gates, T* grad_hx) {
+    ParallelFor(
+        0, batch_size,
+        [&](int64_t begin, int64_t end) {
+          FOR_RANGE(int64_t, b, begin, end) {
+            FOR_RANGE(int64_t, j, 0, hidden_size) {
+              fused_rnn_cell::GruCellBackward(b, j, hidden_size, grad_hy, hx, workspace,
+                                              grad_input_gates, grad_hidden_gates, grad_hx);
+            }
+          }
+        },
+        RowGrainSize(hidden_size));
+  }
+};
+
+OF_PP_SEQ_PRODUCT_FOR_EACH_TUPLE(INSTANTIATE_FUSED_RNN_CELL_KERNEL_UTIL, (DeviceType::kCPU),
+                                 FLOATING_DATA_TYPE_SEQ);
+
+}  // namespace oneflow
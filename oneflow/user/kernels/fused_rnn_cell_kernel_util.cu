@@ -0,0 +1,98 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/user/kernels/fused_rnn_cell_kernel_util.h"
+#include "oneflow/core/device/cuda_util.h"
+
+namespace oneflow {
+
+namespace {
+
+template<typename T>
+__global__ void LstmForwardGpu(int64_t elem_cnt, int64_t hidden_size, const T* input_gates,
+                               const T* hidden_gates, const T* cx, T* hy, T* cy, T* workspace) {
+  CUDA_1D_KERNEL_LOOP_T(int64_t, i, elem_cnt) {
+    fused_rnn_cell::LstmCellForward(i / hidden_size, i % hidden_size, hidden_size, input_gates,
+                                    hidden_gates, cx, hy, cy, workspace);
+  }
+}
+
+template<typename T>
+__global__ void LstmBackwardGpu(int64_t elem_cnt, int64_t hidden_size, const T* grad_hy,
+                                const T* grad_cy, const T* cx, const T* cy, const T* workspace,
+                                T* grad_gates, T* grad_cx) {
+  CUDA_1D_KERNEL_LOOP_T(int64_t, i, elem_cnt) {
+    fused_rnn_cell::LstmCellBackward(i / hidden_size, i % hidden_size, hidden_size, grad_hy,
+                                     grad_cy, cx, cy, workspace, grad_gates, grad_cx);
+  }
+}
+
+template<typename T>
+__global__ void GruForwardGpu(int64_t elem_cnt, int64_t hidden_size, const T* input_gates,
+                              const T* hidden_gates, const T* hx, T* hy, T* workspace) {
+  CUDA_1D_KERNEL_LOOP_T(int64_t, i, elem_cnt) {
+    fused_rnn_cell::GruCellForward(i / hidden_size, i % hidden_size, hidden_size, input_gates,
+                                   hidden_gates, hx, hy, workspace);
+  }
+}
+
+template<typename T>
+__global__ void GruBackwardGpu(int64_t elem_cnt, int64_t hidden_size, const T* grad_hy,
+                               const T* hx, const T* workspace, T* grad_input_gates,
+                               T* grad_hidden_gates, T* grad_hx) {
+  CUDA_1D_KERNEL_LOOP_T(int64_t, i, elem_cnt) {
+    fused_rnn_cell::GruCellBackward(i / hidden_size, i % hidden_size, hidden_size, grad_hy, hx,
+                                    workspace, grad_input_gates, grad_hidden_gates, grad_hx);
+  }
+}
+
+}  // namespace
+
+template<typename T>
+struct FusedRnnCellKernelUtil<DeviceType::kCUDA, T> {
+  static void LstmForward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                          const T* input_gates, const T* hidden_gates, const T* cx, T* hy, T* cy,
+                          T* workspace) {
+    const int64_t elem_cnt = batch_size * hidden_size;
+    RUN_CUDA_KERNEL((LstmForwardGpu<T>), stream, elem_cnt, elem_cnt, hidden_size, input_gates,
+                    hidden_gates, cx, hy, cy, workspace);
+  }
+  static void LstmBackward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                           const T* grad_hy, const T* grad_cy, const T* cx, const T* cy,
+                           const T* workspace, T* grad_gates, T* grad_cx) {
+    const int64_t elem_cnt = batch_size * hidden_size;
+    RUN_CUDA_KERNEL((LstmBackwardGpu<T>), stream, elem_cnt, elem_cnt, hidden_size, grad_hy,
+                    grad_cy, cx, cy, workspace, grad_gates, grad_cx);
+  }
+  static void GruForward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                         const T* input_gates, const T* hidden_gates, const T* hx, T* hy,
+                         T* workspace) {
+    const int64_t elem_cnt = batch_size * hidden_size;
+    RUN_CUDA_KERNEL((GruForwardGpu<T>), stream, elem_cnt, elem_cnt, hidden_size, input_gates,
+                    hidden_gates, hx, hy, workspace);
+  }
+  static void GruBackward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                          const T* grad_hy, const T* hx, const T* workspace, T* grad_input_gates,
+                          T* grad_hidden_gates, T* grad_hx) {
+    const int64_t elem_cnt = batch_size * hidden_size;
+    RUN_CUDA_KERNEL((GruBackwardGpu<T>), stream, elem_cnt, elem_cnt, hidden_size, grad_hy, hx,
+                    workspace, grad_input_gates, grad_hidden_gates, grad_hx);
+  }
+};
+
+OF_PP_SEQ_PRODUCT_FOR_EACH_TUPLE(INSTANTIATE_FUSED_RNN_CELL_KERNEL_UTIL, (DeviceType::kCUDA),
+                                 FLOATING_DATA_TYPE_SEQ);
+
+}  // namespace oneflow
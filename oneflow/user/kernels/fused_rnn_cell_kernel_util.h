@@ -0,0 +1,144 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_USER_KERNELS_FUSED_RNN_CELL_KERNEL_UTIL_H_
+#define ONEFLOW_USER_KERNELS_FUSED_RNN_CELL_KERNEL_UTIL_H_
+
+#include "oneflow/core/kernel/kernel_util.h"
+#include "oneflow/core/ep/include/stream.h"
+
+namespace oneflow {
+
+namespace fused_rnn_cell {
+
+template<typename T>
+OF_DEVICE_FUNC T Sigmoid(T x) {
+  return static_cast<T>(1) / (static_cast<T>(1) + exp(-x));
+}
+
+// Computes the element `j` of sample `b` of a batch of LSTM cells. Gates are ordered as
+// input, forget, cell and output gate, `workspace` keeps the activated gates.
+template<typename T>
+OF_DEVICE_FUNC void LstmCellForward(int64_t b, int64_t j, int64_t hidden_size,
+                                    const T* input_gates, const T* hidden_gates, const T* cx,
+                                    T* hy, T* cy, T* workspace) {
+  const int64_t gates_offset = b * 4 * hidden_size + j;
+  const int64_t state_offset = b * hidden_size + j;
+  const T i = Sigmoid(input_gates[gates_offset] + hidden_gates[gates_offset]);
+  const T f = Sigmoid(input_gates[gates_offset + hidden_size]
+                      + hidden_gates[gates_offset + hidden_size]);
+  const T g = tanh(input_gates[gates_offset + 2 * hidden_size]
+                   + hidden_gates[gates_offset + 2 * hidden_size]);
+  const T o = Sigmoid(input_gates[gates_offset + 3 * hidden_size]
+                      + hidden_gates[gates_offset + 3 * hidden_size]);
+  const T c = f * cx[state_offset] + i * g;
+  cy[state_offset] = c;
+  hy[state_offset] = o * tanh(c);
+  workspace[gates_offset] = i;
+  workspace[gates_offset + hidden_size] = f;
+  workspace[gates_offset + 2 * hidden_size] = g;
+  workspace[gates_offset + 3 * hidden_size] = o;
+}
+
+template<typename T>
+OF_DEVICE_FUNC void LstmCellBackward(int64_t b, int64_t j, int64_t hidden_size, const T* grad_hy,
+                                     const T* grad_cy, const T* cx, const T* cy,
+                                     const T* workspace, T* grad_gates, T* grad_cx) {
+  const int64_t gates_offset = b * 4 * hidden_size + j;
+  const int64_t state_offset = b * hidden_size + j;
+  const T i = workspace[gates_offset];
+  const T f = workspace[gates_offset + hidden_size];
+  const T g = workspace[gates_offset + 2 * hidden_size];
+  const T o = workspace[gates_offset + 3 * hidden_size];
+  const T tanh_c = tanh(cy[state_offset]);
+  const T dh = grad_hy[state_offset];
+  T dc = dh * o * (static_cast<T>(1) - tanh_c * tanh_c);
+  if (grad_cy != nullptr) { dc += grad_cy[state_offset]; }
+  grad_gates[gates_offset] = dc * g * i * (static_cast<T>(1) - i);
+  grad_gates[gates_offset + hidden_size] = dc * cx[state_offset] * f * (static_cast<T>(1) - f);
+  grad_gates[gates_offset + 2 * hidden_size] = dc * i * (static_cast<T>(1) - g * g);
+  grad_gates[gates_offset + 3 * hidden_size] = dh * tanh_c * o * (static_cast<T>(1) - o);
+  grad_cx[state_offset] = dc * f;
+}
+
+// Gates are ordered as reset, update and new gate. `workspace` keeps the activated gates and
+// the new gate part of `hidden_gates`, which is scaled by the reset gate.
+template<typename T>
+OF_DEVICE_FUNC void GruCellForward(int64_t b, int64_t j, int64_t hidden_size,
+                                   const T* input_gates, const T* hidden_gates, const T* hx,
+                                   T* hy, T* workspace) {
+  const int64_t gates_offset = b * 3 * hidden_size + j;
+  const int64_t workspace_offset = b * 4 * hidden_size + j;
+  const int64_t state_offset = b * hidden_size + j;
+  const T r = Sigmoid(input_gates[gates_offset] + hidden_gates[gates_offset]);
+  const T z = Sigmoid(input_gates[gates_offset + hidden_size]
+                      + hidden_gates[gates_offset + hidden_size]);
+  const T hn = hidden_gates[gates_offset + 2 * hidden_size];
+  const T n = tanh(input_gates[gates_offset + 2 * hidden_size] + r * hn);
+  hy[state_offset] = n + z * (hx[state_offset] - n);
+  workspace[workspace_offset] = r;
+  workspace[workspace_offset + hidden_size] = z;
+  workspace[workspace_offset + 2 * hidden_size] = n;
+  workspace[workspace_offset + 3 * hidden_size] = hn;
+}
+
+template<typename T>
+OF_DEVICE_FUNC void GruCellBackward(int64_t b, int64_t j, int64_t hidden_size, const T* grad_hy,
+                                    const T* hx, const T* workspace, T* grad_input_gates,
+                                    T* grad_hidden_gates, T* grad_hx) {
+  const int64_t gates_offset = b * 3 * hidden_size + j;
+  const int64_t workspace_offset = b * 4 * hidden_size + j;
+  const int64_t state_offset = b * hidden_size + j;
+  const T r = workspace[workspace_offset];
+  const T z = workspace[workspace_offset + hidden_size];
+  const T n = workspace[workspace_offset + 2 * hidden_size];
+  const T hn = workspace[workspace_offset + 3 * hidden_size];
+  const T dh = grad_hy[state_offset];
+  const T dn = dh * (static_cast<T>(1) - z) * (static_cast<T>(1) - n * n);
+  const T dz = dh * (hx[state_offset] - n) * z * (static_cast<T>(1) - z);
+  const T dr = dn * hn * r * (static_cast<T>(1) - r);
+  grad_input_gates[gates_offset] = dr;
+  grad_input_gates[gates_offset + hidden_size] = dz;
+  grad_input_gates[gates_offset + 2 * hidden_size] = dn;
+  grad_hidden_gates[gates_offset] = dr;
+  grad_hidden_gates[gates_offset + hidden_size] = dz;
+  grad_hidden_gates[gates_offset + 2 * hidden_size] = dn * r;
+  grad_hx[state_offset] = dh * z;
+}
+
+}  // namespace fused_rnn_cell
+
+template<DeviceType device_type, typename T>
+struct FusedRnnCellKernelUtil {
+  static void LstmForward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                          const T* input_gates, const T* hidden_gates, const T* cx, T* hy, T* cy,
+                          T* workspace);
+  static void LstmBackward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                           const T* grad_hy, const T* grad_cy, const T* cx, const T* cy,
+                           const T* workspace, T* grad_gates, T* grad_cx);
+  static void GruForward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                         const T* input_gates, const T* hidden_gates, const T* hx, T* hy,
+                         T* workspace);
+  static void GruBackward(ep::Stream* stream, int64_t batch_size, int64_t hidden_size,
+                          const T* grad_hy, const T* hx, const T* workspace, T* grad_input_gates,
+                          T* grad_hidden_gates, T* grad_hx);
+};
+
+#define INSTANTIATE_FUSED_RNN_CELL_KERNEL_UTIL(device_type, dtype_pair) \
+  template struct FusedRnnCellKernelUtil<device_type, OF_PP_PAIR_FIRST(dtype_pair)>;
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_USER_KERNELS_FUSED_RNN_CELL_KERNEL_UTIL_H_
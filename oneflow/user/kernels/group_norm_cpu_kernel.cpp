@@ -0,0 +1,253 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/framework.h"
+#include "oneflow/user/kernels/normalization_cpu_util.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
+
+namespace oneflow {
+
+namespace {
+
+struct GroupNormShape {
+  int64_t batch_size;
+  int64_t num_channels;
+  int64_t num_groups;
+  int64_t spatial_size;
+  int64_t channels_per_group;
+  int64_t group_size;
+};
+
+GroupNormShape GetGroupNormShape(const ShapeView& x_shape, int32_t num_groups) {
+  GroupNormShape shape;
+  shape.batch_size = x_shape.At(0);
+  shape.num_channels = x_shape.At(1);
+  shape.num_groups = num_groups;
+  shape.spatial_size = x_shape.Count(2);
+  shape.channels_per_group = shape.num_channels / num_groups;
+  shape.group_size = shape.channels_per_group * shape.spatial_size;
+  return shape;
+}
+
+}  // namespace
+
+template<typename T>
+class GroupNormCpuKernel final : public user_op::OpKernel {
+ public:
+  GroupNormCpuKernel() = default;
+  ~GroupNormCpuKernel() = default;
+
+ private:
+  using user_op::OpKernel::Compute;
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* x = ctx->Tensor4ArgNameAndIndex("x", 0);
+    user_op::Tensor* y = ctx->Tensor4ArgNameAndIndex("y", 0);
+    user_op::Tensor* mean = ctx->Tensor4ArgNameAndIndex("mean", 0);
+    user_op::Tensor* inv_variance = ctx->Tensor4ArgNameAndIndex("inv_variance", 0);
+    const double epsilon = ctx->Attr<double>("epsilon");
+    const GroupNormShape shape = GetGroupNormShape(x->shape(), ctx->Attr<int32_t>("num_groups"));
+    const T* gamma_ptr =
+        ctx->has_input("gamma", 0) ? ctx->Tensor4ArgNameAndIndex("gamma", 0)->dptr<T>() : nullptr;
+    const T* beta_ptr =
+        ctx->has_input("beta", 0) ? ctx->Tensor4ArgNameAndIndex("beta", 0)->dptr<T>() : nullptr;
+    const T* x_ptr = x->dptr<T>();
+    T* y_ptr = y->mut_dptr<T>();
+    T* mean_ptr = mean->mut_dptr<T>();
+    T* inv_variance_ptr = inv_variance->mut_dptr<T>();
+    const int64_t num_instances = shape.batch_size * shape.num_groups;
+    const int64_t grain_size =
+        std::max<int64_t>(kParallelForDefaultGrain / std::max<int64_t>(shape.group_size, 1), 1);
+    ParallelFor(
+        0, num_instances,
+        [&](int64_t begin, int64_t end) {
+          for (int64_t i = begin; i < end; ++i) {
+            const int64_t offset = i * shape.group_size;
+            T group_mean = 0;
+            T group_inv_variance = 0;
+            normalization_cpu::WelfordMeanInvVariance(x_ptr + offset, shape.group_size, epsilon,
+                                                      &group_mean, &group_inv_variance);
+            mean_ptr[i] = group_mean;
+            inv_variance_ptr[i] = group_inv_variance;
+            const int64_t first_channel = (i % shape.num_groups) * shape.channels_per_group;
+            for (int64_t c = 0; c < shape.channels_per_group; ++c) {
+              // The per-channel affine transform is folded into one scale and shift.
+              T scale = group_inv_variance;
+              T shift = -group_mean * group_inv_variance;
+              if (gamma_ptr != nullptr) {
+                scale *= gamma_ptr[first_channel + c];
+                shift *= gamma_ptr[first_channel + c];
+              }
+              if (beta_ptr != nullptr) { shift += beta_ptr[first_channel + c]; }
+              const int64_t channel_offset = offset + c * shape.spatial_size;
+              for (int64_t s = 0; s < shape.spatial_size; ++s) {
+                y_ptr[channel_offset + s] = x_ptr[channel_offset + s] * scale + shift;
+              }
+            }
+          }
+        },
+        grain_size);
+  };
+};
+
+#define REGISTER_GROUP_NORM_CPU_KERNEL(dtype)                         \
+  REGISTER_USER_KERNEL("group_norm")                                  \
+      .SetCreateFn<GroupNormCpuKernel<dtype>>()                       \
+      .SetIsMatchedHob((user_op::HobDeviceType() == DeviceType::kCPU) \
+                       && (user_op::HobDataType("x", 0) == GetDataType<dtype>::value));
+
+REGISTER_GROUP_NORM_CPU_KERNEL(float)
+REGISTER_GROUP_NORM_CPU_KERNEL(double)
+
+template<typename T>
+class GroupNormGradCpuKernel final : public user_op::OpKernel {
+ public:
+  GroupNormGradCpuKernel() = default;
+  ~GroupNormGradCpuKernel() = default;
+
+ private:
+  using user_op::OpKernel::Compute;
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* dy = ctx->Tensor4ArgNameAndIndex("dy", 0);
+    const user_op::Tensor* x = ctx->Tensor4ArgNameAndIndex("x", 0);
+    const user_op::Tensor* mean = ctx->Tensor4ArgNameAndIndex("mean", 0);
+    const user_op::Tensor* inv_variance = ctx->Tensor4ArgNameAndIndex("inv_variance", 0);
+    user_op::Tensor* dx = ctx->Tensor4ArgNameAndIndex("dx", 0);
+    const GroupNormShape shape = GetGroupNormShape(x->shape(), ctx->Attr<int32_t>("num_groups"));
+    const T* gamma_ptr =
+        ctx->has_input("gamma", 0) ? ctx->Tensor4ArgNameAndIndex("gamma", 0)->dptr<T>() : nullptr;
+    const T* dy_ptr = dy->dptr<T>();
+    const T* x_ptr = x->dptr<T>();
+    const T* mean_ptr = mean->dptr<T>();
+    const T* inv_variance_ptr = inv_variance->dptr<T>();
+    T* dx_ptr = dx->mut_dptr<T>();
+    const int64_t num_instances = shape.batch_size * shape.num_groups;
+    const int64_t grain_size =
+        std::max<int64_t>(kParallelForDefaultGrain / std::max<int64_t>(shape.group_size, 1), 1);
+    ParallelFor(
+        0, num_instances,
+        [&](int64_t begin, int64_t end) {
+          for (int64_t i = begin; i < end; ++i) {
+            const int64_t offset = i * shape.group_size;
+            const int64_t first_channel = (i % shape.num_groups) * shape.channels_per_group;
+            const T group_mean = mean_ptr[i];
+            const T group_inv_variance = inv_variance_ptr[i];
+            T sum_dy = 0;
+            T sum_dy_normalized = 0;
+            for (int64_t c = 0; c < shape.channels_per_group; ++c) {
+              const T gamma =
+                  gamma_ptr != nullptr ? gamma_ptr[first_channel + c] : static_cast<T>(1);
+              const int64_t channel_offset = offset + c * shape.spatial_size;
+              for (int64_t s = 0; s < shape.spatial_size; ++s) {
+                const T normalized_dy = dy_ptr[channel_offset + s] * gamma;
+                sum_dy += normalized_dy;
+                sum_dy_normalized +=
+                    normalized_dy * (x_ptr[channel_offset + s] - group_mean) * group_inv_variance;
+              }
+            }
+            const T mean_dy = sum_dy / shape.group_size;
+            const T mean_dy_normalized = sum_dy_normalized / shape.group_size;
+            for (int64_t c = 0; c < shape.channels_per_group; ++c) {
+              const T gamma =
+                  gamma_ptr != nullptr ? gamma_ptr[first_channel + c] : static_cast<T>(1);
+              const int64_t channel_offset = offset + c * shape.spatial_size;
+              for (int64_t s = 0; s < shape.spatial_size; ++s) {
+                const T normalized = (x_ptr[channel_offset + s] - group_mean) * group_inv_variance;
+                dx_ptr[channel_offset + s] = group_inv_variance
+                                             * (dy_ptr[channel_offset + s] * gamma - mean_dy
+                                                - normalized * mean_dy_normalized);
+              }
+            }
+          }
+        },
+        grain_size);
+  };
+};
+
+#define REGISTER_GROUP_NORM_GRAD_CPU_KERNEL(dtype)                    \
+  REGISTER_USER_KERNEL("group_norm_grad")                             \
+      .SetCreateFn<GroupNormGradCpuKernel<dtype>>()                   \
+      .SetIsMatchedHob((user_op::HobDeviceType() == DeviceType::kCPU) \
+                       && (user_op::HobDataType("dy", 0) == GetDataType<dtype>::value));
+
+REGISTER_GROUP_NORM_GRAD_CPU_KERNEL(float)
+REGISTER_GROUP_NORM_GRAD_CPU_KERNEL(double)
+
+template<typename T>
+class GroupNormParamGradCpuKernel final : public user_op::OpKernel {
+ public:
+  GroupNormParamGradCpuKernel() = default;
+  ~GroupNormParamGradCpuKernel() = default;
+
+ private:
+  using user_op::OpKernel::Compute;
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* dy = ctx->Tensor4ArgNameAndIndex("dy", 0);
+    const user_op::Tensor* x = ctx->Tensor4ArgNameAndIndex("x", 0);
+    const user_op::Tensor* mean = ctx->Tensor4ArgNameAndIndex("mean", 0);
+    const user_op::Tensor* inv_variance = ctx->Tensor4ArgNameAndIndex("inv_variance", 0);
+    user_op::Tensor* gamma_diff = ctx->Tensor4ArgNameAndIndex("gamma_diff", 0);
+    user_op::Tensor* beta_diff = ctx->Tensor4ArgNameAndIndex("beta_diff", 0);
+    const GroupNormShape shape = GetGroupNormShape(x->shape(), ctx->Attr<int32_t>("num_groups"));
+    const T* dy_ptr = dy->dptr<T>();
+    const T* x_ptr = x->dptr<T>();
+    const T* mean_ptr = mean->dptr<T>();
+    const T* inv_variance_ptr = inv_variance->dptr<T>();
+    T* gamma_diff_ptr = gamma_diff->mut_dptr<T>();
+    T* beta_diff_ptr = beta_diff->mut_dptr<T>();
+    std::fill(gamma_diff_ptr, gamma_diff_ptr + shape.num_channels, static_cast<T>(0));
+    std::fill(beta_diff_ptr, beta_diff_ptr + shape.num_channels, static_cast<T>(0));
+    // Each thread owns a slice of the channels, so the reductions over the batch need no
+    // synchronization.
+    const int64_t grain_size = std::max<int64_t>(
+        kParallelForDefaultGrain / std::max<int64_t>(shape.batch_size * shape.spatial_size, 1), 1);
+    ParallelFor(
+        0, shape.num_channels,
+        [&](int64_t begin, int64_t end) {
+          for (int64_t n = 0; n < shape.batch_size; ++n) {
+            for (int64_t channel = begin; channel < end; ++channel) {
+              const int64_t instance = n * shape.num_groups + channel / shape.channels_per_group;
+              const T group_mean = mean_ptr[instance];
+              const T group_inv_variance = inv_variance_ptr[instance];
+              const int64_t channel_offset =
+                  (n * shape.num_channels + channel) * shape.spatial_size;
+              T sum_dy = 0;
+              T sum_dy_normalized = 0;
+              for (int64_t s = 0; s < shape.spatial_size; ++s) {
+                const T dy_val = dy_ptr[channel_offset + s];
+                sum_dy += dy_val;
+                sum_dy_normalized += dy_val * (x_ptr[channel_offset + s] - group_mean);
+              }
+              gamma_diff_ptr[channel] += sum_dy_normalized * group_inv_variance;
+              beta_diff_ptr[channel] += sum_dy;
+            }
+          }
+        },
+        grain_size);
+  };
+};
+
+#define REGISTER_GROUP_NORM_PARAM_GRAD_CPU_KERNEL(dtype)              \
+  REGISTER_USER_KERNEL("group_norm_param_grad")                       \
+      .SetCreateFn<GroupNormParamGradCpuKernel<dtype>>()              \
+      .SetIsMatchedHob((user_op::HobDeviceType() == DeviceType::kCPU) \
+                       && (user_op::HobDataType("dy", 0) == GetDataType<dtype>::value));
+
+REGISTER_GROUP_NORM_PARAM_GRAD_CPU_KERNEL(float)
+REGISTER_GROUP_NORM_PARAM_GRAD_CPU_KERNEL(double)
+
+}  // namespace oneflow
@@ -14,6 +14,8 @@ See the License for the specific language governing permissions and
 limitations under the License.
 */
 #include "oneflow/core/framework/framework.h"
+#include "oneflow/user/kernels/normalization_cpu_util.h"
+#include "oneflow/core/thread/intra_op_parallel.h"
 
 namespace oneflow {
 
@@ -24,8 +26,61 @@ class LayerNormCpuKernel final : public user_op::OpKernel {
   ~LayerNormCpuKernel() = default;
 
  private:
+  using user_op::OpKernel::Compute;
   bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
-  void Compute(user_op::KernelComputeContext* ctx) const override { TODO(); };
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* x = ctx->Tensor4ArgNameAndIndex("x", 0);
+    user_op::Tensor* y = ctx->Tensor4ArgNameAndIndex("y", 0);
+    user_op::Tensor* mean = ctx->Tensor4ArgNameAndIndex("mean", 0);
+    user_op::Tensor* inv_variance = ctx->Tensor4ArgNameAndIndex("inv_variance", 0);
+    const double epsilon = ctx->Attr<double>("epsilon");
+    const int64_t num_instances = mean->shape().elem_cnt();
+    if (num_instances == 0) { return; }
+    const int64_t norm_size = x->shape().elem_cnt() / num_instances;
+    const T* gamma_ptr = nullptr;
+    const T* beta_ptr = nullptr;
+    T* normalized_ptr = nullptr;
+    if (ctx->has_input("gamma", 0)) {
+      const user_op::Tensor* gamma = ctx->Tensor4ArgNameAndIndex("gamma", 0);
+      CHECK_EQ(gamma->shape().elem_cnt(), norm_size);
+      gamma_ptr = gamma->dptr<T>();
+      normalized_ptr = ctx->Tensor4ArgNameAndIndex("normalized", 0)->mut_dptr<T>();
+    }
+    if (ctx->has_input("beta", 0)) {
+      const user_op::Tensor* beta = ctx->Tensor4ArgNameAndIndex("beta", 0);
+      CHECK_EQ(beta->shape().elem_cnt(), norm_size);
+      beta_ptr = beta->dptr<T>();
+    }
+    const T* x_ptr = x->dptr<T>();
+    T* y_ptr = y->mut_dptr<T>();
+    T* mean_ptr = mean->mut_dptr<T>();
+    T* inv_variance_ptr = inv_variance->mut_dptr<T>();
+    const int64_t grain_size =
+        std::max<int64_t>(kParallelForDefaultGrain / std::max<int64_t>(norm_size, 1), 1);
+    ParallelFor(
+        0, num_instances,
+        [&](int64_t begin, int64_t end) {
+          for (int64_t i = begin; i < end; ++i) {
+            const int64_t offset = i * norm_size;
+            T row_mean = 0;
+            T row_inv_variance = 0;
+            normalization_cpu::WelfordMeanInvVariance(x_ptr + offset, norm_size, epsilon, &row_mean,
+                                                      &row_inv_variance);
+            mean_ptr[i] = row_mean;
+            inv_variance_ptr[i] = row_inv_variance;
+            for (int64_t j = 0; j < norm_size; ++j) {
+              T val = (x_ptr[offset + j] - row_mean) * row_inv_variance;
+              if (gamma_ptr != nullptr) {
+                normalized_ptr[offset + j] = val;
+                val *= gamma_ptr[j];
+              }
+              if (beta_ptr != nullptr) { val += beta_ptr[j]; }
+              y_ptr[offset + j] = val;
+            }
+          }
+        },
+        grain_size);
+  };
 };
 
 #define REGISTER_LAYER_NORM_CPU_KERNEL(dtype)                         \
@@ -44,15 +99,72 @@ class LayerNormGradCpuKernel final : public user_op::OpKernel {
   ~LayerNormGradCpuKernel() = default;
 
  private:
+  using user_op::OpKernel::Compute;
   bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
-  void Compute(user_op::KernelComputeContext* ctx) const override { TODO(); };
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* dy = ctx->Tensor4ArgNameAndIndex("dy", 0);
+    const user_op::Tensor* x = ctx->Tensor4ArgNameAndIndex("x", 0);
+    const user_op::Tensor* mean = ctx->Tensor4ArgNameAndIndex("mean", 0);
+    const user_op::Tensor* inv_variance = ctx->Tensor4ArgNameAndIndex("inv_variance", 0);
+    user_op::Tensor* dx = ctx->Tensor4ArgNameAndIndex("dx", 0);
+    const int64_t num_instances = mean->shape().elem_cnt();
+    if (num_instances == 0) { return; }
+    const int64_t norm_size = x->shape().elem_cnt() / num_instances;
+    const T* add_to_output_ptr = nullptr;
+    if (ctx->has_input("_add_to_output", 0)) {
+      const user_op::Tensor* add_to_output = ctx->Tensor4ArgNameAndIndex("_add_to_output", 0);
+      CHECK_EQ(add_to_output->shape(), dx->shape());
+      add_to_output_ptr = add_to_output->dptr<T>();
+    }
+    const T* dy_ptr = dy->dptr<T>();
+    const T* x_ptr = x->dptr<T>();
+    const T* mean_ptr = mean->dptr<T>();
+    const T* inv_variance_ptr = inv_variance->dptr<T>();
+    T* dx_ptr = dx->mut_dptr<T>();
+    const int64_t grain_size =
+        std::max<int64_t>(kParallelForDefaultGrain / std::max<int64_t>(norm_size, 1), 1);
+    ParallelFor(
+        0, num_instances,
+        [&](int64_t begin, int64_t end) {
+          for (int64_t i = begin; i < end; ++i) {
+            const int64_t offset = i * norm_size;
+            const T row_mean = mean_ptr[i];
+            const T row_inv_variance = inv_variance_ptr[i];
+            T sum_dy = 0;
+            T sum_dy_normalized = 0;
+            for (int64_t j = 0; j < norm_size; ++j) {
+              const T normalized = (x_ptr[offset + j] - row_mean) * row_inv_variance;
+              sum_dy += dy_ptr[offset + j];
+              sum_dy_normalized += dy_ptr[offset + j] * normalized;
+            }
+            const T mean_dy = sum_dy / norm_size;
+            const T mean_dy_normalized = sum_dy_normalized / norm_size;
+            for (int64_t j = 0; j < norm_size; ++j) {
+              const T normalized = (x_ptr[offset + j] - row_mean) * row_inv_variance;
+              T val = row_inv_variance
+                      * (dy_ptr[offset + j] - mean_dy - normalized * mean_dy_normalized);
+              if (add_to_output_ptr != nullptr) { val += add_to_output_ptr[offset + j]; }
+              dx_ptr[offset + j] = val;
+            }
+          }
+        },
+        grain_size);
+  };
 };
 
-#define REGISTER_LAYER_NORM_GRAD_CPU_KERNEL(dtype)                    \
-  REGISTER_USER_KERNEL("layer_norm_grad")                             \
-      .SetCreateFn<LayerNormGradCpuKernel<dtype>>()                   \
-      .SetIsMatchedHob((user_op::HobDeviceType() == DeviceType::kCPU) \
-                       && (user_op::HobDataType("dy", 0) == GetDataType<dtype>::value));
+#define REGISTER_LAYER_NORM_GRAD_CPU_KERNEL(dtype)                                           \
+  REGISTER_USER_KERNEL("layer_norm_grad")                                                    \
+      .SetCreateFn<LayerNormGradCpuKernel<dtype>>()                                          \
+      .SetIsMatchedHob((user_op::HobDeviceType() == DeviceType::kCPU)                        \
+                       && (user_op::HobDataType("dy", 0) == GetDataType<dtype>::value))      \
+      .SetInplaceProposalFn(                                                                 \
+          [](const user_op::InferContext& ctx,                                               \
+             const user_op::AddInplaceArgPair& AddInplaceArgPairFn) -> Maybe<void> {         \
+            if (ctx.has_input("_add_to_output", 0)) {                                        \
+              OF_RETURN_IF_ERROR(AddInplaceArgPairFn("dx", 0, "_add_to_output", 0, true));   \
+            }                                                                                \
+            return Maybe<void>::Ok();                                                        \
+          });
 
 REGISTER_LAYER_NORM_GRAD_CPU_KERNEL(float)
 REGISTER_LAYER_NORM_GRAD_CPU_KERNEL(double)
@@ -64,8 +176,63 @@ class LayerNormParamGradCpuKernel final : public user_op::OpKernel {
   ~LayerNormParamGradCpuKernel() = default;
 
  private:
+  using user_op::OpKernel::Compute;
   bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
-  void Compute(user_op::KernelComputeContext* ctx) const override { TODO(); };
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const user_op::Tensor* dy = ctx->Tensor4ArgNameAndIndex("dy", 0);
+    user_op::Tensor* beta_diff = ctx->Tensor4ArgNameAndIndex("beta_diff", 0);
+    user_op::Tensor* gamma_diff = ctx->Tensor4ArgNameAndIndex("gamma_diff", 0);
+    user_op::Tensor* normalized_diff = ctx->Tensor4ArgNameAndIndex("normalized_diff", 0);
+    const user_op::Tensor* gamma = ctx->Tensor4ArgNameAndIndex("gamma", 0);
+    const int64_t begin_params_axis = ctx->Attr<int64_t>("begin_params_axis");
+    const int64_t m = dy->shape().Count(begin_params_axis);
+    if (m == 0) { return; }
+    const int64_t n = dy->shape().elem_cnt() / m;
+    const T* dy_ptr = dy->dptr<T>();
+    const T* gamma_ptr = gamma != nullptr ? gamma->dptr<T>() : nullptr;
+    const T* normalized_ptr = nullptr;
+    T* beta_diff_ptr = nullptr;
+    T* gamma_diff_ptr = nullptr;
+    T* normalized_diff_ptr = nullptr;
+    if (beta_diff != nullptr) {
+      CHECK_EQ(beta_diff->shape().elem_cnt(), m);
+      beta_diff_ptr = beta_diff->mut_dptr<T>();
+      std::fill(beta_diff_ptr, beta_diff_ptr + m, static_cast<T>(0));
+    }
+    if (gamma_diff != nullptr) {
+      CHECK_EQ(gamma_diff->shape().elem_cnt(), m);
+      normalized_ptr = ctx->Tensor4ArgNameAndIndex("normalized", 0)->dptr<T>();
+      gamma_diff_ptr = gamma_diff->mut_dptr<T>();
+      std::fill(gamma_diff_ptr, gamma_diff_ptr + m, static_cast<T>(0));
+    }
+    if (normalized_diff != nullptr) {
+      if (gamma_ptr != nullptr) { CHECK_EQ(gamma->shape().elem_cnt(), m); }
+      normalized_diff_ptr = normalized_diff->mut_dptr<T>();
+    }
+    // One sweep over dy produces every requested output. Each thread owns a slice of the
+    // parameters, so the reductions over instances need no synchronization.
+    const int64_t grain_size =
+        std::max<int64_t>(kParallelForDefaultGrain / std::max<int64_t>(n, 1), 1);
+    ParallelFor(
+        0, m,
+        [&](int64_t begin, int64_t end) {
+          for (int64_t i = 0; i < n; ++i) {
+            const int64_t offset = i * m;
+            for (int64_t j = begin; j < end; ++j) {
+              const T dy_val = dy_ptr[offset + j];
+              if (beta_diff_ptr != nullptr) { beta_diff_ptr[j] += dy_val; }
+              if (gamma_diff_ptr != nullptr) {
+                gamma_diff_ptr[j] += dy_val * normalized_ptr[offset + j];
+              }
+              if (normalized_diff_ptr != nullptr) {
+                normalized_diff_ptr[offset + j] =
+                    gamma_ptr != nullptr ? dy_val * gamma_ptr[j] : dy_val;
+              }
+            }
+          }
+        },
+        grain_size);
+  };
 };
 
 #define REGISTER_LAYER_NORM_PARAM_GRAD_CPU_KERNEL(dtype)              \
@@ -388,7 +388,10 @@ class AdamUpdateKernel final : public user_op::OpKernel, public user_op::CudaGra
     user_op::Tensor* model = ctx->Tensor4ArgNameAndIndex("model", 0);
     user_op::Tensor* m = ctx->Tensor4ArgNameAndIndex("m", 0);
     user_op::Tensor* v = ctx->Tensor4ArgNameAndIndex("v", 0);
-    user_op::Tensor* max_v = ctx->Tensor4ArgNameAndIndex("max_v", 0);
+    T* max_v_ptr = nullptr;
+    if (ctx->has_input("max_v", 0)) {
+      max_v_ptr = ctx->Tensor4ArgNameAndIndex("max_v", 0)->mut_dptr<T>();
+    }
 
     const auto scale = ctx->Attr<double>("scale");
     const auto l1 = ctx->Attr<float>("l1");
@@ -443,7 +446,7 @@ class AdamUpdateKernel final : public user_op::OpKernel, public user_op::CudaGra
         epsilon, weight_decay, amsgrad, do_bias_correction, learning_rate_val, bias_correction1_val,
         bias_correction2_val, learning_rate_ptr, scale_by_ptr, skip_if_ptr, bias_correction1_ptr,
         bias_correction2_ptr, model_diff->dptr<G>(), model->mut_dptr<T>(), m->mut_dptr<T>(),
-        v->mut_dptr<T>(), max_v->mut_dptr<T>());
+        v->mut_dptr<T>(), max_v_ptr);
   }
   bool AlwaysComputeWhenAllOutputsEmpty() const override { return true; }
 };
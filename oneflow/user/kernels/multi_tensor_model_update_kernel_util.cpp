@@ -0,0 +1,110 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/user/kernels/multi_tensor_model_update_kernel_util.h"
+
+namespace oneflow {
+
+// On cpu there is no launch to save, the tensors are updated one by one by the single tensor
+// update kernel utils.
+
+template<typename T, typename G>
+struct MultiTensorSGDUpdateKernelUtil<DeviceType::kCPU, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 1>& params, T scale,
+                     float l1, float l2, float weight_decay, float learning_rate_val,
+                     const float* learning_rate) {
+    FOR_RANGE(int32_t, i, 0, params.num_tensors) {
+      SGDUpdateKernelUtil<DeviceType::kCPU, T, G>::Update(
+          stream, params.elem_cnt[i], scale, l1, l2, weight_decay, learning_rate_val,
+          learning_rate, nullptr, nullptr, params.model_diff[i], params.model[i]);
+    }
+  }
+};
+
+template struct MultiTensorSGDUpdateKernelUtil<DeviceType::kCPU, float, float>;
+template struct MultiTensorSGDUpdateKernelUtil<DeviceType::kCPU, double, double>;
+
+template<typename T, typename G>
+struct MultiTensorMomentumUpdateKernelUtil<DeviceType::kCPU, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 1>& params, T scale,
+                     float l1, float l2, float beta, float weight_decay, float learning_rate_val,
+                     const float* learning_rate) {
+    FOR_RANGE(int32_t, i, 0, params.num_tensors) {
+      MomentumUpdateKernelUtil<DeviceType::kCPU, T, G>::Update(
+          stream, params.elem_cnt[i], scale, l1, l2, beta, weight_decay, learning_rate_val,
+          learning_rate, nullptr, nullptr, params.model_diff[i], params.model[i],
+          params.state[0][i]);
+    }
+  }
+};
+
+template struct MultiTensorMomentumUpdateKernelUtil<DeviceType::kCPU, float, float>;
+template struct MultiTensorMomentumUpdateKernelUtil<DeviceType::kCPU, double, double>;
+
+template<typename T, typename G>
+struct MultiTensorAdamUpdateKernelUtil<DeviceType::kCPU, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 3>& params, T scale,
+                     float l1, float l2, float beta1, float beta2, float epsilon,
+                     float weight_decay, bool amsgrad, bool do_bias_correction,
+                     float learning_rate_val, float bias_correction1_val,
+                     float bias_correction2_val, const float* learning_rate) {
+    FOR_RANGE(int32_t, i, 0, params.num_tensors) {
+      AdamUpdateKernelUtil<DeviceType::kCPU, T, G>::Update(
+          stream, params.elem_cnt[i], scale, l1, l2, beta1, beta2, epsilon, weight_decay, amsgrad,
+          do_bias_correction, learning_rate_val, bias_correction1_val, bias_correction2_val,
+          learning_rate, nullptr, nullptr, nullptr, nullptr, params.model_diff[i],
+          params.model[i], params.state[0][i], params.state[1][i], params.state[2][i]);
+    }
+  }
+};
+
+template struct MultiTensorAdamUpdateKernelUtil<DeviceType::kCPU, float, float>;
+template struct MultiTensorAdamUpdateKernelUtil<DeviceType::kCPU, double, double>;
+
+template<typename T, typename G>
+struct MultiTensorAdagradUpdateKernelUtil<DeviceType::kCPU, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 1>& params, T scale,
+                     float l1, float l2, float lr_decay, float epsilon, float weight_decay,
+                     float learning_rate_val, int64_t train_step, const float* learning_rate) {
+    FOR_RANGE(int32_t, i, 0, params.num_tensors) {
+      AdagradUpdateKernelUtil<DeviceType::kCPU, T, G>::Update(
+          stream, params.elem_cnt[i], scale, l1, l2, lr_decay, epsilon, weight_decay,
+          learning_rate_val, train_step, learning_rate, nullptr, nullptr, nullptr,
+          params.model_diff[i], params.model[i], params.state[0][i]);
+    }
+  }
+};
+
+template struct MultiTensorAdagradUpdateKernelUtil<DeviceType::kCPU, float, float>;
+template struct MultiTensorAdagradUpdateKernelUtil<DeviceType::kCPU, double, double>;
+
+template<typename T, typename G>
+struct MultiTensorRmsPropUpdateKernelUtil<DeviceType::kCPU, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 2>& params, T scale,
+                     float l1, float l2, bool centered, float epsilon, float weight_decay,
+                     float decay_rate, float learning_rate_val, const float* learning_rate) {
+    FOR_RANGE(int32_t, i, 0, params.num_tensors) {
+      RmsPropUpdateKernelUtil<DeviceType::kCPU, T, G>::Update(
+          stream, params.elem_cnt[i], scale, l1, l2, centered, epsilon, weight_decay, decay_rate,
+          learning_rate_val, learning_rate, nullptr, nullptr, params.model_diff[i],
+          params.model[i], params.state[0][i], params.state[1][i]);
+    }
+  }
+};
+
+template struct MultiTensorRmsPropUpdateKernelUtil<DeviceType::kCPU, float, float>;
+template struct MultiTensorRmsPropUpdateKernelUtil<DeviceType::kCPU, double, double>;
+
+}  // namespace oneflow
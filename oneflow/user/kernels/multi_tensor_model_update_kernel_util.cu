@@ -0,0 +1,280 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/framework.h"
+#include "oneflow/user/kernels/multi_tensor_model_update_kernel_util.h"
+#include "oneflow/core/ep/cuda/cuda_stream.h"
+
+namespace oneflow {
+
+namespace {
+
+static_assert(sizeof(MultiTensorUpdateParams<double, double, 3>) <= 4000,
+              "the params of the multi tensor update kernels exceed the CUDA parameter limit");
+
+// Every block walks all the tensors of the launch with a grid-stride loop, so the grid is sized
+// by the largest tensor instead of the sum of all of them.
+int32_t GetMultiTensorUpdateNumBlocks(int64_t max_elem_cnt) {
+  return static_cast<int32_t>(std::min<int64_t>(
+      (max_elem_cnt + kCudaThreadsNumPerBlock - 1) / kCudaThreadsNumPerBlock, kCudaMaxBlocksNum));
+}
+
+template<typename T, typename G>
+__global__ void MultiTensorSGDUpdateGpu(MultiTensorUpdateParams<T, G, 1> params, T scale,
+                                        float l1, float l2, float weight_decay,
+                                        float learning_rate_val, const float* learning_rate) {
+  if (learning_rate != nullptr) { learning_rate_val = *learning_rate; }
+  for (int32_t t = 0; t < params.num_tensors; ++t) {
+    const G* model_diff = params.model_diff[t];
+    T* model = params.model[t];
+    CUDA_1D_KERNEL_LOOP_T(int64_t, i, params.elem_cnt[t]) {
+      SGDUpdateFunctor<T, G>()(model_diff + i, model + i, scale, l1, l2, weight_decay,
+                               learning_rate_val);
+    }
+  }
+}
+
+template<typename T, typename G>
+__global__ void MultiTensorMomentumUpdateGpu(MultiTensorUpdateParams<T, G, 1> params, T scale,
+                                             float l1, float l2, float beta, float weight_decay,
+                                             float learning_rate_val, const float* learning_rate) {
+  if (learning_rate != nullptr) { learning_rate_val = *learning_rate; }
+  for (int32_t t = 0; t < params.num_tensors; ++t) {
+    const G* model_diff = params.model_diff[t];
+    T* model = params.model[t];
+    T* momentum = params.state[0][t];
+    CUDA_1D_KERNEL_LOOP_T(int64_t, i, params.elem_cnt[t]) {
+      MomentumUpdateFunctor<T, G>()(model_diff + i, model + i, momentum + i, scale, l1, l2, beta,
+                                    weight_decay, learning_rate_val);
+    }
+  }
+}
+
+template<typename T, typename G>
+__global__ void MultiTensorAdamUpdateGpu(MultiTensorUpdateParams<T, G, 3> params, T scale,
+                                         float l1, float l2, float beta1, float beta2,
+                                         float epsilon, float weight_decay, bool amsgrad,
+                                         float learning_rate_val, float bias_correction1_val,
+                                         float bias_correction2_val, const float* learning_rate) {
+  if (learning_rate != nullptr) { learning_rate_val = *learning_rate; }
+  for (int32_t t = 0; t < params.num_tensors; ++t) {
+    const G* model_diff = params.model_diff[t];
+    T* model = params.model[t];
+    T* m = params.state[0][t];
+    T* v = params.state[1][t];
+    T* max_v = params.state[2][t];
+    CUDA_1D_KERNEL_LOOP_T(int64_t, i, params.elem_cnt[t]) {
+      AdamUpdateFunctor<T, G>()(model_diff + i, model + i, m + i, v + i,
+                                (amsgrad ? max_v + i : nullptr), scale, l1, l2, beta1, beta2,
+                                epsilon, weight_decay, amsgrad, bias_correction1_val,
+                                bias_correction2_val, learning_rate_val);
+    }
+  }
+}
+
+template<typename T, typename G>
+__global__ void MultiTensorAdagradUpdateGpu(MultiTensorUpdateParams<T, G, 1> params, T scale,
+                                            float l1, float l2, float lr_decay, float epsilon,
+                                            float weight_decay, float learning_rate_val,
+                                            int64_t train_step, const float* learning_rate) {
+  if (learning_rate != nullptr) { learning_rate_val = *learning_rate; }
+  learning_rate_val = learning_rate_val / (1 + (train_step - 1) * lr_decay);
+  for (int32_t t = 0; t < params.num_tensors; ++t) {
+    const G* model_diff = params.model_diff[t];
+    T* model = params.model[t];
+    T* sum = params.state[0][t];
+    CUDA_1D_KERNEL_LOOP_T(int64_t, i, params.elem_cnt[t]) {
+      AdagradUpdateFunctor<T, G>()(model_diff + i, model + i, sum + i, scale, l1, l2, epsilon,
+                                   weight_decay, learning_rate_val);
+    }
+  }
+}
+
+template<typename T, typename G, bool centered>
+__global__ void MultiTensorRmsPropUpdateGpu(MultiTensorUpdateParams<T, G, 2> params, T scale,
+                                            float l1, float l2, float epsilon, float weight_decay,
+                                            float decay_rate, float learning_rate_val,
+                                            const float* learning_rate) {
+  if (learning_rate != nullptr) { learning_rate_val = *learning_rate; }
+  for (int32_t t = 0; t < params.num_tensors; ++t) {
+    const int64_t n = params.elem_cnt[t];
+    const G* model_diff = params.model_diff[t];
+    T* model = params.model[t];
+    T* mean_square = params.state[0][t];
+    T* mean_gradient = params.state[1][t];
+    CUDA_1D_KERNEL_LOOP_T(int64_t, i, n) {
+      RmsPropUpdateFunctor<T, G, centered>()(model_diff + i, model + i, n, scale, l1, l2,
+                                             mean_square + i,
+                                             (centered ? mean_gradient + i : nullptr), epsilon,
+                                             weight_decay, decay_rate, learning_rate_val);
+    }
+  }
+}
+
+// float16 and half share the same layout, the float16 kernel utils forward to the half ones like
+// the single tensor update kernel utils do.
+template<typename T, int32_t num_states>
+const MultiTensorUpdateParams<T, half, num_states>& ToHalfParams(
+    const MultiTensorUpdateParams<T, float16, num_states>& params) {
+  return reinterpret_cast<const MultiTensorUpdateParams<T, half, num_states>&>(params);
+}
+
+}  // namespace
+
+template<typename T, typename G>
+struct MultiTensorSGDUpdateKernelUtil<DeviceType::kCUDA, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 1>& params, T scale,
+                     float l1, float l2, float weight_decay, float learning_rate_val,
+                     const float* learning_rate) {
+    if (params.max_elem_cnt == 0) { return; }
+    MultiTensorSGDUpdateGpu<T, G><<<GetMultiTensorUpdateNumBlocks(params.max_elem_cnt),
+                                    kCudaThreadsNumPerBlock, 0,
+                                    stream->As<ep::CudaStream>()->cuda_stream()>>>(
+        params, scale, l1, l2, weight_decay, learning_rate_val, learning_rate);
+  }
+};
+
+template<typename T>
+struct MultiTensorSGDUpdateKernelUtil<DeviceType::kCUDA, T, float16> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, float16, 1>& params,
+                     T scale, float l1, float l2, float weight_decay, float learning_rate_val,
+                     const float* learning_rate) {
+    MultiTensorSGDUpdateKernelUtil<DeviceType::kCUDA, T, half>::Update(
+        stream, ToHalfParams(params), scale, l1, l2, weight_decay, learning_rate_val,
+        learning_rate);
+  }
+};
+
+template struct MultiTensorSGDUpdateKernelUtil<DeviceType::kCUDA, float, float>;
+template struct MultiTensorSGDUpdateKernelUtil<DeviceType::kCUDA, double, double>;
+template struct MultiTensorSGDUpdateKernelUtil<DeviceType::kCUDA, float, float16>;
+
+template<typename T, typename G>
+struct MultiTensorMomentumUpdateKernelUtil<DeviceType::kCUDA, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 1>& params, T scale,
+                     float l1, float l2, float beta, float weight_decay, float learning_rate_val,
+                     const float* learning_rate) {
+    if (params.max_elem_cnt == 0) { return; }
+    MultiTensorMomentumUpdateGpu<T, G><<<GetMultiTensorUpdateNumBlocks(params.max_elem_cnt),
+                                         kCudaThreadsNumPerBlock, 0,
+                                         stream->As<ep::CudaStream>()->cuda_stream()>>>(
+        params, scale, l1, l2, beta, weight_decay, learning_rate_val, learning_rate);
+  }
+};
+
+template<typename T>
+struct MultiTensorMomentumUpdateKernelUtil<DeviceType::kCUDA, T, float16> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, float16, 1>& params,
+                     T scale, float l1, float l2, float beta, float weight_decay,
+                     float learning_rate_val, const float* learning_rate) {
+    MultiTensorMomentumUpdateKernelUtil<DeviceType::kCUDA, T, half>::Update(
+        stream, ToHalfParams(params), scale, l1, l2, beta, weight_decay, learning_rate_val,
+        learning_rate);
+  }
+};
+
+template struct MultiTensorMomentumUpdateKernelUtil<DeviceType::kCUDA, float, float>;
+template struct MultiTensorMomentumUpdateKernelUtil<DeviceType::kCUDA, double, double>;
+template struct MultiTensorMomentumUpdateKernelUtil<DeviceType::kCUDA, float, float16>;
+
+template<typename T, typename G>
+struct MultiTensorAdamUpdateKernelUtil<DeviceType::kCUDA, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 3>& params, T scale,
+                     float l1, float l2, float beta1, float beta2, float epsilon,
+                     float weight_decay, bool amsgrad, bool do_bias_correction,
+                     float learning_rate_val, float bias_correction1_val,
+                     float bias_correction2_val, const float* learning_rate) {
+    if (params.max_elem_cnt == 0) { return; }
+    MultiTensorAdamUpdateGpu<T, G><<<GetMultiTensorUpdateNumBlocks(params.max_elem_cnt),
+                                     kCudaThreadsNumPerBlock, 0,
+                                     stream->As<ep::CudaStream>()->cuda_stream()>>>(
+        params, scale, l1, l2, beta1, beta2, epsilon, weight_decay, amsgrad, learning_rate_val,
+        bias_correction1_val, bias_correction2_val, learning_rate);
+  }
+};
+
+template<typename T>
+struct MultiTensorAdamUpdateKernelUtil<DeviceType::kCUDA, T, float16> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, float16, 3>& params,
+                     T scale, float l1, float l2, float beta1, float beta2, float epsilon,
+                     float weight_decay, bool amsgrad, bool do_bias_correction,
+                     float learning_rate_val, float bias_correction1_val,
+                     float bias_correction2_val, const float* learning_rate) {
+    MultiTensorAdamUpdateKernelUtil<DeviceType::kCUDA, T, half>::Update(
+        stream, ToHalfParams(params), scale, l1, l2, beta1, beta2, epsilon, weight_decay, amsgrad,
+        do_bias_correction, learning_rate_val, bias_correction1_val, bias_correction2_val,
+        learning_rate);
+  }
+};
+
+template struct MultiTensorAdamUpdateKernelUtil<DeviceType::kCUDA, float, float>;
+template struct MultiTensorAdamUpdateKernelUtil<DeviceType::kCUDA, double, double>;
+template struct MultiTensorAdamUpdateKernelUtil<DeviceType::kCUDA, float, float16>;
+
+template<typename T, typename G>
+struct MultiTensorAdagradUpdateKernelUtil<DeviceType::kCUDA, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 1>& params, T scale,
+                     float l1, float l2, float lr_decay, float epsilon, float weight_decay,
+                     float learning_rate_val, int64_t train_step, const float* learning_rate) {
+    if (params.max_elem_cnt == 0) { return; }
+    MultiTensorAdagradUpdateGpu<T, G><<<GetMultiTensorUpdateNumBlocks(params.max_elem_cnt),
+                                        kCudaThreadsNumPerBlock, 0,
+                                        stream->As<ep::CudaStream>()->cuda_stream()>>>(
+        params, scale, l1, l2, lr_decay, epsilon, weight_decay, learning_rate_val, train_step,
+        learning_rate);
+  }
+};
+
+template struct MultiTensorAdagradUpdateKernelUtil<DeviceType::kCUDA, float, float>;
+template struct MultiTensorAdagradUpdateKernelUtil<DeviceType::kCUDA, double, double>;
+
+template<typename T, typename G>
+struct MultiTensorRmsPropUpdateKernelUtil<DeviceType::kCUDA, T, G> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 2>& params, T scale,
+                     float l1, float l2, bool centered, float epsilon, float weight_decay,
+                     float decay_rate, float learning_rate_val, const float* learning_rate) {
+    if (params.max_elem_cnt == 0) { return; }
+    const int32_t num_blocks = GetMultiTensorUpdateNumBlocks(params.max_elem_cnt);
+    cudaStream_t cuda_stream = stream->As<ep::CudaStream>()->cuda_stream();
+    if (centered) {
+      MultiTensorRmsPropUpdateGpu<T, G, true>
+          <<<num_blocks, kCudaThreadsNumPerBlock, 0, cuda_stream>>>(
+              params, scale, l1, l2, epsilon, weight_decay, decay_rate, learning_rate_val,
+              learning_rate);
+    } else {
+      MultiTensorRmsPropUpdateGpu<T, G, false>
+          <<<num_blocks, kCudaThreadsNumPerBlock, 0, cuda_stream>>>(
+              params, scale, l1, l2, epsilon, weight_decay, decay_rate, learning_rate_val,
+              learning_rate);
+    }
+  }
+};
+
+template<typename T>
+struct MultiTensorRmsPropUpdateKernelUtil<DeviceType::kCUDA, T, float16> {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, float16, 2>& params,
+                     T scale, float l1, float l2, bool centered, float epsilon, float weight_decay,
+                     float decay_rate, float learning_rate_val, const float* learning_rate) {
+    MultiTensorRmsPropUpdateKernelUtil<DeviceType::kCUDA, T, half>::Update(
+        stream, ToHalfParams(params), scale, l1, l2, centered, epsilon, weight_decay, decay_rate,
+        learning_rate_val, learning_rate);
+  }
+};
+
+template struct MultiTensorRmsPropUpdateKernelUtil<DeviceType::kCUDA, float, float>;
+template struct MultiTensorRmsPropUpdateKernelUtil<DeviceType::kCUDA, double, double>;
+template struct MultiTensorRmsPropUpdateKernelUtil<DeviceType::kCUDA, float, float16>;
+
+}  // namespace oneflow
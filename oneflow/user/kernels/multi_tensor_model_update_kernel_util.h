@@ -0,0 +1,78 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_USER_KERNELS_MULTI_TENSOR_MODEL_UPDATE_KERNEL_UTIL_H_
+#define ONEFLOW_USER_KERNELS_MULTI_TENSOR_MODEL_UPDATE_KERNEL_UTIL_H_
+
+#include "oneflow/user/kernels/model_update_kernel_util.h"
+
+namespace oneflow {
+
+// The max number of tensors updated by one launch. The params are passed to the CUDA kernel by
+// value, so they are bounded by the 4KB limit of kernel parameters.
+constexpr int32_t kMultiTensorUpdateMaxTensors = 64;
+
+// The (model, model_diff, states...) tuples of up to kMultiTensorUpdateMaxTensors parameters.
+// A state pointer is nullptr if the optional state is absent, e.g. max_v of adam without amsgrad.
+template<typename T, typename G, int32_t num_states>
+struct MultiTensorUpdateParams {
+  int32_t num_tensors;
+  int64_t max_elem_cnt;
+  int64_t elem_cnt[kMultiTensorUpdateMaxTensors];
+  const G* model_diff[kMultiTensorUpdateMaxTensors];
+  T* model[kMultiTensorUpdateMaxTensors];
+  T* state[num_states][kMultiTensorUpdateMaxTensors];
+};
+
+template<DeviceType device_type, typename T, typename G>
+struct MultiTensorSGDUpdateKernelUtil {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 1>& params, T scale,
+                     float l1, float l2, float weight_decay, float learning_rate_val,
+                     const float* learning_rate);
+};
+
+template<DeviceType device_type, typename T, typename G>
+struct MultiTensorMomentumUpdateKernelUtil {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 1>& params, T scale,
+                     float l1, float l2, float beta, float weight_decay, float learning_rate_val,
+                     const float* learning_rate);
+};
+
+template<DeviceType device_type, typename T, typename G>
+struct MultiTensorAdamUpdateKernelUtil {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 3>& params, T scale,
+                     float l1, float l2, float beta1, float beta2, float epsilon,
+                     float weight_decay, bool amsgrad, bool do_bias_correction,
+                     float learning_rate_val, float bias_correction1_val,
+                     float bias_correction2_val, const float* learning_rate);
+};
+
+template<DeviceType device_type, typename T, typename G>
+struct MultiTensorAdagradUpdateKernelUtil {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 1>& params, T scale,
+                     float l1, float l2, float lr_decay, float epsilon, float weight_decay,
+                     float learning_rate_val, int64_t train_step, const float* learning_rate);
+};
+
+template<DeviceType device_type, typename T, typename G>
+struct MultiTensorRmsPropUpdateKernelUtil {
+  static void Update(ep::Stream* stream, const MultiTensorUpdateParams<T, G, 2>& params, T scale,
+                     float l1, float l2, bool centered, float epsilon, float weight_decay,
+                     float decay_rate, float learning_rate_val, const float* learning_rate);
+};
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_USER_KERNELS_MULTI_TENSOR_MODEL_UPDATE_KERNEL_UTIL_H_
@@ -0,0 +1,241 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/framework.h"
+#include "oneflow/user/kernels/multi_tensor_model_update_kernel_util.h"
+#include "oneflow/core/kernel/cuda_graph_support.h"
+
+namespace oneflow {
+
+namespace {
+
+// The multi tensor update kernels collect the (model, model_diff, states...) tuples of the op into
+// groups of at most kMultiTensorUpdateMaxTensors tensors. On cuda every group is updated by one
+// kernel launch, on cpu the tensors of a group are updated one by one.
+
+const float* LearningRatePtr(user_op::KernelComputeContext* ctx) {
+  if (ctx->has_input("learning_rate", 0)) {
+    return ctx->Tensor4ArgNameAndIndex("learning_rate", 0)->dptr<float>();
+  }
+  return nullptr;
+}
+
+template<typename T>
+T* OptionalMutDptr(user_op::KernelComputeContext* ctx, const std::string& arg_name,
+                   int32_t index) {
+  if (!ctx->has_input(arg_name, 0)) { return nullptr; }
+  return ctx->Tensor4ArgNameAndIndex(arg_name, index)->mut_dptr<T>();
+}
+
+template<typename T, typename G, int32_t num_states, typename UpdateFn>
+void UpdateInGroups(user_op::KernelComputeContext* ctx,
+                    const std::vector<std::string>& state_names, const UpdateFn& update) {
+  CHECK_LE(state_names.size(), static_cast<size_t>(num_states));
+  MultiTensorUpdateParams<T, G, num_states> params{};
+  const int32_t num_models = ctx->input_size("model");
+  FOR_RANGE(int32_t, i, 0, num_models) {
+    const int32_t t = params.num_tensors;
+    user_op::Tensor* model = ctx->Tensor4ArgNameAndIndex("model", i);
+    params.elem_cnt[t] = model->shape().elem_cnt();
+    params.max_elem_cnt = std::max(params.max_elem_cnt, params.elem_cnt[t]);
+    params.model_diff[t] = ctx->Tensor4ArgNameAndIndex("model_diff", i)->dptr<G>();
+    params.model[t] = model->mut_dptr<T>();
+    FOR_RANGE(size_t, s, 0, state_names.size()) {
+      params.state[s][t] = OptionalMutDptr<T>(ctx, state_names[s], i);
+    }
+    params.num_tensors += 1;
+    if (params.num_tensors == kMultiTensorUpdateMaxTensors || i == num_models - 1) {
+      update(params);
+      params.num_tensors = 0;
+      params.max_elem_cnt = 0;
+    }
+  }
+}
+
+}  // namespace
+
+template<DeviceType device_type, typename T, typename G>
+class MultiTensorSGDUpdateKernel final : public user_op::OpKernel,
+                                         public user_op::CudaGraphSupport {
+ public:
+  MultiTensorSGDUpdateKernel() = default;
+  ~MultiTensorSGDUpdateKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const auto scale = ctx->Attr<double>("scale");
+    const auto l1 = ctx->Attr<float>("l1");
+    const auto l2 = ctx->Attr<float>("l2");
+    const auto weight_decay = ctx->Attr<float>("weight_decay");
+    const float learning_rate_val = ctx->Attr<float>("learning_rate_val");
+    const float* learning_rate_ptr = LearningRatePtr(ctx);
+    UpdateInGroups<T, G, 1>(ctx, {}, [&](const MultiTensorUpdateParams<T, G, 1>& params) {
+      MultiTensorSGDUpdateKernelUtil<device_type, T, G>::Update(
+          ctx->stream(), params, static_cast<T>(scale), l1, l2, weight_decay, learning_rate_val,
+          learning_rate_ptr);
+    });
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return true; }
+};
+
+template<DeviceType device_type, typename T, typename G>
+class MultiTensorMomentumUpdateKernel final : public user_op::OpKernel,
+                                              public user_op::CudaGraphSupport {
+ public:
+  MultiTensorMomentumUpdateKernel() = default;
+  ~MultiTensorMomentumUpdateKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const auto scale = ctx->Attr<double>("scale");
+    const auto l1 = ctx->Attr<float>("l1");
+    const auto l2 = ctx->Attr<float>("l2");
+    const auto beta = ctx->Attr<float>("beta");
+    const auto weight_decay = ctx->Attr<float>("weight_decay");
+    const float learning_rate_val = ctx->Attr<float>("learning_rate_val");
+    const float* learning_rate_ptr = LearningRatePtr(ctx);
+    UpdateInGroups<T, G, 1>(
+        ctx, {"momentum"}, [&](const MultiTensorUpdateParams<T, G, 1>& params) {
+          MultiTensorMomentumUpdateKernelUtil<device_type, T, G>::Update(
+              ctx->stream(), params, static_cast<T>(scale), l1, l2, beta, weight_decay,
+              learning_rate_val, learning_rate_ptr);
+        });
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return true; }
+};
+
+template<DeviceType device_type, typename T, typename G>
+class MultiTensorAdamUpdateKernel final : public user_op::OpKernel,
+                                          public user_op::CudaGraphSupport {
+ public:
+  MultiTensorAdamUpdateKernel() = default;
+  ~MultiTensorAdamUpdateKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const auto scale = ctx->Attr<double>("scale");
+    const auto l1 = ctx->Attr<float>("l1");
+    const auto l2 = ctx->Attr<float>("l2");
+    const auto beta1 = ctx->Attr<float>("beta1");
+    const auto beta2 = ctx->Attr<float>("beta2");
+    const auto epsilon = ctx->Attr<float>("epsilon");
+    const auto weight_decay = ctx->Attr<float>("weight_decay");
+    const bool amsgrad = ctx->Attr<bool>("amsgrad");
+    const bool do_bias_correction = ctx->Attr<bool>("do_bias_correction");
+    const float learning_rate_val = ctx->Attr<float>("learning_rate_val");
+    const float bias_correction1_val = ctx->Attr<float>("bias_correction1_val");
+    const float bias_correction2_val = ctx->Attr<float>("bias_correction2_val");
+    const float* learning_rate_ptr = LearningRatePtr(ctx);
+    UpdateInGroups<T, G, 3>(
+        ctx, {"m", "v", "max_v"}, [&](const MultiTensorUpdateParams<T, G, 3>& params) {
+          MultiTensorAdamUpdateKernelUtil<device_type, T, G>::Update(
+              ctx->stream(), params, static_cast<T>(scale), l1, l2, beta1, beta2, epsilon,
+              weight_decay, amsgrad, do_bias_correction, learning_rate_val, bias_correction1_val,
+              bias_correction2_val, learning_rate_ptr);
+        });
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return true; }
+};
+
+template<DeviceType device_type, typename T, typename G>
+class MultiTensorAdagradUpdateKernel final : public user_op::OpKernel,
+                                             public user_op::CudaGraphSupport {
+ public:
+  MultiTensorAdagradUpdateKernel() = default;
+  ~MultiTensorAdagradUpdateKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const auto scale = ctx->Attr<double>("scale");
+    const auto l1 = ctx->Attr<float>("l1");
+    const auto l2 = ctx->Attr<float>("l2");
+    const auto lr_decay = ctx->Attr<float>("lr_decay");
+    const auto epsilon = ctx->Attr<float>("epsilon");
+    const auto weight_decay = ctx->Attr<float>("weight_decay");
+    const float learning_rate_val = ctx->Attr<float>("learning_rate_val");
+    const int64_t train_step_val = ctx->Attr<int32_t>("train_step_val");
+    const float* learning_rate_ptr = LearningRatePtr(ctx);
+    UpdateInGroups<T, G, 1>(ctx, {"sum"}, [&](const MultiTensorUpdateParams<T, G, 1>& params) {
+      MultiTensorAdagradUpdateKernelUtil<device_type, T, G>::Update(
+          ctx->stream(), params, static_cast<T>(scale), l1, l2, lr_decay, epsilon, weight_decay,
+          learning_rate_val, train_step_val, learning_rate_ptr);
+    });
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return true; }
+};
+
+template<DeviceType device_type, typename T, typename G>
+class MultiTensorRmsPropUpdateKernel final : public user_op::OpKernel,
+                                             public user_op::CudaGraphSupport {
+ public:
+  MultiTensorRmsPropUpdateKernel() = default;
+  ~MultiTensorRmsPropUpdateKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const auto scale = ctx->Attr<double>("scale");
+    const auto l1 = ctx->Attr<float>("l1");
+    const auto l2 = ctx->Attr<float>("l2");
+    const auto decay_rate = ctx->Attr<float>("decay_rate");
+    const auto epsilon = ctx->Attr<float>("epsilon");
+    const auto centered = ctx->Attr<bool>("centered");
+    const auto weight_decay = ctx->Attr<float>("weight_decay");
+    const float learning_rate_val = ctx->Attr<float>("learning_rate_val");
+    const float* learning_rate_ptr = LearningRatePtr(ctx);
+    UpdateInGroups<T, G, 2>(
+        ctx, {"mean_square", "mean_gradient"},
+        [&](const MultiTensorUpdateParams<T, G, 2>& params) {
+          MultiTensorRmsPropUpdateKernelUtil<device_type, T, G>::Update(
+              ctx->stream(), params, static_cast<T>(scale), l1, l2, centered, epsilon,
+              weight_decay, decay_rate, learning_rate_val, learning_rate_ptr);
+        });
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return true; }
+};
+
+#define REGISTER_MULTI_TENSOR_UPDATE_KERNEL(op_type_name, kernel, device, dtype, gtype)   \
+  REGISTER_USER_KERNEL(op_type_name)                                                      \
+      .SetCreateFn<kernel<device, dtype, gtype>>()                                        \
+      .SetIsMatchedHob((user_op::HobDeviceType() == device)                               \
+                       && (user_op::HobDataType("model", 0) == GetDataType<dtype>::value) \
+                       && (user_op::HobDataType("model_diff", 0) == GetDataType<gtype>::value));
+
+#define REGISTER_MULTI_TENSOR_UPDATE_KERNELS(device, dtype, gtype)                               \
+  REGISTER_MULTI_TENSOR_UPDATE_KERNEL("multi_tensor_sgd_update", MultiTensorSGDUpdateKernel,     \
+                                      device, dtype, gtype)                                      \
+  REGISTER_MULTI_TENSOR_UPDATE_KERNEL("multi_tensor_momentum_update",                            \
+                                      MultiTensorMomentumUpdateKernel, device, dtype, gtype)     \
+  REGISTER_MULTI_TENSOR_UPDATE_KERNEL("multi_tensor_adam_update", MultiTensorAdamUpdateKernel,   \
+                                      device, dtype, gtype)                                      \
+  REGISTER_MULTI_TENSOR_UPDATE_KERNEL("multi_tensor_rmsprop_update",                             \
+                                      MultiTensorRmsPropUpdateKernel, device, dtype, gtype)
+
+REGISTER_MULTI_TENSOR_UPDATE_KERNELS(DeviceType::kCPU, float, float);
+REGISTER_MULTI_TENSOR_UPDATE_KERNELS(DeviceType::kCPU, double, double);
+REGISTER_MULTI_TENSOR_UPDATE_KERNEL("multi_tensor_adagrad_update", MultiTensorAdagradUpdateKernel,
+                                    DeviceType::kCPU, float, float);
+REGISTER_MULTI_TENSOR_UPDATE_KERNEL("multi_tensor_adagrad_update", MultiTensorAdagradUpdateKernel,
+                                    DeviceType::kCPU, double, double);
+#ifdef WITH_CUDA
+REGISTER_MULTI_TENSOR_UPDATE_KERNELS(DeviceType::kCUDA, float, float16);
+REGISTER_MULTI_TENSOR_UPDATE_KERNELS(DeviceType::kCUDA, float, float);
+REGISTER_MULTI_TENSOR_UPDATE_KERNELS(DeviceType::kCUDA, double, double);
+REGISTER_MULTI_TENSOR_UPDATE_KERNEL("multi_tensor_adagrad_update", MultiTensorAdagradUpdateKernel,
+                                    DeviceType::kCUDA, float, float);
+REGISTER_MULTI_TENSOR_UPDATE_KERNEL("multi_tensor_adagrad_update", MultiTensorAdagradUpdateKernel,
+                                    DeviceType::kCUDA, double, double);
+#endif  // WITH_CUDA
+
+}  // namespace oneflow
@@ -0,0 +1,48 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_USER_KERNELS_NORMALIZATION_CPU_UTIL_H_
+#define ONEFLOW_USER_KERNELS_NORMALIZATION_CPU_UTIL_H_
+
+#include <cmath>
+#include <cstdint>
+
+namespace oneflow {
+
+namespace normalization_cpu {
+
+// Mean and 1 / sqrt(var + epsilon) of `x[0, size)` in a single Welford pass, the biased
+// estimator is used for the variance.
+template<typename T, typename ComputeType>
+void WelfordMeanInvVariance(const T* x, int64_t size, double epsilon, ComputeType* mean,
+                            ComputeType* inv_variance) {
+  ComputeType m = 0;
+  ComputeType m2 = 0;
+  for (int64_t i = 0; i < size; ++i) {
+    const ComputeType val = static_cast<ComputeType>(x[i]);
+    const ComputeType delta = val - m;
+    m += delta / static_cast<ComputeType>(i + 1);
+    m2 += delta * (val - m);
+  }
+  *mean = m;
+  *inv_variance =
+      static_cast<ComputeType>(1) / std::sqrt(m2 / static_cast<ComputeType>(size) + epsilon);
+}
+
+}  // namespace normalization_cpu
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_USER_KERNELS_NORMALIZATION_CPU_UTIL_H_
@@ -72,4 +72,47 @@ REGISTER_NO_GRAD_USER_OP("multi_count_not_finite")
       return Maybe<void>::Ok();
     });
 
+// Counts the inf and nan elements of all the inputs like multi_count_not_finite, and multiplies
+// the inputs by `scale` in place in the same pass, e.g. to unscale gradients for mixed precision.
+REGISTER_NO_GRAD_USER_OP("multi_unscale_count_not_finite")
+    .InputWithMinimum("x", 1)
+    .Output("y")
+    .Attr<double>("scale", 1.0)
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      user_op::TensorDesc* y_desc = ctx->OutputTensorDesc("y", 0);
+      *y_desc->mut_shape() = Shape({1});
+      return Maybe<void>::Ok();
+    })
+    .SetGetSbpFn([](user_op::SbpContext* ctx) -> Maybe<void> {
+      int64_t min_num_axes = ctx->LogicalTensorDesc4InputArgNameAndIndex("x", 0).shape().NumAxes();
+      for (int64_t i = 1; i < ctx->user_op_conf().input_size("x"); ++i) {
+        min_num_axes = std::min(
+            min_num_axes, ctx->LogicalTensorDesc4InputArgNameAndIndex("x", i).shape().NumAxes());
+      }
+      for (int64_t i = 0; i < min_num_axes; ++i) {
+        ctx->NewBuilder().Split(ctx->inputs(), i).PartialSum(user_op::OpArg("y", 0)).Build();
+      }
+      return Maybe<void>::Ok();
+    })
+    .SetInputArgModifyFn([](const user_op::GetInputArgModifier& GetInputArgModifierFn,
+                            const user_op::UserOpConfWrapper& conf) -> Maybe<void> {
+      FOR_RANGE(int32_t, i, 0, conf.input_size("x")) {
+        user_op::InputArgModifier* x_modifier = GetInputArgModifierFn("x", i);
+        CHECK_NOTNULL_OR_RETURN(x_modifier);
+        x_modifier->set_is_mutable(true);
+      }
+      return Maybe<void>::Ok();
+    })
+    .SetDataTypeInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const user_op::TensorDesc& first_x_desc = ctx->InputTensorDesc("x", 0);
+      for (const auto& in_arg_pair : ctx->inputs()) {
+        const user_op::TensorDesc& x_desc =
+            ctx->InputTensorDesc(in_arg_pair.first, in_arg_pair.second);
+        CHECK_EQ_OR_RETURN(x_desc.data_type(), first_x_desc.data_type());
+      }
+      user_op::TensorDesc* y_desc = ctx->OutputTensorDesc("y", 0);
+      *y_desc->mut_data_type() = DataType::kInt64;
+      return Maybe<void>::Ok();
+    });
+
 }  // namespace oneflow
@@ -0,0 +1,196 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/framework.h"
+
+namespace oneflow {
+
+namespace {
+
+// Gates of a batch of cells are laid out as (batch_size, num_gates * hidden_size).
+Maybe<void> CheckGatesShape(const Shape& gates_shape, const Shape& state_shape,
+                            int64_t num_gates) {
+  CHECK_EQ_OR_RETURN(gates_shape.NumAxes(), 2);
+  CHECK_EQ_OR_RETURN(state_shape.NumAxes(), 2);
+  CHECK_EQ_OR_RETURN(gates_shape.At(0), state_shape.At(0));
+  CHECK_EQ_OR_RETURN(gates_shape.At(1), num_gates * state_shape.At(1));
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> GetBatchSplitSbp(user_op::SbpContext* ctx) {
+  ctx->NewBuilder().Split(ctx->inputs(), 0).Split(ctx->outputs(), 0).Build();
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> InferDataTypeAsInput0(user_op::InferContext* ctx) {
+  const DataType data_type = ctx->InputDType(ctx->inputs().at(0).first, 0);
+  for (const auto& in_arg_pair : ctx->inputs()) {
+    CHECK_EQ_OR_RETURN(ctx->InputDType(in_arg_pair.first, in_arg_pair.second), data_type);
+  }
+  for (const auto& out_arg_pair : ctx->outputs()) {
+    *ctx->OutputDType(out_arg_pair.first, out_arg_pair.second) = data_type;
+  }
+  return Maybe<void>::Ok();
+}
+
+}  // namespace
+
+REGISTER_USER_OP("fused_lstm_cell")
+    .Input("input_gates")
+    .Input("hidden_gates")
+    .Input("cx")
+    .Output("hy")
+    .Output("cy")
+    .Output("workspace")
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const Shape& input_gates_shape = ctx->InputShape("input_gates", 0);
+      const Shape& cx_shape = ctx->InputShape("cx", 0);
+      JUST(CheckGatesShape(input_gates_shape, cx_shape, 4));
+      CHECK_EQ_OR_RETURN(ctx->InputShape("hidden_gates", 0), input_gates_shape);
+      *ctx->OutputShape("hy", 0) = cx_shape;
+      *ctx->OutputShape("cy", 0) = cx_shape;
+      *ctx->OutputShape("workspace", 0) = input_gates_shape;
+      return Maybe<void>::Ok();
+    })
+    .SetGetSbpFn(GetBatchSplitSbp)
+    .SetDataTypeInferFn(InferDataTypeAsInput0);
+
+REGISTER_USER_OP("fused_lstm_cell_grad")
+    .Input("grad_hy")
+    .OptionalInput("grad_cy")
+    .Input("cx")
+    .Input("cy")
+    .Input("workspace")
+    .Output("grad_gates")
+    .Output("grad_cx")
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const Shape& cx_shape = ctx->InputShape("cx", 0);
+      const Shape& workspace_shape = ctx->InputShape("workspace", 0);
+      JUST(CheckGatesShape(workspace_shape, cx_shape, 4));
+      CHECK_EQ_OR_RETURN(ctx->InputShape("grad_hy", 0), cx_shape);
+      CHECK_EQ_OR_RETURN(ctx->InputShape("cy", 0), cx_shape);
+      if (ctx->has_input("grad_cy", 0)) {
+        CHECK_EQ_OR_RETURN(ctx->InputShape("grad_cy", 0), cx_shape);
+      }
+      *ctx->OutputShape("grad_gates", 0) = workspace_shape;
+      *ctx->OutputShape("grad_cx", 0) = cx_shape;
+      return Maybe<void>::Ok();
+    })
+    .SetGetSbpFn(GetBatchSplitSbp)
+    .SetDataTypeInferFn(InferDataTypeAsInput0);
+
+REGISTER_USER_OP("fused_gru_cell")
+    .Input("input_gates")
+    .Input("hidden_gates")
+    .Input("hx")
+    .Output("hy")
+    .Output("workspace")
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const Shape& input_gates_shape = ctx->InputShape("input_gates", 0);
+      const Shape& hx_shape = ctx->InputShape("hx", 0);
+      JUST(CheckGatesShape(input_gates_shape, hx_shape, 3));
+      CHECK_EQ_OR_RETURN(ctx->InputShape("hidden_gates", 0), input_gates_shape);
+      *ctx->OutputShape("hy", 0) = hx_shape;
+      // Keeps the activated reset, update and new gates and the new gate part of hidden_gates.
+      *ctx->OutputShape("workspace", 0) = Shape({hx_shape.At(0), 4 * hx_shape.At(1)});
+      return Maybe<void>::Ok();
+    })
+    .SetGetSbpFn(GetBatchSplitSbp)
+    .SetDataTypeInferFn(InferDataTypeAsInput0);
+
+REGISTER_USER_OP("fused_gru_cell_grad")
+    .Input("grad_hy")
+    .Input("hx")
+    .Input("workspace")
+    .Output("grad_input_gates")
+    .Output("grad_hidden_gates")
+    .Output("grad_hx")
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const Shape& hx_shape = ctx->InputShape("hx", 0);
+      JUST(CheckGatesShape(ctx->InputShape("workspace", 0), hx_shape, 4));
+      CHECK_EQ_OR_RETURN(ctx->InputShape("grad_hy", 0), hx_shape);
+      const Shape gates_shape({hx_shape.At(0), 3 * hx_shape.At(1)});
+      *ctx->OutputShape("grad_input_gates", 0) = gates_shape;
+      *ctx->OutputShape("grad_hidden_gates", 0) = gates_shape;
+      *ctx->OutputShape("grad_hx", 0) = hx_shape;
+      return Maybe<void>::Ok();
+    })
+    .SetGetSbpFn(GetBatchSplitSbp)
+    .SetDataTypeInferFn(InferDataTypeAsInput0);
+
+REGISTER_USER_OP_GRAD("fused_lstm_cell")
+    .SetGenBackwardOpConfFn([](const user_op::UserOpWrapper& op,
+                               user_op::AddOpFn AddOp) -> Maybe<void> {
+      if (op.NeedGenGradTensor4OpInput("input_gates", 0)
+          || op.NeedGenGradTensor4OpInput("hidden_gates", 0)
+          || op.NeedGenGradTensor4OpInput("cx", 0)) {
+        user_op::UserOpConfWrapperBuilder builder(op.op_name() + "_grad");
+        builder.Op("fused_lstm_cell_grad")
+            .Input("grad_hy", op.GetGradTensorWithOpOutput("hy", 0))
+            .Input("cx", op.input("cx", 0))
+            .Input("cy", op.output("cy", 0))
+            .Input("workspace", op.output("workspace", 0))
+            .Output("grad_gates")
+            .Output("grad_cx");
+        if (op.HasGradTensor4OpOutput("cy", 0)) {
+          builder.Input("grad_cy", op.GetGradTensorWithOpOutput("cy", 0));
+        }
+        user_op::UserOpConfWrapper grad_op = builder.Build();
+        AddOp(grad_op);
+        if (op.NeedGenGradTensor4OpInput("input_gates", 0)) {
+          op.BindGradTensorWithOpInput(grad_op.output("grad_gates", 0), "input_gates", 0);
+        }
+        if (op.NeedGenGradTensor4OpInput("hidden_gates", 0)) {
+          op.BindGradTensorWithOpInput(grad_op.output("grad_gates", 0), "hidden_gates", 0);
+        }
+        if (op.NeedGenGradTensor4OpInput("cx", 0)) {
+          op.BindGradTensorWithOpInput(grad_op.output("grad_cx", 0), "cx", 0);
+        }
+      }
+      return Maybe<void>::Ok();
+    });
+
+REGISTER_USER_OP_GRAD("fused_gru_cell")
+    .SetGenBackwardOpConfFn([](const user_op::UserOpWrapper& op,
+                               user_op::AddOpFn AddOp) -> Maybe<void> {
+      if (op.NeedGenGradTensor4OpInput("input_gates", 0)
+          || op.NeedGenGradTensor4OpInput("hidden_gates", 0)
+          || op.NeedGenGradTensor4OpInput("hx", 0)) {
+        user_op::UserOpConfWrapperBuilder builder(op.op_name() + "_grad");
+        user_op::UserOpConfWrapper grad_op =
+            builder.Op("fused_gru_cell_grad")
+                .Input("grad_hy", op.GetGradTensorWithOpOutput("hy", 0))
+                .Input("hx", op.input("hx", 0))
+                .Input("workspace", op.output("workspace", 0))
+                .Output("grad_input_gates")
+                .Output("grad_hidden_gates")
+                .Output("grad_hx")
+                .Build();
+        AddOp(grad_op);
+        if (op.NeedGenGradTensor4OpInput("input_gates", 0)) {
+          op.BindGradTensorWithOpInput(grad_op.output("grad_input_gates", 0), "input_gates", 0);
+        }
+        if (op.NeedGenGradTensor4OpInput("hidden_gates", 0)) {
+          op.BindGradTensorWithOpInput(grad_op.output("grad_hidden_gates", 0), "hidden_gates",
+                                       0);
+        }
+        if (op.NeedGenGradTensor4OpInput("hx", 0)) {
+          op.BindGradTensorWithOpInput(grad_op.output("grad_hx", 0), "hx", 0);
+        }
+      }
+      return Maybe<void>::Ok();
+    });
+
+}  // namespace oneflow
@@ -0,0 +1,193 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/framework.h"
+
+namespace oneflow {
+
+namespace {
+
+Maybe<void> CheckGroupNormInput(const Shape& x_shape, int32_t num_groups) {
+  CHECK_GE_OR_RETURN(x_shape.NumAxes(), 2);
+  CHECK_GT_OR_RETURN(num_groups, 0);
+  CHECK_EQ_OR_RETURN(x_shape.At(1) % num_groups, 0)
+      << "num_channels must be divisible by num_groups";
+  return Maybe<void>::Ok();
+}
+
+Shape InferGroupNormParamShape(const Shape& x_shape, int32_t num_groups) {
+  return Shape({x_shape.At(0), num_groups});
+}
+
+}  // namespace
+
+REGISTER_USER_OP("group_norm")
+    .Input("x")
+    .OptionalInput("gamma")
+    .OptionalInput("beta")
+    .Output("y")
+    .Output("mean")
+    .Output("inv_variance")
+    .Attr<int32_t>("num_groups")
+    .Attr<double>("epsilon")
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const Shape& x_shape = ctx->InputShape("x", 0);
+      const int32_t num_groups = ctx->Attr<int32_t>("num_groups");
+      JUST(CheckGroupNormInput(x_shape, num_groups));
+      if (ctx->has_input("gamma", 0)) {
+        CHECK_EQ_OR_RETURN(ctx->InputShape("gamma", 0), Shape({x_shape.At(1)}));
+      }
+      if (ctx->has_input("beta", 0)) {
+        CHECK_EQ_OR_RETURN(ctx->InputShape("beta", 0), Shape({x_shape.At(1)}));
+      }
+      *ctx->OutputShape("y", 0) = x_shape;
+      *ctx->OutputIsDynamic("y", 0) = ctx->InputIsDynamic("x", 0);
+      *ctx->OutputShape("mean", 0) = InferGroupNormParamShape(x_shape, num_groups);
+      *ctx->OutputShape("inv_variance", 0) = InferGroupNormParamShape(x_shape, num_groups);
+      return Maybe<void>::Ok();
+    })
+    .SetGetSbpFn([](user_op::SbpContext* ctx) -> Maybe<void> {
+      ctx->NewBuilder()
+          .Split(user_op::OpArg("x", 0), 0)
+          .Broadcast(user_op::OpArg("gamma", 0))
+          .Broadcast(user_op::OpArg("beta", 0))
+          .Split(ctx->outputs(), 0)
+          .Build();
+      return Maybe<void>::Ok();
+    })
+    .SetDataTypeInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const DataType data_type = ctx->InputDType("x", 0);
+      if (ctx->has_input("gamma", 0)) {
+        CHECK_EQ_OR_RETURN(ctx->InputDType("gamma", 0), data_type);
+      }
+      if (ctx->has_input("beta", 0)) { CHECK_EQ_OR_RETURN(ctx->InputDType("beta", 0), data_type); }
+      *ctx->OutputDType("y", 0) = data_type;
+      *ctx->OutputDType("mean", 0) = data_type;
+      *ctx->OutputDType("inv_variance", 0) = data_type;
+      return Maybe<void>::Ok();
+    });
+
+REGISTER_USER_OP("group_norm_grad")
+    .Input("dy")
+    .Input("x")
+    .Input("mean")
+    .Input("inv_variance")
+    .OptionalInput("gamma")
+    .Output("dx")
+    .Attr<int32_t>("num_groups")
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const Shape& x_shape = ctx->InputShape("x", 0);
+      const int32_t num_groups = ctx->Attr<int32_t>("num_groups");
+      JUST(CheckGroupNormInput(x_shape, num_groups));
+      CHECK_EQ_OR_RETURN(ctx->InputShape("dy", 0), x_shape);
+      const Shape param_shape = InferGroupNormParamShape(x_shape, num_groups);
+      CHECK_EQ_OR_RETURN(ctx->InputShape("mean", 0), param_shape);
+      CHECK_EQ_OR_RETURN(ctx->InputShape("inv_variance", 0), param_shape);
+      *ctx->OutputShape("dx", 0) = x_shape;
+      *ctx->OutputIsDynamic("dx", 0) = ctx->InputIsDynamic("x", 0);
+      return Maybe<void>::Ok();
+    })
+    .SetGetSbpFn([](user_op::SbpContext* ctx) -> Maybe<void> {
+      ctx->NewBuilder()
+          .Split(user_op::OpArg("dy", 0), 0)
+          .Split(user_op::OpArg("x", 0), 0)
+          .Split(user_op::OpArg("mean", 0), 0)
+          .Split(user_op::OpArg("inv_variance", 0), 0)
+          .Broadcast(user_op::OpArg("gamma", 0))
+          .Split(user_op::OpArg("dx", 0), 0)
+          .Build();
+      return Maybe<void>::Ok();
+    })
+    .SetDataTypeInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const DataType data_type = ctx->InputDType("x", 0);
+      CHECK_EQ_OR_RETURN(ctx->InputDType("dy", 0), data_type);
+      *ctx->OutputDType("dx", 0) = data_type;
+      return Maybe<void>::Ok();
+    });
+
+REGISTER_USER_OP("group_norm_param_grad")
+    .Input("dy")
+    .Input("x")
+    .Input("mean")
+    .Input("inv_variance")
+    .Output("gamma_diff")
+    .Output("beta_diff")
+    .Attr<int32_t>("num_groups")
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const Shape& x_shape = ctx->InputShape("x", 0);
+      JUST(CheckGroupNormInput(x_shape, ctx->Attr<int32_t>("num_groups")));
+      CHECK_EQ_OR_RETURN(ctx->InputShape("dy", 0), x_shape);
+      *ctx->OutputShape("gamma_diff", 0) = Shape({x_shape.At(1)});
+      *ctx->OutputShape("beta_diff", 0) = Shape({x_shape.At(1)});
+      return Maybe<void>::Ok();
+    })
+    .SetGetSbpFn([](user_op::SbpContext* ctx) -> Maybe<void> {
+      ctx->NewBuilder().Split(ctx->inputs(), 0).PartialSum(ctx->outputs()).Build();
+      return Maybe<void>::Ok();
+    })
+    .SetDataTypeInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      const DataType data_type = ctx->InputDType("x", 0);
+      CHECK_EQ_OR_RETURN(ctx->InputDType("dy", 0), data_type);
+      *ctx->OutputDType("gamma_diff", 0) = data_type;
+      *ctx->OutputDType("beta_diff", 0) = data_type;
+      return Maybe<void>::Ok();
+    });
+
+REGISTER_USER_OP_GRAD("group_norm")
+    .SetGenBackwardOpConfFn([](const user_op::UserOpWrapper& op,
+                               user_op::AddOpFn AddOp) -> Maybe<void> {
+      const bool has_gamma = op.user_op_conf().has_input("gamma", 0);
+      const bool has_beta = op.user_op_conf().has_input("beta", 0);
+      const int32_t num_groups = op.attr<int32_t>("num_groups");
+      if (op.NeedGenGradTensor4OpInput("x", 0)) {
+        user_op::UserOpConfWrapperBuilder builder(op.op_name() + "_grad");
+        builder.Op("group_norm_grad")
+            .Input("dy", op.GetGradTensorWithOpOutput("y", 0))
+            .Input("x", op.input("x", 0))
+            .Input("mean", op.output("mean", 0))
+            .Input("inv_variance", op.output("inv_variance", 0))
+            .Output("dx")
+            .Attr("num_groups", num_groups);
+        if (has_gamma) { builder.Input("gamma", op.input("gamma", 0)); }
+        user_op::UserOpConfWrapper grad_op = builder.Build();
+        op.BindGradTensorWithOpInput(grad_op.output("dx", 0), "x", 0);
+        AddOp(grad_op);
+      }
+      const bool has_gamma_diff = has_gamma && op.NeedGenGradTensor4OpInput("gamma", 0);
+      const bool has_beta_diff = has_beta && op.NeedGenGradTensor4OpInput("beta", 0);
+      if (has_gamma_diff || has_beta_diff) {
+        user_op::UserOpConfWrapperBuilder builder(op.op_name() + "_param_grad");
+        user_op::UserOpConfWrapper grad_op =
+            builder.Op("group_norm_param_grad")
+                .Input("dy", op.GetGradTensorWithOpOutput("y", 0))
+                .Input("x", op.input("x", 0))
+                .Input("mean", op.output("mean", 0))
+                .Input("inv_variance", op.output("inv_variance", 0))
+                .Output("gamma_diff")
+                .Output("beta_diff")
+                .Attr("num_groups", num_groups)
+                .Build();
+        if (has_gamma_diff) {
+          op.BindGradTensorWithOpInput(grad_op.output("gamma_diff", 0), "gamma", 0);
+        }
+        if (has_beta_diff) {
+          op.BindGradTensorWithOpInput(grad_op.output("beta_diff", 0), "beta", 0);
+        }
+        AddOp(grad_op);
+      }
+      return Maybe<void>::Ok();
+    });
+
+}  // namespace oneflow
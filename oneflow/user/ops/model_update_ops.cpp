@@ -178,6 +178,12 @@ Maybe<void> InferAdamUpdateTensorDesc(user_op::InferContext* ctx) {
   JUST(CheckShapeLike(&m, &model));
   const user_op::TensorDesc& v = ctx->InputTensorDesc("v", 0);
   JUST(CheckShapeLike(&v, &model));
+  if (ctx->has_input("max_v", 0)) {
+    const user_op::TensorDesc& max_v = ctx->InputTensorDesc("max_v", 0);
+    JUST(CheckShapeLike(&max_v, &model));
+  } else {
+    CHECK_OR_RETURN(!ctx->Attr<bool>("amsgrad")) << "adam_update with amsgrad requires max_v";
+  }
   JUST(CheckLearningRateShape(ctx));
   if (ctx->has_input("scale_by_tensor", 0)) {
     const auto& scale_by_tensor = ctx->InputTensorDesc("scale_by_tensor", 0);
@@ -191,6 +197,10 @@ Maybe<void> InferAdamUpdateDataType(user_op::InferContext* ctx) {
   JUST(CheckDataTypeLike(&m, &model));
   const user_op::TensorDesc& v = ctx->InputTensorDesc("v", 0);
   JUST(CheckDataTypeLike(&v, &model));
+  if (ctx->has_input("max_v", 0)) {
+    const user_op::TensorDesc& max_v = ctx->InputTensorDesc("max_v", 0);
+    JUST(CheckDataTypeLike(&max_v, &model));
+  }
   JUST(CheckLearningRateDataType(ctx));
   if (ctx->has_input("scale_by_tensor", 0)) {
     const auto& scale_by_tensor = ctx->InputTensorDesc("scale_by_tensor", 0);
@@ -294,7 +304,9 @@ Maybe<void> AdamInputArgModifyFn(const user_op::GetInputArgModifier& GetInputArg
   JUST(SetInputArgModifierMutable(GetInputArgModifierFn, "model", 0));
   JUST(SetInputArgModifierMutable(GetInputArgModifierFn, "m", 0));
   JUST(SetInputArgModifierMutable(GetInputArgModifierFn, "v", 0));
-  JUST(SetInputArgModifierMutable(GetInputArgModifierFn, "max_v", 0));
+  if (conf.has_input("max_v", 0)) {
+    JUST(SetInputArgModifierMutable(GetInputArgModifierFn, "max_v", 0));
+  }
   return Maybe<void>::Ok();
 }
 
@@ -558,7 +570,7 @@ REGISTER_NO_GRAD_USER_OP("adam_update")
     .OptionalInput("bias_correction2")
     .Input("m")
     .Input("v")
-    .Input("max_v")
+    .OptionalInput("max_v")
     .Attr<float>("learning_rate_val", 0.0)
     .Attr<float>("bias_correction1_val", 1.0)
     .Attr<float>("bias_correction2_val", 1.0)
@@ -574,15 +586,16 @@ REGISTER_NO_GRAD_USER_OP("adam_update")
     .SetTensorDescInferFn(InferAdamUpdateTensorDesc)
     .SetGetSbpFn([](user_op::SbpContext* ctx) -> Maybe<void> {
       const user_op::TensorDesc& model = ctx->LogicalTensorDesc4InputArgNameAndIndex("model", 0);
+      const bool has_max_v = ctx->user_op_conf().has_input("max_v", 0);
       FOR_RANGE(int64_t, axis, 0, model.shape().NumAxes()) {
-        ctx->NewBuilder()
-            .Broadcast(ctx->inputs())
-            .Split(user_op::OpArg("model", 0), axis)
-            .Split(user_op::OpArg("model_diff", 0), axis)
-            .Split(user_op::OpArg("m", 0), axis)
-            .Split(user_op::OpArg("v", 0), axis)
-            .Split(user_op::OpArg("max_v", 0), axis)
-            .Build();
+        auto builder = ctx->NewBuilder()
+                           .Broadcast(ctx->inputs())
+                           .Split(user_op::OpArg("model", 0), axis)
+                           .Split(user_op::OpArg("model_diff", 0), axis)
+                           .Split(user_op::OpArg("m", 0), axis)
+                           .Split(user_op::OpArg("v", 0), axis);
+        if (has_max_v) { builder.Split(user_op::OpArg("max_v", 0), axis); }
+        builder.Build();
       }
       return Maybe<void>::Ok();
     })
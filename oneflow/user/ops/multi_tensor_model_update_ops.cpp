@@ -0,0 +1,259 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/framework.h"
+
+namespace oneflow {
+
+namespace {
+
+// The multi tensor update ops apply one optimizer update to a list of parameters which share
+// the same device and data type. The i-th tensor of each state arg belongs to the i-th model.
+
+Maybe<void> CheckLearningRate(user_op::InferContext* ctx) {
+  if (ctx->has_input("learning_rate", 0)) {
+    const user_op::TensorDesc& learning_rate = ctx->InputTensorDesc("learning_rate", 0);
+    CHECK_EQ_OR_RETURN(learning_rate.shape(), Shape({1}));
+  }
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> CheckLearningRateDataType(user_op::InferContext* ctx) {
+  if (ctx->has_input("learning_rate", 0)) {
+    const user_op::TensorDesc& learning_rate = ctx->InputTensorDesc("learning_rate", 0);
+    CHECK_EQ_OR_RETURN(learning_rate.data_type(), DataType::kFloat);
+  }
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> InferMultiTensorUpdateTensorDesc(user_op::InferContext* ctx,
+                                             const std::vector<std::string>& state_arg_names) {
+  const int32_t num_models = ctx->input_size("model");
+  CHECK_EQ_OR_RETURN(ctx->input_size("model_diff"), num_models);
+  for (const auto& arg_name : state_arg_names) {
+    if (!ctx->has_input(arg_name, 0)) { continue; }
+    CHECK_EQ_OR_RETURN(ctx->input_size(arg_name), num_models);
+  }
+  FOR_RANGE(int32_t, i, 0, num_models) {
+    const Shape& shape = ctx->InputTensorDesc("model", i).shape();
+    CHECK_EQ_OR_RETURN(ctx->InputTensorDesc("model_diff", i).shape(), shape);
+    for (const auto& arg_name : state_arg_names) {
+      if (!ctx->has_input(arg_name, 0)) { continue; }
+      CHECK_EQ_OR_RETURN(ctx->InputTensorDesc(arg_name, i).shape(), shape);
+    }
+  }
+  return CheckLearningRate(ctx);
+}
+
+Maybe<void> InferMultiTensorUpdateDataType(user_op::InferContext* ctx,
+                                           const std::vector<std::string>& state_arg_names) {
+  const DataType data_type = ctx->InputTensorDesc("model", 0).data_type();
+  const DataType diff_data_type = ctx->InputTensorDesc("model_diff", 0).data_type();
+  FOR_RANGE(int32_t, i, 0, ctx->input_size("model")) {
+    CHECK_EQ_OR_RETURN(ctx->InputTensorDesc("model", i).data_type(), data_type);
+    CHECK_EQ_OR_RETURN(ctx->InputTensorDesc("model_diff", i).data_type(), diff_data_type);
+    for (const auto& arg_name : state_arg_names) {
+      if (!ctx->has_input(arg_name, 0)) { continue; }
+      CHECK_EQ_OR_RETURN(ctx->InputTensorDesc(arg_name, i).data_type(), data_type);
+    }
+  }
+  return CheckLearningRateDataType(ctx);
+}
+
+Maybe<void> GetMultiTensorUpdateSbp(user_op::SbpContext* ctx,
+                                    const std::vector<std::string>& state_arg_names) {
+  const int32_t num_models = ctx->user_op_conf().input_size("model");
+  std::vector<std::string> arg_names{"model", "model_diff"};
+  for (const auto& arg_name : state_arg_names) {
+    if (ctx->user_op_conf().has_input(arg_name, 0)) { arg_names.push_back(arg_name); }
+  }
+  int64_t min_num_axes = ctx->LogicalTensorDesc4InputArgNameAndIndex("model", 0).shape().NumAxes();
+  FOR_RANGE(int32_t, i, 1, num_models) {
+    min_num_axes = std::min(
+        min_num_axes, ctx->LogicalTensorDesc4InputArgNameAndIndex("model", i).shape().NumAxes());
+  }
+  std::vector<std::pair<std::string, int32_t>> split_args;
+  for (const auto& arg_name : arg_names) {
+    FOR_RANGE(int32_t, i, 0, num_models) { split_args.emplace_back(arg_name, i); }
+  }
+  FOR_RANGE(int64_t, axis, 0, min_num_axes) {
+    ctx->NewBuilder().Broadcast(ctx->inputs()).Split(split_args, axis).Build();
+  }
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> SetMultiTensorInputArgModifierMutable(
+    const user_op::GetInputArgModifier& GetInputArgModifierFn,
+    const user_op::UserOpConfWrapper& conf, const std::vector<std::string>& mutable_arg_names) {
+  for (const auto& arg_name : mutable_arg_names) {
+    if (!conf.has_input(arg_name, 0)) { continue; }
+    FOR_RANGE(int32_t, i, 0, conf.input_size(arg_name)) {
+      user_op::InputArgModifier* arg_modifier = GetInputArgModifierFn(arg_name, i);
+      CHECK_NOTNULL_OR_RETURN(arg_modifier);
+      arg_modifier->set_is_mutable(true);
+    }
+  }
+  return Maybe<void>::Ok();
+}
+
+const std::vector<std::string>& SGDUpdateStateArgNames() {
+  static const std::vector<std::string> arg_names{};
+  return arg_names;
+}
+const std::vector<std::string>& MomentumUpdateStateArgNames() {
+  static const std::vector<std::string> arg_names{"momentum"};
+  return arg_names;
+}
+const std::vector<std::string>& AdamUpdateStateArgNames() {
+  static const std::vector<std::string> arg_names{"m", "v", "max_v"};
+  return arg_names;
+}
+const std::vector<std::string>& AdagradUpdateStateArgNames() {
+  static const std::vector<std::string> arg_names{"sum"};
+  return arg_names;
+}
+const std::vector<std::string>& RmsPropUpdateStateArgNames() {
+  static const std::vector<std::string> arg_names{"mean_square", "mean_gradient"};
+  return arg_names;
+}
+
+#define DEFINE_MULTI_TENSOR_UPDATE_FNS(update_name)                                           \
+  Maybe<void> InferMultiTensor##update_name##TensorDesc(user_op::InferContext* ctx) {         \
+    return InferMultiTensorUpdateTensorDesc(ctx, update_name##StateArgNames());               \
+  }                                                                                           \
+  Maybe<void> InferMultiTensor##update_name##DataType(user_op::InferContext* ctx) {           \
+    return InferMultiTensorUpdateDataType(ctx, update_name##StateArgNames());                 \
+  }                                                                                           \
+  Maybe<void> GetMultiTensor##update_name##Sbp(user_op::SbpContext* ctx) {                    \
+    return GetMultiTensorUpdateSbp(ctx, update_name##StateArgNames());                        \
+  }                                                                                           \
+  Maybe<void> MultiTensor##update_name##InputArgModifyFn(                                     \
+      const user_op::GetInputArgModifier& GetInputArgModifierFn,                              \
+      const user_op::UserOpConfWrapper& conf) {                                               \
+    std::vector<std::string> mutable_arg_names{"model"};                                      \
+    mutable_arg_names.insert(mutable_arg_names.end(), update_name##StateArgNames().begin(),   \
+                             update_name##StateArgNames().end());                             \
+    return SetMultiTensorInputArgModifierMutable(GetInputArgModifierFn, conf,                 \
+                                                 mutable_arg_names);                          \
+  }
+
+DEFINE_MULTI_TENSOR_UPDATE_FNS(SGDUpdate)
+DEFINE_MULTI_TENSOR_UPDATE_FNS(MomentumUpdate)
+DEFINE_MULTI_TENSOR_UPDATE_FNS(AdamUpdate)
+DEFINE_MULTI_TENSOR_UPDATE_FNS(AdagradUpdate)
+DEFINE_MULTI_TENSOR_UPDATE_FNS(RmsPropUpdate)
+
+#undef DEFINE_MULTI_TENSOR_UPDATE_FNS
+
+}  // namespace
+
+REGISTER_NO_GRAD_USER_OP("multi_tensor_sgd_update")
+    .InputWithMinimum("model", 1)
+    .InputWithMinimum("model_diff", 1)
+    .OptionalInput("learning_rate")
+    .Attr<float>("learning_rate_val", 0.0)
+    .Attr<double>("scale", 1.0)
+    .Attr<float>("l1", 0.0)
+    .Attr<float>("l2", 0.0)
+    .Attr<float>("weight_decay", 0.0)
+    .SetTensorDescInferFn(InferMultiTensorSGDUpdateTensorDesc)
+    .SetGetSbpFn(GetMultiTensorSGDUpdateSbp)
+    .SetInputArgModifyFn(MultiTensorSGDUpdateInputArgModifyFn)
+    .SetDataTypeInferFn(InferMultiTensorSGDUpdateDataType);
+
+REGISTER_NO_GRAD_USER_OP("multi_tensor_momentum_update")
+    .InputWithMinimum("model", 1)
+    .InputWithMinimum("model_diff", 1)
+    .InputWithMinimum("momentum", 1)
+    .OptionalInput("learning_rate")
+    .Attr<float>("learning_rate_val", 0.0)
+    .Attr<double>("scale", 1.0)
+    .Attr<float>("l1", 0.0)
+    .Attr<float>("l2", 0.0)
+    .Attr<float>("beta", 0.9)
+    .Attr<float>("weight_decay", 0.0)
+    .SetTensorDescInferFn(InferMultiTensorMomentumUpdateTensorDesc)
+    .SetGetSbpFn(GetMultiTensorMomentumUpdateSbp)
+    .SetInputArgModifyFn(MultiTensorMomentumUpdateInputArgModifyFn)
+    .SetDataTypeInferFn(InferMultiTensorMomentumUpdateDataType);
+
+REGISTER_NO_GRAD_USER_OP("multi_tensor_adam_update")
+    .InputWithMinimum("model", 1)
+    .InputWithMinimum("model_diff", 1)
+    .InputWithMinimum("m", 1)
+    .InputWithMinimum("v", 1)
+    .OptionalInputWithMinimum("max_v", 1)
+    .OptionalInput("learning_rate")
+    .Attr<float>("learning_rate_val", 0.0)
+    .Attr<float>("bias_correction1_val", 1.0)
+    .Attr<float>("bias_correction2_val", 1.0)
+    .Attr<double>("scale", 1.0)
+    .Attr<float>("l1", 0.0)
+    .Attr<float>("l2", 0.0)
+    .Attr<float>("beta1", 0.9)
+    .Attr<float>("beta2", 0.999)
+    .Attr<float>("epsilon", 1e-8)
+    .Attr<float>("weight_decay", 0.0)
+    .Attr<bool>("amsgrad", false)
+    .Attr<bool>("do_bias_correction", true)
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      if (ctx->Attr<bool>("amsgrad")) { CHECK_OR_RETURN(ctx->has_input("max_v", 0)); }
+      return InferMultiTensorAdamUpdateTensorDesc(ctx);
+    })
+    .SetGetSbpFn(GetMultiTensorAdamUpdateSbp)
+    .SetInputArgModifyFn(MultiTensorAdamUpdateInputArgModifyFn)
+    .SetDataTypeInferFn(InferMultiTensorAdamUpdateDataType);
+
+REGISTER_NO_GRAD_USER_OP("multi_tensor_adagrad_update")
+    .InputWithMinimum("model", 1)
+    .InputWithMinimum("model_diff", 1)
+    .InputWithMinimum("sum", 1)
+    .OptionalInput("learning_rate")
+    .Attr<int>("train_step_val", 0)
+    .Attr<float>("learning_rate_val", 0.0)
+    .Attr<double>("scale", 1.0)
+    .Attr<float>("l1", 0.0)
+    .Attr<float>("l2", 0.0)
+    .Attr<float>("lr_decay", 0.0)
+    .Attr<float>("weight_decay", 0.0)
+    .Attr<float>("epsilon", 1e-10)
+    .SetTensorDescInferFn(InferMultiTensorAdagradUpdateTensorDesc)
+    .SetGetSbpFn(GetMultiTensorAdagradUpdateSbp)
+    .SetInputArgModifyFn(MultiTensorAdagradUpdateInputArgModifyFn)
+    .SetDataTypeInferFn(InferMultiTensorAdagradUpdateDataType);
+
+REGISTER_NO_GRAD_USER_OP("multi_tensor_rmsprop_update")
+    .InputWithMinimum("model", 1)
+    .InputWithMinimum("model_diff", 1)
+    .InputWithMinimum("mean_square", 1)
+    .OptionalInputWithMinimum("mean_gradient", 1)
+    .OptionalInput("learning_rate")
+    .Attr<float>("learning_rate_val", 0.0)
+    .Attr<double>("scale", 1.0)
+    .Attr<float>("l1", 0.0)
+    .Attr<float>("l2", 0.0)
+    .Attr<bool>("centered", false)
+    .Attr<float>("epsilon", 1e-8)
+    .Attr<float>("decay_rate", 0.99)
+    .Attr<float>("weight_decay", 0.0)
+    .SetTensorDescInferFn([](user_op::InferContext* ctx) -> Maybe<void> {
+      if (ctx->Attr<bool>("centered")) { CHECK_OR_RETURN(ctx->has_input("mean_gradient", 0)); }
+      return InferMultiTensorRmsPropUpdateTensorDesc(ctx);
+    })
+    .SetGetSbpFn(GetMultiTensorRmsPropUpdateSbp)
+    .SetInputArgModifyFn(MultiTensorRmsPropUpdateInputArgModifyFn)
+    .SetDataTypeInferFn(InferMultiTensorRmsPropUpdateDataType);
+
+}  // namespace oneflow
@@ -176,6 +176,7 @@ import oneflow.framework.scope_util as scope_util
 import oneflow.framework.session_context as session_ctx
 from oneflow.framework.multi_client_session import MultiClientSession
 from oneflow.framework.tensor_str import set_printoptions
+from oneflow.framework.intra_op_parallel import set_num_threads, get_num_threads
 
 if not env_util.HasAllMultiClientEnvVars():
     env_util.SetDefaultMultiClientEnvVars()
@@ -376,11 +377,14 @@ from . import (
     backends,
     amp,
 )  # , saved_model NOTE(chengcheng): unavailable now
+from oneflow.amp import autocast
 import oneflow.utils.data
+import oneflow.utils.checkpoint
 import oneflow.utils.vision
 import oneflow.comm
 import oneflow.framework.docstr as docstr
 import oneflow.cuda
+import oneflow.cpu
 import oneflow.multiprocessing
 
 if oneflow._oneflow_internal.flags.with_mlir():
@@ -0,0 +1,111 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import functools
+import warnings
+
+import oneflow
+import oneflow._oneflow_internal
+
+_autocast_internal = oneflow._oneflow_internal.autocast
+
+
+class autocast(object):
+    r"""
+    Context-manager that runs eager ops in mixed precision.
+
+    Inside an enabled region, ops on ``device_type`` are casted at dispatch time
+    following the same lists as the auto mixed precision pass of nn.Graph: compute
+    bound ops (e.g. matmul, conv) run in ``dtype``, numerically sensitive ops run in
+    float32, and the other listed ops follow the precision of their inputs.
+
+    This context manager is thread local; it will not affect computation in other threads.
+
+    Also functions as a decorator. (Make sure to instantiate with parenthesis.)
+
+    Args:
+        device_type (str): ``"cuda"`` or ``"cpu"``. The compute bound ops have no
+            float16 or bfloat16 CPU kernels yet, so a ``"cpu"`` region warns and
+            runs with autocasting disabled.
+        dtype (oneflow.dtype, optional): ``oneflow.float16`` or ``oneflow.bfloat16``.
+            Defaults to ``oneflow.float16`` on cuda and ``oneflow.bfloat16`` on cpu.
+        enabled (bool): Whether autocasting is enabled in the region. (default: True)
+
+    .. code-block:: python
+
+        >>> import oneflow as flow
+        >>> x = flow.randn(2, 3, device="cuda")
+        >>> w = flow.randn(3, 4, device="cuda")
+        >>> with flow.autocast("cuda"):
+        ...     y = flow.matmul(x, w)
+        >>> y.dtype
+        oneflow.float16
+    """
+
+    def __init__(self, device_type, dtype=None, enabled=True):
+        if device_type not in ("cuda", "cpu"):
+            raise ValueError(
+                "Unsupported autocast device_type {}, expected 'cuda' or 'cpu'".format(
+                    device_type
+                )
+            )
+        if dtype is None:
+            dtype = oneflow.float16 if device_type == "cuda" else oneflow.bfloat16
+        if dtype not in (oneflow.float16, oneflow.bfloat16):
+            raise ValueError(
+                "Unsupported autocast dtype {}, expected oneflow.float16 or oneflow.bfloat16".format(
+                    dtype
+                )
+            )
+        if device_type == "cpu" and enabled:
+            warnings.warn(
+                "CPU autocast is not supported because there are no float16 or "
+                "bfloat16 CPU kernels for the ops it casts, disabling autocast."
+            )
+            enabled = False
+        self.device_type = device_type
+        self.dtype = dtype
+        self.enabled = enabled
+
+    def __enter__(self):
+        self._prev_enabled = _autocast_internal.is_enabled()
+        self._prev_device_type = _autocast_internal.get_device_type()
+        self._prev_dtype = _autocast_internal.get_dtype()
+        _autocast_internal.set_enabled(self.enabled)
+        _autocast_internal.set_device_type(self.device_type)
+        _autocast_internal.set_dtype(self.dtype)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _autocast_internal.set_enabled(self._prev_enabled)
+        _autocast_internal.set_device_type(self._prev_device_type)
+        _autocast_internal.set_dtype(self._prev_dtype)
+        if not self._prev_enabled:
+            _autocast_internal.clear_cache()
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def is_autocast_enabled():
+    r"""
+    Returns True if autocast is enabled in the current thread.
+    """
+    return _autocast_internal.is_enabled()
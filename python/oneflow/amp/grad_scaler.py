@@ -14,14 +14,46 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from collections import defaultdict
+
+import oneflow
+from oneflow.framework.tensor import Tensor
+
+
+# Gradient dtypes unscaled and checked by the fused multi_unscale_count_not_finite op.
+_UNSCALE_DTYPES = (oneflow.float16, oneflow.float32, oneflow.float64)
+
 
 class GradScaler(object):
+    r"""
+    Scales the loss to avoid underflow of low precision gradients.
+
+    In nn.Graph, the scaler is turned into the dynamic loss scale policy of the job.
+    In eager mode, it is used together with :class:`oneflow.autocast`:
+
+    .. code-block:: python
+
+        scaler = flow.amp.GradScaler()
+        for x, label in data:
+            with flow.autocast("cuda"):
+                loss = loss_fn(model(x), label)
+            scaler.scale(loss).backward()
+            scaler.step(optimizer)
+            scaler.update()
+            optimizer.zero_grad()
+
+    :meth:`step` unscales the gradients and skips ``optimizer.step()`` if any of them
+    is inf or nan, :meth:`update` then decreases the scale by ``backoff_factor``, or
+    increases it by ``growth_factor`` after ``growth_interval`` successful steps.
+    """
+
     def __init__(
         self,
         init_scale=2.0 ** 16,
         growth_factor=2.0,
         backoff_factor=0.5,
         growth_interval=2000,
+        enabled=True,
     ):
         self._init_scale = init_scale
         self._growth_factor = growth_factor
@@ -32,6 +64,163 @@ class GradScaler(object):
                 "got {}".format(backoff_factor)
             )
         self._growth_interval = growth_interval
+        self._enabled = enabled
+        self._scale = float(init_scale)
+        self._growth_tracker = 0
+        self._per_optimizer_states = defaultdict(dict)
+        self._unscale_ops = dict()
+
+    def is_enabled(self):
+        return self._enabled
+
+    def get_scale(self):
+        return self._scale if self._enabled else 1.0
+
+    def scale(self, outputs):
+        r"""Multiplies a tensor or a list/tuple of tensors by the scale factor."""
+        if not self._enabled:
+            return outputs
+        if isinstance(outputs, Tensor):
+            return outputs * self._scale
+        if isinstance(outputs, (list, tuple)):
+            return type(outputs)(self.scale(output) for output in outputs)
+        raise ValueError("outputs must be a Tensor or a list/tuple of Tensors")
+
+    def _get_unscale_op(self, num_tensors):
+        op = self._unscale_ops.get(num_tensors)
+        if op is None:
+            op = (
+                oneflow.builtin_op("multi_unscale_count_not_finite")
+                .Input("x", num_tensors)
+                .Output("y")
+                .Attr("scale", 1.0)
+                .Build()
+            )
+            self._unscale_ops[num_tensors] = op
+        return op
+
+    def _unscale_and_found_inf(self, grads, inv_scale):
+        # One multi_unscale_count_not_finite op per group of gradients sharing device
+        # and dtype multiplies them by inv_scale in place and counts their inf/nan in
+        # the same pass. The counts are summed on device and synchronized once.
+        groups = defaultdict(list)
+        for grad in grads:
+            device = str(grad.placement) if grad.is_consistent else str(grad.device)
+            groups[(device, grad.dtype)].append(grad)
+        total_count = None
+        for (_, dtype), group in groups.items():
+            if dtype in _UNSCALE_DTYPES:
+                count = self._get_unscale_op(len(group))(*group, scale=inv_scale)[0]
+            else:
+                # no fused kernel for this dtype
+                count = oneflow._C.multi_count_not_finite(
+                    [grad.to(oneflow.float32) for grad in group]
+                )
+                for grad in group:
+                    grad.mul_(inv_scale)
+            if total_count is None:
+                total_count = count
+            else:
+                if count.is_local and total_count.is_local:
+                    count = count.to(device=total_count.device)
+                total_count = total_count + count
+        return total_count.numpy().item() > 0
+
+    def unscale_(self, optimizer):
+        r"""Divides the gradients of ``optimizer`` by the scale factor in place and
+        checks them for inf and nan. It is called by :meth:`step` if not called
+        explicitly, e.g. before clipping gradients.
+        """
+        if not self._enabled:
+            return
+        optimizer_state = self._per_optimizer_states[id(optimizer)]
+        if optimizer_state.get("unscaled", False):
+            raise RuntimeError(
+                "unscale_() has already been called on this optimizer since the last update()."
+            )
+        grads = [
+            param.grad
+            for param_group in optimizer.param_groups
+            for param in param_group.parameters
+            if param.grad is not None
+        ]
+        with oneflow.no_grad():
+            optimizer_state["found_inf"] = (
+                self._unscale_and_found_inf(grads, 1.0 / self._scale)
+                if len(grads) > 0
+                else False
+            )
+        optimizer_state["unscaled"] = True
+
+    def step(self, optimizer, *args, **kwargs):
+        r"""Unscales the gradients and runs ``optimizer.step(*args, **kwargs)`` unless
+        the gradients contain inf or nan.
+        """
+        if not self._enabled:
+            return optimizer.step(*args, **kwargs)
+        optimizer_state = self._per_optimizer_states[id(optimizer)]
+        if optimizer_state.get("stepped", False):
+            raise RuntimeError(
+                "step() has already been called on this optimizer since the last update()."
+            )
+        if not optimizer_state.get("unscaled", False):
+            self.unscale_(optimizer)
+        optimizer_state["stepped"] = True
+        if optimizer_state["found_inf"]:
+            return None
+        return optimizer.step(*args, **kwargs)
+
+    def update(self, new_scale=None):
+        r"""Updates the scale factor according to the inf/nan checks of this iteration,
+        or sets it to ``new_scale`` if given.
+        """
+        if not self._enabled:
+            return
+        if new_scale is None and not any(
+            state.get("stepped", False) for state in self._per_optimizer_states.values()
+        ):
+            # No optimizer step was attempted since the last update, so there is no
+            # inf/nan check to update the scale with.
+            return
+        if new_scale is not None:
+            self._scale = float(new_scale)
+        elif any(
+            state.get("found_inf", False)
+            for state in self._per_optimizer_states.values()
+        ):
+            self._scale *= self._backoff_factor
+            self._growth_tracker = 0
+        else:
+            self._growth_tracker += 1
+            if self._growth_tracker == self._growth_interval:
+                self._scale *= self._growth_factor
+                self._growth_tracker = 0
+        self._per_optimizer_states = defaultdict(dict)
+
+    def state_dict(self):
+        if not self._enabled:
+            return {}
+        return {
+            "scale": self._scale,
+            "growth_factor": self._growth_factor,
+            "backoff_factor": self._backoff_factor,
+            "growth_interval": self._growth_interval,
+            "_growth_tracker": self._growth_tracker,
+        }
+
+    def load_state_dict(self, state_dict):
+        if not self._enabled:
+            return
+        if len(state_dict) == 0:
+            raise RuntimeError(
+                "The source state dict is empty, possibly because it was saved "
+                "from a disabled instance of GradScaler."
+            )
+        self._scale = float(state_dict["scale"])
+        self._growth_factor = state_dict["growth_factor"]
+        self._backoff_factor = state_dict["backoff_factor"]
+        self._growth_interval = state_dict["growth_interval"]
+        self._growth_tracker = state_dict["_growth_tracker"]
 
     def _generate_conf_for_graph(self, train_conf):
         train_conf.mutable_dynamic_loss_scale_policy().set_initial_loss_scale(
@@ -0,0 +1,87 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import oneflow as flow
+
+
+def _sync():
+    # Eager ops free their outputs asynchronously, wait for the virtual machine
+    # so that the statistics reflect all the ops issued so far.
+    if flow.env.is_multi_client():
+        flow._oneflow_internal.eager.multi_client.Sync()
+    else:
+        flow._oneflow_internal.eager.single_client.Sync()
+
+
+def memory_stats() -> dict:
+    r"""Returns a dict of the host caching allocator statistics of eager CPU tensors.
+
+    The dict contains ``bytes_in_use``, ``peak_bytes_in_use``, ``cached_bytes``,
+    ``num_allocs``, ``num_frees``, ``num_cache_hits``, ``num_system_allocs``
+    and ``num_system_frees``. Byte counts are measured in size classes, which
+    may be slightly larger than the requested sizes.
+    """
+    _sync()
+    return flow._oneflow_internal.vm.CpuAllocatorStats()
+
+
+def memory_allocated() -> int:
+    r"""Returns the host memory in bytes occupied by eager CPU tensors."""
+    return memory_stats()["bytes_in_use"]
+
+
+def max_memory_allocated() -> int:
+    r"""Returns the peak host memory in bytes occupied by eager CPU tensors since
+    the beginning of the program or the last :func:`reset_peak_memory_stats`."""
+    return memory_stats()["peak_bytes_in_use"]
+
+
+def memory_reserved() -> int:
+    r"""Returns the host memory in bytes managed by the caching allocator, i.e.
+    the memory in use plus the memory cached for reuse."""
+    stats = memory_stats()
+    return stats["bytes_in_use"] + stats["cached_bytes"]
+
+
+def reset_peak_memory_stats() -> None:
+    r"""Resets the peak of :func:`max_memory_allocated` to the current usage."""
+    _sync()
+    flow._oneflow_internal.vm.CpuAllocatorResetPeakStats()
+
+
+def empty_cache() -> None:
+    r"""Releases all the unoccupied cached host memory back to the system.
+
+    Memory occupied by tensors is not freed.
+    """
+    _sync()
+    flow._oneflow_internal.vm.CpuAllocatorEmptyCache()
+
+
+def get_cache_limit() -> int:
+    r"""Returns the maximum bytes of freed host memory kept for reuse."""
+    return flow._oneflow_internal.vm.CpuAllocatorGetCacheLimit()
+
+
+def set_cache_limit(limit: int) -> None:
+    r"""Sets the maximum bytes of freed host memory kept for reuse, cached
+    memory beyond the new limit is released. ``0`` disables caching.
+
+    The default limit is 1GB and can also be set by the environment variable
+    ``ONEFLOW_CPU_ALLOCATOR_CACHE_LIMIT_MB``.
+    """
+    assert limit >= 0, "the cache limit must be non-negative"
+    _sync()
+    flow._oneflow_internal.vm.CpuAllocatorSetCacheLimit(limit)
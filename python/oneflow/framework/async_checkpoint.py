@@ -0,0 +1,211 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import concurrent.futures
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, List, Optional
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_INFLIGHT_BYTES = 4 << 30
+
+
+def fsync_file(file_path: str) -> None:
+    with open(file_path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def fsync_dir(dir_path: str) -> None:
+    fd = os.open(dir_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def tmp_dir_for(path: Path, rank: int) -> Path:
+    return path.parent / f".{path.name}.tmp-{rank}-{uuid.uuid4().hex}"
+
+
+# Serializes the swaps and recoveries of checkpoint directories in this process,
+# since the swaps of async saves run in the committer thread.
+_replace_lock = threading.Lock()
+
+
+def _old_dirs_of(path: Path) -> List[Path]:
+    return list(path.parent.glob(f".{path.name}.old-*"))
+
+
+def _recover_replaced_dir(path: Path) -> None:
+    if path.exists():
+        # Left behind by a crash after the swap, before the old checkpoint is removed
+        for old_path in _old_dirs_of(path):
+            shutil.rmtree(old_path, ignore_errors=True)
+        return
+    old_paths = _old_dirs_of(path)
+    if len(old_paths) == 0:
+        return
+    # Left behind by a crash in the middle of the swap, restore the old checkpoint
+    old_paths.sort(key=lambda p: p.stat().st_mtime_ns)
+    os.rename(old_paths[-1], path)
+    fsync_dir(str(path.parent))
+    for old_path in old_paths[:-1]:
+        shutil.rmtree(old_path, ignore_errors=True)
+
+
+def recover_replaced_dir(path: Path) -> None:
+    r"""Finish or roll back an interrupted :func:`atomic_replace_dir` of ``path``."""
+    with _replace_lock:
+        _recover_replaced_dir(path)
+
+
+def atomic_replace_dir(tmp_path: Path, path: Path) -> None:
+    r"""Move the fully written ``tmp_path`` to ``path``. If ``path`` exists, it is
+    renamed aside to a hidden ``.old-*`` sibling first and removed after the new
+    checkpoint is in place. A crash between the two renames leaves no ``path``, but
+    the old checkpoint in the ``.old-*`` sibling, which is moved back by
+    :func:`recover_replaced_dir` when ``path`` is loaded or saved again. So ``path``
+    is seen with either the old or the new checkpoint, never a half-written one.
+    """
+    with _replace_lock:
+        _recover_replaced_dir(path)
+        old_path = None
+        if path.exists():
+            old_path = path.parent / f".{path.name}.old-{uuid.uuid4().hex}"
+            os.rename(path, old_path)
+            # The aside rename must be durable before the new checkpoint takes its place
+            fsync_dir(str(path.parent))
+        os.rename(tmp_path, path)
+        fsync_dir(str(path.parent))
+        if old_path is not None:
+            shutil.rmtree(old_path, ignore_errors=True)
+
+
+class SaveReservation(object):
+    def __init__(self, writer: "AsyncCheckpointWriter"):
+        self._writer = writer
+        self.nbytes = 0
+
+    def reserve(self, nbytes: int) -> None:
+        self._writer._reserve(self, nbytes)
+
+
+class AsyncCheckpointWriter(object):
+    r"""Writes snapshotted checkpoints in background threads.
+
+    Tensor files of one save are written in parallel by a thread pool, and a single
+    committer thread finalizes the saves in order. The host memory held by snapshots
+    that are not written yet is bounded by ``max_inflight_bytes``: snapshotting blocks
+    until earlier saves finish, unless nothing else is in flight.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES,
+    ):
+        assert max_workers >= 1
+        self._max_workers = max_workers
+        self._max_inflight_bytes = max_inflight_bytes
+        self._inflight_bytes = 0
+        self._cond = threading.Condition()
+        self._pool = None
+        self._committer = None
+
+    @property
+    def inflight_bytes(self) -> int:
+        return self._inflight_bytes
+
+    def _lazy_init(self):
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                self._max_workers, thread_name_prefix="oneflow_async_save"
+            )
+            self._committer = concurrent.futures.ThreadPoolExecutor(
+                1, thread_name_prefix="oneflow_async_save_commit"
+            )
+
+    def new_reservation(self) -> SaveReservation:
+        return SaveReservation(self)
+
+    def _reserve(self, reservation: SaveReservation, nbytes: int) -> None:
+        with self._cond:
+            # Bytes reserved by the current save itself can not be released before
+            # it is submitted, so only wait for the other saves.
+            while (
+                self._inflight_bytes > reservation.nbytes
+                and self._inflight_bytes + nbytes > self._max_inflight_bytes
+            ):
+                self._cond.wait()
+            self._inflight_bytes += nbytes
+            reservation.nbytes += nbytes
+
+    def _release(self, nbytes: int) -> None:
+        with self._cond:
+            self._inflight_bytes -= nbytes
+            self._cond.notify_all()
+
+    def submit(
+        self,
+        reservation: SaveReservation,
+        write_fns: List[Callable[[], None]],
+        commit_fn: Callable[[], None],
+        abort_fn: Optional[Callable[[], None]] = None,
+    ) -> concurrent.futures.Future:
+        r"""Run ``write_fns`` in parallel and then ``commit_fn``, the returned future
+        is done when ``commit_fn`` returns.
+        """
+        self._lazy_init()
+        write_futures = [self._pool.submit(fn) for fn in write_fns]
+
+        def commit():
+            try:
+                for f in write_futures:
+                    f.result()
+                commit_fn()
+            except BaseException:
+                if abort_fn is not None:
+                    abort_fn()
+                raise
+            finally:
+                self._release(reservation.nbytes)
+
+        return self._committer.submit(commit)
+
+    def wait(self) -> None:
+        if self._committer is not None:
+            self._committer.submit(lambda: None).result()
+
+
+_writer = None
+
+
+def get_writer() -> AsyncCheckpointWriter:
+    global _writer
+    if _writer is None:
+        _writer = AsyncCheckpointWriter(
+            max_workers=int(
+                os.getenv("ONEFLOW_ASYNC_SAVE_MAX_WORKERS", DEFAULT_MAX_WORKERS)
+            ),
+            max_inflight_bytes=int(
+                os.getenv(
+                    "ONEFLOW_ASYNC_SAVE_MAX_INFLIGHT_BYTES", DEFAULT_MAX_INFLIGHT_BYTES
+                )
+            ),
+        )
+    return _writer
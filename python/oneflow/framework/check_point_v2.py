@@ -13,8 +13,14 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import ast
+from collections import OrderedDict
+from concurrent.futures import Future
 from contextlib import contextmanager
+import io
 import os
+import re
+import shutil
 import warnings
 from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from pathlib import Path
@@ -27,6 +33,8 @@ import oneflow
 import oneflow as flow
 import oneflow._oneflow_internal
 import oneflow.core.framework.variable_meta_info_pb2 as variable_meta_info_pb
+import oneflow.framework.async_checkpoint as async_checkpoint
+import oneflow.framework.checkpoint_container as checkpoint_container_util
 import oneflow.framework.dtype as dtype_util
 import oneflow.framework.id_util as id_util
 import pickle
@@ -36,6 +44,10 @@ META_INFO_FILENAME = "meta"
 PICKLE_FILENAME = "pickled_data"
 DATA_FILENAME = "out"
 PROTOCOL_VERSION = 1
+SHARD_FILENAME_PREFIX = "shard_"
+
+_MACHINE_DEVICE_IDS_PATTERN = re.compile(r"machine_device_ids=(\{.*?\})")
+_SPLIT_SBP_PATTERN = re.compile(r"split\(axis=(\d+)\)")
 
 
 class FileBackendVariableBlob:
@@ -93,28 +105,53 @@ class FileBackendVariableBlob:
     def dtype(self) -> oneflow.dtype:
         return self.dtype_
 
-    def numpy(self) -> np.ndarray:
+    def numpy(self, mmap: bool = False) -> np.ndarray:
         if not self.has_meta_info_:
             raise RuntimeError("This variable does not have meta info")
-        return np.fromfile(
-            self.file_path,
-            dtype=dtype_util.convert_oneflow_dtype_to_numpy_dtype(self.dtype),
-        ).reshape(self.shape)
+        np_dtype = dtype_util.convert_oneflow_dtype_to_numpy_dtype(self.dtype)
+        if mmap and _ElemCnt(self.shape) > 0:
+            # The data is read from the page cache when it is copied into a tensor,
+            # instead of being read into an intermediate array first
+            return np.memmap(self.file_path, dtype=np_dtype, mode="r", shape=self.shape)
+        return np.fromfile(self.file_path, dtype=np_dtype).reshape(self.shape)
 
 
-def _save_tensor_to_disk(tensor: "oneflow.Tensor", dir_name: Union[str, Path]) -> None:
+def _write_tensor_to_disk(
+    data: np.ndarray, dtype: flow.dtype, dir_name: Union[str, Path], fsync=False
+) -> None:
     os.makedirs(dir_name, exist_ok=True)
     meta_info = variable_meta_info_pb.VariableMetaInfo()
-    meta_info.shape.dim[:] = tensor.shape
+    meta_info.shape.dim[:] = data.shape
     meta_info.data_type = oneflow._oneflow_internal.deprecated.GetProtoDtype4OfDtype(
-        tensor.dtype
+        dtype
     )
     data_path = os.path.join(dir_name, DATA_FILENAME)
     with open(data_path, "wb") as f:
-        f.write(tensor.numpy().tobytes())
+        f.write(data.tobytes())
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
 
-    with open(os.path.join(dir_name, META_INFO_FILENAME), "w") as f:
+    meta_path = os.path.join(dir_name, META_INFO_FILENAME)
+    with open(meta_path, "w") as f:
         f.write(text_format.MessageToString(meta_info))
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _save_tensor_to_disk(tensor: "oneflow.Tensor", dir_name: Union[str, Path]) -> None:
+    if async_save_snapshots is not None:
+        # Snapshot the tensor into host memory, it is written by the async writer
+        async_save_reservation.reserve(
+            _ElemCnt(tuple(tensor.shape))
+            * np.dtype(
+                dtype_util.convert_oneflow_dtype_to_numpy_dtype(tensor.dtype)
+            ).itemsize
+        )
+        async_save_snapshots.append((tensor.numpy(), tensor.dtype, dir_name))
+        return
+    _write_tensor_to_disk(tensor.numpy(), tensor.dtype, dir_name)
 
 
 ValueContainer = Union[FileBackendVariableBlob, np.ndarray, "oneflow.Tensor"]
@@ -124,16 +161,24 @@ def _ElemCnt(shape):
     return np.prod(shape).astype(int).item()
 
 
+def _variable_blob(path):
+    if isinstance(path, checkpoint_container_util.ContainerVariable):
+        return path
+    assert isinstance(path, str)
+    return FileBackendVariableBlob(path)
+
+
 def _LoadSingleVariable(
-    path: Optional[str], consistent_src_rank: Optional[int] = None
+    path: Optional[Union[str, checkpoint_container_util.ContainerVariable]],
+    consistent_src_rank: Optional[int] = None,
+    mmap: bool = False,
 ) -> "flow.Tensor":
     if consistent_src_rank is not None:
         rank = flow.env.get_rank()
         if rank == consistent_src_rank:
-            assert isinstance(path, str)
-            file_backed_blob = FileBackendVariableBlob(path)
+            file_backed_blob = _variable_blob(path)
             loaded = flow.tensor(
-                file_backed_blob.numpy(), dtype=file_backed_blob.dtype
+                file_backed_blob.numpy(mmap=mmap), dtype=file_backed_blob.dtype
             ).to("cuda")
         else:
             loaded = flow.tensor([]).to("cuda")
@@ -142,8 +187,232 @@ def _LoadSingleVariable(
         )
         return loaded
 
-    assert isinstance(path, str)
-    return flow.tensor(FileBackendVariableBlob(path).numpy())
+    file_backed_blob = _variable_blob(path)
+    return flow.tensor(file_backed_blob.numpy(mmap=mmap), dtype=file_backed_blob.dtype)
+
+
+def _placement_to_tuple(placement):
+    m = _MACHINE_DEVICE_IDS_PATTERN.search(str(placement))
+    assert m is not None, "Invalid placement " + str(placement)
+    machine_device_ids = {
+        int(k): tuple(int(d) for d in v)
+        for k, v in ast.literal_eval(m.group(1)).items()
+    }
+    return (placement.device_type, machine_device_ids, tuple(placement.hierarchy))
+
+
+def _placement_from_tuple(placement_tuple):
+    device_type, machine_device_ids, hierarchy = placement_tuple
+    return flow.placement(
+        device_type, {k: list(v) for k, v in machine_device_ids.items()}, hierarchy
+    )
+
+
+def _sbp_split_axis(sbp):
+    m = _SPLIT_SBP_PATTERN.search(str(sbp))
+    return None if m is None else int(m.group(1))
+
+
+def _sbp_is_partial_sum(sbp):
+    return str(sbp).endswith("partial_sum")
+
+
+def _parallel_id_of_cur_rank(placement_tuple) -> Optional[int]:
+    _, machine_device_ids, _ = placement_tuple
+    local_world_size = flow.env.get_world_size() // flow.env.get_node_size()
+    machine_id = flow.env.get_rank() // local_world_size
+    device_id = flow.env.get_local_rank()
+    parallel_id = 0
+    for cur_machine_id in sorted(machine_device_ids.keys()):
+        for cur_device_id in sorted(machine_device_ids[cur_machine_id]):
+            if cur_machine_id == machine_id and cur_device_id == device_id:
+                return parallel_id
+            parallel_id += 1
+    return None
+
+
+def _is_placement_valid_in_cur_env(placement_tuple) -> bool:
+    _, machine_device_ids, _ = placement_tuple
+    local_world_size = flow.env.get_world_size() // flow.env.get_node_size()
+    return all(
+        machine_id < flow.env.get_node_size()
+        and all(device_id < local_world_size for device_id in device_ids)
+        for machine_id, device_ids in machine_device_ids.items()
+    )
+
+
+def _balanced_range(start: int, stop: int, num: int, index: int) -> Tuple[int, int]:
+    # The same partition as BalancedSplitter: the first (size % num) parts get one more
+    base, remainder = divmod(stop - start, num)
+    begin = start + index * base + min(index, remainder)
+    return (begin, begin + base + (1 if index < remainder else 0))
+
+
+def _shard_slices(shape, hierarchy, split_axes, parallel_id):
+    r"""The [start, stop) range of each axis of the local tensor of ``parallel_id``."""
+    ranges = [(0, d) for d in shape]
+    hierarchy_index = np.unravel_index(parallel_id, hierarchy)
+    for k, axis in enumerate(split_axes):
+        if axis is None:
+            continue
+        ranges[axis] = _balanced_range(
+            *ranges[axis], hierarchy[k], int(hierarchy_index[k])
+        )
+    return tuple(ranges)
+
+
+def _is_evenly_split(shape, hierarchy, split_axes):
+    sizes = list(shape)
+    for k, axis in enumerate(split_axes):
+        if axis is None:
+            continue
+        if sizes[axis] % hierarchy[k] != 0:
+            return False
+        sizes[axis] //= hierarchy[k]
+    return True
+
+
+def _local_device(placement_tuple):
+    device_type = placement_tuple[0]
+    if device_type == "cpu":
+        return flow.device("cpu")
+    return flow.device(device_type, flow.env.get_local_rank())
+
+
+def _sharded_tensor_getstate(tensor, rel_dir_name, abs_dir_name):
+    r"""Every rank only writes its own local shard, shards replicated on several ranks
+    are written by the first one of them.
+    """
+    if any(_sbp_is_partial_sum(sbp) for sbp in tensor.sbp):
+        tensor = tensor.to_consistent(
+            sbp=[
+                flow.sbp.broadcast if _sbp_is_partial_sum(sbp) else sbp
+                for sbp in tensor.sbp
+            ]
+        )
+    placement_tuple = _placement_to_tuple(tensor.placement)
+    hierarchy = placement_tuple[2]
+    split_axes = [_sbp_split_axis(sbp) for sbp in tensor.sbp]
+    shape = tuple(tensor.shape)
+    owner_of_slices = {}
+    shards = []
+    for parallel_id in range(int(np.prod(hierarchy))):
+        slices = _shard_slices(shape, hierarchy, split_axes, parallel_id)
+        if slices not in owner_of_slices:
+            owner_of_slices[slices] = parallel_id
+            shards.append(
+                {"file": SHARD_FILENAME_PREFIX + str(parallel_id), "slices": slices}
+            )
+    parallel_id = _parallel_id_of_cur_rank(placement_tuple)
+    if parallel_id is not None:
+        slices = _shard_slices(shape, hierarchy, split_axes, parallel_id)
+        if owner_of_slices[slices] == parallel_id:
+            os.makedirs(abs_dir_name, exist_ok=True)
+            with open(
+                os.path.join(abs_dir_name, SHARD_FILENAME_PREFIX + str(parallel_id)),
+                "wb",
+            ) as f:
+                f.write(tensor.to_local().numpy().tobytes())
+    return {
+        "sharded_path": rel_dir_name,
+        "shape": shape,
+        "dtype": tensor.dtype,
+        "placement": placement_tuple,
+        "sbp": tuple(str(sbp) for sbp in tensor.sbp),
+        "shards": shards,
+    }
+
+
+def _read_sharded_slices(abs_dir_name, state, slices) -> np.ndarray:
+    np_dtype = dtype_util.convert_oneflow_dtype_to_numpy_dtype(state["dtype"])
+    out = np.empty([stop - start for start, stop in slices], dtype=np_dtype)
+    for shard in state["shards"]:
+        shard_slices = shard["slices"]
+        overlap = [
+            (max(start, shard_start), min(stop, shard_stop))
+            for (start, stop), (shard_start, shard_stop) in zip(slices, shard_slices)
+        ]
+        if any(start >= stop for start, stop in overlap):
+            continue
+        shard_shape = tuple(stop - start for start, stop in shard_slices)
+        if _ElemCnt(shard_shape) == 0:
+            continue
+        shard_data = np.memmap(
+            os.path.join(abs_dir_name, shard["file"]),
+            dtype=np_dtype,
+            mode="r",
+            shape=shard_shape,
+        )
+        src = tuple(
+            slice(start - shard_start, stop - shard_start)
+            for (start, stop), (shard_start, _) in zip(overlap, shard_slices)
+        )
+        dst = tuple(
+            slice(start - out_start, stop - out_start)
+            for (start, stop), (out_start, _) in zip(overlap, slices)
+        )
+        out[dst] = shard_data[src]
+        del shard_data
+    return out
+
+
+def _load_sharded_tensor(abs_dir_name, state, placement=None, sbp=None):
+    r"""Load a tensor saved by ``flow.save(..., sharded=True)`` as a consistent tensor
+    with ``placement`` and ``sbp``, which default to the ones when it is saved. Every
+    rank only reads the parts of the shards overlapping with its local tensor.
+    """
+    if placement is None:
+        placement_tuple = state["placement"]
+        if not _is_placement_valid_in_cur_env(placement_tuple):
+            raise RuntimeError(
+                "The placement "
+                + str(placement_tuple)
+                + " of the sharded checkpoint is not valid in the current environment, "
+                "please pass the placement argument of oneflow.load to reshard it."
+            )
+        placement = _placement_from_tuple(placement_tuple)
+    else:
+        placement_tuple = _placement_to_tuple(placement)
+    hierarchy = placement_tuple[2]
+    if sbp is None:
+        if len(state["sbp"]) == len(hierarchy):
+            sbp = [
+                flow.sbp.broadcast
+                if _sbp_split_axis(s) is None
+                else flow.sbp.split(_sbp_split_axis(s))
+                for s in state["sbp"]
+            ]
+        else:
+            sbp = [flow.sbp.broadcast] * len(hierarchy)
+    elif isinstance(sbp, flow.sbp.sbp):
+        sbp = [sbp]
+    sbp = list(sbp)
+    assert len(sbp) == len(hierarchy)
+    assert not any(
+        _sbp_is_partial_sum(s) for s in sbp
+    ), "can not load a tensor with partial_sum sbp"
+    split_axes = [_sbp_split_axis(s) for s in sbp]
+    shape = tuple(state["shape"])
+    # Multi-dimensional uneven split can not be built from local tensors, load the
+    # whole tensor on every rank and split it then.
+    load_sbp = sbp
+    if len(hierarchy) > 1 and not _is_evenly_split(shape, hierarchy, split_axes):
+        load_sbp = [flow.sbp.broadcast] * len(hierarchy)
+        split_axes = [None] * len(hierarchy)
+    parallel_id = _parallel_id_of_cur_rank(placement_tuple)
+    if parallel_id is None:
+        local = flow.tensor([], dtype=state["dtype"])
+    else:
+        slices = _shard_slices(shape, hierarchy, split_axes, parallel_id)
+        local = flow.tensor(
+            _read_sharded_slices(abs_dir_name, state, slices),
+            dtype=state["dtype"],
+            device=_local_device(placement_tuple),
+        )
+    loaded = local.to_consistent(placement, load_sbp)
+    if load_sbp is not sbp:
+        loaded = loaded.to_consistent(sbp=sbp)
+    return loaded
 
 
 def _broadcast_py_object(obj, src: int = 0):
@@ -163,7 +432,12 @@ def tensor_getstate(self):
         # save_load_path is not None means setstate/getstate is called inside
         # flow.save or flow.load
         assert isinstance(save_load_path, Path)
-        if consistent_src_dsk_rank is None:
+        if sharded_save and not self.is_local:
+            rel_dir_name = f"consistent_tensor_{self.consistent_id()}"
+            return _sharded_tensor_getstate(
+                self, rel_dir_name, save_load_path / rel_dir_name
+            )
+        elif consistent_src_dsk_rank is None:
             assert self.is_local
             rel_dir_name = id_util.UniqueStr("tensor_")
             abs_dir_name = save_load_path / rel_dir_name
@@ -177,11 +451,18 @@ def tensor_getstate(self):
             tensor = self.to_consistent(
                 sbp=[flow.sbp.broadcast] * len(self.sbp)
             ).to_local()
-        if (
+        if sharded_save:
+            # Only the pickled data of rank 0 is written in sharded saving
+            if flow.env.get_rank() == 0:
+                _save_tensor_to_disk(tensor, abs_dir_name)
+        elif (
             consistent_src_dsk_rank is None
             or consistent_src_dsk_rank == flow.env.get_rank()
         ):
-            _save_tensor_to_disk(tensor, abs_dir_name)
+            if checkpoint_container is not None:
+                checkpoint_container.add(rel_dir_name, tensor.numpy(), tensor.dtype)
+            else:
+                _save_tensor_to_disk(tensor, abs_dir_name)
 
         return {"path": rel_dir_name}
     else:
@@ -196,9 +477,21 @@ def tensor_getstate(self):
 def tensor_setstate(self, pickle_dict):
     if save_load_path is not None:
         assert isinstance(save_load_path, Path)
+        if "sharded_path" in pickle_dict:
+            abs_dir_name = save_load_path / pickle_dict["sharded_path"]
+            return self.__init__(
+                _load_sharded_tensor(
+                    str(abs_dir_name), pickle_dict, *sharded_load_placement_and_sbp
+                )
+            )
         rel_dir_name = pickle_dict["path"]
-        abs_dir_name = save_load_path / rel_dir_name
-        self.__init__(_LoadSingleVariable(str(abs_dir_name), consistent_src_dsk_rank))
+        if checkpoint_container is not None:
+            variable = checkpoint_container.variable(rel_dir_name)
+        else:
+            variable = str(save_load_path / rel_dir_name)
+        self.__init__(
+            _LoadSingleVariable(variable, consistent_src_dsk_rank, mmap=load_with_mmap)
+        )
     else:
         return self.__init__(
             flow.tensor(pickle_dict["data"], dtype=pickle_dict["dtype"])
@@ -232,64 +525,263 @@ def legacy_load(
 
 
 @contextmanager
-def tensor_pickling_context(path: Path, consistent_src_dst_rank: int):
+def tensor_pickling_context(
+    path: Path,
+    consistent_src_dst_rank: int,
+    sharded: bool = False,
+    placement=None,
+    sbp=None,
+    mmap: bool = False,
+    container=None,
+):
     global save_load_path
     global consistent_src_dsk_rank
+    global sharded_save
+    global sharded_load_placement_and_sbp
+    global load_with_mmap
+    global checkpoint_container
     consistent_src_dsk_rank = consistent_src_dst_rank
     save_load_path = path
+    sharded_save = sharded
+    sharded_load_placement_and_sbp = (placement, sbp)
+    load_with_mmap = mmap
+    checkpoint_container = container
     try:
         yield
     finally:
         consistent_src_dsk_rank = None
         save_load_path = None
+        sharded_save = False
+        sharded_load_placement_and_sbp = (None, None)
+        load_with_mmap = False
+        checkpoint_container = None
+
+
+class _LazyTensor(object):
+    r"""Placeholder of a tensor unpickled by ``flow.load(..., mmap=True)``, which
+    records the pickled state and loads the tensor when it is accessed.
+    """
 
+    tensor_cls = None
+    pickling_context_kwargs = None
+
+    def __setstate__(self, pickle_dict):
+        self.pickle_dict = pickle_dict
+
+    def materialize(self) -> "flow.Tensor":
+        tensor = self.tensor_cls.__new__(self.tensor_cls)
+        with tensor_pickling_context(**self.pickling_context_kwargs):
+            tensor.__setstate__(self.pickle_dict)
+        return tensor
+
+
+class _LazyTensorUnpickler(pickle.Unpickler):
+    def __init__(self, file, pickling_context_kwargs):
+        super().__init__(file)
+        self._pickling_context_kwargs = pickling_context_kwargs
+        self._lazy_classes = {}
+
+    def find_class(self, module, name):
+        cls = super().find_class(module, name)
+        if isinstance(cls, type) and issubclass(cls, flow.Tensor):
+            if cls not in self._lazy_classes:
+                self._lazy_classes[cls] = type(
+                    "_LazyTensor",
+                    (_LazyTensor,),
+                    {
+                        "tensor_cls": cls,
+                        "pickling_context_kwargs": self._pickling_context_kwargs,
+                    },
+                )
+            return self._lazy_classes[cls]
+        return cls
+
+
+class LazyStateDict(OrderedDict):
+    r"""A dict returned by ``flow.load(..., mmap=True)``, tensor values are loaded
+    when they are first accessed, so ``load_state_dict`` only reads the tensors it
+    consumes.
+    """
 
-def load(path: str, consistent_src_rank: Optional[int] = None,) -> Any:
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, _LazyTensor):
+            value = value.materialize()
+            super().__setitem__(key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def pop(self, key, *args):
+        if key in self:
+            value = self[key]
+            super().__delitem__(key)
+            return value
+        return super().pop(key, *args)
+
+    def values(self):
+        return [self[k] for k in self.keys()]
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def copy(self):
+        copied = LazyStateDict()
+        for k in self.keys():
+            OrderedDict.__setitem__(copied, k, OrderedDict.__getitem__(self, k))
+        if hasattr(self, "_metadata"):
+            copied._metadata = self._metadata
+        return copied
+
+    def __reduce__(self):
+        return (OrderedDict, (self.items(),))
+
+    def __repr__(self):
+        return repr(OrderedDict(self.items()))
+
+
+def _wrap_lazy_tensors(obj):
+    r"""Keep the tensors directly in dicts lazy, and load the other ones."""
+    if isinstance(obj, _LazyTensor):
+        return obj.materialize()
+    if type(obj) in (dict, OrderedDict):
+        values = {
+            k: v if isinstance(v, _LazyTensor) else _wrap_lazy_tensors(v)
+            for k, v in obj.items()
+        }
+        if not any(isinstance(v, _LazyTensor) for v in values.values()):
+            obj.update(values)
+            return obj
+        wrapped = LazyStateDict()
+        for k, v in values.items():
+            OrderedDict.__setitem__(wrapped, k, v)
+        if hasattr(obj, "_metadata"):
+            wrapped._metadata = obj._metadata
+        return wrapped
+    if isinstance(obj, list):
+        obj[:] = [_wrap_lazy_tensors(v) for v in obj]
+        return obj
+    if type(obj) is tuple:
+        return tuple(_wrap_lazy_tensors(v) for v in obj)
+    return obj
+
+
+def _barrier():
+    flow.zeros(1).to_consistent(
+        flow.env.all_device_placement("cpu"), flow.sbp.split(0)
+    ).to_consistent(sbp=flow.sbp.broadcast).to_local().numpy()
+
+
+def load(
+    path: str,
+    consistent_src_rank: Optional[int] = None,
+    placement: Optional[flow.placement] = None,
+    sbp=None,
+    mmap: bool = False,
+) -> Any:
     r"""Loads an object saved with oneflow.save() from a directory.
 
     Args:
-        path (str): The directory containing the object
+        path (str): The directory containing the object, or the file
+            saved with `single_file=True`
         consistent_src_rank (int, optional): The source rank for 
             loading consistent tensors. When specified, only the 
             process whose rank == consistent_src_rank will really
             read the files in `path`, and tensors in the loaded
             object will be consistent with placement = 
             `flow.placement('cuda', [consistent_src_rank])`
+        placement (flow.placement, optional): The placement of the
+            consistent tensors saved with `sharded=True`. Defaults to
+            the placement when they are saved. Pass it to reshard a
+            checkpoint saved with a different world size.
+        sbp (flow.sbp.sbp or tuple of flow.sbp.sbp, optional): The sbp
+            of the consistent tensors saved with `sharded=True`. Defaults
+            to the sbp when they are saved.
+        mmap (bool, optional): Whether to memory-map the tensor files
+            instead of reading them into intermediate buffers. Tensors
+            in dicts (like state dicts) are also loaded lazily when they
+            are first accessed, so `load_state_dict` only reads the
+            tensors it consumes. Consistent tensors must be accessed in
+            the same order on all ranks.
 
     Returns:
         The loaded object
     """
     path: Path = Path(path)
-    assert path.is_dir(), "Directory {} doesn't exist!".format(path)
+    async_checkpoint.recover_replaced_dir(path)
+    assert (
+        path.is_dir() or path.is_file()
+    ), "Directory or file {} doesn't exist!".format(path)
     pickle_path = path / PICKLE_FILENAME
     rank = flow.env.get_rank()
-    if consistent_src_rank is None or consistent_src_rank == rank:
-        is_legacy = not pickle_path.exists()
+    is_reading_rank = consistent_src_rank is None or consistent_src_rank == rank
+    if is_reading_rank:
+        is_container = checkpoint_container_util.is_container_file(path)
+        is_legacy = not is_container and not pickle_path.exists()
         if consistent_src_rank is not None:
-            _broadcast_py_object(is_legacy, consistent_src_rank)
+            _broadcast_py_object((is_container, is_legacy), consistent_src_rank)
     else:
-        is_legacy = _broadcast_py_object(None, consistent_src_rank)
+        (is_container, is_legacy) = _broadcast_py_object(None, consistent_src_rank)
     if is_legacy:
         return legacy_load(path, consistent_src_rank)
 
+    container = None
+    if is_container and is_reading_rank:
+        container = checkpoint_container_util.ContainerReader(str(path))
     if consistent_src_rank is not None:
         if rank == consistent_src_rank:
-            pickle_bytes = pickle_path.read_bytes()
+            if container is not None:
+                pickle_bytes = container.pickled_bytes
+            else:
+                pickle_bytes = pickle_path.read_bytes()
             _broadcast_py_object(pickle_bytes, consistent_src_rank)
         else:
             pickle_bytes = _broadcast_py_object(None, consistent_src_rank)
+    elif container is not None:
+        pickle_bytes = container.pickled_bytes
     else:
         pickle_bytes = pickle_path.read_bytes()
 
-    with tensor_pickling_context(path, consistent_src_rank):
-        res = pickle.loads(pickle_bytes)
+    if mmap:
+        res = _LazyTensorUnpickler(
+            io.BytesIO(pickle_bytes),
+            {
+                "path": path,
+                "consistent_src_dst_rank": consistent_src_rank,
+                "placement": placement,
+                "sbp": sbp,
+                "mmap": True,
+                "container": container,
+            },
+        ).load()
+        assert res["protocol_version"] == PROTOCOL_VERSION
+        return _wrap_lazy_tensors(res["data"])
+    if container is not None:
+        # The tensors are read with parallel range reads a bounded number of bytes
+        # ahead of the unpickler, instead of all before it.
+        container.start_read_ahead()
+    try:
+        with tensor_pickling_context(
+            path, consistent_src_rank, placement=placement, sbp=sbp, container=container
+        ):
+            res = pickle.loads(pickle_bytes)
+    finally:
+        if container is not None:
+            container.close()
     assert res["protocol_version"] == PROTOCOL_VERSION
     return res["data"]
 
 
 def save(
-    obj: Any, path: Union[str, Path], consistent_dst_rank: Optional[int] = None,
-) -> None:
+    obj: Any,
+    path: Union[str, Path],
+    consistent_dst_rank: Optional[int] = None,
+    sharded: bool = False,
+    async_: bool = False,
+    single_file: bool = False,
+    checksum: bool = False,
+) -> Optional[Future]:
     r"""Save an object to a directory.
 
     Args:
@@ -300,18 +792,124 @@ def save(
             will be saved by the process whose rank == 
             consistent_src_rank, while other processes will not do any
             disk I/O.
+        sharded (bool, optional): Whether every rank saves only its
+            local shards of consistent tensors together with their
+            placement and sbp, instead of gathering whole tensors. All
+            ranks must be able to read `path` when loading, and the
+            checkpoint can be loaded with another placement or sbp.
+        async_ (bool, optional): Whether to write files in background
+            threads. Tensors are snapshotted into host memory before
+            returning, so they can be modified right after. The files are
+            written into a temporary directory which is renamed to `path`
+            when all of them are written and synced. Returns a
+            `concurrent.futures.Future` which is done when `path` is
+            complete, or raises the error of writing.
+        single_file (bool, optional): Whether to save the object and all
+            tensors into a single file at `path` instead of a directory
+            with a subdirectory per tensor. The file holds an index of the
+            offsets, shapes and dtypes of the aligned tensor payloads, so
+            tensors can be read with parallel range reads.
+        checksum (bool, optional): Whether to store the crc32 of every
+            tensor in a single-file checkpoint, which is verified when
+            the tensor is loaded without `mmap`.
     """
+    assert not (
+        sharded and consistent_dst_rank is not None
+    ), "consistent_dst_rank can not be used with sharded saving"
+    assert not (sharded and async_), "async_ can not be used with sharded saving"
+    assert not (
+        single_file and (sharded or async_)
+    ), "single_file can not be used with sharded or async_ saving"
     path: Path = Path(path)
     obj = {"protocol_version": PROTOCOL_VERSION, "data": obj}
-    with tensor_pickling_context(path, consistent_dst_rank):
+    if async_:
+        return _async_save(obj, path, consistent_dst_rank)
+    if single_file:
+        return _single_file_save(obj, path, consistent_dst_rank, checksum)
+    if sharded:
+        path.mkdir(exist_ok=True)
+    with tensor_pickling_context(path, consistent_dst_rank, sharded=sharded):
         pickled_bytes = pickle.dumps(obj)
     rank = flow.env.get_rank()
-    if consistent_dst_rank is None or consistent_dst_rank == rank:
+    if sharded:
+        # pickled_data is written after all the shards are written
+        _barrier()
+        if rank == 0:
+            (path / PICKLE_FILENAME).write_bytes(pickled_bytes)
+    elif consistent_dst_rank is None or consistent_dst_rank == rank:
         path.mkdir(exist_ok=True)
         pickle_path = path / PICKLE_FILENAME
         pickle_path.write_bytes(pickled_bytes)
 
 
+def _single_file_save(
+    obj: Any, path: Path, consistent_dst_rank: Optional[int], checksum: bool
+) -> None:
+    rank = flow.env.get_rank()
+    container = None
+    if consistent_dst_rank is None or consistent_dst_rank == rank:
+        container = checkpoint_container_util.ContainerWriter(
+            str(path), checksum=checksum
+        )
+    try:
+        with tensor_pickling_context(path, consistent_dst_rank, container=container):
+            pickled_bytes = pickle.dumps(obj)
+    except BaseException:
+        if container is not None:
+            container.abort()
+        raise
+    if container is not None:
+        container.finish(pickled_bytes)
+
+
+def _async_save(obj: Any, path: Path, consistent_dst_rank: Optional[int]) -> Future:
+    global async_save_snapshots
+    global async_save_reservation
+    rank = flow.env.get_rank()
+    writer = async_checkpoint.get_writer()
+    tmp_path = async_checkpoint.tmp_dir_for(path, rank)
+    async_save_snapshots = []
+    async_save_reservation = writer.new_reservation()
+    try:
+        with tensor_pickling_context(tmp_path, consistent_dst_rank):
+            pickled_bytes = pickle.dumps(obj)
+        snapshots = async_save_snapshots
+        reservation = async_save_reservation
+    finally:
+        async_save_snapshots = None
+        async_save_reservation = None
+    if not (consistent_dst_rank is None or consistent_dst_rank == rank):
+        assert len(snapshots) == 0
+        done = Future()
+        done.set_result(None)
+        return done
+
+    def write_fn(data, dtype, dir_name):
+        return lambda: _write_tensor_to_disk(data, dtype, dir_name, fsync=True)
+
+    def commit_fn():
+        tmp_path.mkdir(parents=True, exist_ok=True)
+        pickle_path = tmp_path / PICKLE_FILENAME
+        with open(pickle_path, "wb") as f:
+            f.write(pickled_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+        for _, _, dir_name in snapshots:
+            async_checkpoint.fsync_dir(str(dir_name))
+        async_checkpoint.fsync_dir(str(tmp_path))
+        async_checkpoint.atomic_replace_dir(tmp_path, path)
+
+    def abort_fn():
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return writer.submit(
+        reservation,
+        [write_fn(*snapshot) for snapshot in snapshots],
+        commit_fn,
+        abort_fn,
+    )
+
+
 def generate_values_by_initializer(initializer, shape, dtype):
     np_dtype = np.dtype(dtype_util.convert_oneflow_dtype_to_numpy_dtype(dtype))
     length = _ElemCnt(shape)
@@ -320,3 +918,11 @@ def generate_values_by_initializer(initializer, shape, dtype):
 
 save_load_path = None
 consistent_src_dsk_rank = None
+sharded_save = False
+sharded_load_placement_and_sbp = (None, None)
+load_with_mmap = False
+# The ContainerWriter or ContainerReader of single-file checkpoints
+checkpoint_container = None
+# Not None inside async flow.save, tensors are snapshotted instead of written
+async_save_snapshots = None
+async_save_reservation = None
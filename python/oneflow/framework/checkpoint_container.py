@@ -0,0 +1,268 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import collections
+import concurrent.futures
+import os
+import pickle
+import struct
+import zlib
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+import oneflow
+import oneflow._oneflow_internal
+import oneflow.framework.dtype as dtype_util
+
+# Layout of a checkpoint container file:
+#   | magic (8 bytes) | index offset (uint64) | aligned tensor payloads ... | index |
+# The index is a pickled dict holding the pickled object and the offset, shape,
+# dtype and optional crc32 of every tensor payload, so tensors can be read with
+# independent range reads.
+CONTAINER_MAGIC = b"OFCKPT\x00\x01"
+CONTAINER_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sQ")
+DEFAULT_ALIGNMENT = 64
+# os.preadv is only available on some platforms (e.g. not on Windows), tensors
+# are read with seek + readinto elsewhere.
+_HAS_PREADV = hasattr(os, "preadv")
+
+
+def is_container_file(path) -> bool:
+    if not os.path.isfile(path):
+        return False
+    with open(path, "rb") as f:
+        return f.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+
+
+class ContainerWriter(object):
+    r"""Writes tensors into a single checkpoint file. The file is written to a
+    temporary path and renamed to ``path`` by :meth:`finish`.
+    """
+
+    def __init__(
+        self, path: str, alignment: int = DEFAULT_ALIGNMENT, checksum: bool = False
+    ):
+        assert alignment > 0 and alignment & (alignment - 1) == 0
+        self._path = path
+        self._tmp_path = path + ".tmp"
+        self._alignment = alignment
+        self._checksum = checksum
+        self._entries = {}
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(_HEADER.pack(CONTAINER_MAGIC, 0))
+
+    def _pad_to_alignment(self):
+        offset = self._file.tell()
+        padding = -offset % self._alignment
+        if padding > 0:
+            self._file.write(b"\0" * padding)
+        return offset + padding
+
+    def add(self, name: str, data: np.ndarray, dtype: oneflow.dtype) -> None:
+        assert name not in self._entries, "Duplicated tensor " + name
+        data = np.ascontiguousarray(data)
+        offset = self._pad_to_alignment()
+        self._file.write(data.data)
+        self._entries[name] = {
+            "offset": offset,
+            "nbytes": data.nbytes,
+            "shape": tuple(data.shape),
+            "data_type": oneflow._oneflow_internal.deprecated.GetProtoDtype4OfDtype(
+                dtype
+            ),
+            "crc32": zlib.crc32(data.data) if self._checksum else None,
+        }
+
+    def finish(self, pickled_bytes: bytes) -> None:
+        index_offset = self._pad_to_alignment()
+        pickle.dump(
+            {
+                "format_version": CONTAINER_FORMAT_VERSION,
+                "alignment": self._alignment,
+                "pickled_data": pickled_bytes,
+                "tensors": self._entries,
+            },
+            self._file,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(CONTAINER_MAGIC, index_offset))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self._path)
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class ContainerVariable(object):
+    r"""A tensor in a checkpoint container, with the same interface as
+    ``FileBackendVariableBlob``.
+    """
+
+    def __init__(self, reader: "ContainerReader", name: str):
+        self._reader = reader
+        self._name = name
+        self._entry = reader.entry(name)
+
+    @property
+    def shape(self) -> Tuple[int]:
+        return self._entry["shape"]
+
+    @property
+    def dtype(self) -> oneflow.dtype:
+        return dtype_util.convert_proto_dtype_to_oneflow_dtype(self._entry["data_type"])
+
+    def numpy(self, mmap: bool = False) -> np.ndarray:
+        return self._reader.read(self._name, mmap=mmap)
+
+
+class ContainerReader(object):
+    def __init__(self, path: str):
+        self._path = path
+        with open(path, "rb") as f:
+            magic, index_offset = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != CONTAINER_MAGIC:
+                raise RuntimeError(path + " is not a OneFlow checkpoint file")
+            f.seek(index_offset)
+            index = pickle.load(f)
+        if index["format_version"] != CONTAINER_FORMAT_VERSION:
+            raise RuntimeError(
+                "Checkpoint file "
+                + path
+                + " is saved with an incompatible format version."
+            )
+        self._index = index
+        self._read_ahead_pool = None
+
+    @property
+    def pickled_bytes(self) -> bytes:
+        return self._index["pickled_data"]
+
+    @property
+    def names(self) -> Iterable[str]:
+        return self._index["tensors"].keys()
+
+    def entry(self, name: str) -> Dict:
+        return self._index["tensors"][name]
+
+    def variable(self, name: str) -> ContainerVariable:
+        return ContainerVariable(self, name)
+
+    def _np_dtype(self, entry):
+        return dtype_util.convert_oneflow_dtype_to_numpy_dtype(
+            dtype_util.convert_proto_dtype_to_oneflow_dtype(entry["data_type"])
+        )
+
+    def _read_range(self, entry) -> np.ndarray:
+        buf = bytearray(entry["nbytes"])
+        view = memoryview(buf)
+        with open(self._path, "rb", buffering=0) as f:
+            done = 0
+            if _HAS_PREADV:
+                while done < len(buf):
+                    n = os.preadv(f.fileno(), [view[done:]], entry["offset"] + done)
+                    if n == 0:
+                        break
+                    done += n
+            else:
+                f.seek(entry["offset"])
+                while done < len(buf):
+                    n = f.readinto(view[done:])
+                    if not n:
+                        break
+                    done += n
+        if done < len(buf):
+            raise RuntimeError("Unexpected end of file " + self._path)
+        if entry["crc32"] is not None and zlib.crc32(buf) != entry["crc32"]:
+            raise RuntimeError("Checksum mismatch of a tensor in " + self._path)
+        return np.frombuffer(buf, dtype=self._np_dtype(entry)).reshape(entry["shape"])
+
+    def read(self, name: str, mmap: bool = False) -> np.ndarray:
+        if self._read_ahead_pool is not None:
+            self._unread_names.discard(name)
+            future = self._read_ahead_futures.pop(name, None)
+            if future is not None:
+                self._read_ahead_bytes -= self.entry(name)["nbytes"]
+                self._schedule_read_ahead()
+                return future.result()
+        entry = self.entry(name)
+        if mmap and entry["nbytes"] > 0:
+            return np.memmap(
+                self._path,
+                dtype=self._np_dtype(entry),
+                mode="r",
+                offset=entry["offset"],
+                shape=entry["shape"],
+            )
+        return self._read_range(entry)
+
+    def start_read_ahead(
+        self,
+        num_threads: int = 8,
+        max_tensors: int = 16,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        r"""Reads the tensors in index order, which is the order they are unpickled
+        in, with parallel range reads ahead of :meth:`read`. At most ``max_tensors``
+        tensors and ``max_bytes`` bytes (but at least one tensor) are read ahead, so
+        the peak memory stays bounded. :meth:`close` stops the reads.
+        """
+        assert self._read_ahead_pool is None
+        self._read_ahead_pool = concurrent.futures.ThreadPoolExecutor(num_threads)
+        self._max_read_ahead_tensors = max_tensors
+        self._max_read_ahead_bytes = max_bytes
+        self._read_ahead_bytes = 0
+        self._read_ahead_futures = collections.OrderedDict()
+        self._unread_names = set(self.names)
+        self._names_to_read_ahead = collections.deque(self.names)
+        self._schedule_read_ahead()
+
+    def _schedule_read_ahead(self):
+        while (
+            len(self._names_to_read_ahead) > 0
+            and len(self._read_ahead_futures) < self._max_read_ahead_tensors
+        ):
+            name = self._names_to_read_ahead[0]
+            if name not in self._unread_names:
+                # read without read-ahead already
+                self._names_to_read_ahead.popleft()
+                continue
+            entry = self.entry(name)
+            if (
+                len(self._read_ahead_futures) > 0
+                and self._read_ahead_bytes + entry["nbytes"]
+                > self._max_read_ahead_bytes
+            ):
+                break
+            self._names_to_read_ahead.popleft()
+            self._read_ahead_futures[name] = self._read_ahead_pool.submit(
+                self._read_range, entry
+            )
+            self._read_ahead_bytes += entry["nbytes"]
+
+    def close(self) -> None:
+        if self._read_ahead_pool is None:
+            return
+        for future in self._read_ahead_futures.values():
+            future.cancel()
+        self._read_ahead_pool.shutdown(wait=True)
+        self._read_ahead_pool = None
+        self._read_ahead_futures = None
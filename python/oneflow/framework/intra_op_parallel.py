@@ -0,0 +1,40 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import oneflow as flow
+
+
+def set_num_threads(num_threads: int) -> None:
+    r"""Sets the number of threads used for intra-op parallelism of CPU kernels.
+
+    The default is the number of cores divided by the number of processes on
+    this node, and can also be set by the environment variable
+    ``ONEFLOW_NUM_THREADS``.
+
+    Args:
+        num_threads (int): the number of threads, ``1`` runs every CPU kernel
+            in a single thread.
+
+    """
+    if not isinstance(num_threads, int) or num_threads <= 0:
+        raise ValueError(
+            "num_threads must be a positive integer, but got {}".format(num_threads)
+        )
+    flow._oneflow_internal.SetIntraOpNumThreads(num_threads)
+
+
+def get_num_threads() -> int:
+    r"""Returns the number of threads used for intra-op parallelism of CPU kernels."""
+    return flow._oneflow_internal.GetIntraOpNumThreads()
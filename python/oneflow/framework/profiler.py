@@ -13,6 +13,8 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import json
+
 import oneflow._oneflow_internal
 
 
@@ -30,3 +32,307 @@ def ProfilerStart():
 
 def ProfilerStop():
     oneflow._oneflow_internal.profiler.ProfilerStop()
+
+
+def _sync():
+    # The kernel fields of the events are written by the vm threads.
+    if oneflow.env.is_multi_client():
+        oneflow._oneflow_internal.eager.multi_client.Sync()
+    else:
+        oneflow._oneflow_internal.eager.single_client.Sync()
+
+
+class OpEvent(object):
+    r"""The record of one eager op call, times are in microseconds."""
+
+    def __init__(self, record):
+        self.id = record["id"]
+        self.name = record["op_type_name"]
+        self.device = record["device"]
+        self.input_shapes = [tuple(shape) for shape in record["input_shapes"]]
+        self.allocated_bytes = record["allocated_bytes"]
+        self.dispatch_thread_id = record["dispatch_thread_id"]
+        self.kernel_thread_id = record["kernel_thread_id"]
+        self.dispatch_start_us = record["dispatch_start_ns"] / 1000.0
+        self.dispatch_end_us = record["dispatch_end_ns"] / 1000.0
+        self.kernel_start_us = record["kernel_start_ns"] / 1000.0
+        self.kernel_end_us = record["kernel_end_ns"] / 1000.0
+
+    @property
+    def wall_time(self):
+        r"""The time spent by the calling thread to dispatch the op."""
+        return self.dispatch_end_us - self.dispatch_start_us
+
+    @property
+    def kernel_time(self):
+        r"""The time spent by the vm to allocate the outputs and run the kernel,
+        or 0 if the kernel has not run."""
+        if self.kernel_end_us < 0:
+            return 0.0
+        return self.kernel_end_us - self.kernel_start_us
+
+    @property
+    def self_time(self):
+        return self.kernel_time
+
+    def __repr__(self):
+        return (
+            "OpEvent(name={}, device={}, input_shapes={}, wall_time={:.3f}us, "
+            "kernel_time={:.3f}us, allocated_bytes={})"
+        ).format(
+            self.name,
+            self.device,
+            self.input_shapes,
+            self.wall_time,
+            self.kernel_time,
+            self.allocated_bytes,
+        )
+
+
+class OpEventAverage(object):
+    r"""The statistics of the op events sharing a key."""
+
+    def __init__(self, name, device, input_shapes):
+        self.name = name
+        self.device = device
+        self.input_shapes = input_shapes
+        self.count = 0
+        self.wall_time = 0.0
+        self.kernel_time = 0.0
+        self.allocated_bytes = 0
+
+    @property
+    def self_time(self):
+        return self.kernel_time
+
+    def add(self, event):
+        self.count += 1
+        self.wall_time += event.wall_time
+        self.kernel_time += event.kernel_time
+        self.allocated_bytes += event.allocated_bytes
+
+
+_SORT_KEYS = {
+    "self_time": lambda avg: avg.self_time,
+    "kernel_time": lambda avg: avg.kernel_time,
+    "wall_time": lambda avg: avg.wall_time,
+    "count": lambda avg: avg.count,
+    "allocated_bytes": lambda avg: avg.allocated_bytes,
+}
+
+
+class profile(object):
+    r"""Context manager recording every eager op dispatched inside it.
+
+    Each event carries the op type, the input shapes (if ``record_shapes``),
+    the device, the wall time of the dispatch, the kernel time and the bytes
+    allocated for the outputs and the temporary buffer. On devices other than
+    cpu, the vm waits for every profiled kernel so that its time covers the
+    device execution, which serializes the device work while profiling.
+
+    Args:
+        enabled (bool): profile nothing if ``False``. Default: ``True``
+        record_shapes (bool): record the input shapes. Default: ``False``
+
+    For example:
+
+    .. code-block:: python
+
+        >>> import oneflow as flow
+        >>> x = flow.randn(64, 64)
+        >>> with flow.profiler.profile(record_shapes=True) as prof:
+        ...     y = flow.matmul(x, x).relu()
+        >>> [event.name for event in prof.events()]
+        ['matmul', 'relu']
+
+    """
+
+    def __init__(self, enabled=True, record_shapes=False):
+        self.enabled = enabled
+        self.record_shapes = record_shapes
+        self._events = []
+
+    def __enter__(self):
+        if self.enabled:
+            _sync()
+            oneflow._oneflow_internal.profiler.EnableOpProfiler(self.record_shapes)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.enabled:
+            _sync()
+            records = oneflow._oneflow_internal.profiler.DisableOpProfiler()
+            self._events = [OpEvent(record) for record in records]
+
+    def events(self):
+        r"""Returns the recorded :class:`OpEvent` list in dispatch order."""
+        return self._events
+
+    def key_averages(self, group_by_input_shape=False):
+        r"""Aggregates the events by op type and device, and also by input
+        shapes if ``group_by_input_shape``."""
+        averages = {}
+        for event in self._events:
+            key = (event.name, event.device)
+            if group_by_input_shape:
+                key += (tuple(event.input_shapes),)
+            if key not in averages:
+                averages[key] = OpEventAverage(
+                    event.name,
+                    event.device,
+                    event.input_shapes if group_by_input_shape else None,
+                )
+            averages[key].add(event)
+        return list(averages.values())
+
+    def table(self, sort_by="self_time", row_limit=100, group_by_input_shape=False):
+        r"""Returns the :meth:`key_averages` as a table sorted by ``sort_by``,
+        which is one of ``"self_time"``, ``"kernel_time"``, ``"wall_time"``,
+        ``"count"`` and ``"allocated_bytes"``."""
+        if sort_by not in _SORT_KEYS:
+            raise ValueError(
+                "sort_by must be one of {}, but got {}".format(
+                    list(_SORT_KEYS.keys()), sort_by
+                )
+            )
+        averages = sorted(
+            self.key_averages(group_by_input_shape),
+            key=_SORT_KEYS[sort_by],
+            reverse=True,
+        )
+        # The percentages are relative to all the ops, not only the rows shown.
+        total_self_time = sum(avg.self_time for avg in averages) or 1.0
+        averages = averages[:row_limit]
+        headers = [
+            "Name",
+            "Device",
+            "Self %",
+            "Self time",
+            "Avg kernel",
+            "Wall time",
+            "Allocated",
+            "Calls",
+        ]
+        if group_by_input_shape:
+            headers.append("Input shapes")
+        rows = []
+        for avg in averages:
+            row = [
+                avg.name,
+                avg.device,
+                "{:.2f}%".format(avg.self_time / total_self_time * 100),
+                _format_time(avg.self_time),
+                _format_time(avg.kernel_time / avg.count),
+                _format_time(avg.wall_time),
+                _format_bytes(avg.allocated_bytes),
+                str(avg.count),
+            ]
+            if group_by_input_shape:
+                row.append(str([list(shape) for shape in avg.input_shapes]))
+            rows.append(row)
+        widths = [
+            max([len(header)] + [len(row[i]) for row in rows])
+            for (i, header) in enumerate(headers)
+        ]
+        separator = "  ".join("-" * width for width in widths)
+        lines = [separator, "  ".join(h.ljust(w) for (h, w) in zip(headers, widths))]
+        lines.append(separator)
+        for row in rows:
+            lines.append("  ".join(c.ljust(w) for (c, w) in zip(row, widths)))
+        lines.append(separator)
+        lines.append("Self time total: {}".format(_format_time(total_self_time)))
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path):
+        r"""Writes the events as a Chrome trace JSON file, which can be opened
+        by chrome://tracing or https://ui.perfetto.dev."""
+        with open(path, "w") as f:
+            json.dump(self._chrome_trace(), f)
+
+    def _chrome_trace(self):
+        trace_events = []
+        if len(self._events) == 0:
+            return {"traceEvents": trace_events}
+        origin = min(event.dispatch_start_us for event in self._events)
+        thread_names = {}
+        for event in self._events:
+            args = {
+                "id": event.id,
+                "device": event.device,
+                "allocated_bytes": event.allocated_bytes,
+            }
+            if self.record_shapes:
+                args["input_shapes"] = [list(shape) for shape in event.input_shapes]
+            thread_names[event.dispatch_thread_id] = "dispatch"
+            trace_events.append(
+                {
+                    "name": event.name,
+                    "cat": "dispatch",
+                    "ph": "X",
+                    "pid": 0,
+                    "tid": event.dispatch_thread_id,
+                    "ts": event.dispatch_start_us - origin,
+                    "dur": event.wall_time,
+                    "args": args,
+                }
+            )
+            if event.kernel_end_us < 0:
+                continue
+            thread_names[event.kernel_thread_id] = "vm stream"
+            trace_events.append(
+                {
+                    "name": event.name,
+                    "cat": "kernel",
+                    "ph": "X",
+                    "pid": 0,
+                    "tid": event.kernel_thread_id,
+                    "ts": event.kernel_start_us - origin,
+                    "dur": event.kernel_time,
+                    "args": args,
+                }
+            )
+            # An arrow from the dispatch to the kernel it launched.
+            for (ph, tid, ts) in (
+                ("s", event.dispatch_thread_id, event.dispatch_start_us),
+                ("f", event.kernel_thread_id, event.kernel_start_us),
+            ):
+                trace_events.append(
+                    {
+                        "name": "launch",
+                        "cat": "launch",
+                        "ph": ph,
+                        "bp": "e",
+                        "id": event.id,
+                        "pid": 0,
+                        "tid": tid,
+                        "ts": ts - origin,
+                    }
+                )
+        for (tid, name) in thread_names.items():
+            trace_events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 0,
+                    "tid": tid,
+                    "args": {"name": "{} {}".format(name, tid)},
+                }
+            )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def _format_time(time_us):
+    if time_us >= 1e6:
+        return "{:.3f}s".format(time_us / 1e6)
+    if time_us >= 1e3:
+        return "{:.3f}ms".format(time_us / 1e3)
+    return "{:.3f}us".format(time_us)
+
+
+def _format_bytes(num_bytes):
+    if num_bytes < 1024:
+        return "{}B".format(num_bytes)
+    for unit in ("KB", "MB", "GB"):
+        num_bytes /= 1024.0
+        if num_bytes < 1024 or unit == "GB":
+            return "{:.2f}{}".format(num_bytes, unit)
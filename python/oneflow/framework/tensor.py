@@ -699,6 +699,17 @@ def _init_by_initializer_conf(tensor, initializer_conf, random_seed=None):
     return tensor
 
 
+def _share_memory_(self):
+    r"""Kept for compatibility with code written for ``multiprocessing``. CPU tensors
+    sent through :mod:`oneflow.multiprocessing` always pass their data through POSIX
+    shared memory instead of pipes, so nothing needs to be moved here. The tensor is
+    still copied once on each side, in-place updates after sending are not visible
+    to the other process.
+    """
+    assert self.is_local, "share_memory_() only supports local tensors"
+    return self
+
+
 def _copy(self, other: Union[Tensor, np.ndarray]):
     if self.is_consistent:
         assert isinstance(other, Tensor)
@@ -787,6 +798,7 @@ def RegisterMethods():
     Tensor.normal_ = _normal
     Tensor.fill_ = _fill
     Tensor.copy_ = _copy
+    Tensor.share_memory_ = _share_memory_
     Tensor.get_device = _get_device
     Tensor._meta_repr = _meta_repr
     Tensor.abs = _abs
@@ -13,12 +13,23 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import os
+import sys
+import threading
+import multiprocessing.util
 from multiprocessing.reduction import ForkingPickler
 
+import numpy as np
+
 import oneflow as flow
 from oneflow.nn.parameter import Parameter
 from oneflow.framework.tensor import Tensor
 
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    shared_memory = None
+
 
 try:
     # Early load resource_sharer to prevent a partially initialized instance
@@ -31,8 +42,26 @@ except ImportError:
     pass
 
 
-def rebuild_tensor(cls, tensor_data, requires_grad):
-    t = flow.tensor(tensor_data)
+# Whether CPU tensors are sent through POSIX shared memory instead of pickling
+# their data into the pipe.
+_use_shared_memory = shared_memory is not None
+
+# A shared memory block starts with a header holding the number of times it has
+# been rebuilt, the tensor data follows at an aligned offset.
+_SHM_HEADER_SIZE = 64
+
+# The process that creates a shared memory block owns it: the block stays
+# registered with the resource tracker of the owner, so it is unlinked when the
+# owner exits even if the pickled tensor is never rebuilt. Receivers only attach
+# to the block and count their rebuilds, the owner unlinks rebuilt blocks when it
+# sends the next tensor. Like the file descriptor strategy of other frameworks,
+# the sending process has to stay alive until the tensors it sent are rebuilt.
+_owned_shms = {}
+_owner_pid = None
+_shm_lock = threading.Lock()
+
+
+def _rebuild(cls, t, requires_grad):
     if cls == Parameter:
         # we have to pass requires_grad into constructor, rather than set it as an
         # attribute later, because it's an important check for Integer Tensors to
@@ -43,13 +72,131 @@ def rebuild_tensor(cls, tensor_data, requires_grad):
     return t
 
 
+def rebuild_tensor(cls, tensor_data, requires_grad):
+    t = flow.tensor(tensor_data)
+    return _rebuild(cls, t, requires_grad)
+
+
+def _attach_shared_memory(shm_name):
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=shm_name, track=False)
+    # Before Python 3.13 attaching to a block registers it with the resource
+    # tracker, which would unlink it when the receiving process exits, or drop
+    # the registration of the owner when they share the tracker after a fork.
+    with _shm_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=shm_name)
+        finally:
+            resource_tracker.register = register
+
+
+def _rebuild_count(shm):
+    return np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+
+
+def _release_shared_memory(rebuilt_only=True):
+    with _shm_lock:
+        if _owner_pid != os.getpid():
+            return
+        for name in list(_owned_shms.keys()):
+            shm = _owned_shms[name]
+            if rebuilt_only and _rebuild_count(shm)[0] == 0:
+                continue
+            del _owned_shms[name]
+            shm.close()
+            shm.unlink()
+
+
+def _own_shared_memory(shm):
+    global _owner_pid
+    with _shm_lock:
+        if _owner_pid != os.getpid():
+            # Blocks inherited from the parent of a forked process are owned by
+            # the parent.
+            _owned_shms.clear()
+            _owner_pid = os.getpid()
+            # Runs after the feeder threads of queues are joined at exit.
+            multiprocessing.util.Finalize(
+                None,
+                _release_shared_memory,
+                kwargs={"rebuilt_only": False},
+                exitpriority=-100,
+            )
+        _owned_shms[shm.name] = shm
+
+
+def rebuild_tensor_from_shared_memory(cls, shm_name, shape, dtype, requires_grad):
+    try:
+        shm = _attach_shared_memory(shm_name)
+    except FileNotFoundError:
+        raise RuntimeError(
+            "The shared memory of a tensor has been released, the sending process "
+            "must stay alive until the tensors it sent are received."
+        )
+    try:
+        t = flow.empty(shape, dtype=dtype)
+        ndarray = np.ndarray(
+            shape,
+            dtype=flow.convert_oneflow_dtype_to_numpy_dtype(dtype),
+            buffer=shm.buf,
+            offset=_SHM_HEADER_SIZE,
+        )
+        # The only copy in the receiving process, from the shared memory into the
+        # tensor memory. It blocks until done, so the shared memory can be released.
+        method_name = t._get_copy_mirrored_tensor_from_numpy_func_name().replace(
+            "_copy_from_numpy_", "_copy_from_numpy_blocking_"
+        )
+        getattr(t, method_name)(ndarray)
+        del ndarray
+        count = _rebuild_count(shm)
+        count[0] += 1
+        del count
+    finally:
+        shm.close()
+    return _rebuild(cls, t, requires_grad)
+
+
+def _reduce_to_shared_memory(tensor):
+    _release_shared_memory()
+    shape = tuple(tensor.shape)
+    dtype = tensor.dtype
+    np_dtype = np.dtype(flow.convert_oneflow_dtype_to_numpy_dtype(dtype))
+    nbytes = int(np.prod(shape)) * np_dtype.itemsize
+    with _shm_lock:
+        shm = shared_memory.SharedMemory(create=True, size=_SHM_HEADER_SIZE + nbytes)
+    ndarray = np.ndarray(shape, dtype=np_dtype, buffer=shm.buf, offset=_SHM_HEADER_SIZE)
+    # The only copy in the sending process, from the tensor into the shared memory.
+    getattr(tensor, tensor._get_copy_mirrored_tensor_to_numpy_func_name())(ndarray)
+    del ndarray
+    _own_shared_memory(shm)
+    return (
+        rebuild_tensor_from_shared_memory,
+        (type(tensor), shm.name, shape, dtype, tensor.requires_grad),
+    )
+
+
+def _can_use_shared_memory(tensor):
+    return (
+        _use_shared_memory
+        and tensor.is_local
+        and tensor.dtype != flow.tensor_buffer
+        and tensor.nelement() > 0
+    )
+
+
 def reduce_tensor(tensor):
+    if _can_use_shared_memory(tensor):
+        return _reduce_to_shared_memory(tensor)
     tensor_data = tensor.numpy()
     requires_grad = tensor.requires_grad
     return (rebuild_tensor, (type(tensor), tensor_data, requires_grad))
 
 
 def reduce_local_tensor(tensor):
+    if _can_use_shared_memory(tensor):
+        return _reduce_to_shared_memory(tensor)
     tensor_data = tensor.numpy()
     requires_grad = tensor.requires_grad
     return (rebuild_tensor, (type(tensor), tensor_data, requires_grad))
@@ -95,6 +95,12 @@ class Block(object):
     def scope_context(self):
         return graph_build_util.BlockScopeContext(self.prev_scope, self.scope)
 
+    def _reset_build_cache(self):
+        # Scopes are created for the job being built, so they are rebuilt
+        # when nn.Graph builds a new job.
+        self._scope = None
+        self._prev_scope = None
+
 
 class ModuleBlock(Block):
     def __init__(
@@ -136,6 +142,14 @@ class ModuleBlock(Block):
                 n, get_block_cls(b)(self._name_prefix + self._name + ".", n, b)
             )
 
+    def _reset_build_cache(self):
+        super()._reset_build_cache()
+        self._args_repr = []
+        self._outs_repr = []
+        for d in (self._modules, self._parameters, self._buffers):
+            for (_, n) in d.items():
+                n._reset_build_cache()
+
     def debug(
         self,
         v_level: int = 0,
@@ -601,6 +615,11 @@ class TensorBlock(Block):
         ), "Only Parameter or Buffer Block has lazy_origin_builder"
         return self._lazy_origin_builder
 
+    def _reset_build_cache(self):
+        super()._reset_build_cache()
+        self._lazy_origin = None
+        self._lazy_origin_builder = None
+
     def set_lazy_origin_builder(self, fn=None):
         assert (
             self._type == BlockType.PARAMETER or self._type == BlockType.BUFFER
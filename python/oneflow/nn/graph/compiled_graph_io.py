@@ -0,0 +1,189 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import ast
+import hashlib
+import inspect
+import os
+import pickle
+import re
+
+import oneflow
+import oneflow._oneflow_internal
+from oneflow.framework.tensor import Tensor, TensorTuple
+
+COMPILED_GRAPH_FORMAT_VERSION = 1
+
+_PLACEMENT_PATTERN = re.compile(
+    r'device_type="(\w+)", machine_device_ids=(\{.*\}), hierarchy=(\(.*\))'
+)
+_SPLIT_SBP_PATTERN = re.compile(r"split\(axis=(\d+)\)")
+
+
+def compiled_graph_file(path, rank):
+    return os.path.join(path, "compiled_graph_rank_" + str(rank))
+
+
+def tensor_meta(t):
+    meta = {"shape": tuple(t.shape), "dtype": str(t.dtype)}
+    if t.is_consistent:
+        meta["placement"] = str(t.placement)
+        meta["sbp"] = tuple(str(s) for s in t.sbp)
+    else:
+        meta["device"] = str(t.device)
+    return meta
+
+
+def _parse_placement(placement_str):
+    m = _PLACEMENT_PATTERN.search(placement_str)
+    assert m is not None, "Invalid placement " + placement_str
+    return oneflow.placement(
+        m.group(1), ast.literal_eval(m.group(2)), ast.literal_eval(m.group(3))
+    )
+
+
+def _parse_sbp(sbp_str):
+    if sbp_str.endswith("broadcast"):
+        return oneflow.sbp.broadcast
+    if sbp_str.endswith("partial_sum"):
+        return oneflow.sbp.partial_sum
+    m = _SPLIT_SBP_PATTERN.search(sbp_str)
+    assert m is not None, "Invalid sbp " + sbp_str
+    return oneflow.sbp.split(int(m.group(1)))
+
+
+def empty_from_meta(meta):
+    dtype = getattr(oneflow, meta["dtype"].split(".")[-1])
+    with oneflow._oneflow_internal.lazy_mode.guard(False):
+        if "placement" in meta:
+            return oneflow.empty(
+                meta["shape"],
+                dtype=dtype,
+                placement=_parse_placement(meta["placement"]),
+                sbp=[_parse_sbp(s) for s in meta["sbp"]],
+            )
+        return oneflow.empty(meta["shape"], dtype=dtype, device=meta["device"])
+
+
+def io_meta(*args):
+    r"""Record the structure and tensor metas of nn.Graph inputs or outputs, which
+    are Tensor, list(Tensor) or None.
+    """
+    metas = []
+    for arg in args:
+        if isinstance(arg, Tensor):
+            metas.append(("tensor", tensor_meta(arg)))
+        elif isinstance(arg, (TensorTuple, list)):
+            metas.append(("list", [None if t is None else tensor_meta(t) for t in arg]))
+        else:
+            assert arg is None
+            metas.append(None)
+    return metas
+
+
+def empty_io_from_meta(metas):
+    args = []
+    for item in metas:
+        if item is None:
+            args.append(None)
+        elif item[0] == "tensor":
+            args.append(empty_from_meta(item[1]))
+        else:
+            args.append([None if m is None else empty_from_meta(m) for m in item[1]])
+    return args
+
+
+def _code_digest(code):
+    # The bytecode, names and constants of a code object and its nested code objects,
+    # so that a changed build() is detected even if its source is not available.
+    items = [code.co_code.hex(), repr(code.co_names), repr(code.co_varnames)]
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            items.append(_code_digest(const))
+        else:
+            items.append(repr(const))
+    return "|".join(items)
+
+
+def _class_code_digest(cls, base):
+    # Code of the methods defined by cls and its bases below base
+    items = []
+    for klass in cls.__mro__:
+        if klass is base or klass is object:
+            break
+        for name, attr in sorted(vars(klass).items()):
+            func = getattr(attr, "__func__", attr)
+            if inspect.isfunction(func):
+                items.append(name + ":" + _code_digest(func.__code__))
+    return "\n".join(items)
+
+
+def _module_structure(module):
+    items = []
+    user_module_types = []
+    for name, m in module.named_modules():
+        m_type = type(m)
+        items.append(name + ":" + m_type.__module__ + "." + m_type.__qualname__)
+        if not m_type.__module__.startswith("oneflow.") and (
+            m_type not in user_module_types
+        ):
+            user_module_types.append(m_type)
+    items.append(repr(module))
+    for m_type in user_module_types:
+        items.append(_class_code_digest(m_type, oneflow.nn.Module))
+    return "\n".join(items)
+
+
+def compiled_graph_cache_key(graph):
+    r"""Compiled plans are only valid for the same graph class and code, module
+    structure and code of user defined modules, states, config and OneFlow version.
+    """
+    items = [
+        type(graph).__module__ + "." + type(graph).__qualname__,
+        _class_code_digest(type(graph), oneflow.nn.Graph),
+        oneflow.__version__,
+        str(graph.config.proto),
+        str(graph.config._outputs_buffer_size),
+    ]
+    for name, block in graph._blocks.items():
+        if isinstance(block.origin, oneflow.nn.Module):
+            items.append(name + "\n" + _module_structure(block.origin))
+    for state_block in graph._state():
+        items.append(
+            state_block.name_prefix
+            + state_block.name
+            + ":"
+            + str(sorted(tensor_meta(state_block.origin).items()))
+        )
+    return hashlib.sha256("\n".join(items).encode("utf-8")).hexdigest()
+
+
+def save_compiled_graph_file(file_path, content):
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, file_path)
+
+
+def load_compiled_graph_file(file_path):
+    with open(file_path, "rb") as f:
+        content = pickle.load(f)
+    if content.get("format_version") != COMPILED_GRAPH_FORMAT_VERSION:
+        raise RuntimeError(
+            "Compiled graph file "
+            + file_path
+            + " is saved with an incompatible format version."
+        )
+    return content
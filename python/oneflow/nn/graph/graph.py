@@ -16,10 +16,12 @@ limitations under the License.
 from collections import OrderedDict
 from functools import partial
 from typing import Dict, Optional, Union, List
+import os
 import time
 
 import oneflow
 import oneflow._oneflow_internal
+import oneflow.core.job.job_pb2 as job_pb
 import oneflow.framework.c_api_util as c_api_util
 import oneflow.framework.graph_build_util as graph_build_util
 import oneflow.framework.session_context as session_ctx
@@ -29,8 +31,24 @@ from oneflow.framework.multi_client_session import MultiClientSession
 from oneflow.framework.tensor import Tensor, TensorTuple
 from oneflow.framework.tensor_tuple_util import convert_to_tensor_tuple
 from oneflow.nn.graph.block import Block, BlockType, get_block_cls
+from oneflow.nn.graph.compiled_graph_io import (
+    COMPILED_GRAPH_FORMAT_VERSION,
+    compiled_graph_cache_key,
+    compiled_graph_file,
+    empty_io_from_meta,
+    io_meta,
+    load_compiled_graph_file,
+    save_compiled_graph_file,
+)
 from oneflow.nn.graph.graph_config import GraphConfig
 from oneflow.nn.graph.optimizer import OptDict, VariableConfig
+from oneflow.nn.graph.plan_cache import (
+    PLAN_ATTRS,
+    PlanCache,
+    input_signature,
+    pad_tensor_to,
+)
+from oneflow.nn.graph.runtime_profile import build_runtime_profile
 from oneflow.nn.graph.util import add_indent, seq_to_func_return, sys_exc_error_msg
 from oneflow.nn.module import Module
 from oneflow.nn.optimizer.lr_scheduler import LrScheduler
@@ -105,6 +123,10 @@ class Graph(object):
         self._forward_job_proto = None
         # forward, backward and optimized graph job proto
         self._full_job_proto = None
+        self._is_config_proto_generated = False
+        self._inputs_meta = []
+        self._input_op_names = []
+        self._output_op_names = []
         self._args_repr = []
         self._outs_repr = []
         self._debug = False
@@ -112,12 +134,13 @@ class Graph(object):
         self._debug_max_v_level = 0
         self._outputs_buffer_size = 2
         self._cur_index_of_ouputs_buffer = 0
+        # compiled plans keyed by input signature, see GraphConfig.enable_plan_cache
+        self._plan_cache = None
+        self._cur_plan = None
+        self._cur_input_signature = None
+        self._plan_cnt = 0
 
-        self._c_nn_graph = oneflow._oneflow_internal.nn.graph.CNNGraph(self._name)
-        session = session_ctx.GetDefaultSession()
-        assert type(session) is MultiClientSession
-        session.TryInit()
-        session.AddCGraph(self._c_nn_graph)
+        self._new_c_nn_graph(self._name)
 
     def build(self, *args):
         r"""The ``build()`` method must be overridden to define neural network
@@ -253,6 +276,8 @@ class Graph(object):
         """
         if not self._is_compiled:
             self._compile(*args)
+        elif self._plan_cache is not None:
+            args = self._switch_plan(*args)
 
         return self._run(*args)
 
@@ -262,6 +287,214 @@ class Graph(object):
         """
         return self._name
 
+    def plan_cache_stats(self):
+        r"""Statistics of the compiled plan cache, or None if plan cache is not
+        enabled by ``config.enable_plan_cache()``.
+
+        The returned dict has these keys:
+
+        * ``size``: the number of cached plans.
+        * ``capacity``: the max number of cached plans.
+        * ``hits``: calls run by a plan compiled for the same input signature.
+        * ``padded_hits``: calls run by a plan after padding the inputs.
+        * ``misses``: calls that compiled a new plan.
+        * ``evictions``: plans released to keep the cache bounded.
+        """
+        if self._plan_cache is None:
+            return None
+        return self._plan_cache.stats()
+
+    def runtime_profile(self, reset: bool = False):
+        r"""Runtime statistics of the current compiled plan, or None if runtime
+        profiling is not enabled by ``config.enable_profiling()``.
+
+        The statistics are accumulated since the first call or the last reset. The
+        returned dict has these keys:
+
+        * ``steps``: the number of calls covered by the statistics.
+        * ``ops``: a dict keyed by the op names of ``_full_graph_proto``. Each
+          value has the op type, the ids of the actors running it, the number of
+          kernel launches and the total, max, average and per step kernel time in
+          nanoseconds.
+        * ``actors``: a dict keyed by actor id. Each value has the op names of the
+          actor, the number of acts and the act time, the time waiting for
+          readable inputs (``read_wait_ns``) or free output registers
+          (``write_wait_ns``), the time input messages are queued before being
+          handled, and the mean and max number of in-use registers of each
+          produced register with the ratio of acts leaving them all in use.
+
+        Args:
+            reset (bool): whether to reset the statistics after reading them. Default is False.
+        """
+        if not self._is_compiled or not self.config.proto.enable_runtime_profiling():
+            return None
+        # Wait for the launched steps to finish.
+        oneflow._oneflow_internal.eager.multi_client.Sync()
+        job_name = self._c_nn_graph.name
+        records = oneflow._oneflow_internal.nn.graph.GetRuntimeProfile(job_name)
+        report = build_runtime_profile(
+            self._full_job_proto, records, self._runtime_profile_steps
+        )
+        if reset:
+            oneflow._oneflow_internal.nn.graph.ResetRuntimeProfile(job_name)
+            self._runtime_profile_steps = 0
+        return report
+
+    def save_compiled(self, path: str):
+        r"""Save the compiled plan of the graph to directory ``path``, so that a
+        restarted process can skip building and compiling the graph with ``load_compiled()``.
+
+        The forward and full graph job proto, the compiled plan and the
+        inputs/outputs infos are saved. Each rank saves its own file.
+
+        .. code-block:: python
+
+            g = CustomGraph()
+            out_tensors = g(input_tensors)  # Graph is compiled at the first call
+            g.save_compiled("./compiled_graph")
+
+        Args:
+            path (str): the directory to save the compiled plan.
+        """
+        assert self._is_compiled, (
+            "nn.Graph " + self._name + " must be compiled before save_compiled()."
+        )
+        content = {
+            "format_version": COMPILED_GRAPH_FORMAT_VERSION,
+            "cache_key": compiled_graph_cache_key(self),
+            "forward_job": self._forward_job_proto.SerializeToString(),
+            "full_job": self._full_job_proto.SerializeToString(),
+            "plan": self._c_nn_graph.get_serialized_plan(),
+            "inputs": self._inputs_meta,
+            "outputs": io_meta(*self._eager_outputs),
+            "input_op_names": self._input_op_names,
+            "output_op_names": self._output_op_names,
+            "args_repr": self._args_repr,
+            "outs_repr": self._outs_repr,
+        }
+        os.makedirs(path, exist_ok=True)
+        save_compiled_graph_file(compiled_graph_file(path, get_rank()), content)
+
+    def load_compiled(self, path: str) -> bool:
+        r"""Load the compiled plan saved by ``save_compiled()`` and init the graph
+        runtime with it, ``build()`` is not traced and the plan is not compiled again.
+
+        The saved plan is only used if the graph class, parameters and buffers, graph
+        config and OneFlow version are the same as when it was saved. Otherwise
+        nothing is loaded and the graph will be compiled at its first call as usual.
+
+        Compiled plans record the id of their job, so graphs must be created and
+        loaded in the same order as they were compiled.
+
+        .. code-block:: python
+
+            g = CustomGraph()
+            if not g.load_compiled("./compiled_graph"):
+                print("compiled plan is out of date, compile it again.")
+            out_tensors = g(input_tensors)
+
+        Args:
+            path (str): the directory the compiled plan saved in.
+
+        Returns:
+            bool: whether the compiled plan is loaded.
+        """
+        assert not self._is_compiled, (
+            "nn.Graph " + self._name + " has already been compiled."
+        )
+        file_path = compiled_graph_file(path, get_rank())
+        if not os.path.exists(file_path):
+            self._print(
+                1,
+                0,
+                "[WARNING]"
+                + self._shallow_repr()
+                + " has no compiled plan in "
+                + path
+                + ".",
+            )
+            return False
+        content = load_compiled_graph_file(file_path)
+
+        self._outputs_buffer_size = self.config._outputs_buffer_size
+        self._generate_config_proto()
+        if content["cache_key"] != compiled_graph_cache_key(self):
+            self._print(
+                1,
+                0,
+                "[WARNING]"
+                + self._shallow_repr()
+                + " compiled plan in "
+                + path
+                + " is out of date because the graph, its config or OneFlow version has changed.",
+            )
+            return False
+
+        try:
+            self._print(
+                0, 0, self._shallow_repr() + " Start loading compiled plan from " + path
+            )
+            load_start = time.perf_counter()
+            session = session_ctx.GetDefaultSession()
+            assert type(session) is MultiClientSession
+            # Open the job build and infer ctx only to register the job of this graph.
+            with graph_build_util.graph_build_context(self.config.proto, session):
+                state_op_names, self._states_tensor_tuple = self._build_states()
+
+            self._forward_job_proto = job_pb.Job()
+            self._forward_job_proto.ParseFromString(content["forward_job"])
+            self._full_job_proto = job_pb.Job()
+            self._full_job_proto.ParseFromString(content["full_job"])
+            self._inputs_meta = content["inputs"]
+            self._input_op_names = content["input_op_names"]
+            self._output_op_names = content["output_op_names"]
+            self._args_repr = content["args_repr"]
+            self._outs_repr = content["outs_repr"]
+            self._eager_outputs = empty_io_from_meta(content["outputs"])
+            self._make_outputs_buffer()
+
+            # Inputs are only registered with their metas.
+            flattened_inputs = self._flatten_io(
+                "input", *empty_io_from_meta(self._inputs_meta)
+            )
+            self._c_nn_graph.register_input_op_names_and_tensors(
+                self._input_op_names, convert_to_tensor_tuple(flattened_inputs)
+            )
+            self._c_nn_graph.register_output_op_names_and_tensors(
+                self._output_op_names, self._outputs_tensor_tuple
+            )
+            self._c_nn_graph.register_variable_op_names_and_tensors(
+                state_op_names, self._states_tensor_tuple
+            )
+            self._c_nn_graph.init_runtime_with_compiled_plan(
+                content["full_job"], content["plan"]
+            )
+            load_end = time.perf_counter()
+            self._print(
+                0,
+                0,
+                self._shallow_repr()
+                + " Done! cost time: "
+                + str(round(load_end - load_start, 2))
+                + "s."
+                + "\n",
+            )
+        except:
+            self._print(
+                2,
+                0,
+                "[ERROR]"
+                + self._shallow_repr()
+                + " loading compiled plan got error: "
+                + sys_exc_error_msg(),
+            )
+            raise
+
+        self._is_compiled = True
+        if self.config._plan_cache_size > 0:
+            self._add_cur_plan_to_cache(input_signature(flattened_inputs))
+        return True
+
     @property
     def training(self):
         r"""In traninig mode if the graph has an optimizer.
@@ -422,8 +655,21 @@ class Graph(object):
             for bu in bu_gen:
                 yield bu
 
+    def _new_c_nn_graph(self, job_name):
+        self._c_nn_graph = oneflow._oneflow_internal.nn.graph.CNNGraph(job_name)
+        # steps run by this plan since its runtime profile was last reset
+        self._runtime_profile_steps = 0
+        session = session_ctx.GetDefaultSession()
+        assert type(session) is MultiClientSession
+        session.TryInit()
+        session.AddCGraph(self._c_nn_graph)
+
     def _generate_config_proto(self):
-        self.config.proto.set_job_name(self._name)
+        self.config.proto.set_job_name(self._c_nn_graph.name)
+        # Optimizer configs are appended to the config proto, so they must be generated only once.
+        if self._is_config_proto_generated:
+            return
+        self._is_config_proto_generated = True
 
         if self._grad_scaler is not None:
             self._grad_scaler._generate_conf_for_graph(
@@ -507,8 +753,77 @@ class Graph(object):
             raise
 
         self._is_compiled = True
+        if self.config._plan_cache_size > 0:
+            self._add_cur_plan_to_cache(
+                input_signature(self._flatten_io("input", *args))
+            )
         return eager_outputs
 
+    def _add_cur_plan_to_cache(self, sig):
+        if self._plan_cache is None:
+            self._plan_cache = PlanCache(self.config._plan_cache_size)
+        self._cur_plan = dict()
+        self._stash_cur_plan()
+        self._cur_input_signature = sig
+        evicted_plans = self._plan_cache.put(sig, self._cur_plan)
+        for plan in evicted_plans:
+            # Release the runtime and the buffers of the evicted plan.
+            plan["_c_nn_graph"].close()
+
+    def _stash_cur_plan(self):
+        for attr in PLAN_ATTRS:
+            self._cur_plan[attr] = getattr(self, attr)
+
+    def _restore_plan(self, plan):
+        for attr in PLAN_ATTRS:
+            object.__setattr__(self, attr, plan[attr])
+        self._cur_plan = plan
+
+    def _switch_plan(self, *args):
+        sig = input_signature(self._flatten_io("input", *args))
+        if sig == self._cur_input_signature:
+            self._plan_cache.hit()
+            return args
+
+        cached_sig, plan = self._plan_cache.lookup(
+            sig, allow_padding=self.config._pad_to_cached_shape
+        )
+        # Save running states such as outputs buffer index of the current plan.
+        self._stash_cur_plan()
+        if plan is not None:
+            self._restore_plan(plan)
+            self._cur_input_signature = cached_sig
+            if cached_sig != sig:
+                target_shapes = iter([item[0] for item in cached_sig])
+                args = self._mapping_io(
+                    "input",
+                    lambda t: pad_tensor_to(
+                        t, next(target_shapes), self.config._pad_value
+                    ),
+                    *args,
+                )
+            return args
+
+        if self.training:
+            raise NotImplementedError(
+                "nn.Graph "
+                + self._name
+                + " with optimizer only supports one compiled plan, but got inputs with a new signature."
+            )
+        self._print(
+            0,
+            0,
+            self._shallow_repr() + " Plan cache miss, compile a new plan for inputs.",
+        )
+        self._plan_cnt += 1
+        self._new_c_nn_graph(self._name + "_plan_" + str(self._plan_cnt))
+        self._cur_index_of_ouputs_buffer = 0
+        for _, block in self._blocks.items():
+            block._reset_build_cache()
+        self._is_compiled = False
+        self._compile(*args)
+        return args
+
     def _build_graph(self, *args):
         session = session_ctx.GetDefaultSession()
         assert type(session) is MultiClientSession
@@ -523,6 +838,8 @@ class Graph(object):
             arg_op_names, lazy_args, self._args_repr, _ = self._build_io(
                 "input", graph_build_util.build_graph_input_arg, *args
             )
+            self._input_op_names = arg_op_names
+            self._inputs_meta = io_meta(*args)
             self._print(0, 1, self._shallow_repr() + " end building graph inputs.")
 
             # Deal with parameter and buffer
@@ -557,6 +874,7 @@ class Graph(object):
                 self._outs_repr,
                 out2name,
             ) = self._build_io("output", graph_build_util.build_graph_output, *outputs)
+            self._output_op_names = output_op_names
 
             self._print(0, 1, self._shallow_repr() + " end building graph outputs.")
 
@@ -633,6 +951,12 @@ class Graph(object):
 
             return eager_out
 
+        self._eager_outputs = self._mapping_io(
+            "output", build_real_output, *self._eager_outputs
+        )
+        self._make_outputs_buffer()
+
+    def _make_outputs_buffer(self):
         def convert_to_synced_tensor_tuple(*args):
             tensor_tuple = convert_to_tensor_tuple(*args)
             # tensors acting as buffer should be synced once upon created.
@@ -641,10 +965,6 @@ class Graph(object):
             )
             return tensor_tuple
 
-        self._eager_outputs = self._mapping_io(
-            "output", build_real_output, *self._eager_outputs
-        )
-
         self._outputs_tensor_tuple = convert_to_synced_tensor_tuple(
             self._flatten_io("output", *self._eager_outputs)
         )
@@ -702,6 +1022,7 @@ class Graph(object):
                 self._states_tensor_tuple,
                 self._c_nn_graph,
             )
+            self._runtime_profile_steps += 1
             # Update outputs buffer reading index
             self._cur_index_of_ouputs_buffer += 1
             if self._cur_index_of_ouputs_buffer >= self._outputs_buffer_size:
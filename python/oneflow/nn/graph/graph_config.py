@@ -26,6 +26,9 @@ class GraphConfig(object):
     def __init__(self):
         super().__init__()
         self._outputs_buffer_size = 2
+        self._plan_cache_size = 0
+        self._pad_to_cached_shape = False
+        self._pad_value = 0
         self.proto = job_conf_cfg.JobConfigProto()
         self._train(False)
 
@@ -55,6 +58,67 @@ class GraphConfig(object):
         """
         self._outputs_buffer_size = value
 
+    def enable_plan_cache(
+        self, max_plans: int = 8, pad_to_cached_shape: bool = False, pad_value=0
+    ):
+        r"""Cache compiled plans keyed by the input signature of ``nn.Graph``.
+
+        By default nn.Graph only accepts inputs with the same shape, dtype and
+        placement as the inputs of the first call. With plan cache enabled, a call
+        with a new input signature compiles a new plan instead of failing. At most
+        ``max_plans`` plans are kept, the least recently used one is released
+        when the cache is full. All plans share the parameters and buffers of
+        the graph. Only graphs without optimizer can hold more than one plan.
+
+        If ``pad_to_cached_shape`` is True, a call with a new input signature first
+        tries to pad its inputs with ``pad_value`` up to the smallest cached shape
+        that can hold them. Note that outputs keep the padded shape in this case.
+
+        .. code-block:: python
+
+            g = CustomGraph()
+            g.config.enable_plan_cache(max_plans=4, pad_to_cached_shape=True)
+            for x in inputs_with_varying_shape:
+                out = g(x)
+            print(g.plan_cache_stats())
+
+        Args:
+            max_plans (int): the max number of cached plans. Default is 8.
+            pad_to_cached_shape (bool): whether to pad inputs to a cached shape on cache miss. Default is False.
+            pad_value (float): the value used to pad inputs. Default is 0.
+        """
+        assert isinstance(max_plans, int) and max_plans >= 1
+        self._plan_cache_size = max_plans
+        self._pad_to_cached_shape = pad_to_cached_shape
+        self._pad_value = pad_value
+
+    def enable_profiling(self, mode: bool = True, sync_device: bool = False):
+        r"""Collect runtime statistics of the compiled ``nn.Graph``.
+
+        When enabled, every actor of the compiled graph records its kernel time,
+        the time it spends waiting for inputs or for free output registers, the
+        time its input messages are queued and the occupancy of the registers it
+        produces. The statistics are accumulated over all steps until they are
+        read by ``nn.Graph.runtime_profile``. Must be set before the first call.
+
+        .. code-block:: python
+
+            g = CustomGraph()
+            g.config.enable_profiling()
+            for _ in range(10):
+                out = g(x)
+            report = g.runtime_profile()
+
+        Args:
+            mode (bool): whether to enable runtime profiling. Default is True.
+            sync_device (bool): whether to synchronize the device stream after every kernel, so that
+                kernel time covers the device execution instead of the launch only. It serializes
+                the execution of each actor. Default is False.
+        """
+        assert type(mode) is bool
+        self.proto.set_enable_runtime_profiling(mode)
+        self.proto.set_runtime_profiling_sync_device(sync_device)
+
     def enable_amp(self, mode: bool = True):
         """If true, then graph will use mixed precision mode, it means use both float16 and float32 during model training.
 
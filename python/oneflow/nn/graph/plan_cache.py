@@ -0,0 +1,179 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from collections import OrderedDict
+
+import oneflow
+import oneflow._oneflow_internal
+from oneflow.framework.tensor import Tensor
+
+
+# Graph attributes that belong to one compiled plan. Switching plans only swaps
+# these attributes, the parameters and buffers of nn.Graph are shared by all plans.
+PLAN_ATTRS = (
+    "_c_nn_graph",
+    "_forward_job_proto",
+    "_full_job_proto",
+    "_inputs_meta",
+    "_input_op_names",
+    "_output_op_names",
+    "_args_repr",
+    "_outs_repr",
+    "_eager_outputs",
+    "_eager_outputs_buffer",
+    "_outputs_tensor_tuple",
+    "_outputs_tensor_tuple_buffer",
+    "_cur_index_of_ouputs_buffer",
+    "_states_tensor_tuple",
+    "_runtime_profile_steps",
+)
+
+
+def tensor_signature(t):
+    if t is None:
+        return None
+    assert isinstance(t, Tensor)
+    if t.is_consistent:
+        location = (str(t.placement), tuple(str(s) for s in t.sbp))
+    else:
+        location = str(t.device)
+    return (tuple(t.shape), t.dtype, location)
+
+
+def input_signature(flattened_args):
+    r"""The key of a compiled plan: shape, dtype and device (or placement and sbp)
+    of each flattened input.
+    """
+    return tuple(tensor_signature(t) for t in flattened_args)
+
+
+def _can_pad_to(sig, target_sig):
+    if len(sig) != len(target_sig):
+        return False
+    for item, target in zip(sig, target_sig):
+        if item is None or target is None:
+            if item is not target:
+                return False
+            continue
+        shape, dtype, location = item
+        target_shape, target_dtype, target_location = target
+        if dtype != target_dtype or location != target_location:
+            return False
+        if len(shape) != len(target_shape):
+            return False
+        if any(d > td for d, td in zip(shape, target_shape)):
+            return False
+    return True
+
+
+def _signature_numel(sig):
+    numel = 0
+    for item in sig:
+        if item is None:
+            continue
+        n = 1
+        for d in item[0]:
+            n *= d
+        numel += n
+    return numel
+
+
+def pad_tensor_to(t, shape, value=0):
+    if t is None or tuple(t.shape) == tuple(shape):
+        return t
+    # oneflow._C.pad takes paddings from the last dimension to the first one.
+    pad = []
+    for d, target_d in reversed(list(zip(t.shape, shape))):
+        pad.extend([0, target_d - d])
+    with oneflow._oneflow_internal.lazy_mode.guard(False):
+        return oneflow._C.pad(t, pad, mode="constant", value=value)
+
+
+class PlanCache(object):
+    r"""A LRU bounded cache of compiled plans of one nn.Graph, keyed by input signature.
+    """
+
+    def __init__(self, capacity: int = 8):
+        assert capacity >= 1, "the capacity of plan cache must be at least 1."
+        self._capacity = capacity
+        self._plans = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._padded_hits = 0
+        self._evictions = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        return len(self._plans)
+
+    def __contains__(self, sig):
+        return sig in self._plans
+
+    def lookup(self, sig, allow_padding: bool = False):
+        r"""Return ``(cached_sig, plan)`` for ``sig``, or ``(None, None)`` on a miss.
+
+        If ``allow_padding`` is True and there is no plan for ``sig``, the cached
+        signature with the least elements that every input of ``sig`` can be padded
+        up to is returned.
+        """
+        plan = self._plans.get(sig)
+        if plan is not None:
+            self._hits += 1
+            self._plans.move_to_end(sig)
+            return sig, plan
+        if allow_padding:
+            best_sig = None
+            best_numel = None
+            for cached_sig in self._plans.keys():
+                if not _can_pad_to(sig, cached_sig):
+                    continue
+                numel = _signature_numel(cached_sig)
+                if best_numel is None or numel < best_numel:
+                    best_sig = cached_sig
+                    best_numel = numel
+            if best_sig is not None:
+                self._padded_hits += 1
+                self._plans.move_to_end(best_sig)
+                return best_sig, self._plans[best_sig]
+        self._misses += 1
+        return None, None
+
+    def hit(self):
+        self._hits += 1
+
+    def put(self, sig, plan):
+        r"""Add a plan, return the list of plans evicted to keep the cache bounded.
+        """
+        self._plans[sig] = plan
+        self._plans.move_to_end(sig)
+        evicted = []
+        while len(self._plans) > self._capacity:
+            _, old_plan = self._plans.popitem(last=False)
+            self._evictions += 1
+            evicted.append(old_plan)
+        return evicted
+
+    def stats(self):
+        return {
+            "size": len(self._plans),
+            "capacity": self._capacity,
+            "hits": self._hits,
+            "misses": self._misses,
+            "padded_hits": self._padded_hits,
+            "evictions": self._evictions,
+        }
@@ -0,0 +1,83 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from collections import OrderedDict
+
+
+def _op_type(op_conf):
+    if op_conf.HasField("user_conf"):
+        return op_conf.user_conf.op_type_name
+    return op_conf.WhichOneof("op_type")
+
+
+def _actor_report(record):
+    registers = []
+    for regst in record["regsts"]:
+        sample_cnt = max(regst["sample_cnt"], 1)
+        registers.append(
+            {
+                "regst_desc_id": regst["regst_desc_id"],
+                "capacity": regst["capacity"],
+                "mean_in_use": regst["total_in_use"] / sample_cnt,
+                "max_in_use": regst["max_in_use"],
+                "full_ratio": regst["full_cnt"] / sample_cnt,
+            }
+        )
+    return {
+        "op_names": [kernel["op_name"] for kernel in record["kernels"]],
+        "acts": record["act_cnt"],
+        "act_time_ns": record["act_ns"],
+        "read_wait_ns": record["read_wait_ns"],
+        "write_wait_ns": record["write_wait_ns"],
+        "queue_time_ns": record["queue_ns"],
+        "avg_queue_time_ns": record["queue_ns"] / max(record["queue_msg_cnt"], 1),
+        "registers": registers,
+    }
+
+
+def build_runtime_profile(job_proto, records, steps):
+    r"""Build the report of ``nn.Graph.runtime_profile`` from the actor records
+    of the runtime. Kernel times are merged by op name, so an op placed on several
+    devices reports the sum over its actors.
+    """
+    op_name2type = OrderedDict(
+        (op_conf.name, _op_type(op_conf)) for op_conf in job_proto.net.op
+    )
+    ops = OrderedDict()
+    actors = OrderedDict()
+    for record in sorted(records, key=lambda r: r["actor_id"]):
+        actors[record["actor_id"]] = _actor_report(record)
+        for kernel in record["kernels"]:
+            op_name = kernel["op_name"]
+            if op_name not in op_name2type:
+                # Ops inserted by the compiler, e.g. boxing and ticks.
+                continue
+            if op_name not in ops:
+                ops[op_name] = {
+                    "op_type": op_name2type[op_name],
+                    "actor_ids": [],
+                    "launches": 0,
+                    "kernel_time_ns": 0,
+                    "max_kernel_time_ns": 0,
+                }
+            op = ops[op_name]
+            op["actor_ids"].append(record["actor_id"])
+            op["launches"] += kernel["launch_cnt"]
+            op["kernel_time_ns"] += kernel["total_ns"]
+            op["max_kernel_time_ns"] = max(op["max_kernel_time_ns"], kernel["max_ns"])
+    for op in ops.values():
+        op["avg_kernel_time_ns"] = op["kernel_time_ns"] / max(op["launches"], 1)
+        op["kernel_time_ns_per_step"] = op["kernel_time_ns"] / max(steps, 1)
+    return {"steps": steps, "ops": ops, "actors": actors}
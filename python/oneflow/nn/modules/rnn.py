@@ -17,8 +17,183 @@ limitations under the License.
 import oneflow as flow
 from oneflow import nn
 from oneflow.nn import Module
+from oneflow.nn.utils.rnn import PackedSequence
 from math import sqrt
 
+_FUSED_CELL_DTYPES = (flow.float32, flow.float64)
+
+
+def _lstm_cell(input_gates, hidden_gates, cx):
+    if input_gates.dtype in _FUSED_CELL_DTYPES:
+        hy, cy, _ = flow._C.fused_lstm_cell(input_gates, hidden_gates, cx)
+        return hy, cy
+    ingate, forgetgate, cellgate, outgate = (input_gates + hidden_gates).chunk(4, dim=1)
+    cy = flow.sigmoid(forgetgate) * cx + flow.sigmoid(ingate) * flow.tanh(cellgate)
+    hy = flow.sigmoid(outgate) * flow.tanh(cy)
+    return hy, cy
+
+
+def _gru_cell(input_gates, hidden_gates, hx):
+    if input_gates.dtype in _FUSED_CELL_DTYPES:
+        hy, _ = flow._C.fused_gru_cell(input_gates, hidden_gates, hx)
+        return hy
+    i_r, i_i, i_n = input_gates.chunk(3, dim=1)
+    h_r, h_i, h_n = hidden_gates.chunk(3, dim=1)
+    resetgate = flow.sigmoid(i_r + h_r)
+    inputgate = flow.sigmoid(i_i + h_i)
+    newgate = flow.tanh(i_n + resetgate * h_n)
+    return newgate + inputgate * (hx - newgate)
+
+
+def _rnn_direction(mode, act, x, batch_sizes, h_0, c_0, weights, reverse):
+    """Runs one direction of a layer over the time-major packed rows of ``x``,
+    step ``t`` owning the ``batch_sizes[t]`` rows that follow the previous steps.
+    """
+    w_ih, w_hh, b_ih, b_hh, w_hr = weights
+    # The input projection does not depend on the recurrence, so the whole
+    # sequence is projected by one matmul and only h @ w_hh stays in the loop.
+    input_gates = flow.matmul(x, w_ih)
+    if b_ih is not None:
+        # GRU scales the hidden part of the new gate by the reset gate, so its
+        # hidden bias can not be folded into the input projection.
+        input_gates = input_gates + (b_ih if mode == "GRU" else b_ih + b_hh)
+
+    offsets = [0]
+    for batch_size_t in batch_sizes:
+        offsets.append(offsets[-1] + batch_size_t)
+    seq_len = len(batch_sizes)
+    steps = range(seq_len - 1, -1, -1) if reverse else range(seq_len)
+
+    num_running = batch_sizes[steps[0]]
+    h, c = h_0[:num_running], None if c_0 is None else c_0[:num_running]
+    finished_h, finished_c = [], []
+    outputs = []
+    for t in steps:
+        batch_size_t = batch_sizes[t]
+        if batch_size_t < num_running:
+            # Sequences shorter than t stop here and keep their last state.
+            finished_h.append(h[batch_size_t:])
+            h = h[:batch_size_t]
+            if c is not None:
+                finished_c.append(c[batch_size_t:])
+                c = c[:batch_size_t]
+        elif batch_size_t > num_running:
+            # Walking backwards, sequences ending at t start from their initial state.
+            h = flow.cat([h, h_0[num_running:batch_size_t]], dim=0)
+            if c is not None:
+                c = flow.cat([c, c_0[num_running:batch_size_t]], dim=0)
+        num_running = batch_size_t
+
+        input_gates_t = input_gates[offsets[t] : offsets[t + 1]]
+        hidden_gates_t = flow.matmul(h, w_hh)
+        if mode == "LSTM":
+            h, c = _lstm_cell(input_gates_t, hidden_gates_t, c)
+            if w_hr is not None:
+                h = flow.matmul(h, w_hr)
+        elif mode == "GRU":
+            if b_hh is not None:
+                hidden_gates_t = hidden_gates_t + b_hh
+            h = _gru_cell(input_gates_t, hidden_gates_t, h)
+        else:
+            h = act(input_gates_t + hidden_gates_t)
+        outputs.append(h)
+
+    if reverse:
+        outputs.reverse()
+    if len(finished_h) > 0:
+        h = flow.cat([h] + finished_h[::-1], dim=0)
+        if c is not None:
+            c = flow.cat([c] + finished_c[::-1], dim=0)
+    return flow.cat(outputs, dim=0), h, c
+
+
+def _rnn_forward(module, mode, input, hx):
+    if isinstance(input, PackedSequence):
+        x, packed_batch_sizes, sorted_indices, unsorted_indices = input
+        batch_sizes = [int(b) for b in packed_batch_sizes.numpy().tolist()]
+        batch_size = batch_sizes[0]
+    else:
+        if module.batch_first:
+            input = module.permute_tensor(input)
+        seq_len, batch_size, _ = input.size()
+        x = input.reshape(seq_len * batch_size, input.size(2))
+        batch_sizes = [batch_size] * seq_len
+        sorted_indices = unsorted_indices = None
+
+    D = 2 if module.bidirectional else 1
+    proj_size = getattr(module, "proj_size", 0)
+    real_hidden_size = proj_size if proj_size > 0 else module.hidden_size
+    if hx is None:
+        h_0 = flow.zeros(
+            (D * module.num_layers, batch_size, real_hidden_size),
+            dtype=x.dtype,
+            device=x.device,
+        )
+        c_0 = None
+        if mode == "LSTM":
+            c_0 = flow.zeros(
+                (D * module.num_layers, batch_size, module.hidden_size),
+                dtype=x.dtype,
+                device=x.device,
+            )
+    else:
+        h_0, c_0 = hx if mode == "LSTM" else (hx, None)
+        if sorted_indices is not None:
+            h_0 = flow._C.gather(h_0, sorted_indices, axis=1)
+            if c_0 is not None:
+                c_0 = flow._C.gather(c_0, sorted_indices, axis=1)
+
+    h_n, c_n = [], []
+    for layer in range(module.num_layers):
+        layer_outputs = []
+        for direction in range(D):
+            suffix = "_reverse" if direction == 1 else ""
+            weights = [
+                getattr(module, name.format(layer, suffix), None)
+                for name in (
+                    "weight_ih_l{}{}",
+                    "weight_hh_l{}{}",
+                    "bias_ih_l{}{}",
+                    "bias_hh_l{}{}",
+                    "weight_hr_l{}{}",
+                )
+            ]
+            idx = layer * D + direction
+            output, h, c = _rnn_direction(
+                mode,
+                getattr(module, "act", None),
+                x,
+                batch_sizes,
+                h_0[idx],
+                None if c_0 is None else c_0[idx],
+                weights,
+                reverse=direction == 1,
+            )
+            layer_outputs.append(output)
+            h_n.append(h)
+            c_n.append(c)
+        x = layer_outputs[0] if D == 1 else flow.cat(layer_outputs, dim=1)
+        if module.dropout != 0 and layer != module.num_layers - 1:
+            x = module.drop(x)
+
+    h_n = flow.stack(h_n, dim=0)
+    if mode == "LSTM":
+        c_n = flow.stack(c_n, dim=0)
+    if unsorted_indices is not None:
+        h_n = flow._C.gather(h_n, unsorted_indices, axis=1)
+        if mode == "LSTM":
+            c_n = flow._C.gather(c_n, unsorted_indices, axis=1)
+
+    if isinstance(input, PackedSequence):
+        output = PackedSequence(x, packed_batch_sizes, sorted_indices, unsorted_indices)
+    else:
+        output = x.reshape(seq_len, batch_size, x.size(1))
+        if module.batch_first:
+            output = module.permute_tensor(output)
+    if mode == "LSTM":
+        return output, (h_n, c_n)
+    return output, h_n
+
 
 class RNN(Module):
     """The interface is consistent with PyTorch.
@@ -195,153 +370,7 @@ class RNN(Module):
         return input.permute(1, 0, 2)
 
     def forward(self, input, h_0=None):
-        if self.batch_first == False:
-            input = self.permute_tensor(input)
-
-        D = 2 if self.bidirectional else 1
-        num_layers = self.num_layers
-        batch_size, seq_len, _ = input.size()
-
-        if h_0 is None:
-            h_t = flow.zeros(
-                (D * num_layers, batch_size, self.hidden_size),
-                dtype=input.dtype,
-                device=input.device,
-            )
-        else:
-            h_t = h_0
-
-        if self.bidirectional:
-            if h_0 is None:
-                h_t_f = h_t[:num_layers, :, :]
-                h_t_b = h_t[num_layers:, :, :]
-            else:
-                h_t_f = flow.cat(
-                    [
-                        h_t[l, :, :].unsqueeze(0)
-                        for l in range(h_t.size(0))
-                        if l % 2 == 0
-                    ],
-                    dim=0,
-                )
-                h_t_b = flow.cat(
-                    [
-                        h_t[l, :, :].unsqueeze(0)
-                        for l in range(h_t.size(0))
-                        if l % 2 != 0
-                    ],
-                    dim=0,
-                )
-        else:
-            h_t_f = h_t
-
-        layer_hidden = []
-
-        for layer in range(self.num_layers):
-            hidden_seq_f = []
-            if self.bidirectional:
-                hidden_seq_b = []
-
-            hid_t_f = h_t_f[layer, :, :]
-            if self.bidirectional:
-                hid_t_b = h_t_b[layer, :, :]
-
-            for t in range(seq_len):
-                if layer == 0:
-                    x_t_f = input[:, t, :]
-                    if self.bidirectional:
-                        x_t_b = input[:, seq_len - 1 - t, :]
-                else:
-                    x_t_f = hidden_seq[:, t, :]
-                    if self.bidirectional:
-                        x_t_b = hidden_seq[:, seq_len - 1 - t, :]
-
-                # TODO: Modify after adding the stride attribute
-                # hy1_f = flow.matmul(
-                #     x_t_f,
-                #     getattr(self, "weight_ih_l{}{}".format(layer, "")).permute(1, 0),
-                # )
-                # hy2_f = flow.matmul(
-                #     hid_t_f,
-                #     getattr(self, "weight_hh_l{}{}".format(layer, "")).permute(1, 0),
-                # )
-
-                hy1_f = flow.matmul(
-                    x_t_f, getattr(self, "weight_ih_l{}{}".format(layer, "")),
-                )
-                hy2_f = flow.matmul(
-                    hid_t_f, getattr(self, "weight_hh_l{}{}".format(layer, "")),
-                )
-
-                if self.bias:
-                    hy1_f += getattr(self, "bias_ih_l{}{}".format(layer, ""))
-                    hy2_f += getattr(self, "bias_hh_l{}{}".format(layer, ""))
-                hid_t_f = self.act(hy1_f + hy2_f)
-
-                hidden_seq_f.append(hid_t_f.unsqueeze(1))
-
-                if self.bidirectional:
-
-                    # TODO：Modify after adding the stride attribute
-                    # hy1_b = flow.matmul(
-                    #     x_t_b,
-                    #     getattr(
-                    #         self, "weight_ih_l{}{}".format(layer, "_reverse")
-                    #     ).permute(1, 0),
-                    # )
-                    # hy2_b = flow.matmul(
-                    #     hid_t_b,
-                    #     getattr(
-                    #         self, "weight_hh_l{}{}".format(layer, "_reverse")
-                    #     ).permute(1, 0),
-                    # )
-
-                    hy1_b = flow.matmul(
-                        x_t_b,
-                        getattr(self, "weight_ih_l{}{}".format(layer, "_reverse")),
-                    )
-                    hy2_b = flow.matmul(
-                        hid_t_b,
-                        getattr(self, "weight_hh_l{}{}".format(layer, "_reverse")),
-                    )
-                    if self.bias:
-                        hy1_b += getattr(
-                            self, "bias_ih_l{}{}".format(layer, "_reverse")
-                        )
-                        hy2_b += getattr(
-                            self, "bias_hh_l{}{}".format(layer, "_reverse")
-                        )
-                    hid_t_b = self.act(hy1_b + hy2_b)
-
-                    hidden_seq_b.insert(0, hid_t_b.unsqueeze(1))
-
-            hidden_seq_f = flow.cat(hidden_seq_f, dim=1)
-            if self.bidirectional:
-                hidden_seq_b = flow.cat(hidden_seq_b, dim=1)
-
-            if self.dropout != 0 and layer != self.num_layers - 1:
-                hidden_seq_f = self.drop(hidden_seq_f)
-                if self.bidirectional:
-                    hidden_seq_b = self.drop(hidden_seq_b)
-
-            if self.bidirectional:
-                hidden_seq = flow.cat([hidden_seq_f, hidden_seq_b], dim=2)
-            else:
-                hidden_seq = hidden_seq_f
-
-            if self.bidirectional:
-                h_t = flow.cat([hid_t_f.unsqueeze(0), hid_t_b.unsqueeze(0)], dim=0)
-            else:
-                h_t = hid_t_f.unsqueeze(0)
-
-            layer_hidden.append(h_t)
-
-        h_t = flow.cat(layer_hidden, dim=0)
-
-        if self.batch_first == False:
-            hidden_seq = self.permute_tensor(hidden_seq)
-
-        return hidden_seq, h_t
+        return _rnn_forward(self, "RNN", input, h_0)
 
 
 class GRU(Module):
@@ -520,163 +549,7 @@ class GRU(Module):
         return input.permute(1, 0, 2)
 
     def forward(self, input, h_0=None):
-        if self.batch_first == False:
-            input = self.permute_tensor(input)
-        D = 2 if self.bidirectional else 1
-        num_layers = self.num_layers
-        batch_size, seq_len, _ = input.size()
-
-        if h_0 is None:
-            h_t = flow.zeros(
-                (D * num_layers, batch_size, self.hidden_size),
-                dtype=input.dtype,
-                device=input.device,
-            )
-        else:
-            h_t = h_0
-
-        if self.bidirectional:
-            if h_0 is None:
-                h_t_f = h_t[:num_layers, :, :]
-                h_t_b = h_t[num_layers:, :, :]
-            else:
-                h_t_f = flow.cat(
-                    [
-                        h_t[l, :, :].unsqueeze(0)
-                        for l in range(h_t.size(0))
-                        if l % 2 == 0
-                    ],
-                    dim=0,
-                )
-                h_t_b = flow.cat(
-                    [
-                        h_t[l, :, :].unsqueeze(0)
-                        for l in range(h_t.size(0))
-                        if l % 2 != 0
-                    ],
-                    dim=0,
-                )
-        else:
-            h_t_f = h_t
-
-        layer_hidden = []
-
-        for layer in range(self.num_layers):
-            hidden_seq_f = []
-            if self.bidirectional:
-                hidden_seq_b = []
-
-            hid_t_f = h_t_f[layer, :, :]
-            if self.bidirectional:
-                hid_t_b = h_t_b[layer, :, :]
-
-            for t in range(seq_len):
-                if layer == 0:
-                    x_t_f = input[:, t, :]
-                    if self.bidirectional:
-                        x_t_b = input[:, seq_len - 1 - t, :]
-                else:
-                    x_t_f = hidden_seq[:, t, :]
-                    if self.bidirectional:
-                        x_t_b = hidden_seq[:, seq_len - 1 - t, :]
-
-                # TODO: Modify after adding the stride attribute
-                # gi_f = flow.matmul(
-                #     x_t_f,
-                #     getattr(self, "weight_ih_l{}{}".format(layer, "")).permute(1, 0),
-                # )
-                # gh_f = flow.matmul(
-                #     hid_t_f,
-                #     getattr(self, "weight_hh_l{}{}".format(layer, "")).permute(1, 0),
-                # )
-
-                gi_f = flow.matmul(
-                    x_t_f, getattr(self, "weight_ih_l{}{}".format(layer, "")),
-                )
-                gh_f = flow.matmul(
-                    hid_t_f, getattr(self, "weight_hh_l{}{}".format(layer, "")),
-                )
-                if self.bias:
-                    gi_f += getattr(self, "bias_ih_l{}{}".format(layer, ""))
-                    gh_f += getattr(self, "bias_hh_l{}{}".format(layer, ""))
-
-                i_r_f, i_i_f, i_n_f = gi_f.chunk(3, dim=1)
-                h_r_f, h_i_f, h_n_f = gh_f.chunk(3, dim=1)
-
-                resetgate_f = flow.sigmoid(i_r_f + h_r_f)
-                inputgate_f = flow.sigmoid(i_i_f + h_i_f)
-                newgate_f = flow.tanh(i_n_f + resetgate_f * h_n_f)
-
-                hid_t_f = newgate_f + inputgate_f * (hid_t_f - newgate_f)
-
-                hidden_seq_f.append(hid_t_f.unsqueeze(1))
-
-                if self.bidirectional:
-
-                    # TODO：Modify after adding the stride attribute
-                    # gi_b = flow.matmul(
-                    #     x_t_b,
-                    #     getattr(
-                    #         self, "weight_ih_l{}{}".format(layer, "_reverse")
-                    #     ).permute(1, 0),
-                    # )
-                    # gh_b = flow.matmul(
-                    #     hid_t_b,
-                    #     getattr(
-                    #         self, "weight_hh_l{}{}".format(layer, "_reverse")
-                    #     ).permute(1, 0),
-                    # )
-
-                    gi_b = flow.matmul(
-                        x_t_b,
-                        getattr(self, "weight_ih_l{}{}".format(layer, "_reverse")),
-                    )
-                    gh_b = flow.matmul(
-                        hid_t_b,
-                        getattr(self, "weight_hh_l{}{}".format(layer, "_reverse")),
-                    )
-                    if self.bias:
-                        gi_b += getattr(self, "bias_ih_l{}{}".format(layer, "_reverse"))
-                        gh_b += getattr(self, "bias_hh_l{}{}".format(layer, "_reverse"))
-
-                    i_r_b, i_i_b, i_n_b = gi_b.chunk(3, dim=1)
-                    h_r_b, h_i_b, h_n_b = gh_b.chunk(3, dim=1)
-
-                    resetgate_b = flow.sigmoid(i_r_b + h_r_b)
-                    inputgate_b = flow.sigmoid(i_i_b + h_i_b)
-                    newgate_b = flow.tanh(i_n_b + resetgate_b * h_n_b)
-
-                    hid_t_b = newgate_b + inputgate_b * (hid_t_b - newgate_b)
-
-                    hidden_seq_b.insert(0, hid_t_b.unsqueeze(1))
-
-            hidden_seq_f = flow.cat(hidden_seq_f, dim=1)
-            if self.bidirectional:
-                hidden_seq_b = flow.cat(hidden_seq_b, dim=1)
-
-            if self.dropout != 0 and layer != self.num_layers - 1:
-                hidden_seq_f = self.drop(hidden_seq_f)
-                if self.bidirectional:
-                    hidden_seq_b = self.drop(hidden_seq_b)
-
-            if self.bidirectional:
-                hidden_seq = flow.cat([hidden_seq_f, hidden_seq_b], dim=2)
-            else:
-                hidden_seq = hidden_seq_f
-
-            if self.bidirectional:
-                h_t = flow.cat([hid_t_f.unsqueeze(0), hid_t_b.unsqueeze(0)], dim=0)
-            else:
-                h_t = hid_t_f.unsqueeze(0)
-
-            layer_hidden.append(h_t)
-
-        h_t = flow.cat(layer_hidden, dim=0)
-
-        if self.batch_first == False:
-            hidden_seq = self.permute_tensor(hidden_seq)
-
-        return hidden_seq, h_t
+        return _rnn_forward(self, "GRU", input, h_0)
 
 
 class LSTM(nn.Module):
@@ -902,225 +775,7 @@ class LSTM(nn.Module):
         return input.permute(1, 0, 2)
 
     def forward(self, input, h_0=None):
-        if self.batch_first == False:
-            input = self.permute_tensor(input)
-        D = 2 if self.bidirectional else 1
-        num_layers = self.num_layers
-        batch_size, seq_len, _ = input.size()
-
-        if h_0 is None:
-            real_hidden_size = (
-                self.proj_size if self.proj_size > 0 else self.hidden_size
-            )
-            h_t = flow.zeros(
-                (D * num_layers, batch_size, real_hidden_size),
-                dtype=input.dtype,
-                device=input.device,
-            )
-            c_t = flow.zeros(
-                (D * num_layers, batch_size, self.hidden_size),
-                dtype=input.dtype,
-                device=input.device,
-            )
-            h_0 = (h_t, c_t)
-        else:
-            h_t, c_t = h_0
-
-        if self.bidirectional:
-            if h_0 is None:
-                h_t_f = h_t[:num_layers, :, :]
-                h_t_b = h_t[num_layers:, :, :]
-                c_t_f = c_t[:num_layers, :, :]
-                c_t_b = c_t[num_layers:, :, :]
-            else:
-                h_t_f = flow.cat(
-                    [
-                        h_t[l, :, :].unsqueeze(0)
-                        for l in range(h_t.size(0))
-                        if l % 2 == 0
-                    ],
-                    dim=0,
-                )
-                h_t_b = flow.cat(
-                    [
-                        h_t[l, :, :].unsqueeze(0)
-                        for l in range(h_t.size(0))
-                        if l % 2 != 0
-                    ],
-                    dim=0,
-                )
-                c_t_f = flow.cat(
-                    [
-                        c_t[l, :, :].unsqueeze(0)
-                        for l in range(c_t.size(0))
-                        if l % 2 == 0
-                    ],
-                    dim=0,
-                )
-                c_t_b = flow.cat(
-                    [
-                        c_t[l, :, :].unsqueeze(0)
-                        for l in range(c_t.size(0))
-                        if l % 2 != 0
-                    ],
-                    dim=0,
-                )
-        else:
-            h_t_f = h_t
-            c_t_f = c_t
-
-        layer_hidden = []
-        layer_cell = []
-
-        for layer in range(self.num_layers):
-
-            hidden_seq_f = []
-            if self.bidirectional:
-                hidden_seq_b = []
-
-            hid_t_f = h_t_f[layer, :, :]
-            h_c_t_f = c_t_f[layer, :, :]
-            if self.bidirectional:
-                hid_t_b = h_t_b[layer, :, :]
-                h_c_t_b = c_t_b[layer, :, :]
-
-            for t in range(seq_len):
-                if layer == 0:
-                    x_t_f = input[:, t, :]
-                    if self.bidirectional:
-                        x_t_b = input[:, seq_len - 1 - t, :]
-                else:
-                    x_t_f = hidden_seq[:, t, :]
-                    if self.bidirectional:
-                        x_t_b = hidden_seq[:, seq_len - 1 - t, :]
-
-                # TODO: Modify after adding the stride attribute
-                # gi_f = flow.matmul(
-                #     x_t_f,
-                #     getattr(self, "weight_ih_l{}{}".format(layer, "")).permute(1, 0),
-                # )
-                # gh_f = flow.matmul(
-                #     hid_t_f,
-                #     getattr(self, "weight_hh_l{}{}".format(layer, "")).permute(1, 0),
-                # )
-
-                gi_f = flow.matmul(
-                    x_t_f, getattr(self, "weight_ih_l{}{}".format(layer, "")),
-                )
-                gh_f = flow.matmul(
-                    hid_t_f, getattr(self, "weight_hh_l{}{}".format(layer, "")),
-                )
-                if self.bias:
-                    gi_f += getattr(self, "bias_ih_l{}{}".format(layer, ""))
-                    gh_f += getattr(self, "bias_hh_l{}{}".format(layer, ""))
-                gates_f = gi_f + gh_f
-                ingate_f, forgetgate_f, cellgate_f, outgate_f = gates_f.chunk(4, dim=1)
-                ingate_f = flow.sigmoid(ingate_f)
-                forgetgate_f = flow.sigmoid(forgetgate_f)
-                cellgate_f = flow.tanh(cellgate_f)
-                outgate_f = flow.sigmoid(outgate_f)
-                h_c_t_f = (forgetgate_f * h_c_t_f) + (ingate_f * cellgate_f)
-                hid_t_f = outgate_f * flow.tanh(h_c_t_f)
-                if self.proj_size > 0:
-
-                    # TODO：Modify after adding the stride attribute
-                    # hid_t_f = flow.matmul(
-                    #     hid_t_f,
-                    #     getattr(self, "weight_hr_l{}{}".format(layer, "")).permute(
-                    #         1, 0
-                    #     ),
-                    # )
-
-                    hid_t_f = flow.matmul(
-                        hid_t_f, getattr(self, "weight_hr_l{}{}".format(layer, ""))
-                    )
-                hidden_seq_f.append(hid_t_f.unsqueeze(1))
-
-                if self.bidirectional:
-
-                    # TODO：Modify after adding the stride attribute
-                    # gi_b = flow.matmul(
-                    #     x_t_b,
-                    #     getattr(
-                    #         self, "weight_ih_l{}{}".format(layer, "_reverse")
-                    #     ).permute(1, 0),
-                    # )
-                    # gh_b = flow.matmul(
-                    #     hid_t_b,
-                    #     getattr(
-                    #         self, "weight_hh_l{}{}".format(layer, "_reverse")
-                    #     ).permute(1, 0),
-                    # )
-
-                    gi_b = flow.matmul(
-                        x_t_b,
-                        getattr(self, "weight_ih_l{}{}".format(layer, "_reverse")),
-                    )
-                    gh_b = flow.matmul(
-                        hid_t_b,
-                        getattr(self, "weight_hh_l{}{}".format(layer, "_reverse")),
-                    )
-
-                    if self.bias:
-                        gi_b += getattr(self, "bias_ih_l{}{}".format(layer, "_reverse"))
-                        gh_b += getattr(self, "bias_hh_l{}{}".format(layer, "_reverse"))
-                    gates_b = gi_b + gh_b
-                    ingate_b, forgetgate_b, cellgate_b, outgate_b = gates_b.chunk(
-                        4, dim=1
-                    )
-                    ingate_b = flow.sigmoid(ingate_b)
-                    forgetgate_b = flow.sigmoid(forgetgate_b)
-                    cellgate_b = flow.tanh(cellgate_b)
-                    outgate_b = flow.sigmoid(outgate_b)
-                    h_c_t_b = (forgetgate_b * h_c_t_b) + (ingate_b * cellgate_b)
-                    hid_t_b = outgate_b * flow.tanh(h_c_t_b)
-                    if self.proj_size > 0:
-
-                        # TODO：Modify after adding the stride attribute
-                        # hid_t_b = flow.matmul(
-                        #     hid_t_b,
-                        #     getattr(
-                        #         self, "weight_hr_l{}{}".format(layer, "_reverse")
-                        #     ).permute(1, 0),
-                        # )
-
-                        hid_t_b = flow.matmul(
-                            hid_t_b,
-                            getattr(self, "weight_hr_l{}{}".format(layer, "_reverse")),
-                        )
-                    hidden_seq_b.insert(0, hid_t_b.unsqueeze(1))
-
-            hidden_seq_f = flow.cat(hidden_seq_f, dim=1)
-            if self.bidirectional:
-                hidden_seq_b = flow.cat(hidden_seq_b, dim=1)
-
-            if self.dropout != 0 and layer != self.num_layers - 1:
-                hidden_seq_f = self.drop(hidden_seq_f)
-                if self.bidirectional:
-                    hidden_seq_b = self.drop(hidden_seq_b)
-
-            if self.bidirectional:
-                hidden_seq = flow.cat([hidden_seq_f, hidden_seq_b], dim=2)
-            else:
-                hidden_seq = hidden_seq_f
-
-            if self.bidirectional:
-                h_t = flow.cat([hid_t_f.unsqueeze(0), hid_t_b.unsqueeze(0)], dim=0)
-                c_t = flow.cat([h_c_t_f.unsqueeze(0), h_c_t_b.unsqueeze(0)], dim=0)
-            else:
-                h_t = hid_t_f.unsqueeze(0)
-                c_t = h_c_t_f.unsqueeze(0)
-
-            layer_hidden.append(h_t)
-            layer_cell.append(c_t)
-
-        h_t = flow.cat(layer_hidden, dim=0)
-        c_t = flow.cat(layer_cell, dim=0)
-
-        if self.batch_first == False:
-            hidden_seq = self.permute_tensor(hidden_seq)
-
-        return hidden_seq, (h_t, c_t)
+        return _rnn_forward(self, "LSTM", input, h_0)
 
 
 if __name__ == "__main__":
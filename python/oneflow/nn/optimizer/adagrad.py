@@ -43,6 +43,10 @@ class Adagrad(Optimizer):
             weight_decay (float, optional): The weight decay. Defaults to 0.
             initial_accumulator_value (float, optional): The initial value of S. Defaults to 0.0.
             eps (float, optional): A small constant terms added to the denominator to improve numerical stability. Defaults to 1e-10.
+            foreach (bool, optional): Whether to update the local parameters of the same device and dtype with one multi tensor update op, which reduces the dispatch overhead of models with many parameters. Defaults to False.
+            fused (bool, optional): Whether to update the parameters of the same dtype with the fused multi tensor update kernel, which updates up to 64 parameters per CUDA kernel launch, all the parameters must be local cuda tensors. Defaults to False.
+            state_dtype (oneflow.dtype or dict, optional): The dtype to keep S in between steps. S is a sum of squared gradients, so it is kept in ``oneflow.float32`` if ``state_dtype`` is ``oneflow.float16`` or ``oneflow.bfloat16``, pass ``{"sum": oneflow.bfloat16}`` to keep it in low precision explicitly. The update is computed in the dtype of the parameter. Defaults to None, the dtype of the parameter.
+            offload_state (bool, optional): Whether to keep S of local parameters in host memory between steps. Defaults to False.
         
         For example: 
 
@@ -98,6 +102,10 @@ class Adagrad(Optimizer):
         weight_decay: float = 0,
         initial_accumulator_value: float = 0.0,
         eps: float = 1e-10,
+        foreach: bool = False,
+        fused: bool = False,
+        state_dtype: flow.dtype = None,
+        offload_state: bool = False,
     ):
         assert lr >= 0.0, f"Invalid learning rate: {lr}"
         assert weight_decay >= 0.0, f"Invalid weight_decay value: {weight_decay}"
@@ -113,14 +121,15 @@ class Adagrad(Optimizer):
         options["weight_decay"] = weight_decay
         options["eps"] = eps
         super().__init__(params, options)
+        self._set_multi_tensor_update(foreach, fused)
+        self._set_state_storage(
+            state_dtype, offload_state, second_moment_names=("sum",)
+        )
 
         for param_group in self.param_groups:
             for param in param_group.parameters:
                 assert param.is_leaf, "parameters must be leaf tensor"
                 self._state[param] = dict()
-                self._state[param]["sum"] = flow.zeros_like(param).fill_(
-                    initial_accumulator_value
-                )
 
         self._op = (
             flow.builtin_op("adagrad_update")
@@ -151,11 +160,34 @@ class Adagrad(Optimizer):
                     "lr_decay": param_group["lr_decay"],
                     "train_step_val": self._state["step"] + 1,
                 }
-                for param in param_group.parameters:
+                init_value = param_group["initial_accumulator_value"]
+                param_lists, params = self._split_params_for_update(
+                    param_group.parameters
+                )
+                for param_list in param_lists:
+                    states = [
+                        self._get_state_tensors(param, ("sum",), init_value)
+                        for param in param_list
+                    ]
+                    op = self._get_multi_tensor_op(
+                        "multi_tensor_adagrad_update",
+                        ("model", "model_diff", "sum"),
+                        len(param_list),
+                    )
+                    op(
+                        *param_list,
+                        *[param.grad for param in param_list],
+                        *[state[0] for state in states],
+                        **kwargs,
+                    )
+                    for param, state in zip(param_list, states):
+                        self._set_state_tensors(param, ("sum",), state)
+                for param in params:
                     if param.grad is None:
                         continue
-                    sum_tensor = self._state[param]["sum"]
-                    self._op(param, param.grad, sum_tensor, **kwargs)
+                    state = self._get_state_tensors(param, ("sum",), init_value)
+                    self._op(param, param.grad, *state, **kwargs)
+                    self._set_state_tensors(param, ("sum",), state)
 
             self._state["step"] = self._state["step"] + 1
             return loss
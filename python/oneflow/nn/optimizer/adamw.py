@@ -18,6 +18,7 @@ import math
 from typing import Callable, Dict, Iterator, List, Tuple, Union
 
 import oneflow as flow
+from oneflow.nn.optimizer.adam import _ADAM_STATE_NAMES, _AMSGRAD_STATE_NAMES
 from oneflow.nn.optimizer.optimizer import Optimizer, ParamGroup
 from oneflow.nn.parameter import Parameter
 
@@ -57,6 +58,22 @@ class AdamW(Optimizer):
         weight_decay (float, optional): weight decay (L2 penalty) (In the equation is λ, default: 0)
         amsgrad (bool, optional): whether to use the AMSGrad variant of this algorithm. (default: False) 
         do_bias_correction (bool, optional): Whether do bias correction (default: True)
+        foreach (bool, optional): whether to update the local parameters of the same device
+            and dtype with one multi tensor update op, which reduces the dispatch overhead
+            of models with many parameters (default: False)
+        fused (bool, optional): whether to update the parameters of the same dtype with the
+            fused multi tensor update kernel, which updates up to 64 parameters per CUDA kernel
+            launch, all the parameters must be local cuda tensors (default: False)
+        state_dtype (oneflow.dtype or dict, optional): the dtype to keep ``exp_avg``,
+            ``exp_avg_sq`` and ``max_exp_avg_sq`` in between steps, e.g. ``oneflow.bfloat16``
+            to reduce the memory of optimizer states. With ``oneflow.float16`` or
+            ``oneflow.bfloat16``, ``exp_avg_sq`` and ``max_exp_avg_sq`` are still kept in
+            ``oneflow.float32``, since squares of small gradients underflow. Pass a dict
+            mapping state names to dtypes to choose the dtype of every state explicitly.
+            The update is computed in the dtype of the parameter (default: None, the dtype
+            of the parameter)
+        offload_state (bool, optional): whether to keep the states of local parameters in
+            host memory between steps (default: False)
 
     .. _Adam\\: A Method for Stochastic Optimization:
         https://arxiv.org/abs/1412.6980
@@ -119,6 +136,10 @@ class AdamW(Optimizer):
         weight_decay: float = 0,
         amsgrad: bool = False,
         do_bias_correction: bool = True,
+        foreach: bool = False,
+        fused: bool = False,
+        state_dtype: flow.dtype = None,
+        offload_state: bool = False,
     ):
         assert lr >= 0.0, f"Invalid learning rate: {lr}"
         assert eps >= 0.0, f"Invalid epsilon value: {eps}"
@@ -139,6 +160,12 @@ class AdamW(Optimizer):
         options["do_bias_correction"] = do_bias_correction
         options["amsgrad"] = amsgrad
         super().__init__(parameters, options)
+        self._set_multi_tensor_update(foreach, fused)
+        self._set_state_storage(
+            state_dtype,
+            offload_state,
+            second_moment_names=("exp_avg_sq", "max_exp_avg_sq"),
+        )
 
         for param_group in self.param_groups:
             for param in param_group.parameters:
@@ -146,6 +173,16 @@ class AdamW(Optimizer):
                 self._state[param] = dict()
 
         self._op = (
+            flow.builtin_op("adam_update")
+            .Input("model")
+            .Input("model_diff")
+            .Input("m")
+            .Input("v")
+            .Attr("l1", 0.0)
+            .Attr("l2", 0.0)
+            .Build()
+        )
+        self._amsgrad_op = (
             flow.builtin_op("adam_update")
             .Input("model")
             .Input("model_diff")
@@ -189,22 +226,41 @@ class AdamW(Optimizer):
                     "amsgrad": param_group["amsgrad"],
                 }
 
-                for param in param_group.parameters:
+                amsgrad = param_group["amsgrad"]
+                state_names = _AMSGRAD_STATE_NAMES if amsgrad else _ADAM_STATE_NAMES
+                param_lists, params = self._split_params_for_update(
+                    param_group.parameters
+                )
+                for param_list in param_lists:
+                    states = [
+                        self._get_state_tensors(param, state_names)
+                        for param in param_list
+                    ]
+                    input_names = ["model", "model_diff", "m", "v"]
+                    if amsgrad:
+                        input_names.append("max_v")
+                    op = self._get_multi_tensor_op(
+                        "multi_tensor_adam_update", input_names, len(param_list)
+                    )
+                    op(
+                        *param_list,
+                        *[param.grad for param in param_list],
+                        *[
+                            state[i]
+                            for i in range(len(state_names))
+                            for state in states
+                        ],
+                        **kwargs,
+                    )
+                    for param, state in zip(param_list, states):
+                        self._set_state_tensors(param, state_names, state)
+                for param in params:
                     if param.grad is None:
                         continue
-
-                    if "exp_avg" not in self._state[param]:
-                        self._state[param]["exp_avg"] = flow.zeros_like(param)
-                    if "exp_avg_sq" not in self._state[param]:
-                        self._state[param]["exp_avg_sq"] = flow.zeros_like(param)
-                    if "max_exp_avg_sq" not in self._state[param]:
-                        self._state[param]["max_exp_avg_sq"] = flow.zeros_like(param)
-                    m_tensor = self._state[param]["exp_avg"]
-                    v_tensor = self._state[param]["exp_avg_sq"]
-                    max_v_tensor = self._state[param]["max_exp_avg_sq"]
-                    self._op(
-                        param, param.grad, m_tensor, v_tensor, max_v_tensor, **kwargs,
-                    )
+                    state = self._get_state_tensors(param, state_names)
+                    op = self._amsgrad_op if amsgrad else self._op
+                    op(param, param.grad, *state, **kwargs)
+                    self._set_state_tensors(param, state_names, state)
 
             self._state["step"] += 1
             return loss
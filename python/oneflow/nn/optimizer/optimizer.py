@@ -17,13 +17,31 @@ import collections
 import warnings
 from copy import deepcopy
 from itertools import chain
-from typing import Any, Callable, Dict, Union
+from typing import Any, Callable, Dict, List, Union
 
+import oneflow as flow
 from oneflow.framework.tensor import Tensor
 from oneflow.nn.graph.block import TensorBlock
 from oneflow.nn.parameter import Parameter
 from oneflow.nn.utils.clip_grad import clip_grad_norm_
 
+# With a non-default state storage, at most this many bytes of parameters are
+# updated by one multi tensor update op.
+_FOREACH_STATE_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+def _split_by_bytes(params, max_bytes):
+    chunks = []
+    chunk_bytes = 0
+    for param in params:
+        param_bytes = param.nelement() * param.element_size()
+        if len(chunks) == 0 or chunk_bytes + param_bytes > max_bytes:
+            chunks.append([])
+            chunk_bytes = 0
+        chunks[-1].append(param)
+        chunk_bytes += param_bytes
+    return chunks
+
 
 class ParamGroup(object):
     def __init__(
@@ -81,6 +99,11 @@ class Optimizer(object):
         self._default_options = options
         self._state = dict()
         self._state["step"] = 0
+        self._foreach = False
+        self._multi_tensor_ops = dict()
+        self._state_dtypes = dict()
+        self._default_state_dtype = None
+        self._offload_state = False
 
         self._parse_input_parameters(parameters)
 
@@ -281,6 +304,140 @@ class Optimizer(object):
                 f"params argument given to the optimizer should be an iterable of Tensors or dicts, but got {type(parameters)}"
             )
 
+    def _set_multi_tensor_update(self, foreach: bool, fused: bool):
+        assert not (foreach and fused), "`foreach` and `fused` can not be both True"
+        if fused:
+            for param_group in self.param_groups:
+                for param in param_group.parameters:
+                    assert (
+                        not param.is_consistent and param.device.type == "cuda"
+                    ), "`fused` requires all the parameters to be local cuda tensors"
+        self._foreach = foreach or fused
+
+    def _split_params_for_update(self, params: List[Tensor]):
+        r"""Return ``(param_lists, params)``. Each list of ``param_lists`` holds the local
+        parameters of the same device and data type that are updated by one multi tensor
+        update op when ``foreach`` is enabled, ``params`` are updated one by one.
+        """
+        if not self._foreach:
+            return [], params
+        groups = collections.OrderedDict()
+        single_tensor_params = []
+        for param in params:
+            if param.grad is None:
+                continue
+            if param.is_consistent:
+                single_tensor_params.append(param)
+                continue
+            key = (str(param.device), param.dtype, param.grad.dtype)
+            groups.setdefault(key, []).append(param)
+        if not self._has_default_state_storage():
+            # The states of a multi tensor update are all converted to the layout of
+            # the parameters before the update, so the groups are split into chunks
+            # to bound the memory of the converted states.
+            return (
+                [
+                    chunk
+                    for group in groups.values()
+                    for chunk in _split_by_bytes(group, _FOREACH_STATE_CHUNK_BYTES)
+                ],
+                single_tensor_params,
+            )
+        return list(groups.values()), single_tensor_params
+
+    def _has_default_state_storage(self):
+        return (
+            self._default_state_dtype is None
+            and len(self._state_dtypes) == 0
+            and not self._offload_state
+        )
+
+    def _get_multi_tensor_op(self, op_type_name: str, input_names, num_tensors: int):
+        key = (op_type_name, tuple(input_names), num_tensors)
+        op = self._multi_tensor_ops.get(key)
+        if op is None:
+            builder = flow.builtin_op(op_type_name)
+            for input_name in input_names:
+                builder = builder.Input(input_name, num_tensors)
+            op = builder.Attr("l1", 0.0).Build()
+            self._multi_tensor_ops[key] = op
+        return op
+
+    def _set_state_storage(
+        self, state_dtype=None, offload_state: bool = False, second_moment_names=()
+    ):
+        r"""Keep optimizer states in ``state_dtype`` and/or in host memory between steps.
+        The states are converted to the device and dtype of the parameter for the update.
+
+        ``state_dtype`` is a dtype for all the states, or a dict mapping state names to
+        dtypes. A low precision dtype for all the states does not apply to the states in
+        ``second_moment_names``: averages of squared gradients underflow in float16 and
+        lose most of their precision in bfloat16, so they are kept in float32 unless
+        they are given a dtype by name.
+        """
+        allowed_dtypes = (flow.float16, flow.bfloat16, flow.float32, flow.float64)
+        if isinstance(state_dtype, dict):
+            state_dtypes = dict(state_dtype)
+            default_state_dtype = None
+        else:
+            state_dtypes = dict()
+            default_state_dtype = state_dtype
+            if state_dtype in (flow.float16, flow.bfloat16):
+                for name in second_moment_names:
+                    state_dtypes[name] = flow.float32
+        for dtype in list(state_dtypes.values()) + [default_state_dtype]:
+            assert (
+                dtype is None or dtype in allowed_dtypes
+            ), f"Invalid state_dtype: {dtype}"
+        self._state_dtypes = state_dtypes
+        self._default_state_dtype = default_state_dtype
+        self._offload_state = offload_state
+
+    def _state_in_param_layout(self, param, tensor):
+        if tensor.is_local and str(tensor.device) != str(param.device):
+            tensor = tensor.to(device=param.device)
+        if tensor.dtype != param.dtype:
+            tensor = tensor.to(dtype=param.dtype)
+        return tensor
+
+    def _state_in_storage_layout(self, name, tensor):
+        state_dtype = self._state_dtypes.get(name, self._default_state_dtype)
+        if (
+            state_dtype == flow.bfloat16
+            and tensor.is_local
+            and tensor.device.type == "cpu"
+        ):
+            raise RuntimeError(
+                "bfloat16 optimizer states are only supported for CUDA parameters"
+            )
+        if state_dtype is not None and tensor.dtype != state_dtype:
+            tensor = tensor.to(dtype=state_dtype)
+        if self._offload_state and tensor.is_local and tensor.device.type != "cpu":
+            tensor = tensor.to(device="cpu")
+        return tensor
+
+    def _get_state_tensors(self, param, names, init_value=0.0):
+        r"""Return the states ``names`` of ``param`` in the device and dtype of ``param``.
+        States are only allocated when they are used for the first time.
+        """
+        param_state = self._state[param]
+        tensors = []
+        for name in names:
+            if name not in param_state:
+                tensor = flow.zeros_like(param)
+                if init_value != 0.0:
+                    tensor.fill_(init_value)
+                param_state[name] = self._state_in_storage_layout(name, tensor)
+            tensors.append(self._state_in_param_layout(param, param_state[name]))
+        return tensors
+
+    def _set_state_tensors(self, param, names, tensors):
+        r"""Store the states updated in place after ``_get_state_tensors``."""
+        if self._has_default_state_storage():
+            return
+        for name, tensor in zip(names, tensors):
+            self._state[param][name] = self._state_in_storage_layout(name, tensor)
+
     def _generate_grad_clip_conf_for_optim_conf(self, param_group, optimizer_conf):
         if param_group._enable_clip_grad:
             if (
@@ -79,6 +79,21 @@ class RMSprop(Optimizer):
         centered (bool, optional) : if ``True``, compute the centered RMSProp,
             the gradient is normalized by an estimation of its variance
         weight_decay (float, optional): weight decay (L2 penalty) (default: 0)
+        foreach (bool, optional): whether to update the local parameters of the same device
+            and dtype with one multi tensor update op, which reduces the dispatch overhead
+            of models with many parameters (default: False)
+        fused (bool, optional): whether to update the parameters of the same dtype with the
+            fused multi tensor update kernel, which updates up to 64 parameters per CUDA kernel
+            launch, all the parameters must be local cuda tensors (default: False)
+        state_dtype (oneflow.dtype or dict, optional): the dtype to keep the optimizer states
+            in between steps, e.g. ``oneflow.bfloat16`` to reduce the memory of optimizer
+            states. With ``oneflow.float16`` or ``oneflow.bfloat16``, ``square_avg`` is still
+            kept in ``oneflow.float32``, since squares of small gradients underflow. Pass a
+            dict mapping state names to dtypes to choose the dtype of every state explicitly.
+            The update is computed in the dtype of the parameter (default: None, the dtype
+            of the parameter)
+        offload_state (bool, optional): whether to keep the states of local parameters in
+            host memory between steps (default: False)
 
     For example: 
 
@@ -135,6 +150,10 @@ class RMSprop(Optimizer):
         weight_decay: float = 0,
         momentum: float = 0.0,
         centered: bool = False,
+        foreach: bool = False,
+        fused: bool = False,
+        state_dtype: flow.dtype = None,
+        offload_state: bool = False,
     ):
         assert lr >= 0.0, f"Invalid learning rate: {lr}"
         assert alpha >= 0.0, f"Invalid alpha value: {alpha}"
@@ -148,6 +167,10 @@ class RMSprop(Optimizer):
         options["weight_decay"] = weight_decay
         options["centered"] = centered
         super().__init__(parameters, options)
+        self._set_multi_tensor_update(foreach, fused)
+        self._set_state_storage(
+            state_dtype, offload_state, second_moment_names=("square_avg",)
+        )
 
         for param_group in self.param_groups:
             for param in param_group.parameters:
@@ -194,23 +217,46 @@ class RMSprop(Optimizer):
                     "decay_rate": param_group["alpha"],
                     "l2": param_group["weight_decay"],
                 }
-                for param in param_group.parameters:
+                centered = param_group["centered"]
+                state_names = (
+                    ("square_avg", "grad_avg") if centered else ("square_avg",)
+                )
+                param_lists, params = self._split_params_for_update(
+                    param_group.parameters
+                )
+                for param_list in param_lists:
+                    states = [
+                        self._get_state_tensors(param, state_names)
+                        for param in param_list
+                    ]
+                    input_names = ["model", "model_diff", "mean_square"]
+                    if centered:
+                        input_names.append("mean_gradient")
+                    op = self._get_multi_tensor_op(
+                        "multi_tensor_rmsprop_update", input_names, len(param_list)
+                    )
+                    op(
+                        *param_list,
+                        *[param.grad for param in param_list],
+                        *[
+                            state[i]
+                            for i in range(len(state_names))
+                            for state in states
+                        ],
+                        centered=centered,
+                        **kwargs,
+                    )
+                    for param, state in zip(param_list, states):
+                        self._set_state_tensors(param, state_names, state)
+                for param in params:
                     if param.grad is None:
                         continue
-
-                    if "square_avg" not in self._state[param]:
-                        self._state[param]["square_avg"] = flow.zeros_like(param)
-                    ms_tensor = self._state[param]["square_avg"]
-
-                    if param_group["centered"]:
-                        if "grad_avg" not in self._state[param]:
-                            self._state[param]["grad_avg"] = flow.zeros_like(param)
-                        mg_tensor = self._state[param]["grad_avg"]
-                        self._centered_rmsprop(
-                            param, param.grad, ms_tensor, mg_tensor, **kwargs
-                        )
+                    state = self._get_state_tensors(param, state_names)
+                    if centered:
+                        self._centered_rmsprop(param, param.grad, *state, **kwargs)
                     else:
-                        self._rmsprop(param, param.grad, ms_tensor, **kwargs)
+                        self._rmsprop(param, param.grad, *state, **kwargs)
+                    self._set_state_tensors(param, state_names, state)
             self._state["step"] = self._state["step"] + 1
             return loss
 
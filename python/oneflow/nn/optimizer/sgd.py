@@ -48,6 +48,12 @@ class SGD(Optimizer):
         lr (float, optional): learning rate (default: 1e-3)
         momentum (float, optional): Momentum factor (default: 0.0)
         weight_decay (float, optional): weight decay (L2 penalty) (default: 0.0)
+        foreach (bool, optional): whether to update the local parameters of the same device
+            and dtype with one multi tensor update op, which reduces the dispatch overhead
+            of models with many parameters (default: False)
+        fused (bool, optional): whether to update the parameters of the same dtype with the
+            fused multi tensor update kernel, which updates up to 64 parameters per CUDA kernel
+            launch, all the parameters must be local cuda tensors (default: False)
 
     For example: 
 
@@ -101,6 +107,8 @@ class SGD(Optimizer):
         lr: float = 0.001,
         momentum: float = 0.0,
         weight_decay: float = 0.0,
+        foreach: bool = False,
+        fused: bool = False,
     ):
         assert lr >= 0.0, f"Invalid learning rate: {lr}"
         assert momentum >= 0.0, f"Invalid momentum: {momentum}"
@@ -110,6 +118,7 @@ class SGD(Optimizer):
         options["momentum"] = momentum
         options["weight_decay"] = weight_decay
         super().__init__(parameters, options)
+        self._set_multi_tensor_update(foreach, fused)
 
         for param_group in self.param_groups:
             for param in param_group.parameters:
@@ -142,16 +151,43 @@ class SGD(Optimizer):
             for param_group in self.param_groups:
                 lr = param_group["lr"]
                 l2 = param_group["weight_decay"]
-                for param in param_group.parameters:
+                beta = param_group["momentum"]
+                param_lists, params = self._split_params_for_update(
+                    param_group.parameters
+                )
+                for param_list in param_lists:
+                    grads = [param.grad for param in param_list]
+                    if beta == 0.0:
+                        op = self._get_multi_tensor_op(
+                            "multi_tensor_sgd_update",
+                            ("model", "model_diff"),
+                            len(param_list),
+                        )
+                        op(*param_list, *grads, learning_rate_val=lr, l2=l2)
+                    else:
+                        op = self._get_multi_tensor_op(
+                            "multi_tensor_momentum_update",
+                            ("model", "model_diff", "momentum"),
+                            len(param_list),
+                        )
+                        momentum_bufs = [
+                            self._get_momentum_buf(param) for param in param_list
+                        ]
+                        op(
+                            *param_list,
+                            *grads,
+                            *momentum_bufs,
+                            learning_rate_val=lr,
+                            l2=l2,
+                            beta=beta,
+                        )
+                for param in params:
                     if param.grad is None:
                         continue
-                    if param_group["momentum"] == 0.0:
+                    if beta == 0.0:
                         self._sgd(param, param.grad, learning_rate_val=lr, l2=l2)
                     else:
-                        if "momentum_buf" not in self._state[param]:
-                            self._state[param]["momentum_buf"] = flow.zeros_like(param)
-                        momentum_buf = self._state[param]["momentum_buf"]
-                        beta = param_group["momentum"]
+                        momentum_buf = self._get_momentum_buf(param)
                         self._momentum_sgd(
                             param,
                             param.grad,
@@ -163,6 +199,11 @@ class SGD(Optimizer):
             self._state["step"] = self._state["step"] + 1
             return loss
 
+    def _get_momentum_buf(self, param):
+        if "momentum_buf" not in self._state[param]:
+            self._state[param]["momentum_buf"] = flow.zeros_like(param)
+        return self._state[param]["momentum_buf"]
+
     def _generate_conf_for_graph(self, train_conf, vars_conf):
         new_opt_confs = []
         for param_group in self.param_groups:
@@ -13,36 +13,188 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
-from collections import OrderedDict
+from contextlib import contextmanager
 
 import oneflow as flow
 from oneflow.framework.tensor_tuple_util import convert_to_tensor_tuple
 from oneflow.ops.builtin_ops import BuiltinOp as builtin_op
 
 
-def allreduce_fn(ddp_state_for_reversed_params, param):
-    def allreduce(grad):
-        ddp_state_for_reversed_params[param][0] = True
-        ret = None
-        for cur_param, (ready, deleted) in ddp_state_for_reversed_params.items():
-            if deleted:
-                continue
-            if ready:
-                ddp_state_for_reversed_params[cur_param][1] = True
-                if cur_param is param:
-                    ret = flow._C.local_all_reduce(grad)
-                else:
-                    cur_param.grad = flow._C.local_all_reduce(cur_param.grad)
+def _build_buckets(params, bucket_cap_bytes):
+    buckets = []
+    cur_bucket = []
+    cur_bytes = 0
+    cur_key = None
+    for param in params:
+        key = (param.dtype, str(param.device))
+        nbytes = param.numel() * param.element_size()
+        if len(cur_bucket) > 0 and (
+            key != cur_key or cur_bytes + nbytes > bucket_cap_bytes
+        ):
+            buckets.append(cur_bucket)
+            cur_bucket = []
+            cur_bytes = 0
+        cur_bucket.append(param)
+        cur_bytes += nbytes
+        cur_key = key
+    if len(cur_bucket) > 0:
+        buckets.append(cur_bucket)
+    return buckets
+
+
+class GradBucketReducer(object):
+    r"""All-reduce gradients of parameters in buckets.
+
+    Every bucket owns one persistent flat gradient buffer, and the gradient of a
+    parameter is a view into the buffer of its bucket, so a bucket is reduced by
+    one in-place all-reduce as soon as all of its gradients are ready. Buckets are
+    reduced in the same order on every rank, so a bucket waits for the buckets
+    before it. The bucket order is rebuilt once from the gradient ready order of
+    rank 0 observed in the first synchronized iteration. The rebuild broadcasts the
+    order, so it is done at the start of the next forward, which every rank reaches
+    in sync, instead of when the gradients are ready.
+    """
+
+    def __init__(self, params, world_size, bucket_cap_mb):
+        self.params = params
+        self.world_size = world_size
+        self.bucket_cap_bytes = int(bucket_cap_mb * 1024 * 1024)
+        self.require_sync = True
+        self.sync_this_iteration = True
+        self.prev_iteration_synced = False
+        self.buckets_rebuilt = False
+        self.grad_ready_order = []
+        self._set_buckets(_build_buckets(params, self.bucket_cap_bytes))
+
+    def _set_buckets(self, buckets):
+        self.buckets = buckets
+        self.param2bucket_idx = {}
+        self.bucket_buffers = []
+        self.param2grad_view = {}
+        for idx, bucket in enumerate(buckets):
+            buffer = flow.zeros(
+                sum(param.numel() for param in bucket),
+                dtype=bucket[0].dtype,
+                device=bucket[0].device,
+            )
+            offset = 0
+            for param in bucket:
+                self.param2bucket_idx[param] = idx
+                numel = param.numel()
+                self.param2grad_view[param] = flow._C.narrow_view(
+                    buffer, 0, offset, numel
+                ).view(param.shape)
+                offset += numel
+            self.bucket_buffers.append(buffer)
+        self.bucket_ready_cnt = [0] * len(buckets)
+        self.next_bucket_idx = 0
+
+    def try_rebuild_buckets(self):
+        if self.buckets_rebuilt or not self.prev_iteration_synced:
+            return
+        self.buckets_rebuilt = True
+        if len(self.params) == 0:
+            return
+        param2idx = {param: idx for idx, param in enumerate(self.params)}
+        order = []
+        ready = set()
+        for param in self.grad_ready_order:
+            idx = param2idx[param]
+            if idx not in ready:
+                ready.add(idx)
+                order.append(idx)
+        # Parameters unused in the iteration go last, in the default order, so that
+        # the order is a permutation of all the parameters on every rank.
+        order += [idx for idx in range(len(self.params)) if idx not in ready]
+        order = flow.tensor(order, dtype=flow.int64, device=self.params[0].device)
+        # Use the order of rank 0, so all ranks have the same buckets.
+        order = flow._C.broadcast(order, src_rank=0, inplace=True)
+        # Gradients in the old buffers are moved into the new ones by the hooks
+        # when they are accumulated next time.
+        self._set_buckets(
+            _build_buckets(
+                [self.params[idx] for idx in order.numpy().tolist()],
+                self.bucket_cap_bytes,
+            )
+        )
+
+    def prepare_for_backward(self):
+        self.grad_ready_order = []
+        self.bucket_ready_cnt = [0] * len(self.buckets)
+        self.next_bucket_idx = 0
+        self.sync_this_iteration = self.require_sync
+        self.prev_iteration_synced = self.sync_this_iteration
+
+    def _accumulate_grad(self, param, grad):
+        grad_view = self.param2grad_view[param]
+        with flow.no_grad():
+            if param.grad is grad_view:
+                grad_view.add_(grad)
             else:
-                break
-        return ret
-
-    return allreduce
+                # The first gradient, or param.grad is not in the bucket buffer,
+                # e.g. it is set by the user or the buckets are rebuilt.
+                if param.grad is None:
+                    grad_view.copy_(grad)
+                else:
+                    grad_view.copy_(param.grad)
+                    grad_view.add_(grad)
+        # The returned grad is accumulated into param.grad after the hook, so
+        # clear param.grad to make the view the whole grad.
+        param.grad = None
+        return grad_view
+
+    def _reduce_bucket(self, bucket_idx):
+        buffer = self.bucket_buffers[bucket_idx]
+        with flow.no_grad():
+            flow._C.local_all_reduce(buffer, inplace=True)
+            # Average in the flat buffer once instead of one division per gradient.
+            buffer.mul_(1.0 / self.world_size)
+
+    def hook(self, param):
+        def allreduce(grad):
+            if not self.buckets_rebuilt:
+                self.grad_ready_order.append(param)
+            grad_view = self._accumulate_grad(param, grad)
+            if not self.sync_this_iteration:
+                return grad_view
+            self.bucket_ready_cnt[self.param2bucket_idx[param]] += 1
+            while self.next_bucket_idx < len(self.buckets):
+                bucket = self.buckets[self.next_bucket_idx]
+                if self.bucket_ready_cnt[self.next_bucket_idx] < len(bucket):
+                    break
+                self._reduce_bucket(self.next_bucket_idx)
+                self.next_bucket_idx += 1
+            return grad_view
+
+        return allreduce
 
 
 def DistributedDataParallel(
-    module: "flow.nn.Module", *, broadcast_buffers: bool = True
+    module: "flow.nn.Module",
+    *,
+    broadcast_buffers: bool = True,
+    bucket_cap_mb: float = 25,
 ):
+    r"""Make gradients of module parameters all-reduced and averaged across ranks
+    in backward.
+
+    Gradients are all-reduced in buckets of at most ``bucket_cap_mb`` megabytes,
+    each bucket is launched as soon as its gradients are ready to overlap with
+    the rest of backward. Use ``module.no_sync()`` to accumulate gradients
+    locally without all-reduce:
+
+    .. code-block:: python
+
+        m = flow.nn.parallel.DistributedDataParallel(m)
+        with m.no_sync():
+            m(x1).sum().backward()  # gradients are only accumulated locally
+        m(x2).sum().backward()  # accumulated gradients are all-reduced
+
+    Args:
+        module (oneflow.nn.Module): the module to be parallelized.
+        broadcast_buffers (bool): whether to broadcast buffers of rank 0 before each forward. Default: ``True``.
+        bucket_cap_mb (float): the max size of a gradient bucket in megabytes. Default: ``25``.
+    """
     world_size = flow.env.get_world_size()
     with flow.no_grad():
         for x in module.parameters():
@@ -52,43 +204,49 @@ def DistributedDataParallel(
             # after flow._C.broadcast
             x.requires_grad_(requires_grad)
 
-    ddp_state_for_reversed_params = OrderedDict(
-        reversed([(x, [False, False]) for x in module.parameters() if x.requires_grad])
+    # Gradients are usually ready in the reversed order of parameters.
+    reversed_params = list(
+        reversed([x for x in module.parameters() if x.requires_grad])
     )
-    module._ddp_state_for_reversed_params = ddp_state_for_reversed_params
-    for param in module.parameters():
-        param.register_hook(lambda grad: grad / world_size)
-        param.register_hook(allreduce_fn(ddp_state_for_reversed_params, param))
+    module._ddp_reversed_params = reversed_params
+    reducer = GradBucketReducer(reversed_params, world_size, bucket_cap_mb)
+    module._ddp_grad_reducer = reducer
+    for param in reversed_params:
+        param.register_hook(reducer.hook(param))
+
+    @contextmanager
+    def no_sync():
+        prev_require_sync = reducer.require_sync
+        reducer.require_sync = False
+        try:
+            yield
+        finally:
+            reducer.require_sync = prev_require_sync
+
+    module.no_sync = no_sync
 
     def post_forward_hook(module, input, output):
-        ddp_state_for_reversed_params = module._ddp_state_for_reversed_params
-        for state in ddp_state_for_reversed_params.values():
-            state[0], state[1] = False, False
+        reversed_params = module._ddp_reversed_params
+        module._ddp_grad_reducer.prepare_for_backward()
         if isinstance(output, tuple):
             output = flow._C.select_top_n(
-                convert_to_tensor_tuple(
-                    [*output, *ddp_state_for_reversed_params.keys()]
-                ),
-                n=len(output),
+                convert_to_tensor_tuple([*output, *reversed_params]), n=len(output),
             )
         else:
             output = flow._C.select_top_n(
-                convert_to_tensor_tuple(
-                    [output, *ddp_state_for_reversed_params.keys()]
-                ),
-                n=1,
+                convert_to_tensor_tuple([output, *reversed_params]), n=1,
             )[0]
         return output
 
     module.register_forward_hook(post_forward_hook)
 
-    if broadcast_buffers:
-
-        def pre_forward_hook(module, input):
+    def pre_forward_hook(module, input):
+        module._ddp_grad_reducer.try_rebuild_buckets()
+        if broadcast_buffers:
             with flow.no_grad():
                 for x in module.buffers():
                     flow._C.broadcast(x, inplace=True)
 
-        module.register_forward_pre_hook(pre_forward_hook)
+    module.register_forward_pre_hook(pre_forward_hook)
 
     return module
@@ -0,0 +1,283 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from collections import namedtuple
+from typing import List, Optional, Union
+
+import oneflow as flow
+from oneflow.framework.tensor import Tensor
+
+
+def _to_int_list(x):
+    if isinstance(x, Tensor):
+        return [int(v) for v in x.numpy().tolist()]
+    return [int(v) for v in x]
+
+
+def _index_tensor(indices, device):
+    return flow.tensor(indices, dtype=flow.int64, device=device)
+
+
+class PackedSequence(
+    namedtuple(
+        "PackedSequence", ["data", "batch_sizes", "sorted_indices", "unsorted_indices"]
+    )
+):
+    r"""Holds the data and list of :attr:`batch_sizes` of a packed sequence.
+
+    The interface is consistent with PyTorch.
+    The documentation is referenced from: https://pytorch.org/docs/stable/generated/torch.nn.utils.rnn.PackedSequence.html
+
+    Instances should not be created manually, use :func:`pack_padded_sequence`
+    instead. ``data`` stores the time steps of all the sequences one after
+    another, step ``t`` holding the ``batch_sizes[t]`` sequences that are still
+    running, so recurrent modules never compute on padding.
+
+    Attributes:
+        data (Tensor): Tensor of shape :math:`(\sum batch\_sizes, *)` containing the packed sequence
+        batch_sizes (Tensor): Int64 CPU tensor of batch sizes at each sequence step
+        sorted_indices (Tensor, optional): how the sequences were sorted by length
+        unsorted_indices (Tensor, optional): how to recover the original order
+    """
+
+    def __new__(
+        cls, data, batch_sizes=None, sorted_indices=None, unsorted_indices=None
+    ):
+        if unsorted_indices is None and sorted_indices is not None:
+            unsorted_indices = flow.argsort(sorted_indices)
+        return super(PackedSequence, cls).__new__(
+            cls, data, batch_sizes, sorted_indices, unsorted_indices
+        )
+
+    def to(self, *args, **kwargs):
+        data = self.data.to(*args, **kwargs)
+        if data is self.data:
+            return self
+        sorted_indices = self.sorted_indices
+        unsorted_indices = self.unsorted_indices
+        if sorted_indices is not None:
+            sorted_indices = sorted_indices.to(data.device)
+            unsorted_indices = unsorted_indices.to(data.device)
+        return type(self)(data, self.batch_sizes, sorted_indices, unsorted_indices)
+
+
+def pack_padded_sequence(
+    input: Tensor,
+    lengths: Union[Tensor, List[int]],
+    batch_first: bool = False,
+    enforce_sorted: bool = True,
+) -> PackedSequence:
+    r"""Packs a Tensor containing padded sequences of variable length.
+
+    The interface is consistent with PyTorch.
+    The documentation is referenced from: https://pytorch.org/docs/stable/generated/torch.nn.utils.rnn.pack_padded_sequence.html
+
+    Args:
+        input (Tensor): padded batch of variable length sequences of shape
+            :math:`(T, B, *)`, or :math:`(B, T, *)` if ``batch_first`` is ``True``
+        lengths (Tensor or list(int)): list of sequence lengths of each batch element
+        batch_first (bool, optional): if ``True``, the input is expected in ``B x T x *``
+            format. Default: ``False``
+        enforce_sorted (bool, optional): if ``True``, the input is expected to
+            contain sequences sorted by length in a decreasing order. If
+            ``False``, the input will get sorted unconditionally. Default: ``True``
+
+    Returns:
+        a :class:`PackedSequence` object
+
+    For example:
+
+    .. code-block:: python
+
+        >>> import oneflow as flow
+        >>> from oneflow.nn.utils.rnn import pack_padded_sequence
+        >>> x = flow.tensor([[1, 2, 3], [4, 5, 0]], dtype=flow.float32)
+        >>> packed = pack_padded_sequence(x, [3, 2], batch_first=True)
+        >>> packed.data
+        tensor([1., 4., 2., 5., 3.], dtype=oneflow.float32)
+        >>> packed.batch_sizes
+        tensor([2, 2, 1], dtype=oneflow.int64)
+
+    """
+    lengths = _to_int_list(lengths)
+    if batch_first:
+        input = input.transpose(0, 1)
+    seq_len, batch_size = input.shape[0], input.shape[1]
+    if len(lengths) != batch_size:
+        raise ValueError(
+            "Expected `len(lengths)` to be equal to batch_size, but got "
+            "{} (batch_size={})".format(len(lengths), batch_size)
+        )
+    if enforce_sorted:
+        if any(lengths[i] < lengths[i + 1] for i in range(batch_size - 1)):
+            raise RuntimeError(
+                "`lengths` array must be sorted in decreasing order when "
+                "`enforce_sorted` is True. You can pass `enforce_sorted=False` "
+                "to pack_padded_sequence and/or pack_sequence to sidestep this "
+                "requirement if you do not need ONNX exportability."
+            )
+        order = list(range(batch_size))
+        sorted_indices = None
+    else:
+        order = sorted(range(batch_size), key=lambda b: -lengths[b])
+        sorted_indices = _index_tensor(order, input.device)
+    sorted_lengths = [lengths[b] for b in order]
+    if sorted_lengths[-1] <= 0:
+        raise RuntimeError(
+            "Length of all samples has to be greater than 0, but found an element "
+            "in 'lengths' that is <= 0"
+        )
+    if sorted_lengths[0] > seq_len:
+        raise ValueError("lengths should not exceed the padded sequence length")
+
+    batch_sizes = []
+    rows = []
+    for t in range(sorted_lengths[0]):
+        batch_size_t = sum(1 for l in sorted_lengths if l > t)
+        batch_sizes.append(batch_size_t)
+        rows.extend(t * batch_size + order[b] for b in range(batch_size_t))
+
+    # A single gather over the flattened time-major input replaces per-step slicing.
+    flat = input.reshape(seq_len * batch_size, *input.shape[2:])
+    data = flow._C.gather(flat, _index_tensor(rows, input.device), axis=0)
+    return PackedSequence(
+        data, flow.tensor(batch_sizes, dtype=flow.int64), sorted_indices, None
+    )
+
+
+def pad_packed_sequence(
+    sequence: PackedSequence,
+    batch_first: bool = False,
+    padding_value: float = 0.0,
+    total_length: Optional[int] = None,
+):
+    r"""Pads a packed batch of variable length sequences.
+
+    It is an inverse operation to :func:`pack_padded_sequence`.
+
+    The interface is consistent with PyTorch.
+    The documentation is referenced from: https://pytorch.org/docs/stable/generated/torch.nn.utils.rnn.pad_packed_sequence.html
+
+    Args:
+        sequence (PackedSequence): batch to pad
+        batch_first (bool, optional): if ``True``, the output will be in ``B x T x *``
+            format. Default: ``False``
+        padding_value (float, optional): values for padded elements. Default: 0.0
+        total_length (int, optional): if not ``None``, the output will be padded to
+            have length :attr:`total_length`. Default: ``None``
+
+    Returns:
+        Tuple of Tensor containing the padded sequence, and a Tensor
+        containing the list of lengths of each sequence in the batch.
+
+    For example:
+
+    .. code-block:: python
+
+        >>> import oneflow as flow
+        >>> from oneflow.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
+        >>> x = flow.tensor([[1, 2, 3], [4, 5, 0]], dtype=flow.float32)
+        >>> packed = pack_padded_sequence(x, [3, 2], batch_first=True)
+        >>> padded, lengths = pad_packed_sequence(packed, batch_first=True)
+        >>> padded
+        tensor([[1., 2., 3.],
+                [4., 5., 0.]], dtype=oneflow.float32)
+        >>> lengths
+        tensor([3, 2], dtype=oneflow.int64)
+
+    """
+    data = sequence.data
+    batch_sizes = _to_int_list(sequence.batch_sizes)
+    max_seq_len = len(batch_sizes)
+    if total_length is not None:
+        if total_length < max_seq_len:
+            raise ValueError(
+                "Expected total_length to be at least the length of the longest "
+                "sequence in input, but got total_length={} and max sequence "
+                "length being {}".format(total_length, max_seq_len)
+            )
+        max_seq_len = total_length
+    batch_size = batch_sizes[0]
+    if sequence.unsorted_indices is not None:
+        unsorted = _to_int_list(sequence.unsorted_indices)
+    else:
+        unsorted = list(range(batch_size))
+
+    # Row `data.shape[0]` is a padding row appended to the data, every padded
+    # position gathers it, so the whole output is produced by one gather.
+    pad_row = data.shape[0]
+    rows = [pad_row] * (max_seq_len * batch_size)
+    lengths = [0] * batch_size
+    offset = 0
+    for t, batch_size_t in enumerate(batch_sizes):
+        for b in range(batch_size_t):
+            lengths[b] += 1
+        for b in range(batch_size):
+            if unsorted[b] < batch_size_t:
+                rows[t * batch_size + b] = offset + unsorted[b]
+        offset += batch_size_t
+    padding = (
+        flow.zeros((1,) + tuple(data.shape[1:]), dtype=data.dtype, device=data.device)
+        + padding_value
+    )
+    padded = flow._C.gather(
+        flow.cat([data, padding], dim=0), _index_tensor(rows, data.device), axis=0
+    )
+    padded = padded.reshape(max_seq_len, batch_size, *data.shape[1:])
+    if batch_first:
+        padded = padded.transpose(0, 1)
+    lengths = flow.tensor([lengths[b] for b in unsorted], dtype=flow.int64)
+    return padded, lengths
+
+
+def pad_sequence(
+    sequences: List[Tensor], batch_first: bool = False, padding_value: float = 0.0
+) -> Tensor:
+    r"""Pads a list of variable length Tensors with ``padding_value``.
+
+    The interface is consistent with PyTorch.
+    The documentation is referenced from: https://pytorch.org/docs/stable/generated/torch.nn.utils.rnn.pad_sequence.html
+
+    Args:
+        sequences (list[Tensor]): list of variable length sequences of shape :math:`(L_i, *)`
+        batch_first (bool, optional): output will be in ``B x T x *`` if True, or in
+            ``T x B x *`` otherwise. Default: ``False``
+        padding_value (float, optional): value for padded elements. Default: 0.0
+
+    Returns:
+        Tensor of size ``T x B x *`` if :attr:`batch_first` is ``False``.
+        Tensor of size ``B x T x *`` otherwise
+    """
+    max_len = max(s.shape[0] for s in sequences)
+    padded = []
+    for s in sequences:
+        if s.shape[0] < max_len:
+            padding = (
+                flow.zeros(
+                    (max_len - s.shape[0],) + tuple(s.shape[1:]),
+                    dtype=s.dtype,
+                    device=s.device,
+                )
+                + padding_value
+            )
+            s = flow.cat([s, padding], dim=0)
+        padded.append(s)
+    return flow.stack(padded, dim=0 if batch_first else 1)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(raise_on_error=True)
@@ -0,0 +1,86 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+# Compare the peak host memory and step time of training a deep nn.Sequential with
+# and without activation checkpointing, e.g.
+#
+#   python3 activation_checkpoint_benchmark.py --depth 64 --width 2048 --segments 0,2,4,8
+#
+# Each configuration runs in a fresh process so that the peak resident memory
+# (ru_maxrss) only accounts for that configuration.
+
+import argparse
+import multiprocessing
+import resource
+import time
+
+
+def _run(depth, width, batch_size, segments, iters, queue):
+    import oneflow as flow
+    from oneflow.utils.checkpoint import checkpoint_sequential
+
+    model = flow.nn.Sequential(
+        *[
+            flow.nn.Sequential(
+                flow.nn.Linear(width, width), flow.nn.ReLU(), flow.nn.Dropout(0.1)
+            )
+            for _ in range(depth)
+        ]
+    )
+    x = flow.randn(batch_size, width, requires_grad=True)
+    start = time.perf_counter()
+    for _ in range(iters):
+        if segments > 0:
+            y = checkpoint_sequential(model, segments, x)
+        else:
+            y = model(x)
+        y.sum().backward()
+        model.zero_grad()
+    # numpy() waits for all the instructions launched before
+    x.grad.numpy()
+    elapsed = (time.perf_counter() - start) / iters * 1000
+    queue.put((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=64)
+    parser.add_argument("--width", type=int, default=2048)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument(
+        "--segments",
+        type=str,
+        default="0,2,4,8",
+        help="comma separated segment numbers, 0 means no checkpointing",
+    )
+    parser.add_argument("--iters", type=int, default=3)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    print("segments  peak_rss(MB)  step(ms)")
+    for segments in [int(s) for s in args.segments.split(",")]:
+        queue = ctx.Queue()
+        proc = ctx.Process(
+            target=_run,
+            args=(args.depth, args.width, args.batch_size, segments, args.iters, queue),
+        )
+        proc.start()
+        peak_rss, step_ms = queue.get()
+        proc.join()
+        print("{:>8}  {:>12.1f}  {:>8.2f}".format(segments, peak_rss, step_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+# Compare the DataLoader throughput of passing batches from workers through
+# shared memory and through pickled pipes, e.g.
+#
+#   python3 dataloader_throughput_benchmark.py --num-workers 1,2,4,8 --sample-shape 3,224,224
+
+import argparse
+import time
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.multiprocessing.reductions as reductions
+
+
+class SyntheticDataset(flow.utils.data.Dataset):
+    def __init__(self, length, sample_shape):
+        self.length = length
+        self.sample = np.random.randn(*sample_shape).astype(np.float32)
+
+    def __getitem__(self, index):
+        return self.sample
+
+    def __len__(self):
+        return self.length
+
+
+def benchmark_loader(num_workers, batch_size, sample_shape, num_batches, warmup):
+    dataset = SyntheticDataset((num_batches + warmup) * batch_size, sample_shape)
+    loader = flow.utils.data.DataLoader(
+        dataset, batch_size=batch_size, num_workers=num_workers
+    )
+    it = iter(loader)
+    for _ in range(warmup):
+        next(it)
+    start = time.perf_counter()
+    for _ in range(num_batches):
+        next(it)
+    return num_batches / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-workers", type=str, default="1,2,4,8")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--sample-shape", type=str, default="3,224,224")
+    parser.add_argument("--num-batches", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    args = parser.parse_args()
+    sample_shape = tuple(int(d) for d in args.sample_shape.split(","))
+
+    print(
+        "{:<12}{:>18}{:>18}{:>10}".format(
+            "num_workers", "pickle(batch/s)", "shm(batch/s)", "speedup"
+        )
+    )
+    for num_workers in (int(n) for n in args.num_workers.split(",")):
+        throughputs = []
+        for use_shared_memory in (False, True):
+            # Workers are forked after this, so they see the flag
+            reductions._use_shared_memory = use_shared_memory
+            throughputs.append(
+                benchmark_loader(
+                    num_workers,
+                    args.batch_size,
+                    sample_shape,
+                    args.num_batches,
+                    args.warmup,
+                )
+            )
+        print(
+            "{:<12}{:>18.2f}{:>18.2f}{:>9.2f}x".format(
+                num_workers,
+                throughputs[0],
+                throughputs[1],
+                throughputs[1] / throughputs[0],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
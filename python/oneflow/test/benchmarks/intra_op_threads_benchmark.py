@@ -0,0 +1,99 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+# Measure how the CPU kernels that run on the intra-op thread pool scale from 1
+# to N threads, e.g.
+#
+#   python3 intra_op_threads_benchmark.py --max-threads 32 --numel 16777216
+
+import argparse
+import os
+import time
+
+import oneflow as flow
+
+
+def _timeit(fn, iters, warmup):
+    for _ in range(warmup):
+        fn()
+    # numpy() waits for all the instructions launched before
+    fn().numpy()
+    start = time.perf_counter()
+    for _ in range(iters):
+        y = fn()
+    y.numpy()
+    return (time.perf_counter() - start) / iters * 1000
+
+
+def _thread_counts(max_threads):
+    counts = []
+    num_threads = 1
+    while num_threads < max_threads:
+        counts.append(num_threads)
+        num_threads *= 2
+    counts.append(max_threads)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count())
+    parser.add_argument("--numel", type=int, default=1 << 24)
+    parser.add_argument("--row-size", type=int, default=1024)
+    parser.add_argument("--iters", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = args.numel // args.row_size
+    x = flow.randn(rows, args.row_size)
+    y = flow.randn(rows, args.row_size)
+    image = flow.randn(rows // 64, 64, 4, args.row_size // 4)
+    layer_norm = flow.nn.LayerNorm(args.row_size)
+    group_norm = flow.nn.GroupNorm(32, 64)
+    cases = [
+        ("relu", lambda: flow.relu(x)),
+        ("gelu", lambda: flow.nn.functional.gelu(x)),
+        ("tanh", lambda: flow.tanh(x)),
+        ("cast", lambda: x.to(flow.float64)),
+        ("fill", lambda: flow.ones(rows, args.row_size)),
+        ("add", lambda: x + y),
+        ("transpose", lambda: flow.transpose(x, 0, 1)),
+        ("softmax", lambda: flow.softmax(x, dim=-1)),
+        ("log_softmax", lambda: flow.log_softmax(x, dim=-1)),
+        ("layer_norm", lambda: layer_norm(x)),
+        ("group_norm", lambda: group_norm(image)),
+    ]
+    counts = _thread_counts(args.max_threads)
+    default_num_threads = flow.get_num_threads()
+    print(
+        "{:<12}".format("op")
+        + "".join("{:>12}".format("{}T(ms)".format(t)) for t in counts)
+        + "{:>10}".format("speedup")
+    )
+    for name, fn in cases:
+        latencies = []
+        for num_threads in counts:
+            flow.set_num_threads(num_threads)
+            latencies.append(_timeit(fn, args.iters, args.warmup))
+        print(
+            "{:<12}".format(name)
+            + "".join("{:>12.3f}".format(latency) for latency in latencies)
+            + "{:>9.2f}x".format(latencies[0] / latencies[-1])
+        )
+    flow.set_num_threads(default_num_threads)
+
+
+if __name__ == "__main__":
+    main()
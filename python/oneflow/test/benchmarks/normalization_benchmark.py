@@ -0,0 +1,121 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+# Compare the CPU latency of the native layer_norm / group_norm kernels with the
+# composite path of mean, var, sub, rsqrt, mul and add ops they replace, e.g.
+#
+#   python3 normalization_benchmark.py --batch-size 64 --hidden-size 1024
+
+import argparse
+import time
+
+import oneflow as flow
+
+
+def composite_layer_norm(x, weight, bias, eps):
+    mean = x.mean(dim=-1, keepdim=True)
+    variance = x.var(dim=-1, unbiased=False, keepdim=True)
+    return (x - mean) * (variance + eps).rsqrt() * weight + bias
+
+
+def composite_group_norm(x, num_groups, weight, bias, eps):
+    n, c = x.shape[0], x.shape[1]
+    grouped = x.reshape(n, num_groups, -1)
+    mean = grouped.mean(dim=2, keepdim=True)
+    variance = grouped.var(dim=2, unbiased=False, keepdim=True)
+    normalized = ((grouped - mean) / flow.sqrt(variance + eps)).reshape(n, c, -1)
+    normalized = normalized * weight.reshape(1, c, 1) + bias.reshape(1, c, 1)
+    return normalized.reshape(x.shape)
+
+
+def _timeit(fn, x, iters, warmup, backward):
+    def run():
+        y = fn(x)
+        if backward:
+            y.sum().backward()
+        return y
+
+    for _ in range(warmup):
+        run()
+    # numpy() waits for all the instructions launched before
+    run().numpy()
+    start = time.perf_counter()
+    for _ in range(iters):
+        y = run()
+    y.numpy()
+    return (time.perf_counter() - start) / iters * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seq-len", type=int, default=128)
+    parser.add_argument("--hidden-size", type=int, default=768)
+    parser.add_argument("--channels", type=int, default=64)
+    parser.add_argument("--spatial-size", type=int, default=56)
+    parser.add_argument("--num-groups", type=int, default=32)
+    parser.add_argument("--iters", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--backward", action="store_true")
+    args = parser.parse_args()
+
+    eps = 1e-5
+    layer_norm = flow.nn.LayerNorm(args.hidden_size)
+    group_norm = flow.nn.GroupNorm(args.num_groups, args.channels)
+    ln_x = flow.randn(
+        args.batch_size, args.seq_len, args.hidden_size, requires_grad=args.backward
+    )
+    gn_x = flow.randn(
+        args.batch_size,
+        args.channels,
+        args.spatial_size,
+        args.spatial_size,
+        requires_grad=args.backward,
+    )
+    cases = [
+        (
+            "layer_norm",
+            ln_x,
+            lambda x: composite_layer_norm(x, layer_norm.weight, layer_norm.bias, eps),
+            layer_norm,
+        ),
+        (
+            "group_norm",
+            gn_x,
+            lambda x: composite_group_norm(
+                x, args.num_groups, group_norm.weight, group_norm.bias, eps
+            ),
+            group_norm,
+        ),
+    ]
+    print(
+        "{:<12}{:>16}{:>16}{:>10}".format(
+            "op", "composite(ms)", "native(ms)", "speedup"
+        )
+    )
+    for name, x, composite, native in cases:
+        latencies = [
+            _timeit(fn, x, args.iters, args.warmup, args.backward)
+            for fn in (composite, native)
+        ]
+        print(
+            "{:<12}{:>16.3f}{:>16.3f}{:>9.2f}x".format(
+                name, latencies[0], latencies[1], latencies[0] / latencies[1]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
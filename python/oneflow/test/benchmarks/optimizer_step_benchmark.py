@@ -0,0 +1,108 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+# Compare the eager optimizer step latency of the per parameter loop, the multi
+# tensor (foreach) update and, on cuda, the fused update, e.g.
+#
+#   python3 optimizer_step_benchmark.py --device cuda --num-params 500 --param-size 1024
+#
+# The latency of a step is measured until the device finishes it, so on cuda it
+# includes the kernel launches and the kernels themselves.
+
+import argparse
+import time
+
+import oneflow as flow
+from oneflow.nn.parameter import Parameter
+
+_OPTIMIZERS = {
+    "sgd": (flow.optim.SGD, {"lr": 0.1}),
+    "momentum": (flow.optim.SGD, {"lr": 0.1, "momentum": 0.9}),
+    "adam": (flow.optim.Adam, {"lr": 0.001}),
+    "adamw": (flow.optim.AdamW, {"lr": 0.001, "weight_decay": 0.01}),
+    "rmsprop": (flow.optim.RMSprop, {"lr": 0.001}),
+    "adagrad": (flow.optim.Adagrad, {"lr": 0.001}),
+}
+
+
+def _sync(device):
+    # numpy() waits for all the instructions launched before
+    flow.zeros(1, device=device).numpy()
+
+
+def benchmark_step(name, device, num_params, param_size, iters, warmup, mode):
+    optim_cls, optim_kwargs = _OPTIMIZERS[name]
+    params = []
+    for _ in range(num_params):
+        param = Parameter(flow.randn(param_size, device=device))
+        param.grad = flow.randn(param_size, device=device)
+        params.append(param)
+    optim = optim_cls(
+        params, foreach=mode == "foreach", fused=mode == "fused", **optim_kwargs
+    )
+    for _ in range(warmup):
+        optim.step()
+    _sync(device)
+    start = time.perf_counter()
+    for _ in range(iters):
+        optim.step()
+    _sync(device)
+    return (time.perf_counter() - start) / iters * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--optimizers", type=str, default=",".join(_OPTIMIZERS))
+    parser.add_argument(
+        "--device", type=str, default="cuda" if flow.cuda.is_available() else "cpu"
+    )
+    parser.add_argument("--num-params", type=int, default=200)
+    parser.add_argument("--param-size", type=int, default=1024)
+    parser.add_argument("--iters", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    args = parser.parse_args()
+
+    modes = ["per-param", "foreach"]
+    if flow.device(args.device).type == "cuda":
+        modes.append("fused")
+    print(
+        "{:<10}".format("optimizer")
+        + "".join("{:>16}".format(mode + "(ms)") for mode in modes)
+        + "".join("{:>16}".format(mode + " speedup") for mode in modes[1:])
+    )
+    for name in args.optimizers.split(","):
+        latencies = [
+            benchmark_step(
+                name,
+                args.device,
+                args.num_params,
+                args.param_size,
+                args.iters,
+                args.warmup,
+                mode,
+            )
+            for mode in modes
+        ]
+        print(
+            "{:<10}".format(name)
+            + "".join("{:>16.3f}".format(latency) for latency in latencies)
+            + "".join(
+                "{:>15.2f}x".format(latencies[0] / latency) for latency in latencies[1:]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.utils.data.sampler import _FeistelPermutation
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestArrayBackedSampler(flow.unittest.TestCase):
+    def test_random_sampler(test_case):
+        sampler = flow.utils.data.RandomSampler(range(100))
+        indices = list(sampler)
+        test_case.assertTrue(all(isinstance(i, int) for i in indices))
+        test_case.assertEqual(sorted(indices), list(range(100)))
+
+        sampler = flow.utils.data.RandomSampler(
+            range(10), replacement=True, num_samples=70
+        )
+        indices = list(sampler)
+        test_case.assertEqual(len(indices), 70)
+        test_case.assertTrue(all(0 <= i < 10 for i in indices))
+
+    def test_batch_sampler_yields_lists(test_case):
+        sampler = flow.utils.data.RandomSampler(range(10))
+        batches = list(flow.utils.data.BatchSampler(sampler, 4, drop_last=False))
+        test_case.assertEqual([len(b) for b in batches], [4, 4, 2])
+        test_case.assertTrue(all(isinstance(b, list) for b in batches))
+        test_case.assertTrue(all(isinstance(i, int) for b in batches for i in b))
+        test_case.assertEqual(sorted(sum(batches, [])), list(range(10)))
+        batches = list(flow.utils.data.BatchSampler(sampler, 4, drop_last=True))
+        test_case.assertEqual([len(b) for b in batches], [4, 4])
+
+    def test_dataloader_with_array_batches(test_case):
+        dataset = flow.utils.data.TensorDataset(flow.arange(10))
+        loader = flow.utils.data.DataLoader(dataset, batch_size=3, shuffle=True)
+        values = np.concatenate([batch[0].numpy() for batch in loader])
+        test_case.assertEqual(sorted(values.tolist()), list(range(10)))
+
+    def test_batch_sampler_as_sampler(test_case):
+        class IndexDataset(flow.utils.data.Dataset):
+            def __getitem__(self, index):
+                assert isinstance(index, list)
+                return flow.tensor(index)
+
+            def __len__(self):
+                return 10
+
+        batch_sampler = flow.utils.data.BatchSampler(
+            flow.utils.data.RandomSampler(range(10)), 4, drop_last=False
+        )
+        loader = flow.utils.data.DataLoader(
+            IndexDataset(), sampler=batch_sampler, batch_size=None
+        )
+        values = np.concatenate([batch.numpy() for batch in loader])
+        test_case.assertEqual(sorted(values.tolist()), list(range(10)))
+
+    def test_feistel_permutation(test_case):
+        for n in (1, 2, 7, 100, 4097):
+            perm = _FeistelPermutation(n, 3)
+            indices = perm(np.arange(n))
+            test_case.assertEqual(sorted(indices.tolist()), list(range(n)))
+            test_case.assertTrue(
+                np.array_equal(perm(np.arange(n // 2, n)), indices[n // 2 :])
+            )
+
+    def test_distributed_sampler(test_case):
+        dataset = list(range(11))
+        for lazy_shuffle in (False, True):
+            for drop_last in (False, True):
+                samplers = [
+                    flow.utils.data.DistributedSampler(
+                        dataset,
+                        num_replicas=3,
+                        rank=rank,
+                        drop_last=drop_last,
+                        lazy_shuffle=lazy_shuffle,
+                    )
+                    for rank in range(3)
+                ]
+                per_rank = [list(sampler) for sampler in samplers]
+                test_case.assertTrue(
+                    all(len(indices) == len(samplers[0]) for indices in per_rank)
+                )
+                merged = sum(per_rank, [])
+                if drop_last:
+                    test_case.assertEqual(len(set(merged)), 9)
+                else:
+                    test_case.assertEqual(set(merged), set(dataset))
+                    test_case.assertEqual(len(merged), 12)
+                test_case.assertEqual(per_rank[1], list(samplers[1]))
+
+        sampler = flow.utils.data.DistributedSampler(
+            dataset, num_replicas=2, rank=1, shuffle=False
+        )
+        test_case.assertEqual(list(sampler), [1, 3, 5, 7, 9, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+import oneflow.utils.vision.transforms as transforms
+
+
+def _images(n=4, c=3, h=6, w=8):
+    return flow.tensor(
+        np.random.rand(n, c, h, w).astype(np.float32), dtype=flow.float32
+    )
+
+
+def _find_window(test_case, image, window):
+    # asserts that window is a crop of image and returns its top left corner
+    h, w = window.shape[-2:]
+    for top in range(image.shape[-2] - h + 1):
+        for left in range(image.shape[-1] - w + 1):
+            if np.allclose(image[..., top : top + h, left : left + w], window):
+                return top, left
+    test_case.fail("not a crop of the image")
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestBatchTransforms(flow.unittest.TestCase):
+    def test_to_tensor(test_case):
+        pics = [np.random.randint(0, 256, (5, 7, 3), dtype=np.uint8) for _ in range(3)]
+        batch = transforms.BatchToTensor()(pics)
+        test_case.assertEqual(batch.shape, flow.Size([3, 3, 5, 7]))
+        expected = np.stack(pics).transpose(0, 3, 1, 2) / 255
+        test_case.assertTrue(np.allclose(batch.numpy(), expected, atol=1e-6))
+
+    def test_normalize(test_case):
+        img = _images()
+        mean, std = (0.1, 0.2, 0.3), (0.5, 0.6, 0.7)
+        out = transforms.BatchNormalize(mean, std)(img)
+        expected = transforms.Normalize(mean, std)(img)
+        test_case.assertTrue(np.allclose(out.numpy(), expected.numpy(), atol=1e-6))
+
+    def test_flip(test_case):
+        img = _images()
+        out = transforms.BatchRandomHorizontalFlip(p=1.0)(img)
+        test_case.assertTrue(np.array_equal(out.numpy(), img.numpy()[..., ::-1]))
+        out = transforms.BatchRandomVerticalFlip(p=0.0)(img)
+        test_case.assertTrue(np.array_equal(out.numpy(), img.numpy()))
+
+        img = _images(n=64)
+        out = transforms.BatchRandomHorizontalFlip(p=0.5)(img).numpy()
+        flipped = [np.array_equal(o, i[..., ::-1]) for o, i in zip(out, img.numpy())]
+        test_case.assertTrue(0 < sum(flipped) < 64)
+
+    def test_random_crop(test_case):
+        img = _images(n=16)
+        out = transforms.BatchRandomCrop((4, 5))(img).numpy()
+        test_case.assertEqual(out.shape, (16, 3, 4, 5))
+        corners = [_find_window(test_case, i, o) for o, i in zip(out, img.numpy())]
+        test_case.assertTrue(len(set(corners)) > 1)
+
+        out = transforms.BatchRandomCrop((6, 8), padding=1)(img).numpy()
+        padded = np.pad(img.numpy(), ((0, 0), (0, 0), (1, 1), (1, 1)))
+        for o, i in zip(out, padded):
+            _find_window(test_case, i, o)
+
+    def test_random_resized_crop(test_case):
+        img = _images(n=8, h=8, w=8)
+        out = transforms.BatchRandomResizedCrop(8, scale=(1.0, 1.0), ratio=(1.0, 1.0))(
+            img
+        )
+        test_case.assertTrue(np.allclose(out.numpy(), img.numpy(), atol=1e-5))
+
+        out = transforms.BatchRandomResizedCrop((3, 5))(img)
+        test_case.assertEqual(out.shape, flow.Size([8, 3, 3, 5]))
+
+    def test_fused_compose(test_case):
+        pics = np.random.randint(0, 256, (4, 6, 8, 3), dtype=np.uint8)
+        mean, std = (0.1, 0.2, 0.3), (0.5, 0.6, 0.7)
+        compose = transforms.BatchCompose(
+            [
+                transforms.BatchToTensor(),
+                transforms.BatchRandomResizedCrop(
+                    (6, 8), scale=(1.0, 1.0), ratio=(4.0 / 3, 4.0 / 3)
+                ),
+                transforms.BatchRandomHorizontalFlip(p=1.0),
+                transforms.BatchRandomCrop((6, 8)),
+                transforms.BatchNormalize(mean, std),
+            ]
+        )
+        out = compose(pics)
+        expected = transforms.Normalize(mean, std)(
+            transforms.BatchToTensor()(pics).flip(-1)
+        )
+        test_case.assertTrue(np.allclose(out.numpy(), expected.numpy(), atol=1e-5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+class CountingDataset(flow.utils.data.Dataset):
+    def __init__(self, n):
+        self.data = np.arange(n * 2, dtype=np.float32).reshape(n, 2)
+        self.getitem_cnt = 0
+
+    def __getitem__(self, index):
+        self.getitem_cnt += 1
+        return self.data[index], int(index)
+
+    def __len__(self):
+        return len(self.data)
+
+
+def _fetch_all(dataset, collate_fn=None):
+    loader = flow.utils.data.DataLoader(
+        dataset, batch_size=4, shuffle=False, collate_fn=collate_fn
+    )
+    return list(loader)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestBatchedFetch(flow.unittest.TestCase):
+    def test_tensor_dataset_getitems(test_case):
+        x = flow.tensor(np.random.randn(10, 3), dtype=flow.float32)
+        y = flow.arange(10)
+        dataset = flow.utils.data.TensorDataset(x, y)
+        batch = dataset.__getitems__([3, -1, 0])
+        test_case.assertTrue(isinstance(batch, flow.utils.data.CollatedBatch))
+        test_case.assertEqual(batch.size, 3)
+        test_case.assertTrue(
+            np.allclose(batch.data[0].numpy(), x.numpy()[[3, 9, 0]], 1e-05, 1e-05)
+        )
+        test_case.assertEqual(batch.data[1].numpy().tolist(), [3, 9, 0])
+
+        batches = _fetch_all(dataset)
+        test_case.assertEqual(len(batches), 3)
+        test_case.assertTrue(
+            np.allclose(batches[1][0].numpy(), x.numpy()[4:8], 1e-05, 1e-05)
+        )
+        test_case.assertEqual(batches[2][1].numpy().tolist(), [8, 9])
+
+    def test_custom_collate_fn_gets_samples(test_case):
+        dataset = flow.utils.data.TensorDataset(flow.arange(6))
+        batches = _fetch_all(dataset, collate_fn=lambda samples: len(samples))
+        test_case.assertEqual(batches, [4, 2])
+
+    def test_subset_getitems(test_case):
+        x = flow.arange(10)
+        subset = flow.utils.data.Subset(flow.utils.data.TensorDataset(x), [9, 7, 5, 3])
+        batch = subset.__getitems__([1, 3])
+        test_case.assertEqual(batch.data[0].numpy().tolist(), [7, 3])
+
+        counting = CountingDataset(6)
+        subset = flow.utils.data.Subset(counting, [5, 4, 3])
+        samples = subset.__getitems__([0, 2])
+        test_case.assertEqual([s[1] for s in samples], [5, 3])
+
+    def test_concat_dataset_getitems(test_case):
+        a = flow.utils.data.TensorDataset(flow.arange(0, 5))
+        b = flow.utils.data.TensorDataset(flow.arange(10, 13))
+        concat = flow.utils.data.ConcatDataset([a, b])
+        batch = concat.__getitems__([6, 0, 7, 4, 5])
+        test_case.assertTrue(isinstance(batch, flow.utils.data.CollatedBatch))
+        test_case.assertEqual(batch.data[0].numpy().tolist(), [11, 0, 12, 4, 10])
+
+        counting = CountingDataset(3)
+        concat = flow.utils.data.ConcatDataset([counting, a])
+        samples = concat.__getitems__([4, 1, 3])
+        test_case.assertEqual(int(samples[0][0]), 1)
+        test_case.assertEqual(samples[1][1], 1)
+        test_case.assertEqual(int(samples[2][0]), 0)
+
+    def test_dataset_without_getitems(test_case):
+        counting = CountingDataset(6)
+        batches = _fetch_all(counting)
+        test_case.assertEqual(counting.getitem_cnt, 6)
+        test_case.assertEqual(batches[0][1].numpy().tolist(), [0, 1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
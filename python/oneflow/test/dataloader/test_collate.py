@@ -0,0 +1,71 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import collections
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.utils.data._utils.collate import default_collate
+
+Sample = collections.namedtuple("Sample", ["image", "label"])
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestDefaultCollate(flow.unittest.TestCase):
+    def test_collate_ndarray(test_case):
+        for dtype in (np.float32, np.float64, np.int64, np.uint8):
+            batch = [np.random.randn(3, 4).astype(dtype) for _ in range(5)]
+            out = default_collate(batch)
+            test_case.assertEqual(tuple(out.shape), (5, 3, 4))
+            test_case.assertEqual(out.dtype, flow.tensor(batch[0]).dtype)
+            test_case.assertTrue(np.array_equal(out.numpy(), np.stack(batch)))
+
+    def test_collate_scalars(test_case):
+        batch = [np.float32(i) for i in range(4)]
+        out = default_collate(batch)
+        test_case.assertEqual(out.dtype, flow.float32)
+        test_case.assertTrue(np.array_equal(out.numpy(), np.arange(4)))
+        test_case.assertEqual(default_collate([1, 2, 3]).dtype, flow.int64)
+        test_case.assertEqual(default_collate([1.0, 2.0]).dtype, flow.float64)
+
+    def test_collate_nested(test_case):
+        batch = [
+            {
+                "sample": Sample(np.full((2,), i, dtype=np.float32), i),
+                "arrays": [np.ones(3) * i, np.zeros(1)],
+            }
+            for i in range(4)
+        ]
+        out = default_collate(batch)
+        test_case.assertTrue(isinstance(out["sample"], Sample))
+        test_case.assertTrue(
+            np.array_equal(
+                out["sample"].image.numpy(), np.repeat(np.arange(4), 2).reshape(4, 2)
+            )
+        )
+        test_case.assertTrue(np.array_equal(out["sample"].label.numpy(), np.arange(4)))
+        test_case.assertEqual(tuple(out["arrays"][0].shape), (4, 3))
+        test_case.assertEqual(tuple(out["arrays"][1].shape), (4, 1))
+
+    def test_collate_unequal_shapes(test_case):
+        with test_case.assertRaises(ValueError):
+            default_collate([np.zeros(2), np.zeros(3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+
+import oneflow as flow
+import oneflow.unittest
+
+
+class _RangeIterableDataset(flow.utils.data.IterableDataset):
+    def __init__(self, n):
+        self.n = n
+
+    def __iter__(self):
+        return iter(range(self.n))
+
+
+def _collate(batch):
+    return flow.stack([sample[0] for sample in batch])
+
+
+def _values(batches):
+    return [batch.numpy().tolist() for batch in batches]
+
+
+def _resume_after(test_case, make_loader, num_batches):
+    loader = make_loader()
+    it = iter(loader)
+    seen = [next(it) for _ in range(num_batches)]
+    state = loader.state_dict()
+    test_case.assertEqual(state["num_yielded"], num_batches)
+    expected = _values(list(it))
+
+    resumed = make_loader()
+    resumed.load_state_dict(state)
+    test_case.assertEqual(_values(list(resumed)), expected)
+    return _values(seen), expected
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestDataLoaderStateDict(flow.unittest.TestCase):
+    def test_sequential_resume(test_case):
+        dataset = flow.utils.data.TensorDataset(flow.arange(20))
+        make_loader = lambda: flow.utils.data.DataLoader(
+            dataset, batch_size=3, collate_fn=_collate,
+        )
+        seen, rest = _resume_after(test_case, make_loader, 2)
+        test_case.assertEqual(sum(seen + rest, []), list(range(20)))
+
+    def test_shuffle_resume(test_case):
+        dataset = flow.utils.data.TensorDataset(flow.arange(100))
+        make_loader = lambda: flow.utils.data.DataLoader(
+            dataset, batch_size=8, shuffle=True, collate_fn=_collate
+        )
+        seen, rest = _resume_after(test_case, make_loader, 5)
+        test_case.assertEqual(sorted(sum(seen + rest, [])), list(range(100)))
+
+    def test_shuffle_with_replacement_resume(test_case):
+        dataset = flow.utils.data.TensorDataset(flow.arange(10))
+        make_loader = lambda: flow.utils.data.DataLoader(
+            dataset,
+            batch_size=4,
+            sampler=flow.utils.data.RandomSampler(
+                dataset, replacement=True, num_samples=40
+            ),
+            collate_fn=_collate,
+        )
+        _resume_after(test_case, make_loader, 3)
+
+    def test_distributed_sampler_resume(test_case):
+        dataset = flow.utils.data.TensorDataset(flow.arange(50))
+        sampler = flow.utils.data.DistributedSampler(
+            dataset, num_replicas=2, rank=1, seed=3
+        )
+        sampler.set_epoch(4)
+        loader = flow.utils.data.DataLoader(
+            dataset, batch_size=4, sampler=sampler, collate_fn=_collate
+        )
+        it = iter(loader)
+        next(it)
+        state = loader.state_dict()
+        expected = _values(list(it))
+
+        sampler = flow.utils.data.DistributedSampler(
+            dataset, num_replicas=2, rank=1, seed=3
+        )
+        resumed = flow.utils.data.DataLoader(
+            dataset, batch_size=4, sampler=sampler, collate_fn=_collate
+        )
+        resumed.load_state_dict(state)
+        test_case.assertEqual(_values(list(resumed)), expected)
+        test_case.assertEqual(sampler.epoch, 4)
+
+    def test_iterable_resume(test_case):
+        make_loader = lambda: flow.utils.data.DataLoader(
+            _RangeIterableDataset(23), batch_size=5
+        )
+        seen, rest = _resume_after(test_case, make_loader, 2)
+        test_case.assertEqual(sum(seen + rest, []), list(range(23)))
+
+    def test_resume_only_once(test_case):
+        dataset = flow.utils.data.TensorDataset(flow.arange(12))
+        loader = flow.utils.data.DataLoader(dataset, batch_size=4, collate_fn=_collate)
+        it = iter(loader)
+        next(it)
+        state = loader.state_dict()
+        loader.load_state_dict(state)
+        test_case.assertEqual(len(list(loader)), 2)
+        test_case.assertEqual(len(list(loader)), 3)
+
+    def test_mismatched_dataset_kind(test_case):
+        loader = flow.utils.data.DataLoader(_RangeIterableDataset(4), batch_size=2)
+        map_loader = flow.utils.data.DataLoader(
+            flow.utils.data.TensorDataset(flow.arange(4)), batch_size=2
+        )
+        with test_case.assertRaises(ValueError):
+            loader.load_state_dict(map_loader.state_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
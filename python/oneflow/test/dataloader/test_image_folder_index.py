@@ -0,0 +1,83 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import pickle
+import tempfile
+import time
+import unittest
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.utils.vision.datasets import ImageFolder
+from oneflow.utils.vision.datasets.folder import IMG_EXTENSIONS, make_dataset
+
+
+def _make_tree(root, mtime):
+    for cls in ["dog", "cat"]:
+        for sub in ["", os.path.join("x", "y")]:
+            os.makedirs(os.path.join(root, cls, sub), exist_ok=True)
+            for i in range(3):
+                open(os.path.join(root, cls, sub, "{}.jpg".format(i)), "w").close()
+    open(os.path.join(root, "cat", "notes.txt"), "w").close()
+    # A fresh scan is only cached for directories not modified recently
+    for d, _, _ in os.walk(root):
+        os.utime(d, (mtime, mtime))
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestImageFolderIndex(flow.unittest.TestCase):
+    def test_sample_table(test_case):
+        with tempfile.TemporaryDirectory() as root:
+            _make_tree(root, time.time() - 100)
+            expected = make_dataset(root, extensions=IMG_EXTENSIONS)
+            test_case.assertEqual(len(expected), 12)
+            test_case.assertEqual(
+                make_dataset(root, extensions=IMG_EXTENSIONS, num_workers=4), expected,
+            )
+            dataset = ImageFolder(root, num_scan_workers=2)
+            test_case.assertEqual(list(dataset.samples), expected)
+            test_case.assertEqual(dataset.samples[-1], expected[-1])
+            test_case.assertEqual(dataset.samples[:5], expected[:5])
+            test_case.assertEqual(dataset.samples[-4::-3], expected[-4::-3])
+            test_case.assertEqual(dataset.targets.dtype.name, "int32")
+            samples = pickle.loads(pickle.dumps(dataset.samples))
+            test_case.assertEqual(list(samples), expected)
+
+    def test_index_cache(test_case):
+        with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as tmp:
+            mtime = time.time() - 100
+            _make_tree(root, mtime)
+            cache = os.path.join(tmp, "index.npz")
+            expected = list(ImageFolder(root, index_cache=cache).samples)
+            test_case.assertTrue(os.path.isfile(cache))
+
+            # The cache is used while no directory is modified
+            new_dir = os.path.join(root, "dog", "x", "y")
+            open(os.path.join(new_dir, "new.jpg"), "w").close()
+            os.utime(new_dir, (mtime, mtime))
+            test_case.assertEqual(
+                list(ImageFolder(root, index_cache=cache).samples), expected
+            )
+
+            # and is rebuilt after
+            os.utime(new_dir, (mtime + 1, mtime + 1))
+            dataset = ImageFolder(root, index_cache=cache)
+            test_case.assertEqual(len(dataset), len(expected) + 1)
+            test_case.assertIn(os.path.join(new_dir, "new.jpg"), dict(dataset.samples))
+
+
+if __name__ == "__main__":
+    unittest.main()
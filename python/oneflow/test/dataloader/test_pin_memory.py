@@ -0,0 +1,89 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+class DictDataset(flow.utils.data.Dataset):
+    def __getitem__(self, index):
+        return {
+            "x": np.full((2, 3), index, dtype=np.float32),
+            "y": index,
+        }
+
+    def __len__(self):
+        return 16
+
+
+def _check_batches(test_case, loader, pinned):
+    for i, batch in enumerate(loader):
+        for key in ("x", "y"):
+            test_case.assertEqual(batch[key].device.type, "cpu")
+            test_case.assertEqual(batch[key].is_pinned(), pinned)
+        test_case.assertTrue(
+            np.array_equal(batch["y"].numpy(), np.arange(4 * i, 4 * i + 4))
+        )
+        test_case.assertEqual(tuple(batch["x"].shape), (4, 2, 3))
+    test_case.assertEqual(i, 3)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestPinMemory(flow.unittest.TestCase):
+    @unittest.skipIf(not os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test cpu cases")
+    def test_pin_memory_without_cuda(test_case):
+        for num_workers in (0, 2):
+            loader = flow.utils.data.DataLoader(
+                DictDataset(), batch_size=4, num_workers=num_workers, pin_memory=True
+            )
+            _check_batches(test_case, loader, pinned=False)
+
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test cpu cases")
+    def test_pinned_empty(test_case):
+        x = flow.empty(2, 3, pin_memory=True)
+        test_case.assertEqual(x.device.type, "cpu")
+        test_case.assertTrue(x.is_pinned())
+        test_case.assertFalse(flow.empty(2, 3).is_pinned())
+        x.copy_(flow.ones(2, 3))
+        test_case.assertTrue(np.array_equal(x.numpy(), np.ones((2, 3))))
+        y = x.to("cuda")
+        test_case.assertTrue(np.array_equal(y.numpy(), np.ones((2, 3))))
+
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test cpu cases")
+    def test_pin_memory_reuses_buffers(test_case):
+        for num_workers in (0, 2):
+            loader = flow.utils.data.DataLoader(
+                DictDataset(),
+                batch_size=4,
+                num_workers=num_workers,
+                pin_memory=True,
+                pin_memory_device="cuda",
+            )
+            for _ in range(2):
+                _check_batches(test_case, loader, pinned=True)
+            buffers = loader._pinned_buffer_pool._buffers[((4, 2, 3), flow.float32)]
+            # 8 batches are staged in at most 4 buffers: the staged batches and the
+            # one returned
+            test_case.assertLessEqual(len(buffers), 4)
+            test_case.assertTrue(all(buffer.is_pinned() for buffer in buffers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import unittest
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _test_graph_plan_cache(test_case, device):
+    linear = flow.nn.Linear(3, 8, False)
+    linear = linear.to(device)
+    flow.nn.init.constant_(linear.weight, 2.3)
+
+    class LinearGraph(flow.nn.Graph):
+        def __init__(self):
+            super().__init__()
+            self.my_linear = linear
+
+        def build(self, x):
+            return self.my_linear(x)
+
+    linear_g = LinearGraph()
+    linear_g.config.enable_plan_cache(max_plans=2)
+    test_case.assertIsNone(linear_g.plan_cache_stats())
+
+    for batch in (4, 6, 4, 6, 8, 4):
+        x = flow.randn(batch, 3, device=device)
+        of_lazy_out = linear_g(x)
+        test_case.assertEqual(of_lazy_out.shape, flow.Size([batch, 8]))
+        test_case.assertTrue(
+            np.allclose(of_lazy_out.numpy(), linear(x).numpy(), 1e-05, 1e-05)
+        )
+
+    stats = linear_g.plan_cache_stats()
+    test_case.assertEqual(stats["size"], 2)
+    test_case.assertEqual(stats["hits"], 2)
+    # batch 6, batch 8 and the last batch 4 compile new plans
+    test_case.assertEqual(stats["misses"], 3)
+    test_case.assertEqual(stats["evictions"], 2)
+
+
+def _test_graph_plan_cache_padding(test_case, device):
+    linear = flow.nn.Linear(3, 8, False)
+    linear = linear.to(device)
+    flow.nn.init.constant_(linear.weight, 2.3)
+
+    class LinearGraph(flow.nn.Graph):
+        def __init__(self):
+            super().__init__()
+            self.my_linear = linear
+
+        def build(self, x):
+            return self.my_linear(x)
+
+    linear_g = LinearGraph()
+    linear_g.config.enable_plan_cache(max_plans=4, pad_to_cached_shape=True)
+    linear_g(flow.randn(8, 3, device=device))
+
+    x = flow.randn(5, 3, device=device)
+    of_lazy_out = linear_g(x)
+    # outputs keep the padded shape
+    test_case.assertEqual(of_lazy_out.shape, flow.Size([8, 8]))
+    test_case.assertTrue(
+        np.allclose(of_lazy_out[:5].numpy(), linear(x).numpy(), 1e-05, 1e-05)
+    )
+    test_case.assertTrue(np.allclose(of_lazy_out[5:].numpy(), 0, 1e-05, 1e-05))
+
+    stats = linear_g.plan_cache_stats()
+    test_case.assertEqual(stats["size"], 1)
+    test_case.assertEqual(stats["padded_hits"], 1)
+    test_case.assertEqual(stats["misses"], 0)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestGraphPlanCache(oneflow.unittest.TestCase):
+    def test_graph_plan_cache_cpu(test_case):
+        _test_graph_plan_cache(test_case, flow.device("cpu"))
+
+    def test_graph_plan_cache_padding_cpu(test_case):
+        _test_graph_plan_cache_padding(test_case, flow.device("cpu"))
+
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test cpu cases")
+    def test_graph_plan_cache_gpu(test_case):
+        _test_graph_plan_cache(test_case, flow.device("cuda"))
+
+
+if __name__ == "__main__":
+    unittest.main()
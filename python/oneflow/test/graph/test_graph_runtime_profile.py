@@ -0,0 +1,88 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import unittest
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _test_graph_runtime_profile(test_case, device, sync_device):
+    linear = flow.nn.Linear(3, 8, False)
+    linear = linear.to(device)
+
+    class LinearGraph(flow.nn.Graph):
+        def __init__(self):
+            super().__init__()
+            self.my_linear = linear
+
+        def build(self, x):
+            return self.my_linear(x).relu()
+
+    linear_g = LinearGraph()
+    test_case.assertIsNone(linear_g.runtime_profile())
+    linear_g.config.enable_profiling(sync_device=sync_device)
+
+    x = flow.randn(4, 3, device=device)
+    steps = 5
+    for _ in range(steps):
+        of_lazy_out = linear_g(x)
+    test_case.assertTrue(
+        np.allclose(of_lazy_out.numpy(), linear(x).relu().numpy(), 1e-05, 1e-05)
+    )
+
+    report = linear_g.runtime_profile(reset=True)
+    test_case.assertEqual(report["steps"], steps)
+    job_op_names = set(op.name for op in linear_g._full_graph_proto.net.op)
+    test_case.assertTrue(set(report["ops"].keys()).issubset(job_op_names))
+    op_types = [op["op_type"] for op in report["ops"].values()]
+    test_case.assertIn("matmul", op_types)
+    test_case.assertIn("relu", op_types)
+    for op in report["ops"].values():
+        if op["op_type"] in ("matmul", "relu"):
+            test_case.assertEqual(op["launches"], steps)
+            test_case.assertGreater(op["kernel_time_ns"], 0)
+            test_case.assertGreaterEqual(
+                op["max_kernel_time_ns"], op["avg_kernel_time_ns"]
+            )
+        for actor_id in op["actor_ids"]:
+            test_case.assertIn(actor_id, report["actors"])
+    for actor in report["actors"].values():
+        test_case.assertGreaterEqual(actor["read_wait_ns"], 0)
+        test_case.assertGreaterEqual(actor["write_wait_ns"], 0)
+        for regst in actor["registers"]:
+            test_case.assertLessEqual(regst["max_in_use"], regst["capacity"])
+            test_case.assertLessEqual(regst["mean_in_use"], regst["max_in_use"])
+
+    report = linear_g.runtime_profile()
+    test_case.assertEqual(report["steps"], 0)
+    for op in report["ops"].values():
+        test_case.assertEqual(op["launches"], 0)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestGraphRuntimeProfile(oneflow.unittest.TestCase):
+    def test_graph_runtime_profile_cpu(test_case):
+        _test_graph_runtime_profile(test_case, flow.device("cpu"), False)
+
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test cpu cases")
+    def test_graph_runtime_profile_gpu(test_case):
+        _test_graph_runtime_profile(test_case, flow.device("cuda"), True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+_SCRIPT = textwrap.dedent(
+    """
+    import sys
+    import numpy as np
+    import oneflow as flow
+
+    compiled_path, out_path, mode = sys.argv[1], sys.argv[2], sys.argv[3]
+
+    linear = flow.nn.Linear(3, 8, False)
+    flow.nn.init.constant_(linear.weight, 2.3)
+
+    class LinearGraph(flow.nn.Graph):
+        def __init__(self):
+            super().__init__()
+            self.my_linear = linear
+
+        def build(self, x):
+            return self.my_linear(x)
+
+    linear_g = LinearGraph()
+    x = flow.tensor(np.arange(12, dtype=np.float32).reshape(4, 3))
+    if mode == "save":
+        out = linear_g(x)
+        linear_g.save_compiled(compiled_path)
+    else:
+        assert linear_g.load_compiled(compiled_path)
+        out = linear_g(x)
+    np.save(out_path, out.numpy())
+    """
+)
+
+
+def _run_script(test_case, script_path, compiled_path, out_path, mode):
+    ret = subprocess.run(
+        [sys.executable, script_path, compiled_path, out_path, mode],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    test_case.assertEqual(ret.returncode, 0, ret.stdout.decode())
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestGraphSaveLoadCompiled(oneflow.unittest.TestCase):
+    def test_save_and_load_compiled_in_new_process(test_case):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            script_path = os.path.join(tmp_dir, "linear_graph.py")
+            with open(script_path, "w") as f:
+                f.write(_SCRIPT)
+            compiled_path = os.path.join(tmp_dir, "compiled")
+            save_out = os.path.join(tmp_dir, "save_out.npy")
+            load_out = os.path.join(tmp_dir, "load_out.npy")
+            _run_script(test_case, script_path, compiled_path, save_out, "save")
+            _run_script(test_case, script_path, compiled_path, load_out, "load")
+            test_case.assertTrue(np.array_equal(np.load(save_out), np.load(load_out)))
+
+    def test_load_out_of_date_compiled(test_case):
+        linear = flow.nn.Linear(3, 8, False)
+
+        class LinearGraph(flow.nn.Graph):
+            def __init__(self, module):
+                super().__init__()
+                self.my_linear = module
+
+            def build(self, x):
+                return self.my_linear(x)
+
+        linear_g = LinearGraph(linear)
+        linear_g(flow.randn(4, 3))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            linear_g.save_compiled(tmp_dir)
+            # a different module structure makes the compiled plan out of date
+            other_g = LinearGraph(flow.nn.Linear(3, 8, True))
+            test_case.assertFalse(other_g.load_compiled(tmp_dir))
+            out = other_g(flow.randn(4, 3))
+            test_case.assertEqual(out.shape, flow.Size([4, 8]))
+
+    def test_load_compiled_with_changed_build(test_case):
+        linear = flow.nn.Linear(3, 8, False)
+
+        class LinearGraph(flow.nn.Graph):
+            def __init__(self, module):
+                super().__init__()
+                self.my_linear = module
+
+            def build(self, x):
+                return self.my_linear(x)
+
+        linear_g = LinearGraph(linear)
+        linear_g(flow.randn(4, 3))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            linear_g.save_compiled(tmp_dir)
+            test_case.assertTrue(LinearGraph(linear).load_compiled(tmp_dir))
+
+            # same name, module and states, but build() is changed
+            class LinearGraph(flow.nn.Graph):
+                def __init__(self, module):
+                    super().__init__()
+                    self.my_linear = module
+
+                def build(self, x):
+                    return self.my_linear(x) * 2
+
+            other_g = LinearGraph(linear)
+            test_case.assertFalse(other_g.load_compiled(tmp_dir))
+            x = flow.randn(4, 3)
+            test_case.assertTrue(
+                np.allclose(other_g(x).numpy(), linear(x).numpy() * 2, atol=1e-5)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
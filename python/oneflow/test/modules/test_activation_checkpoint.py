@@ -0,0 +1,95 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.utils.checkpoint import checkpoint, checkpoint_sequential
+
+
+def _make_model(depth=6, width=8, p=0.0):
+    return flow.nn.Sequential(
+        *[
+            flow.nn.Sequential(
+                flow.nn.Linear(width, width), flow.nn.ReLU(), flow.nn.Dropout(p)
+            )
+            for _ in range(depth)
+        ]
+    )
+
+
+def _run(model, x, fn):
+    x = x.clone().detach()
+    x.requires_grad = True
+    flow.manual_seed(1)
+    y = fn(model, x)
+    y.sum().backward()
+    grads = [p.grad.numpy() for p in model.parameters()]
+    return y.numpy(), x.grad.numpy(), grads
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestActivationCheckpoint(flow.unittest.TestCase):
+    def _compare(test_case, p, fn):
+        ref_model = _make_model(p=p)
+        model = _make_model(p=p)
+        model.load_state_dict(ref_model.state_dict())
+        x = flow.randn(4, 8)
+        ref = _run(ref_model, x, lambda m, x: m(x))
+        out = _run(model, x, fn)
+        test_case.assertTrue(np.allclose(ref[0], out[0], atol=1e-5))
+        test_case.assertTrue(np.allclose(ref[1], out[1], atol=1e-5))
+        for (ref_grad, grad) in zip(ref[2], out[2]):
+            test_case.assertTrue(np.allclose(ref_grad, grad, atol=1e-5))
+
+    def test_checkpoint(test_case):
+        test_case._compare(0.0, lambda m, x: checkpoint(m, x))
+
+    def test_checkpoint_reproduces_dropout(test_case):
+        test_case._compare(0.5, lambda m, x: checkpoint(m, x))
+
+    def test_checkpoint_sequential(test_case):
+        for segments in [1, 2, 3, 6, 8]:
+            test_case._compare(
+                0.5, lambda m, x: checkpoint_sequential(m, segments, x),
+            )
+
+    def test_checkpoint_multiple_outputs_and_non_tensor_args(test_case):
+        linear = flow.nn.Linear(8, 8)
+
+        def fn(x, scale, y):
+            h = linear(x) * scale
+            return h, h + y
+
+        x = flow.randn(4, 8, requires_grad=True)
+        y = flow.randn(4, 8, requires_grad=True)
+        a, b = checkpoint(fn, x, 2.0, y)
+        (a.sum() + b.sum()).backward()
+        test_case.assertTrue(np.allclose(y.grad.numpy(), np.ones((4, 8))))
+        test_case.assertTrue(
+            np.allclose(
+                x.grad.numpy(),
+                np.tile(4.0 * linear.weight.numpy().sum(axis=0), (4, 1)),
+                atol=1e-5,
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import tempfile
+import threading
+import unittest
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.framework.async_checkpoint import AsyncCheckpointWriter
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestAsyncSave(flow.unittest.TestCase):
+    def test_async_save_snapshot(test_case):
+        m = flow.nn.Linear(4, 3)
+        expected = {k: v.numpy() for k, v in m.state_dict().items()}
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "ckpt")
+            future = flow.save(m.state_dict(), path, async_=True)
+            # modifying parameters after flow.save returns does not affect the file
+            with flow.no_grad():
+                m.weight.fill_(0.0)
+                m.bias.fill_(0.0)
+            test_case.assertIsNone(future.result())
+            test_case.assertEqual(os.listdir(root), ["ckpt"])
+            loaded = flow.load(path)
+            for k, v in expected.items():
+                test_case.assertTrue(np.array_equal(loaded[k].numpy(), v))
+
+    def test_async_save_overwrite(test_case):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "ckpt")
+            flow.save({"x": flow.ones(2, 3)}, path)
+            futures = [
+                flow.save({"x": flow.ones(2, 3) * i}, path, async_=True)
+                for i in range(3)
+            ]
+            for f in futures:
+                f.result()
+            test_case.assertEqual(os.listdir(root), ["ckpt"])
+            loaded = flow.load(path)
+            test_case.assertTrue(
+                np.array_equal(loaded["x"].numpy(), np.full((2, 3), 2))
+            )
+
+    def test_recover_interrupted_replace(test_case):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "ckpt")
+            flow.save({"x": flow.ones(2, 3)}, path)
+            # a crash between the two renames of atomic_replace_dir leaves only the
+            # old checkpoint renamed aside
+            os.rename(path, os.path.join(root, ".ckpt.old-0"))
+            loaded = flow.load(path)
+            test_case.assertTrue(np.array_equal(loaded["x"].numpy(), np.ones((2, 3))))
+            test_case.assertEqual(os.listdir(root), ["ckpt"])
+
+            # a crash after the swap leaves the old checkpoint, which is removed
+            os.mkdir(os.path.join(root, ".ckpt.old-1"))
+            flow.save({"x": flow.ones(2, 3) * 2}, path, async_=True).result()
+            test_case.assertEqual(os.listdir(root), ["ckpt"])
+            loaded = flow.load(path)
+            test_case.assertTrue(
+                np.array_equal(loaded["x"].numpy(), np.full((2, 3), 2))
+            )
+
+    def test_async_save_failure(test_case):
+        with tempfile.TemporaryDirectory() as root:
+            not_a_dir = os.path.join(root, "file")
+            open(not_a_dir, "w").close()
+            path = os.path.join(not_a_dir, "ckpt")
+            future = flow.save({"x": flow.ones(2)}, path, async_=True)
+            with test_case.assertRaises(Exception):
+                future.result()
+            test_case.assertFalse(os.path.exists(path))
+
+    def test_bounded_inflight_bytes(test_case):
+        writer = AsyncCheckpointWriter(max_workers=2, max_inflight_bytes=100)
+        started = threading.Event()
+        unblock = threading.Event()
+
+        def slow_write():
+            started.set()
+            unblock.wait()
+
+        first = writer.new_reservation()
+        first.reserve(80)
+        # a single save may exceed the limit when nothing else is in flight
+        first.reserve(80)
+        future = writer.submit(first, [slow_write], lambda: None)
+        started.wait()
+        test_case.assertEqual(writer.inflight_bytes, 160)
+
+        second = writer.new_reservation()
+        reserved = threading.Event()
+
+        def reserve():
+            second.reserve(10)
+            reserved.set()
+
+        t = threading.Thread(target=reserve)
+        t.start()
+        test_case.assertFalse(reserved.wait(0.2))
+        unblock.set()
+        future.result()
+        t.join()
+        test_case.assertTrue(reserved.is_set())
+        test_case.assertEqual(writer.inflight_bytes, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestAutocastMode(flow.unittest.TestCase):
+    def test_autocast_state(test_case):
+        test_case.assertFalse(flow.amp.is_autocast_enabled())
+        with flow.autocast("cuda"):
+            test_case.assertTrue(flow.amp.is_autocast_enabled())
+            with flow.autocast("cuda", enabled=False):
+                test_case.assertFalse(flow.amp.is_autocast_enabled())
+            test_case.assertTrue(flow.amp.is_autocast_enabled())
+        test_case.assertFalse(flow.amp.is_autocast_enabled())
+
+        @flow.autocast("cuda", dtype=flow.bfloat16)
+        def func():
+            test_case.assertTrue(flow.amp.is_autocast_enabled())
+
+        func()
+        test_case.assertFalse(flow.amp.is_autocast_enabled())
+
+    def test_autocast_cpu_linear(test_case):
+        linear = flow.nn.Linear(8, 4)
+        x = flow.randn(2, 8)
+        with test_case.assertWarns(UserWarning):
+            ctx = flow.autocast("cpu")
+        with ctx:
+            test_case.assertFalse(flow.amp.is_autocast_enabled())
+            y = linear(x)
+        test_case.assertEqual(y.dtype, flow.float32)
+        expected = np.matmul(x.numpy(), linear.weight.numpy().T) + linear.bias.numpy()
+        test_case.assertTrue(np.allclose(y.numpy(), expected, rtol=1e-5, atol=1e-5))
+
+    def test_autocast_invalid_args(test_case):
+        with test_case.assertRaises(ValueError):
+            flow.autocast("xpu")
+        with test_case.assertRaises(ValueError):
+            flow.autocast("cuda", dtype=flow.int32)
+
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test gpu cases")
+    def test_autocast_matmul(test_case):
+        x = flow.randn(4, 8, device="cuda")
+        w = flow.randn(8, 16, device="cuda", requires_grad=True)
+        b = flow.randn(16, device="cuda", requires_grad=True)
+        with flow.autocast("cuda"):
+            y = flow.matmul(x, w)
+            test_case.assertEqual(y.dtype, flow.float16)
+            # broadcast_add is in the gray list and follows its half input
+            z = y + b
+            test_case.assertEqual(z.dtype, flow.float16)
+            # relu is in the clear list and keeps the dtype
+            test_case.assertEqual(flow.relu(x).dtype, flow.float32)
+        test_case.assertEqual(flow.matmul(x, w).dtype, flow.float32)
+        z.sum().backward()
+        test_case.assertEqual(w.grad.dtype, flow.float32)
+        test_case.assertEqual(b.grad.dtype, flow.float32)
+        test_case.assertTrue(
+            np.allclose(
+                y.numpy(),
+                np.matmul(x.numpy(), w.numpy()).astype(np.float16),
+                rtol=1e-2,
+                atol=1e-2,
+            )
+        )
+
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test gpu cases")
+    def test_autocast_disabled_region(test_case):
+        x = flow.randn(4, 8, device="cuda")
+        w = flow.randn(8, 16, device="cuda")
+        with flow.autocast("cuda"):
+            with flow.autocast("cuda", enabled=False):
+                test_case.assertEqual(flow.matmul(x, w).dtype, flow.float32)
+            test_case.assertEqual(flow.matmul(x, w).dtype, flow.float16)
+
+
+def _make_sgd_with_grad(grad):
+    param = flow.nn.Parameter(flow.ones(4))
+    param.grad = flow.tensor(grad, dtype=flow.float32)
+    return param, flow.optim.SGD([param], lr=1.0)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestGradScaler(flow.unittest.TestCase):
+    def test_scale_and_unscale(test_case):
+        scaler = flow.amp.GradScaler(init_scale=4.0)
+        loss = flow.tensor([1.5])
+        test_case.assertTrue(np.allclose(scaler.scale(loss).numpy(), [6.0]))
+        param, optimizer = _make_sgd_with_grad([4.0, 8.0, -4.0, 0.0])
+        scaler.unscale_(optimizer)
+        test_case.assertTrue(np.allclose(param.grad.numpy(), [1.0, 2.0, -1.0, 0.0]))
+        with test_case.assertRaises(RuntimeError):
+            scaler.unscale_(optimizer)
+        scaler.step(optimizer)
+        test_case.assertTrue(np.allclose(param.numpy(), [0.0, -1.0, 2.0, 1.0]))
+        scaler.update()
+        test_case.assertEqual(scaler.get_scale(), 4.0)
+
+    def test_skip_step_on_inf(test_case):
+        scaler = flow.amp.GradScaler(init_scale=8.0)
+        param, optimizer = _make_sgd_with_grad([1.0, float("inf"), 1.0, float("nan")])
+        test_case.assertIsNone(scaler.step(optimizer))
+        test_case.assertTrue(np.allclose(param.numpy(), np.ones(4)))
+        scaler.update()
+        test_case.assertEqual(scaler.get_scale(), 4.0)
+
+    def test_growth(test_case):
+        scaler = flow.amp.GradScaler(init_scale=2.0, growth_interval=2)
+        param, optimizer = _make_sgd_with_grad([0.0, 0.0, 0.0, 0.0])
+        for expected_scale in [2.0, 4.0, 4.0, 8.0]:
+            scaler.step(optimizer)
+            scaler.update()
+            test_case.assertEqual(scaler.get_scale(), expected_scale)
+        state = scaler.state_dict()
+        new_scaler = flow.amp.GradScaler()
+        new_scaler.load_state_dict(state)
+        test_case.assertEqual(new_scaler.get_scale(), 8.0)
+
+    def test_unscale_groups_of_dtypes(test_case):
+        scaler = flow.amp.GradScaler(init_scale=4.0)
+        p32 = flow.nn.Parameter(flow.ones(3))
+        p32.grad = flow.tensor([4.0, -8.0, 2.0])
+        p64 = flow.nn.Parameter(flow.ones(2, dtype=flow.float64))
+        p64.grad = flow.tensor([8.0, float("inf")], dtype=flow.float64)
+        optimizer = flow.optim.SGD([p32, p64], lr=1.0)
+        scaler.unscale_(optimizer)
+        test_case.assertTrue(scaler._per_optimizer_states[id(optimizer)]["found_inf"])
+        test_case.assertTrue(np.allclose(p32.grad.numpy(), [1.0, -2.0, 0.5]))
+        test_case.assertEqual(p64.grad.numpy()[0], 2.0)
+        test_case.assertTrue(np.isinf(p64.grad.numpy()[1]))
+
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test gpu cases")
+    def test_unscale_half_grads_in_place(test_case):
+        scaler = flow.amp.GradScaler(init_scale=8.0)
+        params = [
+            flow.nn.Parameter(flow.ones(n, dtype=flow.float16, device="cuda"))
+            for n in (5, 1000)
+        ]
+        for param in params:
+            param.grad = flow.full(param.shape, 16.0, dtype=flow.float16, device="cuda")
+        grad_ptrs = [param.grad for param in params]
+        optimizer = flow.optim.SGD(params, lr=1.0)
+        scaler.unscale_(optimizer)
+        test_case.assertFalse(scaler._per_optimizer_states[id(optimizer)]["found_inf"])
+        for param, grad in zip(params, grad_ptrs):
+            test_case.assertIs(param.grad, grad)
+            test_case.assertEqual(param.grad.dtype, flow.float16)
+            test_case.assertTrue(np.all(param.grad.numpy() == 2.0))
+        params[1].grad[3] = float("nan")
+        scaler = flow.amp.GradScaler(init_scale=8.0)
+        scaler.unscale_(optimizer)
+        test_case.assertTrue(scaler._per_optimizer_states[id(optimizer)]["found_inf"])
+
+    def test_update_without_step(test_case):
+        scaler = flow.amp.GradScaler(init_scale=2.0, growth_interval=1)
+        scaler.update()
+        test_case.assertEqual(scaler.get_scale(), 2.0)
+        test_case.assertEqual(scaler.state_dict()["_growth_tracker"], 0)
+
+    def test_disabled(test_case):
+        scaler = flow.amp.GradScaler(enabled=False)
+        loss = flow.tensor([1.5])
+        test_case.assertIs(scaler.scale(loss), loss)
+        param, optimizer = _make_sgd_with_grad([1.0, 1.0, 1.0, 1.0])
+        scaler.step(optimizer)
+        test_case.assertTrue(np.allclose(param.numpy(), np.zeros(4)))
+
+
+if __name__ == "__main__":
+    unittest.main()
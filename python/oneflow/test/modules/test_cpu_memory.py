@@ -0,0 +1,71 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestCpuCachingAllocator(flow.unittest.TestCase):
+    def test_reuse_freed_blocks(test_case):
+        flow.cpu.empty_cache()
+        x = flow.tensor(np.random.randn(1024, 1024).astype(np.float32))
+        del x
+        stats = flow.cpu.memory_stats()
+        test_case.assertGreaterEqual(stats["cached_bytes"], 1024 * 1024 * 4)
+        hits = stats["num_cache_hits"]
+        y = flow.tensor(np.random.randn(1024, 1024).astype(np.float32))
+        test_case.assertGreater(flow.cpu.memory_stats()["num_cache_hits"], hits)
+        test_case.assertGreaterEqual(flow.cpu.memory_allocated(), 1024 * 1024 * 4)
+        test_case.assertGreaterEqual(
+            flow.cpu.memory_reserved(), flow.cpu.memory_allocated()
+        )
+        del y
+
+    def test_empty_cache(test_case):
+        x = flow.ones(256, 256)
+        del x
+        flow.cpu.empty_cache()
+        test_case.assertEqual(flow.cpu.memory_stats()["cached_bytes"], 0)
+
+    def test_peak_stats(test_case):
+        flow.cpu.reset_peak_memory_stats()
+        base = flow.cpu.max_memory_allocated()
+        x = flow.zeros(512, 1024)
+        test_case.assertGreaterEqual(
+            flow.cpu.max_memory_allocated(), base + 512 * 1024 * 4
+        )
+        del x
+        flow.cpu.reset_peak_memory_stats()
+        test_case.assertEqual(
+            flow.cpu.max_memory_allocated(), flow.cpu.memory_allocated()
+        )
+
+    def test_cache_limit(test_case):
+        limit = flow.cpu.get_cache_limit()
+        flow.cpu.set_cache_limit(0)
+        x = flow.ones(256, 256)
+        del x
+        test_case.assertEqual(flow.cpu.memory_stats()["cached_bytes"], 0)
+        flow.cpu.set_cache_limit(limit)
+        test_case.assertEqual(flow.cpu.get_cache_limit(), limit)
+
+
+if __name__ == "__main__":
+    unittest.main()
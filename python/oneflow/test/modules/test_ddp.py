@@ -145,6 +145,161 @@ class TestDDP(flow.unittest.TestCase):
         for dev_type in test_device:
             test_case._test_out_of_order_execution(dev_type)
 
+    def _test_ddp_grad_buckets(test_case, dev_type):
+        class Model(flow.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.w1 = flow.nn.Parameter(flow.Tensor([1, 1]))
+                self.w2 = flow.nn.Parameter(flow.Tensor([2, 2, 2]))
+                self.w3 = flow.nn.Parameter(flow.Tensor([3]))
+
+            def forward(self, x):
+                return (x * self.w1).sum() + (x.sum() * self.w2).sum() + x * self.w3
+
+        rank = flow.env.get_rank()
+        x = flow.Tensor([rank + 1, rank + 1]).to(dev_type)
+        # 8 bytes per bucket puts w1, w2 and w3 into different buckets.
+        m = ddp(Model().to(dev_type), bucket_cap_mb=8 / 1024 / 1024)
+        test_case.assertEqual(len(m._ddp_grad_reducer.buckets), 3)
+        for i in range(2):
+            for param in m.parameters():
+                param.grad = None
+            m(x).sum().backward()
+            test_case.assertTrue(
+                np_allclose_with_shape(m.w1.grad.numpy(), np.array([3, 3]))
+            )
+            test_case.assertTrue(
+                np_allclose_with_shape(m.w2.grad.numpy(), np.array([6, 6, 6]))
+            )
+            test_case.assertTrue(
+                np_allclose_with_shape(m.w3.grad.numpy(), np.array([3]))
+            )
+        test_case.assertTrue(m._ddp_grad_reducer.buckets_rebuilt)
+
+    def test_ddp_grad_buckets(test_case):
+        for dev_type in test_device:
+            test_case._test_ddp_grad_buckets(dev_type)
+
+    def _test_ddp_rebuild_buckets(test_case, dev_type):
+        class Model(flow.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.w1 = flow.nn.Parameter(flow.Tensor([1]))
+                self.w2 = flow.nn.Parameter(flow.Tensor([2]))
+                self.w3 = flow.nn.Parameter(flow.Tensor([3]))
+
+            def forward(self, x):
+                # gradients are ready in different orders on the ranks
+                if flow.env.get_rank() == 0:
+                    return x * self.w1 * self.w2
+                return x * self.w3 * self.w1
+
+        rank = flow.env.get_rank()
+        x = flow.Tensor([rank + 1]).to(dev_type)
+        m = ddp(Model().to(dev_type), bucket_cap_mb=4 / 1024 / 1024)
+        for i in range(3):
+            for param in m.parameters():
+                param.grad = None
+            m(x).backward()
+            # buckets are rebuilt at the start of the second forward
+            test_case.assertEqual(m._ddp_grad_reducer.buckets_rebuilt, i > 0)
+            test_case.assertTrue(
+                np_allclose_with_shape(m.w1.grad.numpy(), np.array([4]))
+            )
+            test_case.assertTrue(
+                np_allclose_with_shape(m.w2.grad.numpy(), np.array([0.5]))
+            )
+            test_case.assertTrue(
+                np_allclose_with_shape(m.w3.grad.numpy(), np.array([1]))
+            )
+
+    def test_ddp_rebuild_buckets(test_case):
+        for dev_type in test_device:
+            test_case._test_ddp_rebuild_buckets(dev_type)
+
+    def _test_ddp_grads_in_bucket_buffer(test_case, dev_type):
+        class Model(flow.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.w1 = flow.nn.Parameter(flow.Tensor([1, 2]))
+                self.w2 = flow.nn.Parameter(flow.Tensor([2]))
+
+            def forward(self, x):
+                return (x * self.w1).sum() * self.w2
+
+        rank = flow.env.get_rank()
+        x = flow.Tensor([rank + 1, rank + 1]).to(dev_type)
+        m = ddp(Model().to(dev_type))
+        reducer = m._ddp_grad_reducer
+        for i in range(3):
+            m(x).backward()
+            test_case.assertEqual(len(reducer.bucket_buffers), 1)
+            buffer = reducer.bucket_buffers[0]
+            if i > 1:
+                # the buffer is allocated once the buckets are rebuilt
+                test_case.assertTrue(buffer is prev_buffer)
+            prev_buffer = buffer
+            for param in m.parameters():
+                test_case.assertTrue(param.grad is reducer.param2grad_view[param])
+            # the gradients are views into the all-reduced buffer
+            test_case.assertTrue(
+                np_allclose_with_shape(buffer.numpy(), np.array([4.5, 3, 3]))
+            )
+            test_case.assertTrue(
+                np_allclose_with_shape(m.w1.grad.numpy(), np.array([3, 3]))
+            )
+            test_case.assertTrue(
+                np_allclose_with_shape(m.w2.grad.numpy(), np.array([4.5]))
+            )
+            for param in m.parameters():
+                param.grad.zeros_()
+            test_case.assertTrue(np.array_equal(buffer.numpy(), np.zeros(3)))
+
+    def test_ddp_grads_in_bucket_buffer(test_case):
+        for dev_type in test_device:
+            test_case._test_ddp_grads_in_bucket_buffer(dev_type)
+
+    def _test_ddp_without_trainable_params(test_case, dev_type):
+        m = flow.nn.Linear(2, 2).to(dev_type)
+        for param in m.parameters():
+            param.requires_grad_(False)
+        m = ddp(m)
+        x = flow.ones(1, 2).to(dev_type)
+        y1 = m(x)
+        y2 = m(x)
+        test_case.assertEqual(len(m._ddp_grad_reducer.buckets), 0)
+        test_case.assertTrue(np.array_equal(y1.numpy(), y2.numpy()))
+
+    def test_ddp_without_trainable_params(test_case):
+        for dev_type in test_device:
+            test_case._test_ddp_without_trainable_params(dev_type)
+
+    def _test_ddp_no_sync(test_case, dev_type):
+        class Mul(flow.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.w = flow.nn.Parameter(flow.Tensor([1, 1]))
+
+            def forward(self, x):
+                return x * self.w
+
+        rank = flow.env.get_rank()
+        x = flow.Tensor([rank + 1, rank + 1]).to(dev_type)
+        m = ddp(Mul().to(dev_type))
+        with m.no_sync():
+            m(x).sum().backward()
+        # gradients are only accumulated locally
+        test_case.assertTrue(
+            np_allclose_with_shape(m.w.grad.numpy(), np.array([rank + 1, rank + 1]))
+        )
+        m(x).sum().backward()
+        # accumulated gradients of 2 iterations are averaged across ranks
+        test_case.assertTrue(np_allclose_with_shape(m.w.grad.numpy(), np.array([3, 3])))
+
+    def test_ddp_no_sync(test_case):
+        for dev_type in test_device:
+            test_case._test_ddp_no_sync(dev_type)
+
     def _test_broadcast_buffer(test_case, dev_type):
         rank = flow.env.get_rank()
 
@@ -0,0 +1,67 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _run_ops(x, image):
+    layer_norm = flow.nn.LayerNorm(x.shape[-1])
+    group_norm = flow.nn.GroupNorm(4, image.shape[1])
+    return [
+        flow.relu(x),
+        flow.tanh(x),
+        x.to(flow.float64),
+        x + x,
+        flow.transpose(x, 0, 1),
+        flow.softmax(x, dim=-1),
+        flow.log_softmax(x, dim=-1),
+        layer_norm(x),
+        group_norm(image),
+    ]
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestIntraOpNumThreads(flow.unittest.TestCase):
+    def test_set_get_num_threads(test_case):
+        default_num_threads = flow.get_num_threads()
+        test_case.assertGreaterEqual(default_num_threads, 1)
+        flow.set_num_threads(3)
+        test_case.assertEqual(flow.get_num_threads(), 3)
+        flow.set_num_threads(default_num_threads)
+        test_case.assertEqual(flow.get_num_threads(), default_num_threads)
+        with test_case.assertRaises(ValueError):
+            flow.set_num_threads(0)
+
+    def test_multi_thread_results_match_single_thread(test_case):
+        default_num_threads = flow.get_num_threads()
+        # Large enough to be split into several chunks by every op above.
+        x = flow.tensor(np.random.randn(512, 1024).astype(np.float32))
+        image = flow.tensor(np.random.randn(16, 8, 64, 64).astype(np.float32))
+        flow.set_num_threads(1)
+        expected = [y.numpy() for y in _run_ops(x, image)]
+        flow.set_num_threads(4)
+        actual = [y.numpy() for y in _run_ops(x, image)]
+        flow.set_num_threads(default_num_threads)
+        for e, a in zip(expected, actual):
+            test_case.assertTrue(np.allclose(e, a, rtol=1e-5, atol=1e-5))
+
+
+if __name__ == "__main__":
+    unittest.main()
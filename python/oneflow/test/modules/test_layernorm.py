@@ -126,6 +126,29 @@ def _test_layernorm_backward(test_case, device):
     )
 
 
+def _test_layernorm_frozen_affine_backward(test_case, device):
+    x_arr = np.random.randn(4, 3, 8).astype(np.float32)
+    dy_arr = np.random.randn(4, 3, 8).astype(np.float32)
+    w_arr = np.random.randn(8).astype(np.float32)
+    m = flow.nn.LayerNorm(8).to(device=flow.device(device))
+    m.weight.copy_(flow.tensor(w_arr))
+    m.weight.requires_grad = False
+    m.bias.requires_grad = False
+    x = flow.tensor(x_arr, device=flow.device(device), requires_grad=True)
+    (m(x) * flow.tensor(dy_arr, device=flow.device(device))).sum().backward()
+
+    mean = x_arr.mean(axis=-1, keepdims=True)
+    inv_std = 1.0 / np.sqrt(x_arr.var(axis=-1, keepdims=True) + m.eps)
+    normalized = (x_arr - mean) * inv_std
+    dnormalized = dy_arr * w_arr
+    dx = inv_std * (
+        dnormalized
+        - dnormalized.mean(axis=-1, keepdims=True)
+        - normalized * (dnormalized * normalized).mean(axis=-1, keepdims=True)
+    )
+    test_case.assertTrue(np.allclose(x.grad.numpy(), dx, 1e-04, 1e-04))
+
+
 @flow.unittest.skip_unless_1n1d()
 class TestLayerNorm(flow.unittest.TestCase):
     def test_layernorm(test_case):
@@ -135,6 +158,7 @@ class TestLayerNorm(flow.unittest.TestCase):
             _test_layernorm_v2,
             _test_layernorm_v3,
             _test_layernorm_backward,
+            _test_layernorm_frozen_affine_backward,
         ]
         arg_dict["device"] = ["cpu", "cuda"]
         for arg in GenArgList(arg_dict):
@@ -0,0 +1,77 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.framework.check_point_v2 import LazyStateDict, _LazyTensor
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestLazyLoad(flow.unittest.TestCase):
+    def test_mmap_load_state_dict(test_case):
+        m = flow.nn.Sequential(flow.nn.Linear(4, 3), flow.nn.Linear(3, 2))
+        with tempfile.TemporaryDirectory() as path:
+            flow.save(m.state_dict(), path)
+            loaded = flow.load(path, mmap=True)
+            test_case.assertTrue(isinstance(loaded, LazyStateDict))
+            test_case.assertEqual(list(loaded.keys()), list(m.state_dict().keys()))
+            test_case.assertTrue(
+                all(
+                    isinstance(OrderedDict.__getitem__(loaded, k), _LazyTensor)
+                    for k in loaded.keys()
+                )
+            )
+            m2 = flow.nn.Sequential(flow.nn.Linear(4, 3), flow.nn.Linear(3, 2))
+            m2.load_state_dict(loaded)
+            for (k, v), v2 in zip(m.state_dict().items(), m2.state_dict().values()):
+                test_case.assertTrue(np.array_equal(v.numpy(), v2.numpy()))
+                test_case.assertTrue(np.array_equal(v.numpy(), loaded[k].numpy()))
+
+    def test_only_read_consumed_keys(test_case):
+        m = flow.nn.Linear(4, 3)
+        with tempfile.TemporaryDirectory() as path:
+            flow.save({"weight": m.weight, "bias": m.bias, "step": 7}, path)
+            loaded = flow.load(path, mmap=True)
+            # remove the files of bias, which is never accessed
+            for name in os.listdir(path):
+                tensor_dir = os.path.join(path, name)
+                if os.path.isdir(tensor_dir):
+                    shape = open(os.path.join(tensor_dir, "meta")).read()
+                    if "dim: 4" not in shape:
+                        shutil.rmtree(tensor_dir)
+            test_case.assertEqual(loaded["step"], 7)
+            test_case.assertTrue(
+                np.array_equal(loaded["weight"].numpy(), m.weight.numpy())
+            )
+
+    def test_mmap_load_nested(test_case):
+        x = flow.randn(2, 3)
+        with tempfile.TemporaryDirectory() as path:
+            flow.save([x, {"x": x}], path)
+            loaded = flow.load(path, mmap=True)
+            test_case.assertTrue(isinstance(loaded[0], flow.Tensor))
+            test_case.assertTrue(np.array_equal(loaded[0].numpy(), x.numpy()))
+            test_case.assertTrue(np.array_equal(loaded[1]["x"].numpy(), x.numpy()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+from multiprocessing.reduction import ForkingPickler
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+import oneflow.multiprocessing.reductions as reductions
+
+
+class RandomDataset(flow.utils.data.Dataset):
+    def __getitem__(self, index):
+        return flow.tensor(np.full((3, 4), index, dtype=np.float32))
+
+    def __len__(self):
+        return 32
+
+
+@flow.unittest.skip_unless_1n1d()
+@unittest.skipIf(
+    reductions.shared_memory is None, "needs multiprocessing.shared_memory"
+)
+class TestSharedMemoryReductions(flow.unittest.TestCase):
+    def test_reduce_through_shared_memory(test_case):
+        x = flow.randn(4, 5)
+        rebuild_fn, args = reductions.reduce_tensor(x)
+        test_case.assertIs(rebuild_fn, reductions.rebuild_tensor_from_shared_memory)
+        shm_name = args[1]
+        y = pickle.loads(ForkingPickler.dumps(x))
+        test_case.assertTrue(np.array_equal(x.numpy(), y.numpy()))
+        test_case.assertFalse(y.requires_grad)
+        rebuild_fn(*args)
+        # The sending process unlinks the block once it has been rebuilt.
+        reductions._release_shared_memory()
+        test_case.assertNotIn(shm_name, reductions._owned_shms)
+        if os.path.isdir("/dev/shm"):
+            test_case.assertFalse(os.path.exists(os.path.join("/dev/shm", shm_name)))
+
+    def test_rebuild_twice(test_case):
+        x = flow.randn(3, 2)
+        data = ForkingPickler.dumps(x)
+        for _ in range(2):
+            test_case.assertTrue(np.array_equal(pickle.loads(data).numpy(), x.numpy()))
+
+    @unittest.skipIf(not os.path.isdir("/dev/shm"), "needs /dev/shm")
+    def test_unreceived_tensor_is_released(test_case):
+        # A process pickles a tensor and exits without it ever being rebuilt.
+        code = (
+            "from multiprocessing.reduction import ForkingPickler\n"
+            "import oneflow as flow\n"
+            "import oneflow.multiprocessing.reductions as reductions\n"
+            "data = ForkingPickler.dumps(flow.randn(8, 8))\n"
+            "del data\n"
+            "print(list(reductions._owned_shms.keys())[0])\n"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code])
+        shm_name = output.decode().split()[-1]
+        test_case.assertFalse(os.path.exists(os.path.join("/dev/shm", shm_name)))
+
+    def test_reduce_parameter_and_empty(test_case):
+        p = flow.nn.Parameter(flow.ones(3, dtype=flow.float64))
+        q = pickle.loads(ForkingPickler.dumps(p))
+        test_case.assertTrue(isinstance(q, flow.nn.Parameter))
+        test_case.assertTrue(q.requires_grad)
+        test_case.assertEqual(q.dtype, flow.float64)
+        empty = pickle.loads(ForkingPickler.dumps(flow.zeros(0, 2)))
+        test_case.assertEqual(tuple(empty.shape), (0, 2))
+
+    def test_share_memory_(test_case):
+        x = flow.ones(2)
+        test_case.assertIs(x.share_memory_(), x)
+
+    def test_dataloader_workers(test_case):
+        loader = flow.utils.data.DataLoader(
+            RandomDataset(), batch_size=4, num_workers=2
+        )
+        for i, batch in enumerate(loader):
+            expected = np.stack(
+                [np.full((3, 4), 4 * i + j, dtype=np.float32) for j in range(4)]
+            )
+            test_case.assertTrue(np.array_equal(batch.numpy(), expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+from test_util import GenArgDict
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.nn.parameter import Parameter
+
+
+def _make_params(init_values, device):
+    return [
+        Parameter(flow.tensor(value, device=flow.device(device)))
+        for value in init_values
+    ]
+
+
+def _step(params, optim, grads, device):
+    loss = 0
+    for param, grad in zip(params, grads):
+        grad_tensor = flow.tensor(grad, device=flow.device(device))
+        loss = loss + flow.sum(param * grad_tensor)
+    loss.backward()
+    optim.step()
+    optim.zero_grad()
+
+
+def _train(
+    optim_cls, optim_kwargs, device, init_values, grad_seq, foreach, fused=False
+):
+    params = _make_params(init_values, device)
+    optim = optim_cls(params, foreach=foreach, fused=fused, **optim_kwargs)
+    for grads in grad_seq:
+        _step(params, optim, grads, device)
+    return params, optim
+
+
+def _assert_state_close(test_case, expected, actual):
+    test_case.assertEqual(sorted(expected.keys()), sorted(actual.keys()))
+    for key, e in expected.items():
+        a = actual[key]
+        if isinstance(e, flow.Tensor):
+            test_case.assertTrue(
+                np.allclose(e.numpy(), a.numpy(), rtol=1e-5, atol=1e-5), key
+            )
+        elif isinstance(e, dict):
+            _assert_state_close(test_case, e, a)
+        else:
+            test_case.assertEqual(e, a, key)
+
+
+def _test_foreach_same_as_per_param(test_case, optim_cls, optim_kwargs, device):
+    shapes = [(4, 3), (7,), (2, 3, 5), (1,)]
+    init_values = [np.random.uniform(size=shape).astype(np.float32) for shape in shapes]
+    grad_seq = [
+        [np.random.uniform(size=shape).astype(np.float32) for shape in shapes]
+        for _ in range(6)
+    ]
+    expected_params, expected_optim = _train(
+        optim_cls, optim_kwargs, device, init_values, grad_seq[:-1], False
+    )
+    actual_params, optim = _train(
+        optim_cls, optim_kwargs, device, init_values, grad_seq[:-1], True
+    )
+    for e, a in zip(expected_params, actual_params):
+        test_case.assertTrue(np.allclose(e.numpy(), a.numpy(), rtol=1e-5, atol=1e-5))
+
+    # the state of the foreach mode is saved in the same layout as the per parameter
+    # mode, so it can be reloaded into a per parameter optimizer
+    reloaded_params = _make_params([p.numpy() for p in actual_params], device)
+    reloaded = optim_cls(reloaded_params, foreach=False, **optim_kwargs)
+    reloaded.load_state_dict(optim.state_dict())
+    _assert_state_close(
+        test_case, expected_optim.state_dict()["state"], reloaded.state_dict()["state"]
+    )
+
+    # and the reloaded optimizer continues the training like the per parameter one
+    _step(expected_params, expected_optim, grad_seq[-1], device)
+    _step(reloaded_params, reloaded, grad_seq[-1], device)
+    for e, a in zip(expected_params, reloaded_params):
+        test_case.assertTrue(np.allclose(e.numpy(), a.numpy(), rtol=1e-5, atol=1e-5))
+
+
+def _test_fused_same_as_per_param(test_case, optim_cls, optim_kwargs):
+    # more parameters than one launch of the fused kernel updates
+    shapes = [(i % 5 + 1, 3) for i in range(150)] + [(600, 700)]
+    init_values = [np.random.uniform(size=shape).astype(np.float32) for shape in shapes]
+    grad_seq = [
+        [np.random.uniform(size=shape).astype(np.float32) for shape in shapes]
+        for _ in range(3)
+    ]
+    expected_params, _ = _train(
+        optim_cls, optim_kwargs, "cuda", init_values, grad_seq, False
+    )
+    actual_params, _ = _train(
+        optim_cls, optim_kwargs, "cuda", init_values, grad_seq, False, fused=True
+    )
+    for e, a in zip(expected_params, actual_params):
+        test_case.assertTrue(np.allclose(e.numpy(), a.numpy(), rtol=1e-5, atol=1e-5))
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestOptimizerForeach(flow.unittest.TestCase):
+    def test_foreach_sgd(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["device"] = ["cpu", "cuda"]
+        arg_dict["optim_kwargs"] = [
+            {"lr": 0.1},
+            {"lr": 0.1, "momentum": 0.9, "weight_decay": 0.01},
+        ]
+        for arg in GenArgDict(arg_dict):
+            _test_foreach_same_as_per_param(test_case, flow.optim.SGD, **arg)
+
+    def test_foreach_adam(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["device"] = ["cpu", "cuda"]
+        arg_dict["optim_kwargs"] = [
+            {"lr": 0.01},
+            {"lr": 0.01, "weight_decay": 0.01, "amsgrad": True},
+            {"lr": 0.01, "do_bias_correction": False},
+        ]
+        for arg in GenArgDict(arg_dict):
+            _test_foreach_same_as_per_param(test_case, flow.optim.Adam, **arg)
+
+    def test_foreach_adamw(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["device"] = ["cpu", "cuda"]
+        arg_dict["optim_kwargs"] = [
+            {"lr": 0.01, "weight_decay": 0.01},
+            {"lr": 0.01, "weight_decay": 0.01, "amsgrad": True},
+        ]
+        for arg in GenArgDict(arg_dict):
+            _test_foreach_same_as_per_param(test_case, flow.optim.AdamW, **arg)
+
+    def test_foreach_rmsprop(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["device"] = ["cpu", "cuda"]
+        arg_dict["optim_kwargs"] = [
+            {"lr": 0.01},
+            {"lr": 0.01, "weight_decay": 0.01, "centered": True},
+        ]
+        for arg in GenArgDict(arg_dict):
+            _test_foreach_same_as_per_param(test_case, flow.optim.RMSprop, **arg)
+
+    def test_foreach_adagrad(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["device"] = ["cpu", "cuda"]
+        arg_dict["optim_kwargs"] = [
+            {"lr": 0.01},
+            {"lr": 0.01, "lr_decay": 0.1, "initial_accumulator_value": 0.1},
+        ]
+        for arg in GenArgDict(arg_dict):
+            _test_foreach_same_as_per_param(test_case, flow.optim.Adagrad, **arg)
+
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test gpu cases")
+    def test_fused(test_case):
+        for optim_cls, optim_kwargs in [
+            (flow.optim.SGD, {"lr": 0.1}),
+            (flow.optim.SGD, {"lr": 0.1, "momentum": 0.9, "weight_decay": 0.01}),
+            (flow.optim.Adam, {"lr": 0.01, "amsgrad": True}),
+            (flow.optim.AdamW, {"lr": 0.01, "weight_decay": 0.01}),
+            (flow.optim.RMSprop, {"lr": 0.01, "centered": True}),
+            (flow.optim.Adagrad, {"lr": 0.01, "lr_decay": 0.1}),
+        ]:
+            _test_fused_same_as_per_param(test_case, optim_cls, optim_kwargs)
+
+    def test_fused_requires_cuda_params(test_case):
+        params = _make_params([np.ones((2, 3), dtype=np.float32)], "cpu")
+        with test_case.assertRaises(AssertionError):
+            flow.optim.SGD(params, lr=0.1, fused=True)
+        with test_case.assertRaises(AssertionError):
+            flow.optim.SGD(params, lr=0.1, foreach=True, fused=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
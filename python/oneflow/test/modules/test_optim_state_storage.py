@@ -0,0 +1,218 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+import numpy as np
+from test_util import GenArgDict
+
+import oneflow as flow
+import oneflow.unittest
+import oneflow.nn.optimizer.optimizer as optimizer_module
+from oneflow.nn.parameter import Parameter
+
+
+_SECOND_MOMENT_NAMES = ("exp_avg_sq", "max_exp_avg_sq", "square_avg", "sum")
+
+
+def _expected_state_dtype(name, state_dtype):
+    if state_dtype in (flow.float16, flow.bfloat16) and name in _SECOND_MOMENT_NAMES:
+        return flow.float32
+    return state_dtype
+
+
+def _train(optim, params, grad_seq, device):
+    for grads in grad_seq:
+        for param, grad in zip(params, grads):
+            param.grad = flow.tensor(grad, device=flow.device(device))
+        optim.step()
+        optim.zero_grad(set_to_none=True)
+
+
+def _make_params(init_values, device):
+    return [
+        Parameter(flow.tensor(value, device=flow.device(device)))
+        for value in init_values
+    ]
+
+
+def _test_state_storage(test_case, optim_cls, optim_kwargs, device, storage):
+    shapes = [(4, 3), (7,)]
+    init_values = [np.random.uniform(size=shape).astype(np.float32) for shape in shapes]
+    grad_seq = [
+        [np.random.uniform(size=shape).astype(np.float32) for shape in shapes]
+        for _ in range(5)
+    ]
+    ref_params = _make_params(init_values, device)
+    _train(optim_cls(ref_params, **optim_kwargs), ref_params, grad_seq, device)
+    params = _make_params(init_values, device)
+    optim = optim_cls(params, **storage, **optim_kwargs)
+    _train(optim, params, grad_seq, device)
+
+    tol = 1e-2 if storage.get("state_dtype") in (flow.float16, flow.bfloat16) else 1e-5
+    for ref_param, param in zip(ref_params, params):
+        test_case.assertTrue(
+            np.allclose(ref_param.numpy(), param.numpy(), rtol=tol, atol=tol)
+        )
+    for param in params:
+        for name, state in optim._state[param].items():
+            if "state_dtype" in storage:
+                test_case.assertEqual(
+                    state.dtype, _expected_state_dtype(name, storage["state_dtype"])
+                )
+            if storage.get("offload_state", False):
+                test_case.assertEqual(state.device.type, "cpu")
+
+    # the state_dict can be loaded by an optimizer keeping states in the default layout
+    reloaded = optim_cls(params, **optim_kwargs)
+    reloaded.load_state_dict(optim.state_dict())
+    _train(reloaded, params, grad_seq[:1], device)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestOptimizerStateStorage(flow.unittest.TestCase):
+    def test_adam_no_max_exp_avg_sq_without_amsgrad(test_case):
+        for amsgrad in [False, True]:
+            param = Parameter(flow.randn(3, 4))
+            adam = flow.optim.Adam([param], amsgrad=amsgrad)
+            param.grad = flow.randn(3, 4)
+            adam.step()
+            test_case.assertEqual(
+                "max_exp_avg_sq" in adam._state[param], amsgrad,
+            )
+
+    def test_state_allocated_lazily(test_case):
+        for optim_cls in [
+            flow.optim.Adam,
+            flow.optim.AdamW,
+            flow.optim.RMSprop,
+            flow.optim.Adagrad,
+        ]:
+            used = Parameter(flow.randn(3, 4))
+            unused = Parameter(flow.randn(3, 4))
+            optim = optim_cls([used, unused])
+            test_case.assertEqual(len(optim._state[used]), 0)
+            used.grad = flow.randn(3, 4)
+            optim.step()
+            test_case.assertTrue(len(optim._state[used]) > 0)
+            test_case.assertEqual(len(optim._state[unused]), 0)
+
+    def test_state_storage(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["optim"] = [
+            (flow.optim.Adam, {"lr": 0.01}),
+            (flow.optim.Adam, {"lr": 0.01, "amsgrad": True, "foreach": True}),
+            (flow.optim.AdamW, {"lr": 0.01, "weight_decay": 0.01}),
+            (flow.optim.RMSprop, {"lr": 0.01, "centered": True}),
+            (flow.optim.Adagrad, {"lr": 0.01, "initial_accumulator_value": 0.1}),
+        ]
+        arg_dict["device"] = ["cpu", "cuda"]
+        arg_dict["storage"] = [
+            {"state_dtype": flow.float16},
+            {"offload_state": True},
+            {"state_dtype": flow.float16, "offload_state": True},
+        ]
+        for arg in GenArgDict(arg_dict):
+            optim_cls, optim_kwargs = arg.pop("optim")
+            _test_state_storage(test_case, optim_cls, optim_kwargs, **arg)
+
+    def test_foreach_state_storage_in_chunks(test_case):
+        # 4 * 3 float32 parameters take 48 bytes, 2 of them fit in a chunk
+        with mock.patch.object(optimizer_module, "_FOREACH_STATE_CHUNK_BYTES", 100):
+            params = [Parameter(flow.randn(4, 3)) for _ in range(5)]
+            for param in params:
+                param.grad = flow.randn(4, 3)
+            adam = flow.optim.Adam(
+                params, foreach=True, state_dtype=flow.float16, offload_state=True
+            )
+            param_lists, single_tensor_params = adam._split_params_for_update(params)
+            test_case.assertEqual([len(l) for l in param_lists], [2, 2, 1])
+            test_case.assertEqual(len(single_tensor_params), 0)
+            adam.step()
+            for param in params:
+                state = adam._state[param]
+                test_case.assertEqual(state["exp_avg"].dtype, flow.float16)
+                test_case.assertEqual(state["exp_avg_sq"].dtype, flow.float32)
+                for name in ("exp_avg", "exp_avg_sq"):
+                    test_case.assertEqual(state[name].device.type, "cpu")
+        # (4, 3) and (7,) parameters are in different chunks
+        with mock.patch.object(optimizer_module, "_FOREACH_STATE_CHUNK_BYTES", 50):
+            for device in ["cpu", "cuda"]:
+                _test_state_storage(
+                    test_case,
+                    flow.optim.Adam,
+                    {"lr": 0.01, "foreach": True},
+                    device,
+                    {"state_dtype": flow.float16, "offload_state": True},
+                )
+        adam = flow.optim.Adam(params, foreach=True)
+        test_case.assertEqual(
+            [len(l) for l in adam._split_params_for_update(params)[0]], [5]
+        )
+
+    def test_bfloat16_state_storage(test_case):
+        for optim_cls, optim_kwargs in [
+            (flow.optim.Adam, {"lr": 0.01}),
+            (flow.optim.RMSprop, {"lr": 0.01, "centered": True}),
+        ]:
+            for storage in [
+                {"state_dtype": flow.bfloat16},
+                {"state_dtype": flow.bfloat16, "offload_state": True},
+            ]:
+                _test_state_storage(test_case, optim_cls, optim_kwargs, "cuda", storage)
+        param = Parameter(flow.randn(3, 4))
+        adam = flow.optim.Adam([param], state_dtype=flow.bfloat16)
+        param.grad = flow.randn(3, 4)
+        with test_case.assertRaises(RuntimeError):
+            adam.step()
+
+    def test_low_precision_states_with_small_grads(test_case):
+        # exp_avg_sq of gradients of 1e-4 is about 1e-11, which underflows in float16
+        for device, state_dtype in [("cpu", flow.float16), ("cuda", flow.bfloat16)]:
+            init_values = [np.random.uniform(size=(64,)).astype(np.float32)]
+            grad_seq = [
+                [np.random.uniform(-1e-4, 1e-4, size=(64,)).astype(np.float32)]
+                for _ in range(5)
+            ]
+            ref_params = _make_params(init_values, device)
+            _train(flow.optim.Adam(ref_params, lr=0.01), ref_params, grad_seq, device)
+            params = _make_params(init_values, device)
+            adam = flow.optim.Adam(params, lr=0.01, state_dtype=state_dtype)
+            _train(adam, params, grad_seq, device)
+            test_case.assertEqual(
+                adam._state[params[0]]["exp_avg_sq"].dtype, flow.float32
+            )
+            test_case.assertTrue(
+                np.allclose(ref_params[0].numpy(), params[0].numpy(), atol=1e-2)
+            )
+
+            # all the states are kept in the low precision dtype if asked explicitly
+            params = _make_params(init_values, device)
+            adam = flow.optim.Adam(
+                params,
+                lr=0.01,
+                state_dtype={"exp_avg": state_dtype, "exp_avg_sq": state_dtype},
+            )
+            _train(adam, params, grad_seq[:1], device)
+            test_case.assertEqual(
+                adam._state[params[0]]["exp_avg_sq"].dtype, state_dtype
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
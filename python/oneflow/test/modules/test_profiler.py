@@ -0,0 +1,87 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import json
+import os
+import tempfile
+import unittest
+
+import oneflow as flow
+import oneflow.unittest
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestEagerOpProfiler(flow.unittest.TestCase):
+    def test_record_op_events(test_case):
+        x = flow.randn(32, 64)
+        with flow.profiler.profile(record_shapes=True) as prof:
+            y = flow.relu(x)
+            z = flow.matmul(y, y.transpose(0, 1))
+        z.numpy()
+        events = prof.events()
+        names = [event.name for event in events]
+        test_case.assertIn("relu", names)
+        test_case.assertIn("matmul", names)
+        relu = events[names.index("relu")]
+        test_case.assertEqual(relu.input_shapes, [(32, 64)])
+        test_case.assertTrue(relu.device.startswith("cpu"))
+        test_case.assertGreaterEqual(relu.allocated_bytes, 32 * 64 * 4)
+        test_case.assertGreater(relu.wall_time, 0)
+        test_case.assertGreaterEqual(relu.kernel_time, 0)
+        test_case.assertGreaterEqual(relu.kernel_start_us, relu.dispatch_start_us)
+
+    def test_disabled_profile_records_nothing(test_case):
+        x = flow.randn(4, 4)
+        with flow.profiler.profile(enabled=False) as prof:
+            flow.relu(x)
+        test_case.assertEqual(len(prof.events()), 0)
+        with flow.profiler.profile() as prof:
+            flow.relu(x)
+        test_case.assertEqual(prof.events()[0].input_shapes, [])
+
+    def test_table_and_chrome_trace(test_case):
+        x = flow.randn(16, 16)
+        with flow.profiler.profile(record_shapes=True) as prof:
+            for _ in range(3):
+                x = flow.tanh(x)
+            flow.relu(x)
+        averages = {avg.name: avg for avg in prof.key_averages()}
+        test_case.assertEqual(averages["tanh"].count, 3)
+        table = prof.table(sort_by="count")
+        test_case.assertLess(table.index("tanh"), table.index("relu"))
+        with test_case.assertRaises(ValueError):
+            prof.table(sort_by="unknown")
+        # The self time total covers all the ops, also when rows are cut off.
+        test_case.assertNotIn("relu", prof.table(sort_by="count", row_limit=1))
+        test_case.assertEqual(
+            prof.table(sort_by="count", row_limit=1).splitlines()[-1],
+            table.splitlines()[-1],
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "trace.json")
+            prof.export_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        kernels = [
+            event
+            for event in trace["traceEvents"]
+            if event.get("cat") == "kernel" and event["name"] == "tanh"
+        ]
+        test_case.assertEqual(len(kernels), 3)
+        test_case.assertEqual(kernels[0]["args"]["input_shapes"], [[16, 16]])
+
+
+if __name__ == "__main__":
+    unittest.main()
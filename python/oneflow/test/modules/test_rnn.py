@@ -231,6 +231,71 @@ def _test_gru(test_case, device):
     )
 
 
+def _test_packed_sequence(test_case, device):
+    for mode in ["RNN", "LSTM", "GRU"]:
+        input_size = random.randint(5, 50)
+        hidden_size = random.randint(5, 50)
+        num_layers = random.randint(1, 3)
+        bidirectional = random.randint(-10, 10) <= 0
+        lengths = [random.randint(1, 10) for _ in range(8)]
+        rnn_torch = getattr(torch.nn, mode)(
+            input_size, hidden_size, num_layers, bidirectional=bidirectional
+        ).to(device)
+        rnn_flow = getattr(flow.nn, mode)(
+            input_size, hidden_size, num_layers, bidirectional=bidirectional
+        ).to(device)
+        for w_flow, w_torch in zip(rnn_flow.parameters(), rnn_torch.parameters()):
+            w = w_torch.cpu().data.numpy()
+            w_flow.copy_(flow.tensor(w.T if w.ndim > 1 else w))
+
+        x = np.random.rand(max(lengths), len(lengths), input_size)
+        x_torch = torch.tensor(x, dtype=torch.float32, requires_grad=True)
+        x_flow = flow.tensor(x, dtype=flow.float32, requires_grad=True)
+        out_torch, hid_torch = rnn_torch(
+            torch.nn.utils.rnn.pack_padded_sequence(
+                x_torch.to(device), lengths, enforce_sorted=False
+            )
+        )
+        out_flow, hid_flow = rnn_flow(
+            flow.nn.utils.rnn.pack_padded_sequence(
+                x_flow.to(device), lengths, enforce_sorted=False
+            )
+        )
+        out_torch, _ = torch.nn.utils.rnn.pad_packed_sequence(out_torch)
+        out_flow, lengths_flow = flow.nn.utils.rnn.pad_packed_sequence(out_flow)
+        test_case.assertEqual(lengths_flow.numpy().tolist(), lengths)
+        test_case.assertTrue(
+            np.allclose(
+                out_torch.cpu().data.numpy(), out_flow.numpy(), rtol=1e-05, atol=1e-05,
+            )
+        )
+        if mode == "LSTM":
+            hid_torch, hid_flow = hid_torch[1], hid_flow[1]
+        test_case.assertTrue(
+            np.allclose(
+                hid_torch.cpu().data.numpy(), hid_flow.numpy(), rtol=1e-05, atol=1e-05,
+            )
+        )
+
+        out_torch.sum().backward()
+        out_flow.sum().backward()
+        test_case.assertTrue(
+            np.allclose(
+                x_torch.grad.numpy(), x_flow.grad.numpy(), rtol=1e-04, atol=1e-04,
+            )
+        )
+        for w_flow, w_torch in zip(rnn_flow.parameters(), rnn_torch.parameters()):
+            g = w_torch.grad.cpu().numpy()
+            test_case.assertTrue(
+                np.allclose(
+                    g.T if g.ndim > 1 else g,
+                    w_flow.grad.numpy(),
+                    rtol=1e-04,
+                    atol=1e-04,
+                )
+            )
+
+
 @flow.unittest.skip_unless_1n1d()
 class TestRNNModule(flow.unittest.TestCase):
     def test_rnn(test_case):
@@ -240,6 +305,12 @@ class TestRNNModule(flow.unittest.TestCase):
         for arg in GenArgList(arg_dict):
             arg[0](test_case, *arg[1:])
 
+    def test_packed_sequence(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["device"] = ["cuda", "cpu"]
+        for arg in GenArgList(arg_dict):
+            _test_packed_sequence(test_case, *arg)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,91 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.framework.check_point_v2 import _broadcast_py_object, _shard_slices
+
+
+def _shared_tmp_dir():
+    path = tempfile.mkdtemp() if flow.env.get_rank() == 0 else None
+    return _broadcast_py_object(path, 0)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestShardSlices(flow.unittest.TestCase):
+    def test_shard_slices_1d(test_case):
+        test_case.assertEqual(_shard_slices((5, 3), (2,), [0], 0), ((0, 3), (0, 3)))
+        test_case.assertEqual(_shard_slices((5, 3), (2,), [0], 1), ((3, 5), (0, 3)))
+        test_case.assertEqual(_shard_slices((5, 3), (2,), [None], 1), ((0, 5), (0, 3)))
+
+    def test_shard_slices_2d(test_case):
+        # split(0) on hierarchy axis 0 is the outermost split
+        test_case.assertEqual(
+            _shard_slices((8,), (2, 2), [0, 0], 1), ((2, 4),),
+        )
+        test_case.assertEqual(
+            _shard_slices((4, 6), (2, 3), [0, 1], 5), ((2, 4), (4, 6)),
+        )
+
+
+@flow.unittest.skip_unless_1n2d()
+class TestShardedCheckpoint(flow.unittest.TestCase):
+    def test_save_split_load_broadcast(test_case):
+        np_arr = np.random.randn(5, 4).astype(np.float32)
+        placement = flow.placement("cuda", {0: [0, 1]})
+        x = flow.tensor(np_arr).to_consistent(placement, flow.sbp.broadcast)
+        x = x.to_consistent(sbp=flow.sbp.split(0))
+        path = _shared_tmp_dir()
+        flow.save({"x": x, "step": 3}, path, sharded=True)
+        rank = flow.env.get_rank()
+        test_case.assertTrue(
+            os.path.isfile(
+                os.path.join(
+                    path, f"consistent_tensor_{x.consistent_id()}", f"shard_{rank}"
+                )
+            )
+        )
+        loaded = flow.load(path)
+        test_case.assertEqual(loaded["step"], 3)
+        test_case.assertEqual(str(loaded["x"].sbp), str(x.sbp))
+        test_case.assertTrue(np.array_equal(loaded["x"].numpy(), np_arr))
+        resharded = flow.load(path, placement=placement, sbp=flow.sbp.split(1))
+        test_case.assertEqual(str(resharded["x"].sbp), str((flow.sbp.split(1),)))
+        test_case.assertTrue(np.array_equal(resharded["x"].numpy(), np_arr))
+        on_one_device = flow.load(
+            path, placement=flow.placement("cpu", {0: [0]}), sbp=flow.sbp.broadcast
+        )
+        if rank == 0:
+            test_case.assertTrue(np.array_equal(on_one_device["x"].numpy(), np_arr))
+
+    def test_save_partial_sum(test_case):
+        np_arr = np.random.randn(3, 4).astype(np.float32)
+        placement = flow.placement("cpu", {0: [0, 1]})
+        x = flow.tensor(np_arr).to_consistent(placement, flow.sbp.broadcast)
+        x = x.to_consistent(sbp=flow.sbp.partial_sum)
+        path = _shared_tmp_dir()
+        flow.save(x, path, sharded=True)
+        loaded = flow.load(path)
+        test_case.assertEqual(str(loaded.sbp), str((flow.sbp.broadcast,)))
+        test_case.assertTrue(np.allclose(loaded.numpy(), np_arr))
+
+
+if __name__ == "__main__":
+    unittest.main()
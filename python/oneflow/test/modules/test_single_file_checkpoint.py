@@ -0,0 +1,109 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+import oneflow.framework.checkpoint_container as checkpoint_container
+from oneflow.framework.checkpoint_container import ContainerReader
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestSingleFileCheckpoint(flow.unittest.TestCase):
+    def test_save_load_single_file(test_case):
+        m = flow.nn.Sequential(flow.nn.Linear(4, 3), flow.nn.Linear(3, 2))
+        state = {"model": m.state_dict(), "epoch": 5, "empty": flow.zeros(0, 3)}
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "ckpt")
+            flow.save(state, path, single_file=True)
+            test_case.assertTrue(os.path.isfile(path))
+            test_case.assertEqual(os.listdir(root), ["ckpt"])
+            reader = ContainerReader(path)
+            test_case.assertEqual(len(list(reader.names)), 5)
+            for name in reader.names:
+                test_case.assertEqual(reader.entry(name)["offset"] % 64, 0)
+            for mmap in (False, True):
+                loaded = flow.load(path, mmap=mmap)
+                test_case.assertEqual(loaded["epoch"], 5)
+                test_case.assertEqual(tuple(loaded["empty"].shape), (0, 3))
+                for k, v in m.state_dict().items():
+                    test_case.assertTrue(
+                        np.array_equal(loaded["model"][k].numpy(), v.numpy())
+                    )
+
+    def test_checksum(test_case):
+        x = flow.randn(16, 16)
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "ckpt")
+            flow.save(x, path, single_file=True, checksum=True)
+            test_case.assertTrue(np.array_equal(flow.load(path).numpy(), x.numpy()))
+            offset = ContainerReader(path).entry(
+                next(iter(ContainerReader(path).names))
+            )["offset"]
+            with open(path, "r+b") as f:
+                f.seek(offset)
+                f.write(b"\xff\xff\xff\xff")
+            with test_case.assertRaises(RuntimeError):
+                flow.load(path)
+
+    def test_load_without_preadv(test_case):
+        state = {"a": flow.randn(5, 7), "b": flow.arange(10), "c": flow.zeros(0)}
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "ckpt")
+            flow.save(state, path, single_file=True, checksum=True)
+            with mock.patch.object(checkpoint_container, "_HAS_PREADV", False):
+                loaded = flow.load(path)
+            for k, v in state.items():
+                test_case.assertTrue(np.array_equal(loaded[k].numpy(), v.numpy()))
+
+    def test_read_ahead(test_case):
+        state = {"t{}".format(i): flow.randn(i + 1, 33) for i in range(20)}
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "ckpt")
+            flow.save(state, path, single_file=True, checksum=True)
+            loaded = flow.load(path)
+            for k, v in state.items():
+                test_case.assertTrue(np.array_equal(loaded[k].numpy(), v.numpy()))
+            reader = ContainerReader(path)
+            names = list(reader.names)
+            reader.start_read_ahead(num_threads=3, max_tensors=4, max_bytes=1024)
+            test_case.assertLessEqual(len(reader._read_ahead_futures), 4)
+            test_case.assertLessEqual(reader._read_ahead_bytes, 1024)
+            arrays = [reader.read(name) for name in names]
+            test_case.assertEqual(reader._read_ahead_bytes, 0)
+            reader.close()
+            test_case.assertEqual(
+                sorted(tuple(a.shape) for a in arrays),
+                sorted(tuple(v.shape) for v in state.values()),
+            )
+            for name, array in zip(names, arrays):
+                test_case.assertTrue(np.array_equal(array, reader.read(name)))
+
+    def test_load_directory_layout(test_case):
+        x = flow.randn(2, 3)
+        with tempfile.TemporaryDirectory() as path:
+            flow.save({"x": x}, path)
+            test_case.assertTrue(
+                np.array_equal(flow.load(path)["x"].numpy(), x.numpy())
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
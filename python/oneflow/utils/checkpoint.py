@@ -0,0 +1,192 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import warnings
+
+import oneflow
+import oneflow._oneflow_internal
+from oneflow.framework.tensor import Tensor
+
+__all__ = ["checkpoint", "checkpoint_sequential"]
+
+
+def _auto_generator():
+    # Random ops draw from the "auto" generator, whose state holds the states of the
+    # generators of all devices.
+    return oneflow._oneflow_internal.default_generator("auto")
+
+
+def _merge_args(args, tensor_indices, tensors):
+    args = list(args)
+    for i, tensor in zip(tensor_indices, tensors):
+        args[i] = tensor
+    return args
+
+
+class _AutocastState(object):
+    def __init__(self):
+        self.enabled = oneflow.amp.is_autocast_enabled()
+        if self.enabled:
+            internal = oneflow._oneflow_internal.autocast
+            self.device_type = internal.get_device_type()
+            self.dtype = internal.get_dtype()
+
+    def context(self):
+        if self.enabled:
+            return oneflow.autocast(self.device_type, dtype=self.dtype)
+        return oneflow.autocast("cuda", enabled=False)
+
+
+def checkpoint(function, *args, preserve_rng_state: bool = True):
+    r"""Checkpoint a model or part of the model.
+
+    Checkpointing trades compute for memory: ``function`` runs without recording
+    the intermediate activations in forward, and runs again during backward to
+    recompute them. The states of the random generators are saved before forward
+    and restored before recomputation, so random ops like dropout produce the same
+    results in both runs. The autocast state is also replayed.
+
+    .. note::
+        At least one of the tensor ``args`` should have ``requires_grad=True``,
+        otherwise the output does not require grad and no gradient reaches the
+        parameters used by ``function``.
+
+    Args:
+        function: the function to run, it returns a Tensor or a tuple of Tensors.
+        args: the arguments of ``function``.
+        preserve_rng_state (bool): whether to save and restore the random generator
+            states. (default: True)
+
+    For example:
+
+    .. code-block:: python
+
+        >>> import oneflow as flow
+        >>> from oneflow.utils.checkpoint import checkpoint
+        >>> layer = flow.nn.Sequential(flow.nn.Linear(4, 4), flow.nn.ReLU())
+        >>> x = flow.randn(2, 4, requires_grad=True)
+        >>> y = checkpoint(layer, x)
+        >>> y.sum().backward()
+        >>> layer[0].weight.grad.shape
+        oneflow.Size([4, 4])
+    """
+    tensor_indices = [i for (i, arg) in enumerate(args) if isinstance(arg, Tensor)]
+    tensor_args = [args[i] for i in tensor_indices]
+    if not any(t.requires_grad for t in tensor_args):
+        warnings.warn(
+            "None of the inputs have requires_grad=True. Gradients will be None"
+        )
+    if len(tensor_args) == 0:
+        return function(*args)
+
+    rng_state = _auto_generator().get_state() if preserve_rng_state else None
+    autocast_state = _AutocastState()
+
+    def forward(ctx, *inputs):
+        return function(*_merge_args(args, tensor_indices, inputs))
+
+    def backward(ctx, *out_grads):
+        detached_inputs = []
+        for t in tensor_args:
+            detached = t.detach()
+            detached.requires_grad = t.requires_grad
+            detached_inputs.append(detached)
+        generator = _auto_generator()
+        if preserve_rng_state:
+            cur_rng_state = generator.get_state()
+            generator.set_state(rng_state)
+        try:
+            with oneflow.grad_enable(), autocast_state.context():
+                outputs = function(*_merge_args(args, tensor_indices, detached_inputs))
+        finally:
+            if preserve_rng_state:
+                generator.set_state(cur_rng_state)
+        if isinstance(outputs, Tensor):
+            outputs = (outputs,)
+        outputs_with_grad = []
+        grads_of_outputs = []
+        for (output, out_grad) in zip(outputs, out_grads):
+            if output.requires_grad:
+                outputs_with_grad.append(output)
+                grads_of_outputs.append(out_grad)
+        if len(outputs_with_grad) > 0:
+            oneflow.autograd.backward(outputs_with_grad, grads_of_outputs)
+        return tuple(
+            oneflow.zeros_like(t) if t.grad is None else t.grad for t in detached_inputs
+        )
+
+    checkpoint_function = type(
+        "CheckpointFunction",
+        (oneflow.autograd.Function,),
+        {"forward": staticmethod(forward), "backward": staticmethod(backward)},
+    )
+    return checkpoint_function.apply(*tensor_args)
+
+
+def checkpoint_sequential(
+    functions, segments: int, input: Tensor, preserve_rng_state: bool = True
+):
+    r"""Checkpoint a sequential model.
+
+    ``functions`` (a :class:`oneflow.nn.Sequential` or a list of modules or
+    functions) is divided into ``segments`` chunks which run in order. All chunks
+    except the last one are checkpointed, so only their inputs are kept in memory
+    during forward. See :func:`checkpoint` for details.
+
+    Args:
+        functions: a :class:`oneflow.nn.Sequential` or a list of modules or
+            functions to run sequentially.
+        segments (int): the number of chunks.
+        input (Tensor): the input of ``functions``.
+        preserve_rng_state (bool): whether to save and restore the random generator
+            states. (default: True)
+
+    For example:
+
+    .. code-block:: python
+
+        >>> import oneflow as flow
+        >>> from oneflow.utils.checkpoint import checkpoint_sequential
+        >>> model = flow.nn.Sequential(*[flow.nn.Linear(4, 4) for _ in range(8)])
+        >>> x = flow.randn(2, 4, requires_grad=True)
+        >>> y = checkpoint_sequential(model, 4, x)
+        >>> y.shape
+        oneflow.Size([2, 4])
+    """
+
+    def run_function(start, end, functions):
+        def forward(input):
+            for j in range(start, end + 1):
+                input = functions[j](input)
+            return input
+
+        return forward
+
+    if isinstance(functions, oneflow.nn.Sequential):
+        functions = list(functions.children())
+    if segments <= 0:
+        raise ValueError("segments should be positive, got {}".format(segments))
+    segment_size = max(len(functions) // segments, 1)
+    end = -1
+    for start in range(0, segment_size * (segments - 1), segment_size):
+        end = min(start + segment_size - 1, len(functions) - 1)
+        if start > end:
+            break
+        input = checkpoint(
+            run_function(start, end, functions),
+            input,
+            preserve_rng_state=preserve_rng_state,
+        )
+    return run_function(end + 1, len(functions) - 1, functions)(input)
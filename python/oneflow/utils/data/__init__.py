@@ -26,6 +26,7 @@ from oneflow.utils.data.dataset import (
     TensorDataset,
     ConcatDataset,
     Subset,
+    CollatedBatch,
     random_split,
 )
 from oneflow.utils.data.dataset import IterableDataset as IterDataPipe
@@ -49,6 +50,7 @@ __all__ = [
     "TensorDataset",
     "ConcatDataset",
     "Subset",
+    "CollatedBatch",
     "random_split",
     "DataLoader",
     "_DatasetKind",
@@ -22,6 +22,8 @@ static methods.
 import re
 import collections
 
+import numpy as np
+
 import oneflow as flow
 
 
@@ -89,9 +91,11 @@ def default_collate(batch):
             if np_str_obj_array_pattern.search(elem.dtype.str) is not None:
                 raise TypeError(default_collate_err_msg_format.format(elem.dtype))
 
-            return default_collate([flow.tensor(b) for b in batch])
+            # Stack the samples into one preallocated array and convert it once,
+            # instead of creating a tensor per sample and stacking the tensors.
+            return flow.tensor(np.stack(batch))
         elif elem.shape == ():  # scalars
-            return flow.tensor(batch)
+            return flow.tensor(np.array(batch))
     elif isinstance(elem, float):
         return flow.tensor(batch, dtype=flow.float64)
     elif isinstance(elem, int):
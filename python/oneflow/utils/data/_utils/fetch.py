@@ -17,6 +17,8 @@ limitations under the License.
 data from an iterable-style or map-style dataset. This logic is shared in both
 single- and multi-processing data loading.
 """
+from oneflow.utils.data._utils.collate import default_collate
+from oneflow.utils.data.dataset import CollatedBatch
 
 
 class _BaseDatasetFetcher(object):
@@ -29,6 +31,10 @@ class _BaseDatasetFetcher(object):
     def fetch(self, possibly_batched_index):
         raise NotImplementedError()
 
+    def skip(self, num_batches, batch_size):
+        r"""Skips the data of ``num_batches`` fetches, used to resume an epoch."""
+        pass
+
 
 class _IterableDatasetFetcher(_BaseDatasetFetcher):
     def __init__(self, dataset, auto_collation, collate_fn, drop_last):
@@ -53,6 +59,15 @@ class _IterableDatasetFetcher(_BaseDatasetFetcher):
             data = next(self.dataset_iter)
         return self.collate_fn(data)
 
+    def skip(self, num_batches, batch_size):
+        # The samples are drawn but neither kept nor collated.
+        num_samples = num_batches * (batch_size if self.auto_collation else 1)
+        for _ in range(num_samples):
+            try:
+                next(self.dataset_iter)
+            except StopIteration:
+                break
+
 
 class _MapDatasetFetcher(_BaseDatasetFetcher):
     def __init__(self, dataset, auto_collation, collate_fn, drop_last):
@@ -62,7 +77,14 @@ class _MapDatasetFetcher(_BaseDatasetFetcher):
 
     def fetch(self, possibly_batched_index):
         if self.auto_collation:
-            data = [self.dataset[idx] for idx in possibly_batched_index]
+            if hasattr(self.dataset, "__getitems__"):
+                data = self.dataset.__getitems__(possibly_batched_index)
+                if isinstance(data, CollatedBatch):
+                    if self.collate_fn is default_collate:
+                        return data.data
+                    data = data.samples()
+            else:
+                data = [self.dataset[idx] for idx in possibly_batched_index]
         else:
             data = self.dataset[possibly_batched_index]
         return self.collate_fn(data)
@@ -0,0 +1,109 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+r"""Contains definitions of the methods used by the _BaseDataLoaderIter to put
+fetched tensors into pinned memory in a background thread.
+"""
+
+import collections
+import queue
+import sys
+import threading
+
+import oneflow as flow
+from . import MP_STATUS_CHECK_INTERVAL
+from .worker import ExceptionWrapper
+
+string_classes = (str, bytes)
+
+
+class PinnedBufferPool(object):
+    r"""Page-locked host buffers reused by the batches of a DataLoader.
+
+    A buffer is handed out again once the pool holds the only reference to it,
+    i.e. the batch it was returned in has been released. Copies into the buffer
+    are ordered after the pending reads of it, e.g. an asynchronous copy to the
+    device, by the dependencies of the tensor.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffers = collections.defaultdict(list)
+
+    def get(self, shape, dtype):
+        with self._lock:
+            buffers = self._buffers[(tuple(shape), dtype)]
+            for buffer in buffers:
+                # the list, `buffer` and the argument of getrefcount
+                if sys.getrefcount(buffer) <= 3:
+                    return buffer
+            buffer = flow.empty(shape, dtype=dtype, pin_memory=True)
+            buffers.append(buffer)
+            return buffer
+
+
+def _pin_memory_loop(in_queue, out_queue, pool, done_event):
+    while not done_event.is_set():
+        try:
+            r = in_queue.get(timeout=MP_STATUS_CHECK_INTERVAL)
+        except queue.Empty:
+            continue
+        idx, data = r
+        if not done_event.is_set() and not isinstance(data, ExceptionWrapper):
+            try:
+                data = pin_memory(data, pool)
+            except Exception:
+                data = ExceptionWrapper(where="in pin memory thread")
+            r = (idx, data)
+        while not done_event.is_set():
+            try:
+                out_queue.put(r, timeout=MP_STATUS_CHECK_INTERVAL)
+                break
+            except queue.Full:
+                continue
+        del r  # save memory
+
+
+def pin_memory(data, pool=None):
+    r"""Copy the tensors in ``data`` into page-locked host memory, so that they can
+    be copied to CUDA devices asynchronously. The buffers are taken from ``pool``
+    if it is given. Without CUDA, the tensors are returned as they are.
+    """
+    if isinstance(data, (flow.Tensor, flow._oneflow_internal.Tensor)):
+        if (
+            data.is_consistent
+            or data.device.type != "cpu"
+            or data.is_pinned()
+            or not flow.cuda.is_available()
+        ):
+            return data
+        if pool is None:
+            buffer = flow.empty(data.shape, dtype=data.dtype, pin_memory=True)
+        else:
+            buffer = pool.get(data.shape, data.dtype)
+        buffer.copy_(data)
+        return buffer
+    elif isinstance(data, string_classes):
+        return data
+    elif isinstance(data, collections.abc.Mapping):
+        return {k: pin_memory(sample, pool) for k, sample in data.items()}
+    elif isinstance(data, tuple) and hasattr(data, "_fields"):  # namedtuple
+        return type(data)(*(pin_memory(sample, pool) for sample in data))
+    elif isinstance(data, collections.abc.Sequence):
+        return [pin_memory(sample, pool) for sample in data]
+    elif hasattr(data, "pin_memory"):
+        return data.pin_memory()
+    else:
+        return data
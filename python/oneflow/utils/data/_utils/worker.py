@@ -23,7 +23,7 @@ import sys
 import traceback
 import queue
 from dataclasses import dataclass
-from typing import Union
+from typing import Optional, Union
 
 import oneflow as flow
 from . import signal_handling, MP_STATUS_CHECK_INTERVAL, IS_WINDOWS, HAS_NUMPY
@@ -177,12 +177,15 @@ class _IterableDatasetStopIteration(object):
     worker_id: int
 
 
-r"""Dummy class used to resume the fetching when worker reuse is enabled"""
+r"""Dummy class used to resume the fetching when worker reuse is enabled, or to
+resume an epoch of an iterable-style dataset from a DataLoader state"""
 
 
 @dataclass(frozen=True)
 class _ResumeIteration(object):
-    pass
+    # batches this worker has already produced in the resumed epoch
+    num_skipped_batches: int = 0
+    batch_size: Optional[int] = None
 
 
 # The function `_generate_state` is adapted from `numpy.random.SeedSequence`
@@ -351,6 +354,7 @@ def _worker_loop(
                 fetcher = _DatasetKind.create_fetcher(
                     dataset_kind, dataset, auto_collation, collate_fn, drop_last
                 )
+                fetcher.skip(r.num_skipped_batches, r.batch_size)
                 continue
             elif r is None:
                 # Received the final signal
@@ -20,6 +20,7 @@ import os
 import threading
 import itertools
 import queue
+import weakref
 
 from typing import Any, Callable, TypeVar, Generic, Sequence, List, Optional
 import multiprocessing as python_multiprocessing
@@ -153,6 +154,11 @@ class DataLoader(Generic[T_co]):
         collate_fn (callable, optional): merges a list of samples to form a
             mini-batch of Tensor(s).  Used when using batched loading from a
             map-style dataset.
+        pin_memory (bool, optional): If ``True``, a background thread copies the
+            tensors of the batches into page-locked host buffers, which are reused
+            across batches, while the model runs. Copies of the returned tensors to
+            CUDA devices are then asynchronous. Without CUDA, the thread only
+            prefetches the batches. (default: ``False``)
         drop_last (bool, optional): set to ``True`` to drop the last incomplete batch,
             if the dataset size is not divisible by the batch size. If ``False`` and
             the size of dataset is not divisible by the batch size, then the last batch
@@ -168,6 +174,9 @@ class DataLoader(Generic[T_co]):
         persistent_workers (bool, optional): If ``True``, the data loader will not shutdown
             the worker processes after a dataset has been consumed once. This allows to
             maintain the workers `Dataset` instances alive. (default: ``False``)
+        pin_memory_device (str, optional, keyword-only arg): the CUDA device that
+            the pinned batches are copied to, e.g. ``"cuda"`` or ``"cuda:1"``. The
+            batches are returned on the host. (default: ``""``)
 
 
     .. warning:: If the ``spawn`` start method is used, :attr:`worker_init_fn`
@@ -207,6 +216,7 @@ class DataLoader(Generic[T_co]):
         batch_sampler: Optional[Sampler[Sequence[int]]] = None,
         num_workers: int = 0,
         collate_fn: Optional[_collate_fn_t] = None,
+        pin_memory: bool = False,
         drop_last: bool = False,
         timeout: float = 0,
         worker_init_fn: Optional[_worker_init_fn_t] = None,
@@ -214,7 +224,8 @@ class DataLoader(Generic[T_co]):
         generator=None,
         *,
         prefetch_factor: int = 2,
-        persistent_workers: bool = False
+        persistent_workers: bool = False,
+        pin_memory_device: str = ""
     ):
 
         if num_workers < 0:
@@ -245,6 +256,19 @@ class DataLoader(Generic[T_co]):
         self.timeout = timeout
         self.worker_init_fn = worker_init_fn
         self.multiprocessing_context = multiprocessing_context
+        self.pin_memory = pin_memory
+        self.pin_memory_device = pin_memory_device
+        if pin_memory_device and not pin_memory:
+            warnings.warn(
+                "pin_memory_device is set but pin_memory is False, "
+                "pin_memory_device takes no effect"
+            )
+        if pin_memory_device and flow.device(pin_memory_device).type != "cuda":
+            raise ValueError(
+                "pin_memory_device should be a CUDA device, but got {}".format(
+                    pin_memory_device
+                )
+            )
 
         # Arg-check dataset related before checking samplers because we want to
         # tell users that iterable-style datasets are incompatible with custom
@@ -357,13 +381,83 @@ class DataLoader(Generic[T_co]):
         )
 
         self._iterator = None
+        # state to resume from, consumed by the next iterator, see load_state_dict
+        self._resume_state = None
+        # weak reference to the latest iterator, whose state is saved by state_dict
+        self._last_iterator = None
+        # page-locked buffers of the batches, reused by the iterators if pin_memory
+        self._pinned_buffer_pool = _utils.pin_memory.PinnedBufferPool()
 
     def _get_iterator(self) -> "_BaseDataLoaderIter":
         if self.num_workers == 0 or self.num_workers == 1:
-            return _SingleProcessDataLoaderIter(self)
+            iterator = _SingleProcessDataLoaderIter(self)
         else:
             self.check_worker_number_rationality()
-            return _MultiProcessingDataLoaderIter(self)
+            iterator = _MultiProcessingDataLoaderIter(self)
+        self._last_iterator = weakref.ref(iterator)
+        return iterator
+
+    def state_dict(self) -> dict:
+        r"""Returns the state of the latest epoch, so that a restarted job can resume
+        it with :meth:`load_state_dict` exactly after the last batch returned.
+
+        The state holds the number of batches returned in the epoch, the state of
+        the sampler as of the start of the epoch (see the ``state_dict`` method of
+        the samplers) and the number of batches produced by each worker. It is
+        small and independent of the dataset size.
+
+        .. code-block:: python
+
+            loader = flow.utils.data.DataLoader(dataset, batch_size=32, shuffle=True)
+            for step, batch in enumerate(loader):
+                train(batch)
+                if step % 1000 == 0:
+                    flow.save({"loader": loader.state_dict(), ...}, path)
+
+            # after restart
+            loader.load_state_dict(flow.load(path)["loader"])
+            for batch in loader:  # continues the saved epoch
+                train(batch)
+        """
+        if self._resume_state is not None:
+            return dict(self._resume_state)
+        iterator = None if self._last_iterator is None else self._last_iterator()
+        if iterator is None:
+            return {
+                "dataset_kind": self._dataset_kind,
+                "num_yielded": 0,
+                "index_sampler": None,
+                "base_seed": None,
+                "worker_num_yielded": None,
+            }
+        return iterator.state_dict()
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        r"""Makes the next iteration over the DataLoader resume the epoch saved by
+        :meth:`state_dict`.
+
+        For map-style datasets the sampler is restored to the saved epoch and starts
+        after the returned batches, so nothing is fetched twice. This requires a
+        sampler with ``load_state_dict``, otherwise the indices of the returned
+        batches are drawn again from the sampler and dropped. For iterable-style
+        datasets each worker draws and drops the samples of the batches it had
+        produced, which requires the same ``num_workers`` as the saved run.
+        """
+        if state_dict["dataset_kind"] != self._dataset_kind:
+            raise ValueError(
+                "The state to load is not saved by a DataLoader of the same kind of dataset"
+            )
+        if (
+            self._dataset_kind == _DatasetKind.Iterable
+            and state_dict["worker_num_yielded"] is not None
+            and len(state_dict["worker_num_yielded"]) != max(self.num_workers, 1)
+        ):
+            raise ValueError(
+                "The state to load is saved with {} workers, but num_workers is {}".format(
+                    len(state_dict["worker_num_yielded"]), self.num_workers
+                )
+            )
+        self._resume_state = dict(state_dict)
 
     def __setattr__(self, attr, val):
         if self.__initialized and attr in (
@@ -394,6 +488,7 @@ class DataLoader(Generic[T_co]):
                 self._iterator = self._get_iterator()
             else:
                 self._iterator._reset(self)
+                self._last_iterator = weakref.ref(self._iterator)
             return self._iterator
         else:
             return self._get_iterator()
@@ -521,15 +616,16 @@ class _BaseDataLoaderIter(object):
         self._index_sampler = loader._index_sampler
         self._num_workers = loader.num_workers
         self._prefetch_factor = loader.prefetch_factor
-        self._pin_memory = False
+        self._pin_memory = loader.pin_memory
+        self._pinned_buffer_pool = loader._pinned_buffer_pool
         self._timeout = loader.timeout
         self._collate_fn = loader.collate_fn
-        self._sampler_iter = iter(self._index_sampler)
+        self._batch_size = loader.batch_size
         self._base_seed = flow.tensor([0], dtype=flow.int64).uniform_().numpy().item()
         # TODO: flow.empty()
         # self._base_seed = flow.empty((), dtype=flow.int64).random_(generator=loader.generator).item()
         self._persistent_workers = loader.persistent_workers
-        self._num_yielded = 0
+        self._begin_epoch(loader)
         self._profile_name = "enumerate(DataLoader)#{}.__next__".format(
             self.__class__.__name__
         )
@@ -538,10 +634,59 @@ class _BaseDataLoaderIter(object):
         return self
 
     def _reset(self, loader, first_iter=False):
-        self._sampler_iter = iter(self._index_sampler)
-        self._num_yielded = 0
+        if not first_iter:
+            # The first epoch is begun by __init__
+            self._begin_epoch(loader)
         self._IterableDataset_len_called = loader._IterableDataset_len_called
 
+    def _begin_epoch(self, loader):
+        state, loader._resume_state = loader._resume_state, None
+        self._num_yielded = 0
+        # batches of the epoch returned before it was resumed from `state`
+        self._num_resumed = 0
+        self._resumed_worker_num_yielded = None
+        if state is None:
+            self._sampler_iter = iter(self._index_sampler)
+            self._epoch_sampler_state = self._index_sampler_state_dict()
+            return
+        self._num_resumed = state["num_yielded"]
+        self._resumed_worker_num_yielded = state["worker_num_yielded"]
+        if state["base_seed"] is not None:
+            self._base_seed = state["base_seed"]
+        sampler_state = state["index_sampler"]
+        if sampler_state is not None and hasattr(
+            self._index_sampler, "load_state_dict"
+        ):
+            # See NOTE [ Resumable Samplers ]
+            sampler_state = dict(sampler_state)
+            sampler_state["offset"] += self._num_resumed
+            self._index_sampler.load_state_dict(sampler_state)
+            self._sampler_iter = iter(self._index_sampler)
+        else:
+            self._sampler_iter = iter(self._index_sampler)
+            if self._dataset_kind == _DatasetKind.Map:
+                for _ in itertools.islice(self._sampler_iter, self._num_resumed):
+                    pass
+        # The saved state always describes the epoch from its real start.
+        self._epoch_sampler_state = state["index_sampler"]
+
+    def _index_sampler_state_dict(self):
+        if not hasattr(self._index_sampler, "state_dict"):
+            return None
+        return self._index_sampler.state_dict()
+
+    def _worker_num_yielded(self):
+        return [self._num_resumed + self._num_yielded]
+
+    def state_dict(self) -> dict:
+        return {
+            "dataset_kind": self._dataset_kind,
+            "num_yielded": self._num_resumed + self._num_yielded,
+            "index_sampler": self._epoch_sampler_state,
+            "base_seed": self._base_seed,
+            "worker_num_yielded": self._worker_num_yielded(),
+        }
+
     def _next_index(self):
         return next(self._sampler_iter)  # may raise StopIteration
 
@@ -587,13 +732,90 @@ class _SingleProcessDataLoaderIter(_BaseDataLoaderIter):
             self._collate_fn,
             self._drop_last,
         )
+        if self._num_resumed > 0:
+            self._dataset_fetcher.skip(self._num_resumed, self._batch_size)
 
-    def _next_data(self):
-        index = self._next_index()  # may raise StopIteration
         if self._pin_memory:
-            raise NotImplementedError("Dataloader pin memory is not support yet!")
+            # Batches are fetched in the main process and put into pinned memory by
+            # the pin_memory_thread, like the batches of the workers, see NOTE [ Data
+            # Loader Multiprocessing Shutdown Logic ].
+            self._pin_memory_thread_done_event = threading.Event()
+            self._staging_queue = queue.Queue()  # type: ignore[var-annotated]
+            self._data_queue = queue.Queue()  # type: ignore[var-annotated]
+            pin_memory_thread = threading.Thread(
+                target=_utils.pin_memory._pin_memory_loop,
+                args=(
+                    self._staging_queue,
+                    self._data_queue,
+                    self._pinned_buffer_pool,
+                    self._pin_memory_thread_done_event,
+                ),
+            )
+            pin_memory_thread.daemon = True
+            pin_memory_thread.start()
+            self._pin_memory_thread = pin_memory_thread
+            self._num_staged = 0
+            # raised once the batches staged before it are returned
+            self._fetch_error = None
+
+    def _fetch_data(self):
+        index = self._next_index()  # may raise StopIteration
         return self._dataset_fetcher.fetch(index)
 
+    def _stage_data(self):
+        # Keep `self._prefetch_factor` batches in the pin_memory_thread, so that
+        # they are copied into pinned memory while the model runs.
+        while self._num_staged < self._prefetch_factor and self._fetch_error is None:
+            try:
+                data = self._fetch_data()
+            except Exception as e:
+                self._fetch_error = e
+                break
+            self._staging_queue.put((self._num_staged, data))
+            self._num_staged += 1
+
+    def _get_staged_data(self):
+        while self._pin_memory_thread.is_alive():
+            try:
+                _, data = self._data_queue.get(timeout=_utils.MP_STATUS_CHECK_INTERVAL)
+                break
+            except queue.Empty:
+                continue
+        else:
+            raise RuntimeError("Pin memory thread exited unexpectedly")
+        self._num_staged -= 1
+        return data
+
+    def _next_data(self):
+        if not self._pin_memory:
+            return self._fetch_data()
+        self._stage_data()
+        if self._num_staged == 0:
+            error, self._fetch_error = self._fetch_error, None
+            raise error
+        data = self._get_staged_data()
+        if isinstance(data, _utils.worker.ExceptionWrapper):
+            data.reraise()
+        return data
+
+    def _reset(self, loader, first_iter=False):
+        if self._pin_memory:
+            # Drop the batches staged for the previous epoch.
+            while self._num_staged > 0:
+                self._get_staged_data()
+            self._fetch_error = None
+        super(_SingleProcessDataLoaderIter, self)._reset(loader, first_iter)
+
+    def __del__(self):
+        python_exit_status = _utils.python_exit_status
+        if python_exit_status is True or python_exit_status is None:
+            return
+        if hasattr(self, "_pin_memory_thread"):
+            self._pin_memory_thread_done_event.set()
+            # Wake the thread up in case it is waiting for a batch.
+            self._staging_queue.put((None, None))
+            self._pin_memory_thread.join()
+
 
 class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
     r"""Iterates once over the DataLoader's dataset, as specified by the sampler"""
@@ -963,7 +1185,6 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
             self._workers.append(w)
 
         if self._pin_memory:
-            raise NotImplementedError("Dataloader pin memory is not support yet!")
             self._pin_memory_thread_done_event = threading.Event()
 
             # Queue is not type-annotated
@@ -973,7 +1194,7 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
                 args=(
                     self._worker_result_queue,
                     self._data_queue,
-                    flow.cuda.current_device(),  # TODO:flow.cuda.current_device()
+                    self._pinned_buffer_pool,
                     self._pin_memory_thread_done_event,
                 ),
             )
@@ -1010,10 +1231,30 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
         # It does not mean that a worker is dead. In case of `_persistent_workers`,
         # the worker will be reset to available in the next epoch.
         self._workers_status = [True for i in range(self._num_workers)]
+        # Batches produced by each worker, only used to resume iterable-style datasets.
+        if (
+            self._resumed_worker_num_yielded is not None
+            and len(self._resumed_worker_num_yielded) == self._num_workers
+        ):
+            self._worker_num_yielded_list = list(self._resumed_worker_num_yielded)
+        else:
+            self._worker_num_yielded_list = [0] * self._num_workers
+        resume_iterable = (
+            self._dataset_kind == _DatasetKind.Iterable and self._num_resumed > 0
+        )
+        if first_iter and self._num_resumed > 0:
+            # Tasks are sent to the workers round-robin from the first batch.
+            for _ in range(self._num_resumed % self._num_workers):
+                next(self._worker_queue_idx_cycle)
         # We resume the prefetching in case it was enabled
-        if not first_iter:
+        if not first_iter or resume_iterable:
             for idx in range(self._num_workers):
-                self._index_queues[idx].put(_utils.worker._ResumeIteration())
+                self._index_queues[idx].put(
+                    _utils.worker._ResumeIteration(
+                        self._worker_num_yielded_list[idx] if resume_iterable else 0,
+                        self._batch_size,
+                    )
+                )
             resume_iteration_cnt = self._num_workers
             while resume_iteration_cnt > 0:
                 return_idx, return_data = self._get_data()
@@ -1140,7 +1381,8 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
 
             # Check if the next sample has already been generated
             if len(self._task_info[self._rcvd_idx]) == 2:
-                data = self._task_info.pop(self._rcvd_idx)[1]
+                worker_id, data = self._task_info.pop(self._rcvd_idx)
+                self._worker_num_yielded_list[worker_id] += 1
                 return self._process_data(data)
 
             assert not self._shutdown and self._tasks_outstanding > 0
@@ -1160,9 +1402,13 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
                 # store out-of-order samples
                 self._task_info[idx] += (data,)
             else:
-                del self._task_info[idx]
+                worker_id = self._task_info.pop(idx)[0]
+                self._worker_num_yielded_list[worker_id] += 1
                 return self._process_data(data)
 
+    def _worker_num_yielded(self):
+        return list(self._worker_num_yielded_list)
+
     def _try_put_index(self):
         assert self._tasks_outstanding < self._prefetch_factor * self._num_workers
 
@@ -14,6 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 import bisect
+import collections
 import functools
 from typing import (
     TypeVar,
@@ -28,6 +29,8 @@ from typing import (
     Callable,
 )
 
+import numpy as np
+
 import oneflow as flow
 from oneflow.framework.tensor import Tensor
 
@@ -54,6 +57,69 @@ T_co = TypeVar("T_co", covariant=True)
 T = TypeVar("T")
 
 
+class CollatedBatch(object):
+    r"""A batch of samples already collated by the dataset.
+
+    :meth:`Dataset.__getitems__` may return it instead of a list of samples when
+    it can gather the whole batch at once. ``data`` must have the structure that
+    :func:`~flow.utils.data._utils.collate.default_collate` would produce for the
+    samples, i.e. tensors with the batch as outer dimension, possibly nested in
+    lists, tuples or dicts. The :class:`~flow.utils.data.DataLoader` returns it
+    as is unless a custom ``collate_fn`` is given, in which case it is split back
+    into samples first.
+
+    Args:
+        data: the collated batch
+        size (int): the number of samples in the batch
+    """
+
+    __slots__ = ("data", "size")
+
+    def __init__(self, data, size: int) -> None:
+        self.data = data
+        self.size = size
+
+    def samples(self) -> list:
+        r"""Splits the batch back into a list of ``size`` samples."""
+        return _unbatch(self.data, self.size)
+
+
+def _unbatch(data, size):
+    if isinstance(data, (flow.Tensor, flow._oneflow_internal.Tensor)):
+        return [data[i] for i in range(size)]
+    elif isinstance(data, collections.abc.Mapping):
+        values = {key: _unbatch(value, size) for key, value in data.items()}
+        return [{key: values[key][i] for key in data} for i in range(size)]
+    elif isinstance(data, tuple) and hasattr(data, "_fields"):  # namedtuple
+        return [
+            type(data)(*sample) for sample in zip(*(_unbatch(d, size) for d in data))
+        ]
+    elif isinstance(data, collections.abc.Sequence):
+        return [list(sample) for sample in zip(*(_unbatch(d, size) for d in data))]
+    raise TypeError("CollatedBatch can not unbatch {}".format(type(data)))
+
+
+def _map_batch(fn, batches):
+    # Applies fn to the tensors at the same position of the collated batches.
+    elem = batches[0]
+    if isinstance(elem, (flow.Tensor, flow._oneflow_internal.Tensor)):
+        return fn(batches)
+    elif isinstance(elem, collections.abc.Mapping):
+        return {key: _map_batch(fn, [b[key] for b in batches]) for key in elem}
+    elif isinstance(elem, tuple) and hasattr(elem, "_fields"):  # namedtuple
+        return type(elem)(*(_map_batch(fn, list(d)) for d in zip(*batches)))
+    elif isinstance(elem, collections.abc.Sequence):
+        return [_map_batch(fn, list(d)) for d in zip(*batches)]
+    raise TypeError("CollatedBatch can not gather {}".format(type(elem)))
+
+
+def _index_array(indices, length):
+    index = np.asarray(indices, dtype=np.int64)
+    if index.size > 0 and index.min() < 0:
+        index = np.where(index < 0, index + length, index)
+    return index
+
+
 class Dataset(Generic[T_co]):
     r"""An abstract class representing a :class:`Dataset`.
 
@@ -64,6 +130,13 @@ class Dataset(Generic[T_co]):
     :class:`~flow.utils.data.Sampler` implementations and the default options
     of :class:`~flow.utils.data.DataLoader`.
 
+    Subclasses could also optionally implement :meth:`__getitems__`, which
+    takes the list of indices of a batch and returns either the list of samples
+    or a :class:`~flow.utils.data.CollatedBatch`. The
+    :class:`~flow.utils.data.DataLoader` calls it instead of calling
+    :meth:`__getitem__` per index when it is defined, so datasets able to
+    gather a whole batch at once save the per-sample calls and the collation.
+
     .. note::
       :class:`~flow.utils.data.DataLoader` by default constructs a index
       sampler that yields integral indices.  To make it work with a map-style
@@ -205,6 +278,14 @@ class TensorDataset(Dataset[Tuple[Tensor, ...]]):
     def __getitem__(self, index):
         return tuple(tensor[index] for tensor in self.tensors)
 
+    def __getitems__(self, indices):
+        index = _index_array(indices, len(self))
+        data = []
+        for tensor in self.tensors:
+            tensor_index = flow.tensor(index, device=tensor.device)
+            data.append(flow._C.gather(tensor, tensor_index, axis=0))
+        return CollatedBatch(data, len(index))
+
     def __len__(self):
         return self.tensors[0].size(0)
 
@@ -257,6 +338,45 @@ class ConcatDataset(Dataset[T_co]):
             sample_idx = idx - self.cumulative_sizes[dataset_idx - 1]
         return self.datasets[dataset_idx][sample_idx]
 
+    def __getitems__(self, indices):
+        index = _index_array(indices, len(self))
+        dataset_idxs = np.searchsorted(self.cumulative_sizes, index, side="right")
+        offsets = np.concatenate(([0], self.cumulative_sizes[:-1]))
+        # Fetch the indices of each dataset at once, keeping the batch order within each one.
+        order = np.argsort(dataset_idxs, kind="stable")
+        parts = []
+        for dataset_idx in np.unique(dataset_idxs):
+            dataset = self.datasets[dataset_idx]
+            sample_idxs = index[dataset_idxs == dataset_idx] - offsets[dataset_idx]
+            if hasattr(dataset, "__getitems__"):
+                parts.append(dataset.__getitems__(sample_idxs))
+            else:
+                parts.append([dataset[int(i)] for i in sample_idxs])
+        if len(parts) > 0 and all(isinstance(p, CollatedBatch) for p in parts):
+            data = _map_batch(
+                lambda tensors: flow._C.concat(tensors, dim=0), [p.data for p in parts]
+            )
+            if len(parts) > 1:
+                # Position of every sample of the batch in the concatenated parts.
+                inverse = np.empty_like(order)
+                inverse[order] = np.arange(len(order))
+                data = _map_batch(
+                    lambda tensors: flow._C.gather(
+                        tensors[0],
+                        flow.tensor(inverse, device=tensors[0].device),
+                        axis=0,
+                    ),
+                    [data],
+                )
+            return CollatedBatch(data, len(index))
+        samples = []
+        for p in parts:
+            samples.extend(p.samples() if isinstance(p, CollatedBatch) else p)
+        batch = [None] * len(samples)
+        for sample, position in zip(samples, order):
+            batch[position] = sample
+        return batch
+
 
 class ChainDataset(IterableDataset):
     r"""Dataset for chainning multiple :class:`IterableDataset` s.
@@ -310,6 +430,15 @@ class Subset(Dataset[T_co]):
     def __getitem__(self, idx):
         return self.dataset[self.indices[idx]]
 
+    def __getitems__(self, indices):
+        if isinstance(self.indices, np.ndarray):
+            dataset_indices = self.indices[np.asarray(indices, dtype=np.int64)].tolist()
+        else:
+            dataset_indices = [self.indices[idx] for idx in indices]
+        if hasattr(self.dataset, "__getitems__"):
+            return self.dataset.__getitems__(dataset_indices)
+        return [self.dataset[idx] for idx in dataset_indices]
+
     def __len__(self):
         return len(self.indices)
 
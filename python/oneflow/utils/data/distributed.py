@@ -19,6 +19,11 @@ from typing import TypeVar, Optional, Iterator
 
 import oneflow as flow
 from oneflow.utils.data import Sampler, Dataset
+from oneflow.utils.data.sampler import (
+    _INDEX_CHUNK_SIZE,
+    _FeistelPermutation,
+    _iter_chunk_items,
+)
 
 
 T_co = TypeVar("T_co", covariant=True)
@@ -53,6 +58,11 @@ class DistributedSampler(Sampler[T_co]):
             tail of the data to make it evenly divisible across the number of
             replicas. If ``False``, the sampler will add extra indices to make
             the data evenly divisible across the replicas. Default: ``False``.
+        lazy_shuffle (bool, optional): if ``True``, the shuffled indices of this
+            rank are computed on the fly by a seeded Feistel permutation instead
+            of materializing a ``randperm`` of the whole dataset, so memory and
+            startup time do not grow with the dataset size. The order differs
+            from the one of ``lazy_shuffle=False``. Default: ``False``.
 
     .. warning::
         In distributed mode, calling the :meth:`set_epoch` method at
@@ -80,6 +90,7 @@ class DistributedSampler(Sampler[T_co]):
         shuffle: bool = True,
         seed: int = 0,
         drop_last: bool = False,
+        lazy_shuffle: bool = False,
     ) -> None:
         if not flow.env.is_multi_client():
             raise RuntimeError("Requires multi-client env to be available")
@@ -120,35 +131,43 @@ class DistributedSampler(Sampler[T_co]):
         self.total_size = self.num_samples * self.num_replicas
         self.shuffle = shuffle
         self.seed = seed
+        self.lazy_shuffle = lazy_shuffle
+        self._iter_epoch = 0
+        self._iter_offset = 0
+        self._resume_offset = 0
+
+    def _iter_index_chunks(self, chunk_size):
+        # See NOTE [ Array-backed Samplers ] and NOTE [ Resumable Samplers ]
+        self._iter_epoch = self.epoch
+        self._iter_offset, self._resume_offset = self._resume_offset, 0
+        return self._generate_index_chunks(
+            chunk_size, self.seed + self._iter_epoch, self._iter_offset
+        )
 
-    def __iter__(self) -> Iterator[T_co]:
+    def _generate_index_chunks(self, chunk_size, seed, offset):
+        n = len(self.dataset)
+        permute = None
         if self.shuffle:
             # deterministically shuffle based on epoch and seed
-            g = flow.Generator()
-            g.manual_seed(self.seed + self.epoch)
-            indices = flow._C.randperm(len(self.dataset), generator=g).tolist()
-        else:
-            indices = list(range(len(self.dataset)))
-
-        if not self.drop_last:
-            # add extra samples to make it evenly divisible
-            padding_size = self.total_size - len(indices)
-            if padding_size <= len(indices):
-                indices += indices[:padding_size]
+            if self.lazy_shuffle:
+                permute = _FeistelPermutation(n, seed)
             else:
-                indices += (indices * math.ceil(padding_size / len(indices)))[
-                    :padding_size
-                ]
-        else:
-            # remove tail of data to make it evenly divisible.
-            indices = indices[: self.total_size]
-        assert len(indices) == self.total_size
+                g = flow.Generator()
+                g.manual_seed(seed)
+                perm = flow._C.randperm(n, generator=g).numpy().astype(np.int64)
+                permute = lambda positions: perm[positions]
+        # The i-th index of this rank is at position i * num_replicas + rank of the
+        # dataset order. Positions past the end wrap around to the beginning, which
+        # pads the data to make it evenly divisible, and with drop_last they never
+        # exceed total_size so the tail is dropped.
+        for start in range(offset, self.num_samples, chunk_size):
+            end = min(start + chunk_size, self.num_samples)
+            positions = np.arange(start, end, dtype=np.int64)
+            positions = (positions * self.num_replicas + self.rank) % n
+            yield positions if permute is None else permute(positions)
 
-        # subsample
-        indices = indices[self.rank : self.total_size : self.num_replicas]
-        assert len(indices) == self.num_samples
-
-        return iter(indices)
+    def __iter__(self) -> Iterator[T_co]:
+        return _iter_chunk_items(self._iter_index_chunks(_INDEX_CHUNK_SIZE))
 
     def __len__(self) -> int:
         return self.num_samples
@@ -163,3 +182,21 @@ class DistributedSampler(Sampler[T_co]):
             epoch (int): Epoch number.
         """
         self.epoch = epoch
+
+    def state_dict(self) -> dict:
+        r"""Returns the state of the current iteration: its epoch and seed, and the
+        number of indices of this rank it skipped. See :meth:`load_state_dict`.
+        """
+        return {
+            "epoch": self._iter_epoch,
+            "seed": self.seed,
+            "offset": self._iter_offset,
+        }
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        r"""Makes the next iteration reproduce the order of the iteration saved in
+        ``state_dict``, starting from its ``state_dict["offset"]``-th index.
+        """
+        self.epoch = state_dict["epoch"]
+        self.seed = state_dict["seed"]
+        self._resume_offset = state_dict["offset"]
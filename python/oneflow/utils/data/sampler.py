@@ -21,6 +21,9 @@ import oneflow as flow
 
 T_co = TypeVar("T_co", covariant=True)
 
+# Number of indices materialized at once by the array-backed samplers.
+_INDEX_CHUNK_SIZE = 65536
+
 
 class Sampler(Generic[T_co]):
     r"""Base class for all Samplers.
@@ -67,6 +70,52 @@ class Sampler(Generic[T_co]):
     #     a method that is not defined on an object.
     #     (@ssnl verifies that this works on at least Python 3.7.)
 
+    # NOTE [ Array-backed Samplers ]
+    #
+    # Samplers of integral indices may also implement
+    # `_iter_index_chunks(chunk_size)`, yielding the same indices as `__iter__`
+    # as int64 numpy arrays of `chunk_size` indices, except the last one which may
+    # be shorter. `BatchSampler` then converts each array to a batch with one
+    # `tolist()` call instead of building Python lists index by index.
+
+    # NOTE [ Resumable Samplers ]
+    #
+    # Samplers may also implement `state_dict()` and `load_state_dict()`, which
+    # `DataLoader.state_dict()` relies on to resume an epoch in the middle:
+    #
+    #   + `state_dict()` describes the current iteration as of its start, i.e.
+    #     the randomness fixed when `__iter__` was called and the "offset",
+    #     the number of items that iteration skipped. It must be valid as soon
+    #     as `__iter__` returns, so `__iter__` fixes its randomness eagerly
+    #     instead of in the body of a generator.
+    #
+    #   + `load_state_dict(state)` makes the next `__iter__` reproduce the
+    #     iteration described by `state`, starting from its "offset"-th item.
+
+
+def _rechunk(blocks, chunk_size):
+    # Cuts a stream of int64 arrays into arrays of exactly chunk_size indices,
+    # except the last one.
+    pending = []
+    pending_size = 0
+    for block in blocks:
+        while len(block) > 0:
+            take = min(chunk_size - pending_size, len(block))
+            pending.append(block[:take])
+            pending_size += take
+            block = block[take:]
+            if pending_size == chunk_size:
+                yield pending[0] if len(pending) == 1 else np.concatenate(pending)
+                pending = []
+                pending_size = 0
+    if pending_size > 0:
+        yield np.concatenate(pending)
+
+
+def _iter_chunk_items(chunks):
+    for chunk in chunks:
+        yield from chunk.tolist()
+
 
 class SequentialSampler(Sampler[int]):
     r"""Samples elements sequentially, always in the same order.
@@ -78,13 +127,24 @@ class SequentialSampler(Sampler[int]):
 
     def __init__(self, data_source):
         self.data_source = data_source
+        self._iter_offset = 0
+        self._resume_offset = 0
 
     def __iter__(self):
-        return iter(range(len(self.data_source)))
+        self._iter_offset, self._resume_offset = self._resume_offset, 0
+        return iter(range(self._iter_offset, len(self.data_source)))
 
     def __len__(self) -> int:
         return len(self.data_source)
 
+    def state_dict(self) -> dict:
+        r"""Returns the state of the current iteration, see :meth:`load_state_dict`."""
+        return {"offset": self._iter_offset}
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        r"""Makes the next iteration start from index ``state_dict["offset"]``."""
+        self._resume_offset = state_dict["offset"]
+
 
 class RandomSampler(Sampler[int]):
     r"""Samples elements randomly. If without replacement, then sample from a shuffled dataset.
@@ -111,6 +171,10 @@ class RandomSampler(Sampler[int]):
         self.replacement = replacement
         self._num_samples = num_samples
         self.generator = generator
+        self._iter_seed = None
+        self._iter_generator_state = None
+        self._iter_offset = 0
+        self._resume_state = None
 
         if not isinstance(self.replacement, bool):
             raise TypeError(
@@ -137,34 +201,76 @@ class RandomSampler(Sampler[int]):
             return len(self.data_source)
         return self._num_samples
 
-    def __iter__(self):
-        n = len(self.data_source)
+    def _begin_iteration(self):
+        # See NOTE [ Resumable Samplers ]
+        state, self._resume_state = self._resume_state, None
         if self.generator is None:
+            if state is not None and state["seed"] is not None:
+                seed = state["seed"]
+            else:
+                seed = np.random.randint(0, np.iinfo(np.int64).max)
+                # TODO: use Tensor.random_
+                # seed = int(flow.empty((), dtype=flow.int64).random_().item())
             generator = flow.Generator()
-            generator.manual_seed(np.random.randint(0, np.iinfo(np.int64).max))
-            # TODO: use Tensor.random_
-            # generator.manual_seed(
-            #     int(flow.empty((), dtype=flow.int64).random_().item())
-            # )
+            generator.manual_seed(seed)
+            self._iter_seed = seed
+            self._iter_generator_state = None
         else:
             generator = self.generator
+            if state is not None and state["generator_state"] is not None:
+                generator.set_state(state["generator_state"])
+            self._iter_seed = None
+            self._iter_generator_state = generator.get_state()
+        self._iter_offset = 0 if state is None else state["offset"]
+        return generator
+
+    def _generate_index_blocks(self, generator):
+        n = len(self.data_source)
+        offset = self._iter_offset
         if self.replacement:
-            for _ in range(self.num_samples // 32):
-                yield from flow._C.randint(
-                    high=n, size=(32,), dtype=flow.int64, generator=generator
-                ).numpy().tolist()
-            yield from flow._C.randint(
-                high=n,
-                size=(self.num_samples % 32,),
-                dtype=flow.int64,
-                generator=generator,
-            ).numpy().tolist()
+            # Always draw blocks of the same size, so that the drawn indices do not
+            # depend on the chunk size nor on the offset.
+            for start in range(0, self.num_samples, _INDEX_CHUNK_SIZE):
+                size = min(_INDEX_CHUNK_SIZE, self.num_samples - start)
+                block = flow._C.randint(
+                    high=n, size=(size,), dtype=flow.int64, generator=generator
+                )
+                # Blocks before the offset are only drawn to advance the generator.
+                if start + size > offset:
+                    yield block.numpy()[max(offset - start, 0) :]
         else:
-            yield from flow._C.randperm(n, generator=generator).numpy().tolist()
+            # Keep the permutation as one int64 array instead of a list of Python ints.
+            perm = flow._C.randperm(n, generator=generator).numpy().astype(np.int64)
+            for start in range(offset, n, _INDEX_CHUNK_SIZE):
+                yield perm[start : start + _INDEX_CHUNK_SIZE]
+
+    def _iter_index_chunks(self, chunk_size):
+        generator = self._begin_iteration()
+        return _rechunk(self._generate_index_blocks(generator), chunk_size)
+
+    def __iter__(self):
+        return _iter_chunk_items(self._iter_index_chunks(_INDEX_CHUNK_SIZE))
 
     def __len__(self):
         return self.num_samples
 
+    def state_dict(self) -> dict:
+        r"""Returns the state of the current iteration: the seed of its generator,
+        or the initial state of :attr:`generator` if one is given, and the number
+        of indices it skipped. See :meth:`load_state_dict`.
+        """
+        return {
+            "seed": self._iter_seed,
+            "generator_state": self._iter_generator_state,
+            "offset": self._iter_offset,
+        }
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        r"""Makes the next iteration reproduce the order of the iteration saved in
+        ``state_dict``, starting from its ``state_dict["offset"]``-th index.
+        """
+        self._resume_state = dict(state_dict)
+
 
 class SubsetRandomSampler(Sampler[int]):
     r"""Samples elements randomly from a given list of indices, without replacement.
@@ -228,8 +334,22 @@ class BatchSampler(Sampler[List[int]]):
         self.drop_last = drop_last
 
     def __iter__(self):
+        # Start the iteration of the sampler eagerly, see NOTE [ Resumable Samplers ]
+        if hasattr(self.sampler, "_iter_index_chunks"):
+            # See NOTE [ Array-backed Samplers ]
+            return self._iter_array_batches(
+                self.sampler._iter_index_chunks(self.batch_size)
+            )
+        return self._iter_list_batches(iter(self.sampler))
+
+    def _iter_array_batches(self, chunks):
+        for batch in chunks:
+            if len(batch) == self.batch_size or not self.drop_last:
+                yield batch.tolist()
+
+    def _iter_list_batches(self, sampler_iter):
         batch = []
-        for idx in self.sampler:
+        for idx in sampler_iter:
             batch.append(idx)
             if len(batch) == self.batch_size:
                 yield batch
@@ -237,6 +357,29 @@ class BatchSampler(Sampler[List[int]]):
         if len(batch) > 0 and not self.drop_last:
             yield batch
 
+    def state_dict(self) -> Optional[dict]:
+        r"""Returns the state of the current iteration, or None if the base sampler
+        is not resumable. ``state_dict["offset"]`` is the number of batches the
+        iteration skipped.
+        """
+        if not hasattr(self.sampler, "state_dict"):
+            return None
+        sampler_state = self.sampler.state_dict()
+        if sampler_state is None:
+            return None
+        return {
+            "sampler": sampler_state,
+            "offset": sampler_state["offset"] // self.batch_size,
+        }
+
+    def load_state_dict(self, state_dict: dict) -> None:
+        r"""Makes the next iteration reproduce the batches of the iteration saved
+        in ``state_dict``, starting from its ``state_dict["offset"]``-th batch.
+        """
+        sampler_state = dict(state_dict["sampler"])
+        sampler_state["offset"] = state_dict["offset"] * self.batch_size
+        self.sampler.load_state_dict(sampler_state)
+
     def __len__(self):
         # Can only be called if self.sampler has __len__ implemented
         # We cannot enforce this condition, so we turn off typechecking for the
@@ -246,3 +389,53 @@ class BatchSampler(Sampler[List[int]]):
             return len(self.sampler) // self.batch_size  # type: ignore
         else:
             return (len(self.sampler) + self.batch_size - 1) // self.batch_size  # type: ignore
+
+
+def _mix64(x):
+    # splitmix64 finalizer, uint64 arithmetic wraps around.
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class _FeistelPermutation(object):
+    r"""A seeded pseudo random permutation of ``range(n)`` evaluated index by index.
+
+    A balanced Feistel network permutes the smallest domain of ``2 ** (2 * k)``
+    values holding ``n``, and values falling outside of ``range(n)`` are
+    permuted again until they fall inside (cycle walking). Unlike ``randperm``
+    it takes O(1) memory, so any slice of the permutation can be computed
+    without materializing the whole of it.
+    """
+
+    _NUM_ROUNDS = 4
+
+    def __init__(self, n: int, seed: int) -> None:
+        self.n = n
+        self.half_bits = (max((n - 1).bit_length(), 2) + 1) // 2
+        self.mask = np.uint64((1 << self.half_bits) - 1)
+        rng = np.random.default_rng(seed)
+        self.keys = rng.integers(
+            0,
+            np.iinfo(np.uint64).max,
+            size=self._NUM_ROUNDS,
+            dtype=np.uint64,
+            endpoint=True,
+        )
+
+    def _encrypt(self, x):
+        half_bits = np.uint64(self.half_bits)
+        left = x >> half_bits
+        right = x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ (_mix64(right ^ key) & self.mask)
+        return (left << half_bits) | right
+
+    def __call__(self, positions: np.ndarray) -> np.ndarray:
+        n = np.uint64(self.n)
+        x = self._encrypt(np.asarray(positions).astype(np.uint64))
+        outside = x >= n
+        while outside.any():
+            x[outside] = self._encrypt(x[outside])
+            outside = x >= n
+        return x.astype(np.int64)
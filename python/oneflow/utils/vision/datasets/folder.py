@@ -13,9 +13,15 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import json
+import operator
 import os
 import os.path
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 from PIL import Image
 from typing import Any, Callable, cast, Dict, List, Optional, Tuple
 
@@ -56,18 +62,27 @@ def find_classes(directory: str) -> Tuple[List[str], Dict[str, int]]:
     return classes, class_to_idx
 
 
-def make_dataset(
+def _scan_class_dir(
+    target_dir: str, class_index: int, is_valid_file: Callable[[str], bool]
+) -> Tuple[List[Tuple[str, int]], List[str]]:
+    instances = []
+    dirs = []
+    for root, _, fnames in sorted(os.walk(target_dir, followlinks=True)):
+        dirs.append(root)
+        for fname in sorted(fnames):
+            if is_valid_file(fname):
+                instances.append((os.path.join(root, fname), class_index))
+    return instances, dirs
+
+
+def _scan_dataset(
     directory: str,
     class_to_idx: Optional[Dict[str, int]] = None,
     extensions: Optional[Tuple[str, ...]] = None,
     is_valid_file: Optional[Callable[[str], bool]] = None,
-) -> List[Tuple[str, int]]:
-    """Generates a list of samples of a form (path_to_sample, class).
-
-    See :class:`DatasetFolder` for details.
-    Note: The class_to_idx parameter is here optional and will use the logic of the ``find_classes`` function
-    by default.
-    """
+    num_workers: int = 1,
+) -> Tuple[List[Tuple[str, int]], List[str]]:
+    # Returns the samples and all the directories scanned for them, see make_dataset
     directory = os.path.expanduser(directory)
 
     if class_to_idx is None:
@@ -91,22 +106,34 @@ def make_dataset(
 
     is_valid_file = cast(Callable[[str], bool], is_valid_file)
 
+    target_classes = [
+        target_class
+        for target_class in sorted(class_to_idx.keys())
+        if os.path.isdir(os.path.join(directory, target_class))
+    ]
+
+    def scan(target_class):
+        return _scan_class_dir(
+            os.path.join(directory, target_class),
+            class_to_idx[target_class],
+            is_valid_file,
+        )
+
+    # The scan is dominated by system calls, which release the GIL
+    if num_workers > 1:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            results = list(executor.map(scan, target_classes))
+    else:
+        results = [scan(target_class) for target_class in target_classes]
+
     instances = []
+    dirs = [directory]
     available_classes = set()
-    for target_class in sorted(class_to_idx.keys()):
-        class_index = class_to_idx[target_class]
-        target_dir = os.path.join(directory, target_class)
-        if not os.path.isdir(target_dir):
-            continue
-        for root, _, fnames in sorted(os.walk(target_dir, followlinks=True)):
-            for fname in sorted(fnames):
-                if is_valid_file(fname):
-                    path = os.path.join(root, fname)
-                    item = path, class_index
-                    instances.append(item)
-
-                    if target_class not in available_classes:
-                        available_classes.add(target_class)
+    for target_class, (class_instances, class_dirs) in zip(target_classes, results):
+        instances.extend(class_instances)
+        dirs.extend(class_dirs)
+        if class_instances:
+            available_classes.add(target_class)
 
     empty_classes = set(class_to_idx.keys()) - available_classes
     if empty_classes:
@@ -117,7 +144,186 @@ def make_dataset(
             msg += f"Supported extensions are: {', '.join(extensions)}"
         raise FileNotFoundError(msg)
 
-    return instances
+    return instances, dirs
+
+
+def make_dataset(
+    directory: str,
+    class_to_idx: Optional[Dict[str, int]] = None,
+    extensions: Optional[Tuple[str, ...]] = None,
+    is_valid_file: Optional[Callable[[str], bool]] = None,
+    num_workers: int = 1,
+) -> List[Tuple[str, int]]:
+    """Generates a list of samples of a form (path_to_sample, class).
+
+    See :class:`DatasetFolder` for details.
+    Note: The class_to_idx parameter is here optional and will use the logic of the ``find_classes`` function
+    by default. With ``num_workers > 1`` the class folders are scanned by a pool of threads,
+    which gives the same samples in the same order.
+    """
+    return _scan_dataset(
+        directory, class_to_idx, extensions, is_valid_file, num_workers
+    )[0]
+
+
+class SampleTable(Sequence):
+    r"""A read-only sequence of (path_to_sample, class) tuples, stored as one byte
+    buffer of the encoded paths, the offsets of the paths in the buffer and an int32
+    array of the classes.
+
+    A table of millions of samples takes a few numpy arrays instead of as many
+    Python tuples, so it is fast to pickle to the DataLoader workers and does not
+    grow their memory as reference counts are touched. Indexing with a slice returns
+    a list of tuples.
+
+    Args:
+        path_buffer (numpy.ndarray): uint8 array of the paths encoded by ``os.fsencode``,
+            without ``prefix``.
+        path_offsets (numpy.ndarray): int64 array of ``len(targets) + 1`` offsets, path ``i``
+            is ``path_buffer[path_offsets[i]:path_offsets[i + 1]]``.
+        targets (numpy.ndarray): int32 array of the classes.
+        prefix (string): common prefix of all the paths.
+    """
+
+    def __init__(
+        self,
+        path_buffer: np.ndarray,
+        path_offsets: np.ndarray,
+        targets: np.ndarray,
+        prefix: str = "",
+    ) -> None:
+        if len(path_offsets) != len(targets) + 1:
+            raise ValueError(
+                "Expect {} path offsets for {} samples. Got {}".format(
+                    len(targets) + 1, len(targets), len(path_offsets)
+                )
+            )
+        self.path_buffer = path_buffer
+        self.path_offsets = path_offsets
+        self.targets = targets
+        self.prefix = prefix
+
+    @classmethod
+    def from_samples(
+        cls, samples: List[Tuple[str, int]], prefix: str = ""
+    ) -> "SampleTable":
+        """Builds a table from a list of (path_to_sample, class) tuples. ``prefix`` is
+        stored once instead of in every path if all the paths start with it.
+        """
+        if not all(path.startswith(prefix) for path, _ in samples):
+            prefix = ""
+        encoded = [os.fsencode(path[len(prefix) :]) for path, _ in samples]
+        path_offsets = np.zeros(len(samples) + 1, dtype=np.int64)
+        np.cumsum([len(path) for path in encoded], out=path_offsets[1:])
+        path_buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        targets = np.array([target for _, target in samples], dtype=np.int32)
+        return cls(path_buffer, path_offsets, targets, prefix)
+
+    def path(self, index: int) -> str:
+        start, end = self.path_offsets[index], self.path_offsets[index + 1]
+        return self.prefix + os.fsdecode(self.path_buffer[start:end].tobytes())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Like slicing a list of samples, returns a new list of tuples.
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = operator.index(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sample index out of range")
+        return self.path(index), int(self.targets[index])
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+
+# NOTE [ Index Cache of DatasetFolder ]
+#
+# Scanning a dataset folder lists every file of it, which takes minutes on trees
+# of millions of files. The cache file saves the SampleTable of a scan together
+# with the paths and modification times of all the directories it scanned.
+# Creating, removing or renaming an entry of a directory updates its modification
+# time, so the cached table is still valid iff all these directories have the
+# same modification time, which takes one stat per directory instead of listing
+# every file. A scan is only cached if no directory was modified shortly before
+# or during it. The cache is also keyed by the root, the classes and the file
+# filter. A custom ``is_valid_file`` is keyed by its qualified name only, so the
+# cache must be removed if its behavior changes.
+
+_INDEX_CACHE_VERSION = 1
+_MTIME_RESOLUTION_NS = 2 * 10 ** 9
+
+
+def _index_cache_key(
+    root: str,
+    class_to_idx: Dict[str, int],
+    extensions: Optional[Tuple[str, ...]],
+    is_valid_file: Optional[Callable[[str], bool]],
+) -> str:
+    return json.dumps(
+        {
+            "version": _INDEX_CACHE_VERSION,
+            "root": os.path.abspath(root),
+            "class_to_idx": class_to_idx,
+            "extensions": None if extensions is None else list(extensions),
+            "is_valid_file": None
+            if is_valid_file is None
+            else "{}.{}".format(
+                getattr(is_valid_file, "__module__", None),
+                getattr(is_valid_file, "__qualname__", repr(is_valid_file)),
+            ),
+        },
+        sort_keys=True,
+    )
+
+
+def _dir_mtimes(dirs: List[str]) -> Optional[np.ndarray]:
+    try:
+        return np.array([os.stat(d).st_mtime_ns for d in dirs], dtype=np.int64)
+    except OSError:
+        return None
+
+
+def _load_index_cache(path: str, key: str) -> Optional[SampleTable]:
+    if not os.path.isfile(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as cache:
+            if str(cache["key"]) != key:
+                return None
+            dirs = os.fsdecode(cache["dir_buffer"].tobytes()).split("\0")
+            mtimes = _dir_mtimes(dirs)
+            if mtimes is None or not np.array_equal(mtimes, cache["dir_mtimes"]):
+                return None
+            return SampleTable(
+                cache["path_buffer"],
+                cache["path_offsets"],
+                cache["targets"],
+                str(cache["prefix"]),
+            )
+    except (OSError, ValueError, KeyError):
+        # An unreadable cache is rebuilt
+        return None
+
+
+def _save_index_cache(
+    path: str, key: str, table: SampleTable, dirs: List[str], mtimes: np.ndarray
+) -> None:
+    # Write to a temporary file first, so that concurrent readers never see a partial cache
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            key=np.array(key),
+            prefix=np.array(table.prefix),
+            path_buffer=table.path_buffer,
+            path_offsets=table.path_offsets,
+            targets=table.targets,
+            dir_buffer=np.frombuffer(os.fsencode("\0".join(dirs)), dtype=np.uint8),
+            dir_mtimes=mtimes,
+        )
+    os.replace(tmp_path, path)
 
 
 class DatasetFolder(VisionDataset):
@@ -138,12 +344,19 @@ class DatasetFolder(VisionDataset):
         is_valid_file (callable, optional): A function that takes path of a file
             and check if the file is a valid file (used to check of corrupt files)
             both extensions and is_valid_file should not be passed.
+        index_cache (string, optional): Path of a file to cache the scanned samples in.
+            The cache is reused as long as no directory scanned for it is modified,
+            see NOTE [ Index Cache of DatasetFolder ]. Default: None, i.e. no cache.
+        num_scan_workers (int, optional): Number of threads scanning the class folders.
+            Default: 1.
 
      Attributes:
         classes (list): List of the class names sorted alphabetically.
         class_to_idx (dict): Dict with items (class_name, class_index).
-        samples (list): List of (sample path, class_index) tuples
-        targets (list): The class_index value for each image in the dataset
+        samples (SampleTable): Sequence of (sample path, class_index) tuples
+        targets (numpy.ndarray): The int32 class_index value for each image in the dataset.
+            It used to be a list, use ``targets.tolist()`` where a list is needed, e.g.
+            for ``list.count`` or concatenating with ``+``.
     """
 
     def __init__(
@@ -154,12 +367,16 @@ class DatasetFolder(VisionDataset):
         transform: Optional[Callable] = None,
         target_transform: Optional[Callable] = None,
         is_valid_file: Optional[Callable[[str], bool]] = None,
+        index_cache: Optional[str] = None,
+        num_scan_workers: int = 1,
     ) -> None:
         super(DatasetFolder, self).__init__(
             root, transform=transform, target_transform=target_transform
         )
         classes, class_to_idx = self.find_classes(self.root)
-        samples = self.make_dataset(self.root, class_to_idx, extensions, is_valid_file)
+        samples = self._make_sample_table(
+            class_to_idx, extensions, is_valid_file, index_cache, num_scan_workers
+        )
 
         self.loader = loader
         self.extensions = extensions
@@ -167,7 +384,49 @@ class DatasetFolder(VisionDataset):
         self.classes = classes
         self.class_to_idx = class_to_idx
         self.samples = samples
-        self.targets = [s[1] for s in samples]
+        self.targets = samples.targets
+
+    def _make_sample_table(
+        self,
+        class_to_idx: Dict[str, int],
+        extensions: Optional[Tuple[str, ...]],
+        is_valid_file: Optional[Callable[[str], bool]],
+        index_cache: Optional[str],
+        num_scan_workers: int,
+    ) -> SampleTable:
+        directory = os.path.expanduser(self.root)
+        if index_cache is not None:
+            key = _index_cache_key(directory, class_to_idx, extensions, is_valid_file)
+            table = _load_index_cache(index_cache, key)
+            if table is not None:
+                return table
+
+        scan_start_ns = time.time_ns()
+        if type(self).make_dataset is DatasetFolder.make_dataset:
+            samples, dirs = _scan_dataset(
+                directory, class_to_idx, extensions, is_valid_file, num_scan_workers
+            )
+        else:
+            # An overridden make_dataset only tells the samples, the cache
+            # can only check the root and class folders.
+            samples = self.make_dataset(
+                self.root, class_to_idx, extensions, is_valid_file
+            )
+            dirs = [directory] + [
+                os.path.join(directory, target_class)
+                for target_class in sorted(class_to_idx.keys())
+            ]
+        table = SampleTable.from_samples(samples, os.path.join(directory, ""))
+
+        if index_cache is not None:
+            mtimes = _dir_mtimes(dirs)
+            # Don't cache a scan that may have missed a modification, allowing for
+            # the coarse timestamps of some file systems.
+            if mtimes is not None and (
+                len(mtimes) == 0 or mtimes.max() < scan_start_ns - _MTIME_RESOLUTION_NS
+            ):
+                _save_index_cache(index_cache, key, table, dirs, mtimes)
+        return table
 
     @staticmethod
     def make_dataset(
@@ -321,10 +580,13 @@ class ImageFolder(DatasetFolder):
         loader (callable, optional): A function to load an image given its path.
         is_valid_file (callable, optional): A function that takes path of an Image file
             and check if the file is a valid file (used to check of corrupt files)
+        index_cache (string, optional): Path of a file to cache the scanned images in,
+            see :class:`~vision.datasets.DatasetFolder`.
+        num_scan_workers (int, optional): Number of threads scanning the class folders.
      Attributes:
         classes (list): List of the class names sorted alphabetically.
         class_to_idx (dict): Dict with items (class_name, class_index).
-        imgs (list): List of (image path, class_index) tuples
+        imgs (SampleTable): Sequence of (image path, class_index) tuples
     """
 
     def __init__(
@@ -334,6 +596,8 @@ class ImageFolder(DatasetFolder):
         target_transform: Optional[Callable] = None,
         loader: Callable[[str], Any] = default_loader,
         is_valid_file: Optional[Callable[[str], bool]] = None,
+        index_cache: Optional[str] = None,
+        num_scan_workers: int = 1,
     ):
         super(ImageFolder, self).__init__(
             root,
@@ -342,5 +606,7 @@ class ImageFolder(DatasetFolder):
             transform=transform,
             target_transform=target_transform,
             is_valid_file=is_valid_file,
+            index_cache=index_cache,
+            num_scan_workers=num_scan_workers,
         )
         self.imgs = self.samples
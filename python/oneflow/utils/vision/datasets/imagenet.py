@@ -50,8 +50,9 @@ class ImageNet(ImageFolder):
         class_to_idx (dict): Dict with items (class_name, class_index).
         wnids (list): List of the WordNet IDs.
         wnid_to_idx (dict): Dict with items (wordnet_id, class_index).
-        imgs (list): List of (image path, class_index) tuples
-        targets (list): The class_index value for each image in the dataset
+        imgs (SampleTable): Sequence of (image path, class_index) tuples
+        targets (numpy.ndarray): The int32 class_index value for each image in the dataset.
+            It used to be a list, use ``targets.tolist()`` where a list is needed.
     """
 
     def __init__(
@@ -38,6 +38,15 @@ from .transforms import (
     TenCrop,
     InterpolationMode,
 )
+from .batch_transforms import (
+    BatchToTensor,
+    BatchNormalize,
+    BatchRandomHorizontalFlip,
+    BatchRandomVerticalFlip,
+    BatchRandomCrop,
+    BatchRandomResizedCrop,
+    BatchCompose,
+)
 
 __all__ = [
     "Compose",
@@ -63,4 +72,11 @@ __all__ = [
     "FiveCrop",
     "TenCrop",
     "InterpolationMode",
+    "BatchToTensor",
+    "BatchNormalize",
+    "BatchRandomHorizontalFlip",
+    "BatchRandomVerticalFlip",
+    "BatchRandomCrop",
+    "BatchRandomResizedCrop",
+    "BatchCompose",
 ]
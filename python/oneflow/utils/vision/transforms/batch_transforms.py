@@ -0,0 +1,551 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import math
+import numbers
+import warnings
+from collections.abc import Sequence
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+import oneflow as flow
+from oneflow.nn import Module
+from oneflow.framework.tensor import Tensor
+from .functional import InterpolationMode, _interpolation_modes_from_int
+from . import functional_tensor as F_t
+from .transforms import _setup_size
+
+# NOTE [ Batch Transforms ]
+#
+# The transforms in this file take a whole collated batch, i.e. a tensor of shape
+# [N, C, H, W], and draw independent random parameters for every sample, so that
+# augmentation can run as a few large ops on the training device instead of once
+# per sample in the DataLoader workers.
+#
+# Geometric transforms describe their effect on every sample as a 3x3 affine
+# matrix (in homogeneous coordinates) mapping the normalized coordinates of an
+# output pixel to the normalized coordinates of the input pixel it is sampled
+# from, see `_get_affine`. Normalized coordinates are in [-1, 1] regardless of
+# the image size, which is what `affine_grid` and `grid_sample` expect, so the
+# matrices of consecutive transforms compose by multiplication and any chain of
+# crops, resized crops and flips is applied by a single `grid_sample`.
+#
+# Per-channel affine transforms such as normalization describe themselves as
+# `x * scale + shift` with one (scale, shift) pair per channel, see
+# `_get_channel_affine`, and consecutive ones compose into a single
+# multiply-add. A pure scale commutes with resampling, which is how the 1/255
+# of `BatchToTensor` is folded into a later normalization.
+#
+# `BatchCompose` fuses consecutive transforms following these two protocols.
+
+
+def _assert_batch(img: Tensor):
+    if not isinstance(img, flow.Tensor) or img.ndim != 4:
+        raise TypeError(
+            "Batch transforms expect a tensor of shape [N, C, H, W]. Got {}".format(
+                img.shape if isinstance(img, flow.Tensor) else type(img)
+            )
+        )
+
+
+def _crop_affine(top, left, crop_h, crop_w, h: int, w: int) -> Tensor:
+    # Affine matrices of crops given by per-sample tensors of boxes in an h x w image
+    sx = crop_w / w
+    sy = crop_h / h
+    tx = (2 * left + crop_w) / w - 1
+    ty = (2 * top + crop_h) / h - 1
+    zeros = flow.zeros_like(sx)
+    ones = flow.ones_like(sx)
+    return flow.stack([sx, zeros, tx, zeros, sy, ty, zeros, zeros, ones], dim=1).view(
+        -1, 3, 3
+    )
+
+
+def _flip_affine(flipped: Tensor, horizontal: bool) -> Tensor:
+    sign = 1 - 2 * flipped
+    zeros = flow.zeros_like(sign)
+    ones = flow.ones_like(sign)
+    if horizontal:
+        rows = [sign, zeros, zeros, zeros, ones, zeros]
+    else:
+        rows = [ones, zeros, zeros, zeros, sign, zeros]
+    return flow.stack(rows + [zeros, zeros, ones], dim=1).view(-1, 3, 3)
+
+
+def _apply_affine(
+    img: Tensor, theta: Tensor, size: Tuple[int, int], interpolation: str
+) -> Tensor:
+    img, need_cast, need_squeeze, out_dtype = F_t._cast_squeeze_in(
+        img, [flow.float32, flow.float64]
+    )
+    theta = flow._C.cast(theta[:, :2, :], img.dtype)
+    grid = flow.nn.functional.affine_grid(
+        theta, [img.shape[0], img.shape[1], size[0], size[1]], align_corners=False
+    )
+    img = flow.nn.functional.grid_sample(
+        img, grid, mode=interpolation, padding_mode="zeros", align_corners=False
+    )
+    if interpolation == "bicubic" and out_dtype == flow.uint8:
+        img = img.clamp(min=0, max=255)
+    return F_t._cast_squeeze_out(img, need_cast, need_squeeze, out_dtype)
+
+
+def _apply_channel_affine(img: Tensor, scale: List[float], shift: List[float]):
+    if not img.is_floating_point():
+        img = flow._C.cast(img, dtype=flow.float32)
+    scale = flow.tensor(scale, dtype=img.dtype, device=img.device).view(-1, 1, 1)
+    if all(s == 0 for s in shift):
+        return img * scale
+    shift = flow.tensor(shift, dtype=img.dtype, device=img.device).view(-1, 1, 1)
+    return img * scale + shift
+
+
+def _check_interpolation(interpolation):
+    # Backward compatibility with integer value
+    if isinstance(interpolation, int):
+        warnings.warn(
+            "Argument interpolation should be of type InterpolationMode instead of int. "
+            "Please, use InterpolationMode enum."
+        )
+        interpolation = _interpolation_modes_from_int(interpolation)
+    if interpolation not in (
+        InterpolationMode.NEAREST,
+        InterpolationMode.BILINEAR,
+        InterpolationMode.BICUBIC,
+    ):
+        raise ValueError(
+            "Interpolation mode '{}' is unsupported by batch transforms".format(
+                interpolation.value
+            )
+        )
+    return interpolation
+
+
+class BatchToTensor:
+    r"""Convert a sequence of ``PIL Image`` or ``numpy.ndarray`` of the same size, or a
+    ``numpy.ndarray`` of shape (N x H x W x C), to a tensor of shape (N x C x H x W).
+
+    Unlike applying :class:`~transforms.ToTensor` to every image, the images are
+    stacked on the host and converted by a single copy, cast and scale. Integer
+    images are scaled to the range [0.0, 1.0], floating point ones are kept as is.
+    It is meant to be called at the end of a ``collate_fn``:
+
+    .. code-block:: python
+
+        def collate_fn(samples):
+            images, targets = zip(*samples)
+            return BatchToTensor()(images), flow.tensor(targets)
+    """
+
+    def to_array(self, pics) -> np.ndarray:
+        if isinstance(pics, np.ndarray):
+            array = pics
+        else:
+            array = np.stack([np.asarray(pic) for pic in pics])
+        if array.ndim == 3:
+            array = array[..., None]
+        if array.ndim != 4:
+            raise ValueError(
+                "pics should be a batch of 2/3 dimensional images. Got {} dimensions.".format(
+                    array.ndim
+                )
+            )
+        return array
+
+    def __call__(self, pics) -> Tensor:
+        array = self.to_array(pics)
+        img = flow.tensor(array).permute(0, 3, 1, 2)
+        if img.is_floating_point():
+            return img
+        return flow._C.cast(img, dtype=flow.float32).div(255)
+
+    def __repr__(self):
+        return self.__class__.__name__ + "()"
+
+
+class BatchNormalize(Module):
+    r"""Normalize a batch of tensor images of shape (N x C x H x W) with mean and
+    standard deviation, see :class:`~transforms.Normalize`.
+
+    Args:
+        mean (sequence): Sequence of means for each channel.
+        std (sequence): Sequence of standard deviations for each channel.
+    """
+
+    def __init__(self, mean, std):
+        super().__init__()
+        self.mean = mean
+        self.std = std
+        if any(s == 0 for s in std):
+            raise ValueError(
+                "std evaluated to zero after conversion to float32, leading to division by zero."
+            )
+
+    def _get_channel_affine(self) -> Tuple[List[float], List[float]]:
+        scale = [1.0 / s for s in self.std]
+        shift = [-m / s for m, s in zip(self.mean, self.std)]
+        return scale, shift
+
+    def forward(self, img: Tensor) -> Tensor:
+        """
+        Args:
+            img (Tensor): Batch of tensor images to be normalized.
+        Returns:
+            Tensor: Normalized batch of tensor images.
+        """
+        _assert_batch(img)
+        return _apply_channel_affine(img, *self._get_channel_affine())
+
+    def __repr__(self):
+        return self.__class__.__name__ + "(mean={0}, std={1})".format(
+            self.mean, self.std
+        )
+
+
+class _BatchRandomFlip(Module):
+    horizontal: bool
+
+    def __init__(self, p=0.5):
+        super().__init__()
+        self.p = p
+
+    def _draw(self, n: int, device) -> Tensor:
+        return flow._C.cast(flow.rand(n, device=device) < self.p, flow.float32)
+
+    def _get_affine(self, n: int, h: int, w: int, device):
+        theta = _flip_affine(self._draw(n, device), self.horizontal)
+        return theta, (h, w), None
+
+    def forward(self, img: Tensor) -> Tensor:
+        """
+        Args:
+            img (Tensor): Batch of tensor images to be flipped.
+
+        Returns:
+            Tensor: Batch of tensor images, each flipped with probability ``p``.
+        """
+        _assert_batch(img)
+        flipped = self._draw(img.shape[0], img.device).view(-1, 1, 1, 1) > 0
+        return flow.where(flipped, img.flip(-1 if self.horizontal else -2), img)
+
+    def __repr__(self):
+        return self.__class__.__name__ + "(p={})".format(self.p)
+
+
+class BatchRandomHorizontalFlip(_BatchRandomFlip):
+    """Horizontally flip every image of a batch of shape (N x C x H x W)
+    independently with a given probability, see :class:`~transforms.RandomHorizontalFlip`.
+
+    Args:
+        p (float): probability of an image being flipped. Default value is 0.5
+    """
+
+    horizontal = True
+
+
+class BatchRandomVerticalFlip(_BatchRandomFlip):
+    """Vertically flip every image of a batch of shape (N x C x H x W)
+    independently with a given probability, see :class:`~transforms.RandomVerticalFlip`.
+
+    Args:
+        p (float): probability of an image being flipped. Default value is 0.5
+    """
+
+    horizontal = False
+
+
+class BatchRandomCrop(Module):
+    """Crop every image of a batch of shape (N x C x H x W) at an independent random
+    location, see :class:`~transforms.RandomCrop`.
+
+    Args:
+        size (sequence or int): Desired output size of the crop. If size is an
+            int instead of sequence like (h, w), a square crop (size, size) is
+            made. If provided a sequence of length 1, it will be interpreted as (size[0], size[0]).
+        padding (int, optional): Zero padding on each border of the images before
+            cropping. Default is None, i.e no padding.
+    """
+
+    def __init__(self, size, padding: Optional[int] = None):
+        super().__init__()
+        self.size = tuple(
+            _setup_size(
+                size, error_msg="Please provide only two dimensions (h, w) for size."
+            )
+        )
+        if padding is not None and not isinstance(padding, numbers.Number):
+            raise TypeError("Got inappropriate padding arg")
+        self.padding = padding
+
+    def _get_affine(self, n: int, h: int, w: int, device):
+        pad = 0 if self.padding is None else int(self.padding)
+        th, tw = self.size
+        if h + 2 * pad < th or w + 2 * pad < tw:
+            raise ValueError(
+                "Required crop size {} is larger then padded input image size {}".format(
+                    (th, tw), (h + 2 * pad, w + 2 * pad)
+                )
+            )
+        top = flow.floor(flow.rand(n, device=device) * (h + 2 * pad - th + 1)) - pad
+        left = flow.floor(flow.rand(n, device=device) * (w + 2 * pad - tw + 1)) - pad
+        return _crop_affine(top, left, th, tw, h, w), self.size, None
+
+    def forward(self, img: Tensor) -> Tensor:
+        """
+        Args:
+            img (Tensor): Batch of tensor images to be cropped.
+
+        Returns:
+            Tensor: Batch of cropped tensor images.
+        """
+        _assert_batch(img)
+        n, _, h, w = img.shape
+        theta, size, _ = self._get_affine(n, h, w, img.device)
+        return _apply_affine(img, theta, size, "nearest")
+
+    def __repr__(self):
+        return self.__class__.__name__ + "(size={0}, padding={1})".format(
+            self.size, self.padding
+        )
+
+
+class BatchRandomResizedCrop(Module):
+    """Crop a random portion of every image of a batch of shape (N x C x H x W) and
+    resize it to a given size, with independent random parameters for every image,
+    see :class:`~transforms.RandomResizedCrop`.
+
+    The crops are sampled from the images directly by ``grid_sample``, so an output
+    pixel near the border of a crop may blend in pixels just outside of it, where
+    resizing the cropped image would replicate the border.
+
+    Args:
+        size (int or sequence): expected output size of the crop, for each edge. If size is an
+            int instead of sequence like (h, w), a square output size ``(size, size)`` is
+            made. If provided a sequence of length 1, it will be interpreted as (size[0], size[0]).
+        scale (tuple of float): Specifies the lower and upper bounds for the random area of the crop,
+            before resizing. The scale is defined with respect to the area of the original image.
+        ratio (tuple of float): lower and upper bounds for the random aspect ratio of the crop, before
+            resizing.
+        interpolation (InterpolationMode): Desired interpolation enum defined by
+            :class:`flow.utils.vision.transforms.InterpolationMode`. Default is ``InterpolationMode.BILINEAR``.
+            Only ``InterpolationMode.NEAREST``, ``InterpolationMode.BILINEAR`` and
+            ``InterpolationMode.BICUBIC`` are supported.
+    """
+
+    # attempts to draw a crop for every image before falling back to a central crop
+    num_attempts = 10
+
+    def __init__(
+        self,
+        size,
+        scale=(0.08, 1.0),
+        ratio=(3.0 / 4.0, 4.0 / 3.0),
+        interpolation=InterpolationMode.BILINEAR,
+    ):
+        super().__init__()
+        self.size = tuple(
+            _setup_size(
+                size, error_msg="Please provide only two dimensions (h, w) for size."
+            )
+        )
+
+        if not isinstance(scale, Sequence):
+            raise TypeError("Scale should be a sequence")
+        if not isinstance(ratio, Sequence):
+            raise TypeError("Ratio should be a sequence")
+        if (scale[0] > scale[1]) or (ratio[0] > ratio[1]):
+            warnings.warn("Scale and ratio should be of kind (min, max)")
+
+        self.interpolation = _check_interpolation(interpolation)
+        self.scale = scale
+        self.ratio = ratio
+
+    def _fallback_size(self, h: int, w: int) -> Tuple[int, int]:
+        in_ratio = float(w) / float(h)
+        if in_ratio < min(self.ratio):
+            return int(round(w / min(self.ratio))), w
+        elif in_ratio > max(self.ratio):
+            return h, int(round(h * max(self.ratio)))
+        return h, w
+
+    def _get_affine(self, n: int, h: int, w: int, device):
+        shape = (n, self.num_attempts)
+        target_area = (
+            h
+            * w
+            * (
+                flow.rand(*shape, device=device) * (self.scale[1] - self.scale[0])
+                + self.scale[0]
+            )
+        )
+        log_ratio = (math.log(self.ratio[0]), math.log(self.ratio[1]))
+        aspect_ratio = flow.exp(
+            flow.rand(*shape, device=device) * (log_ratio[1] - log_ratio[0])
+            + log_ratio[0]
+        )
+        crop_w = flow.round(flow.sqrt(target_area * aspect_ratio))
+        crop_h = flow.round(flow.sqrt(target_area / aspect_ratio))
+        valid = flow._C.cast(
+            flow.logical_and(
+                flow.logical_and(crop_w > 0, crop_w <= w),
+                flow.logical_and(crop_h > 0, crop_h <= h),
+            ),
+            flow.float32,
+        )
+        # index of the first valid attempt of every image
+        priority = valid * flow.arange(
+            self.num_attempts, 0, -1, dtype=flow.float32, device=device
+        )
+        first = flow.argmax(priority, dim=1, keepdim=True)
+        found = flow.gather(valid, 1, first).squeeze(1)
+        crop_w = flow.gather(crop_w, 1, first).squeeze(1)
+        crop_h = flow.gather(crop_h, 1, first).squeeze(1)
+        top = flow.floor(flow.rand(n, device=device) * (h - crop_h + 1))
+        left = flow.floor(flow.rand(n, device=device) * (w - crop_w + 1))
+
+        # Fallback to central crop
+        fallback_h, fallback_w = self._fallback_size(h, w)
+        crop_h = found * crop_h + (1 - found) * fallback_h
+        crop_w = found * crop_w + (1 - found) * fallback_w
+        top = found * top + (1 - found) * ((h - fallback_h) // 2)
+        left = found * left + (1 - found) * ((w - fallback_w) // 2)
+        theta = _crop_affine(top, left, crop_h, crop_w, h, w)
+        return theta, self.size, self.interpolation.value
+
+    def forward(self, img: Tensor) -> Tensor:
+        """
+        Args:
+            img (Tensor): Batch of tensor images to be cropped and resized.
+
+        Returns:
+            Tensor: Batch of randomly cropped and resized tensor images.
+        """
+        _assert_batch(img)
+        n, _, h, w = img.shape
+        theta, size, interpolation = self._get_affine(n, h, w, img.device)
+        return _apply_affine(img, theta, size, interpolation)
+
+    def __repr__(self):
+        interpolate_str = self.interpolation.value
+        format_string = self.__class__.__name__ + "(size={0}".format(self.size)
+        format_string += ", scale={0}".format(tuple(round(s, 4) for s in self.scale))
+        format_string += ", ratio={0}".format(tuple(round(r, 4) for r in self.ratio))
+        format_string += ", interpolation={0})".format(interpolate_str)
+        return format_string
+
+
+class BatchCompose:
+    """Composes several transforms on batches together, fusing consecutive
+    geometric transforms (:class:`BatchRandomCrop`, :class:`BatchRandomResizedCrop`
+    and the flips) into a single resampling of the batch and consecutive
+    :class:`BatchNormalize` into a single multiply-add. When the first transform is
+    :class:`BatchToTensor`, its scaling is folded into the next normalization.
+    Other transforms are applied to the whole batch as they are.
+
+    Fusing changes the result slightly: a chain of crops and resizes is sampled
+    from the input directly, without the intermediate rounding and interpolation.
+
+    Args:
+        transforms (list of ``Transform`` objects): list of transforms to compose.
+    Example:
+        >>> transforms.BatchCompose([
+        >>>     transforms.BatchToTensor(),
+        >>>     transforms.BatchRandomResizedCrop(224),
+        >>>     transforms.BatchRandomHorizontalFlip(),
+        >>>     transforms.BatchNormalize((0.485, 0.456, 0.406), (0.229, 0.224, 0.225)),
+        >>> ])
+    """
+
+    def __init__(self, transforms):
+        self.transforms = transforms
+
+    def __call__(self, img):
+        transforms = list(self.transforms)
+        # pending per-channel x * scale + shift
+        scale, shift = None, None
+        if transforms and isinstance(transforms[0], BatchToTensor):
+            array = transforms.pop(0).to_array(img)
+            img = flow.tensor(array).permute(0, 3, 1, 2)
+            if not img.is_floating_point():
+                img = flow._C.cast(img, dtype=flow.float32)
+                scale, shift = [1.0 / 255], [0.0]
+        # pending geometric transforms, applied by a single resampling
+        group = []
+        for t in transforms:
+            if hasattr(t, "_get_affine"):
+                if shift is not None and any(s != 0 for s in shift):
+                    img = _apply_channel_affine(img, scale, shift)
+                    scale, shift = None, None
+                group.append(t)
+            elif hasattr(t, "_get_channel_affine"):
+                img = self._apply_group(img, group)
+                group = []
+                t_scale, t_shift = t._get_channel_affine()
+                if scale is None:
+                    scale, shift = t_scale, t_shift
+                else:
+                    scale, shift = _compose_channel_affine(
+                        scale, shift, t_scale, t_shift
+                    )
+            else:
+                img = self._apply_group(img, group)
+                group = []
+                if scale is not None:
+                    img = _apply_channel_affine(img, scale, shift)
+                    scale, shift = None, None
+                img = t(img)
+        img = self._apply_group(img, group)
+        if scale is not None:
+            img = _apply_channel_affine(img, scale, shift)
+        return img
+
+    @staticmethod
+    def _apply_group(img: Tensor, group) -> Tensor:
+        if len(group) == 0:
+            return img
+        if len(group) == 1:
+            return group[0](img)
+        _assert_batch(img)
+        n, _, h, w = img.shape
+        theta = None
+        interpolation = "nearest"
+        for t in group:
+            t_theta, (h, w), t_interpolation = t._get_affine(n, h, w, img.device)
+            # output coordinates of t are input coordinates of the previous ones
+            theta = t_theta if theta is None else flow.bmm(theta, t_theta)
+            if t_interpolation is not None and interpolation == "nearest":
+                interpolation = t_interpolation
+        return _apply_affine(img, theta, (h, w), interpolation)
+
+    def __repr__(self):
+        format_string = self.__class__.__name__ + "("
+        for t in self.transforms:
+            format_string += "\n"
+            format_string += "    {0}".format(t)
+        format_string += "\n)"
+        return format_string
+
+
+def _compose_channel_affine(scale, shift, next_scale, next_shift):
+    if len(scale) == 1 and len(next_scale) > 1:
+        scale, shift = scale * len(next_scale), shift * len(next_scale)
+    elif len(next_scale) == 1 and len(scale) > 1:
+        next_scale = next_scale * len(scale)
+        next_shift = next_shift * len(scale)
+    return (
+        [s * t for s, t in zip(scale, next_scale)],
+        [b * t + c for b, t, c in zip(shift, next_scale, next_shift)],
+    )